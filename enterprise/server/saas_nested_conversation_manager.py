@@ -4,7 +4,7 @@ import asyncio
 import contextlib
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from types import MappingProxyType
@@ -59,7 +59,12 @@ from openhands.storage.locations import (
     get_conversation_event_filename,
     get_conversation_events_dir,
 )
-from openhands.utils.http_session import httpx_verify_option
+from openhands.utils.http_session import (
+    NESTED_RUNTIME_UPSTREAM,
+    RUNTIME_API_UPSTREAM,
+    close_shared_async_transports,
+    get_shared_async_transport,
+)
 from openhands.utils.import_utils import get_impl
 from openhands.utils.shutdown_listener import should_continue
 from openhands.utils.utils import create_registry_and_conversation_stats
@@ -115,6 +120,8 @@ class SaasNestedConversationManager(ConversationManager):
     _conversation_store_class: type[ConversationStore] | None = None
     _event_polling_task: asyncio.Task | None = None
     _runtime_container_image: str | None = None
+    # Id of the last event copied from each nested runtime (Polling mode only)
+    _last_copied_event_ids: dict[str, int] = field(default_factory=dict)
 
     async def __aenter__(self):
         if self.event_retrieval == EventRetrieval.POLLING:
@@ -125,6 +132,11 @@ class SaasNestedConversationManager(ConversationManager):
         if self._event_polling_task:
             self._event_polling_task.cancel()
             self._event_polling_task = None
+        # Other components share the transports of other upstreams on this loop, and
+        # the server closes those on shutdown
+        await close_shared_async_transports(
+            [RUNTIME_API_UPSTREAM, NESTED_RUNTIME_UPSTREAM]
+        )
 
     async def attach_to_conversation(
         self, sid: str, user_id: str | None = None
@@ -382,12 +394,7 @@ class SaasNestedConversationManager(ConversationManager):
         session_api_key: str,
     ):
         logger.info('starting_nested_conversation', extra={'sid': sid})
-        async with httpx.AsyncClient(
-            verify=httpx_verify_option(),
-            headers={
-                'X-Session-API-Key': session_api_key,
-            },
-        ) as client:
+        async with self._nested_httpx_client(session_api_key) as client:
             await self._setup_nested_settings(client, api_url, settings)
             await self._setup_provider_tokens(client, api_url, settings)
             await self._setup_custom_secrets(client, api_url, settings.custom_secrets)  # type: ignore
@@ -580,12 +587,7 @@ class SaasNestedConversationManager(ConversationManager):
         if runtime is None:
             raise ValueError(f'no_such_conversation:{sid}')
         nested_url = self._get_nested_url_for_runtime(runtime['runtime_id'], sid)
-        async with httpx.AsyncClient(
-            verify=httpx_verify_option(),
-            headers={
-                'X-Session-API-Key': runtime['session_api_key'],
-            },
-        ) as client:
+        async with self._nested_httpx_client(runtime['session_api_key']) as client:
             response = await client.post(f'{nested_url}/events', json=data)
             response.raise_for_status()
 
@@ -614,23 +616,58 @@ class SaasNestedConversationManager(ConversationManager):
                     },
                 )
 
-    async def _get_user_id_from_conversation(self, conversation_id: str) -> str:
+    async def _get_user_ids_for_conversations(
+        self, conversation_ids: set[str]
+    ) -> dict[str, str]:
         """
-        Get user_id from conversation_id.
+        Get the user_id for each of the conversation_ids given. Conversations
+        without saas metadata are omitted from the result.
         """
-
+        if not conversation_ids:
+            return {}
         async with a_session_maker() as session:
             result = await session.execute(
-                select(StoredConversationMetadataSaas).where(
-                    StoredConversationMetadataSaas.conversation_id == conversation_id
+                select(
+                    StoredConversationMetadataSaas.conversation_id,
+                    StoredConversationMetadataSaas.user_id,
+                ).where(
+                    StoredConversationMetadataSaas.conversation_id.in_(conversation_ids)
                 )
             )
-            conversation_metadata_saas = result.scalars().first()
-
-            if not conversation_metadata_saas:
-                raise ValueError(f'No conversation found {conversation_id}')
+            return {
+                conversation_id: str(user_id)
+                for conversation_id, user_id in result.all()
+            }
 
-            return str(conversation_metadata_saas.user_id)
+    async def _get_conversation_metadata_for_conversations(
+        self, conversation_ids: set[str]
+    ) -> dict[str, tuple[StoredConversationMetadata, str]]:
+        """
+        Get the conversation metadata and user_id for each of the conversation_ids
+        given using a single joined query. Conversations missing either record are
+        omitted from the result.
+        """
+        if not conversation_ids:
+            return {}
+        async with a_session_maker() as session:
+            result = await session.execute(
+                select(
+                    StoredConversationMetadata, StoredConversationMetadataSaas.user_id
+                )
+                .join(
+                    StoredConversationMetadataSaas,
+                    StoredConversationMetadata.conversation_id
+                    == StoredConversationMetadataSaas.conversation_id,
+                )
+                .where(StoredConversationMetadata.conversation_id.in_(conversation_ids))
+            )
+            return {
+                conversation_metadata.conversation_id: (
+                    conversation_metadata,
+                    str(user_id),
+                )
+                for conversation_metadata, user_id in result.all()
+            }
 
     async def _get_runtime_status_from_nested_runtime(
         self, session_api_key: Any | None, nested_url: str, conversation_id: str
@@ -649,11 +686,8 @@ class SaasNestedConversationManager(ConversationManager):
             if not session_api_key:
                 return None
 
-            async with httpx.AsyncClient(
-                verify=httpx_verify_option(),
-                headers={
-                    'X-Session-API-Key': session_api_key,
-                },
+            async with self._nested_httpx_client(
+                session_api_key, timeout=_HTTP_TIMEOUT
             ) as client:
                 # Query the nested runtime for conversation info
                 response = await client.get(nested_url)
@@ -713,40 +747,58 @@ class SaasNestedConversationManager(ConversationManager):
                 runtimes.append(runtime)
         else:
             runtimes = await self._get_runtimes()
-        for runtime in runtimes:
-            conversation_id = runtime['session_id']
-            if conversation_id in conversation_ids:
-                continue
-            if filter_to_sids is not None and conversation_id not in filter_to_sids:
-                continue
+        runtimes = [
+            runtime
+            for runtime in runtimes
+            if runtime['session_id'] not in conversation_ids
+            and (filter_to_sids is None or runtime['session_id'] in filter_to_sids)
+        ]
+        if not runtimes:
+            return results
 
-            user_id_for_convo = user_id
-            if not user_id_for_convo:
-                try:
-                    user_id_for_convo = await self._get_user_id_from_conversation(
-                        conversation_id
-                    )
-                except Exception:
-                    continue
+        # Resolve the owners of all conversations in a single query
+        if user_id:
+            user_ids = {runtime['session_id']: user_id for runtime in runtimes}
+        else:
+            try:
+                user_ids = await self._get_user_ids_for_conversations(
+                    {runtime['session_id'] for runtime in runtimes}
+                )
+            except Exception:
+                logger.exception('error_getting_user_ids_for_conversations')
+                user_ids = {}
+        runtimes = [
+            runtime for runtime in runtimes if runtime['session_id'] in user_ids
+        ]
 
-            nested_url = self._get_nested_url_for_runtime(
-                runtime['runtime_id'], conversation_id
+        # Query the nested runtimes concurrently rather than one after another
+        nested_urls = [
+            self._get_nested_url_for_runtime(
+                runtime['runtime_id'], runtime['session_id']
             )
-            session_api_key = runtime.get('session_api_key')
-
-            # Get runtime status from nested runtime
-            runtime_status = await self._get_runtime_status_from_nested_runtime(
-                session_api_key, nested_url, conversation_id
+            for runtime in runtimes
+        ]
+        runtime_statuses = await asyncio.gather(
+            *(
+                self._get_runtime_status_from_nested_runtime(
+                    runtime.get('session_api_key'), nested_url, runtime['session_id']
+                )
+                for runtime, nested_url in zip(runtimes, nested_urls)
             )
+        )
 
+        for runtime, nested_url, runtime_status in zip(
+            runtimes, nested_urls, runtime_statuses
+        ):
+            conversation_id = runtime['session_id']
             agent_loop_info = AgentLoopInfo(
                 conversation_id=conversation_id,
                 url=nested_url,
-                session_api_key=session_api_key,
+                session_api_key=runtime.get('session_api_key'),
                 event_store=EventStore(
                     sid=conversation_id,
                     file_store=self.file_store,
-                    user_id=user_id_for_convo,
+                    user_id=user_ids[conversation_id],
                 ),
                 status=self._parse_status(runtime),
                 runtime_status=runtime_status,
@@ -943,12 +995,27 @@ class SaasNestedConversationManager(ConversationManager):
     @contextlib.asynccontextmanager
     async def _httpx_client(self):
         async with httpx.AsyncClient(
-            verify=httpx_verify_option(),
+            transport=get_shared_async_transport(RUNTIME_API_UPSTREAM),
             headers={'X-API-Key': self.config.sandbox.api_key or ''},
             timeout=_HTTP_TIMEOUT,
         ) as client:
             yield client
 
+    @contextlib.asynccontextmanager
+    async def _nested_httpx_client(
+        self, session_api_key: str, timeout: float | None = None
+    ):
+        # Connections to the nested runtimes are pooled across conversations
+        kwargs: dict[str, Any] = {}
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        async with httpx.AsyncClient(
+            transport=get_shared_async_transport(NESTED_RUNTIME_UPSTREAM),
+            headers={'X-Session-API-Key': session_api_key},
+            **kwargs,
+        ) as client:
+            yield client
+
     async def _get_runtimes(self) -> list[dict]:
         async with self._httpx_client() as client:
             response = await client.get(f'{self.remote_runtime_api_url}/list')
@@ -1023,13 +1090,37 @@ class SaasNestedConversationManager(ConversationManager):
         while should_continue():
             try:
                 await asyncio.sleep(_POLLING_INTERVAL)
-                agent_loop_infos = await self.get_agent_loop_info()
+                agent_loop_infos = [
+                    agent_loop_info
+                    for agent_loop_info in await self.get_agent_loop_info()
+                    if agent_loop_info.status == ConversationStatus.RUNNING
+                ]
+
+                running_ids = {
+                    agent_loop_info.conversation_id
+                    for agent_loop_info in agent_loop_infos
+                }
+                # Forget the progress of conversations which are no longer running
+                for conversation_id in list(self._last_copied_event_ids):
+                    if conversation_id not in running_ids:
+                        del self._last_copied_event_ids[conversation_id]
+
+                metadata_by_conversation_id = (
+                    await self._get_conversation_metadata_for_conversations(running_ids)
+                )
 
                 for agent_loop_info in agent_loop_infos:
-                    if agent_loop_info.status != ConversationStatus.RUNNING:
+                    metadata = metadata_by_conversation_id.get(
+                        agent_loop_info.conversation_id
+                    )
+                    if metadata is None:
+                        # Conversation is running in different server
                         continue
+                    conversation_metadata, user_id = metadata
                     try:
-                        await self._poll_agent_loop_events(agent_loop_info)
+                        await self._poll_agent_loop_events(
+                            agent_loop_info, conversation_metadata, user_id
+                        )
                     except Exception as e:
                         logger.exception(f'error_polling_events:{str(e)}')
             except Exception as e:
@@ -1040,51 +1131,36 @@ class SaasNestedConversationManager(ConversationManager):
                     # Loop has been shut down, exit gracefully
                     return
 
-    async def _poll_agent_loop_events(self, agent_loop_info: AgentLoopInfo):
+    async def _poll_agent_loop_events(
+        self,
+        agent_loop_info: AgentLoopInfo,
+        conversation_metadata: StoredConversationMetadata | None = None,
+        user_id: str | None = None,
+    ):
         """This method is typically only run in localhost, where the webhook callbacks from the remote runtime are unavailable"""
         if agent_loop_info.status != ConversationStatus.RUNNING:
             return
         conversation_id = agent_loop_info.conversation_id
 
-        async with a_session_maker() as session:
-            result = await session.execute(
-                select(StoredConversationMetadata).where(
-                    StoredConversationMetadata.conversation_id == conversation_id
-                )
-            )
-            conversation_metadata = result.scalars().first()
-
-            result = await session.execute(
-                select(StoredConversationMetadataSaas).where(
-                    StoredConversationMetadataSaas.conversation_id == conversation_id
+        if conversation_metadata is None or user_id is None:
+            metadata = (
+                await self._get_conversation_metadata_for_conversations(
+                    {conversation_id}
                 )
+            ).get(conversation_id)
+            if metadata is None:
+                # Conversation is running in different server
+                return
+            conversation_metadata, user_id = metadata
+
+        # Get the id of the next event which is not present. The file store is only
+        # listed the first time we see a conversation - after that we track it.
+        last_copied_event_id = self._last_copied_event_ids.get(conversation_id)
+        if last_copied_event_id is None:
+            last_copied_event_id = self._get_last_stored_event_id(
+                conversation_id, user_id
             )
-            conversation_metadata_saas = result.scalars().first()
-
-        if conversation_metadata is None or conversation_metadata_saas is None:
-            # Conversation is running in different server
-            return
-
-        user_id = conversation_metadata_saas.user_id
-
-        # Get the id of the next event which is not present
-        events_dir = get_conversation_events_dir(
-            agent_loop_info.conversation_id, user_id
-        )
-        try:
-            event_file_names = self.file_store.list(events_dir)
-        except FileNotFoundError:
-            event_file_names = []
-        start_id = (
-            max(
-                (
-                    _get_id_from_filename(event_file_name)
-                    for event_file_name in event_file_names
-                ),
-                default=-1,
-            )
-            + 1
-        )
+        start_id = last_copied_event_id + 1
 
         # Copy over any missing events and update the conversation metadata
         last_updated_at = conversation_metadata.last_updated_at
@@ -1099,12 +1175,14 @@ class SaasNestedConversationManager(ConversationManager):
                     conversation_id, event.id, user_id
                 )
                 self.file_store.write(path, contents)
+                last_copied_event_id = max(last_copied_event_id, event.id)
 
                 # Process the event using shared logic from event_webhook
                 subpath = f'events/{event.id}.json'
                 await process_event(
                     user_id, conversation_id, subpath, event_to_dict(event)
                 )
+        self._last_copied_event_ids[conversation_id] = last_copied_event_id
 
         # Update conversation metadata using shared logic
         metadata_content = {
@@ -1112,6 +1190,20 @@ class SaasNestedConversationManager(ConversationManager):
         }
         update_conversation_metadata(conversation_id, metadata_content)
 
+    def _get_last_stored_event_id(self, conversation_id: str, user_id: str) -> int:
+        events_dir = get_conversation_events_dir(conversation_id, user_id)
+        try:
+            event_file_names = self.file_store.list(events_dir)
+        except FileNotFoundError:
+            event_file_names = []
+        return max(
+            (
+                _get_id_from_filename(event_file_name)
+                for event_file_name in event_file_names
+            ),
+            default=-1,
+        )
+
     async def list_files(self, sid: str, path: str | None = None) -> list[str]:
         """List files in the workspace for a conversation.
 
@@ -12,7 +12,6 @@ from storage.user import User
 
 from openhands.app_server.app_conversation.app_conversation_info_service import (
     AppConversationInfoService,
-    AppConversationInfoServiceInjector,
 )
 from openhands.app_server.app_conversation.app_conversation_models import (
     AppConversationInfo,
@@ -21,6 +20,7 @@ from openhands.app_server.app_conversation.app_conversation_models import (
 )
 from openhands.app_server.app_conversation.sql_app_conversation_info_service import (
     SQLAppConversationInfoService,
+    SQLAppConversationInfoServiceInjector,
 )
 from openhands.app_server.errors import AuthError
 from openhands.app_server.services.injector import InjectorState
@@ -410,7 +410,7 @@ class SaasSQLAppConversationInfoService(SQLAppConversationInfoService):
         return info
 
 
-class SaasAppConversationInfoServiceInjector(AppConversationInfoServiceInjector):
+class SaasAppConversationInfoServiceInjector(SQLAppConversationInfoServiceInjector):
     """Enterprise injector for SQLAppConversationInfoService with SAAS filtering."""
 
     async def inject(
@@ -426,6 +426,8 @@ class SaasAppConversationInfoServiceInjector(AppConversationInfoServiceInjector)
             get_db_session(state, request) as db_session,
         ):
             service = SaasSQLAppConversationInfoService(
-                db_session=db_session, user_context=user_context
+                db_session=db_session,
+                user_context=user_context,
+                statistics_aggregator=await self.get_statistics_aggregator(),
             )
             yield service
@@ -21,7 +21,10 @@ from storage.encrypt_utils import decrypt_legacy_value
 from storage.user_settings import UserSettings
 
 from openhands.server.settings import Settings
-from openhands.utils.http_session import httpx_verify_option
+from openhands.utils.http_session import (
+    LITELLM_UPSTREAM,
+    get_shared_async_transport,
+)
 
 # Timeout in seconds for key verification requests to LiteLLM
 KEY_VERIFICATION_TIMEOUT = 5.0
@@ -127,9 +130,10 @@ class LiteLlmManager:
             )
 
             async with httpx.AsyncClient(
+                transport=get_shared_async_transport(LITELLM_UPSTREAM),
                 headers={
                     'x-goog-api-key': LITE_LLM_API_KEY,
-                }
+                },
             ) as client:
                 # Check if team already exists and get its budget
                 # New users joining existing orgs should inherit the team's budget
@@ -240,9 +244,10 @@ class LiteLlmManager:
         if not local_deploy:
             # Get user info to add to litellm
             async with httpx.AsyncClient(
+                transport=get_shared_async_transport(LITELLM_UPSTREAM),
                 headers={
                     'x-goog-api-key': LITE_LLM_API_KEY,
-                }
+                },
             ) as client:
                 user_json = await LiteLlmManager._get_user(client, keycloak_user_id)
                 if not user_json:
@@ -439,9 +444,10 @@ class LiteLlmManager:
         local_deploy = os.environ.get('LOCAL_DEPLOYMENT', None)
         if not local_deploy:
             async with httpx.AsyncClient(
+                transport=get_shared_async_transport(LITELLM_UPSTREAM),
                 headers={
                     'x-goog-api-key': LITE_LLM_API_KEY,
-                }
+                },
             ) as client:
                 # Step 1: Get the team info to retrieve the budget
                 logger.debug(
@@ -553,9 +559,10 @@ class LiteLlmManager:
             logger.warning('LiteLLM API configuration not found')
             return
         async with httpx.AsyncClient(
+            transport=get_shared_async_transport(LITELLM_UPSTREAM),
             headers={
                 'x-goog-api-key': LITE_LLM_API_KEY,
-            }
+            },
         ) as client:
             await LiteLlmManager._update_team(client, team_id, None, max_budget)
             team_info = await LiteLlmManager._get_team(client, team_id)
@@ -1278,7 +1285,7 @@ class LiteLlmManager:
 
         try:
             async with httpx.AsyncClient(
-                verify=httpx_verify_option(),
+                transport=get_shared_async_transport(LITELLM_UPSTREAM),
                 timeout=KEY_VERIFICATION_TIMEOUT,
             ) as client:
                 # Make a lightweight request to verify the key
@@ -1608,6 +1615,7 @@ class LiteLlmManager:
         @functools.wraps(internal_fn)
         async def wrapper(*args, **kwargs):
             async with httpx.AsyncClient(
+                transport=get_shared_async_transport(LITELLM_UPSTREAM),
                 headers={'x-goog-api-key': LITE_LLM_API_KEY},
                 timeout=httpx.Timeout(30.0),
             ) as client:
@@ -0,0 +1,134 @@
+"""Tests for batched agent loop info and event polling in SaasNestedConversationManager."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from server.saas_nested_conversation_manager import SaasNestedConversationManager
+
+from openhands.core.config.openhands_config import OpenHandsConfig
+from openhands.server.config.server_config import ServerConfig
+from openhands.server.data_models.agent_loop_info import AgentLoopInfo
+from openhands.storage.data_models.conversation_status import ConversationStatus
+from openhands.storage.memory import InMemoryFileStore
+
+
+async def _empty_scan_iter(pattern):
+    for key in []:
+        yield key
+
+
+@pytest.fixture
+def saas_manager():
+    manager = SaasNestedConversationManager(
+        sio=MagicMock(),
+        config=MagicMock(spec=OpenHandsConfig),
+        server_config=MagicMock(spec=ServerConfig),
+        file_store=InMemoryFileStore(),
+        event_retrieval=MagicMock(),
+    )
+    redis = MagicMock()
+    redis.scan_iter = _empty_scan_iter
+    manager._get_redis_client = MagicMock(return_value=redis)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_get_agent_loop_info_resolves_user_ids_in_one_query(saas_manager):
+    saas_manager._get_runtimes = AsyncMock(
+        return_value=[
+            {'session_id': 'conv-1', 'runtime_id': 'rt-1', 'status': 'running'},
+            {'session_id': 'conv-2', 'runtime_id': 'rt-2', 'status': 'running'},
+            {'session_id': 'conv-3', 'runtime_id': 'rt-3', 'status': 'paused'},
+        ]
+    )
+    saas_manager._get_user_ids_for_conversations = AsyncMock(
+        return_value={'conv-1': 'user-1', 'conv-3': 'user-3'}
+    )
+    saas_manager._get_runtime_status_from_nested_runtime = AsyncMock(return_value=None)
+
+    results = await saas_manager.get_agent_loop_info()
+
+    saas_manager._get_user_ids_for_conversations.assert_awaited_once_with(
+        {'conv-1', 'conv-2', 'conv-3'}
+    )
+    # conv-2 has no saas metadata, so it belongs to a different server
+    assert [r.conversation_id for r in results] == ['conv-1', 'conv-3']
+    assert [r.status for r in results] == [
+        ConversationStatus.RUNNING,
+        ConversationStatus.STOPPED,
+    ]
+    assert saas_manager._get_runtime_status_from_nested_runtime.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_agent_loop_info_with_user_id_skips_lookup(saas_manager):
+    saas_manager._get_runtimes = AsyncMock(
+        return_value=[
+            {'session_id': 'conv-1', 'runtime_id': 'rt-1', 'status': 'running'},
+        ]
+    )
+    saas_manager._get_user_ids_for_conversations = AsyncMock()
+    saas_manager._get_runtime_status_from_nested_runtime = AsyncMock(return_value=None)
+
+    results = await saas_manager.get_agent_loop_info(user_id='user-1')
+
+    saas_manager._get_user_ids_for_conversations.assert_not_awaited()
+    assert len(results) == 1
+    assert results[0].event_store.user_id == 'user-1'
+
+
+def _mock_event(event_id: int):
+    event = MagicMock()
+    event.id = event_id
+    event.timestamp = None
+    return event
+
+
+@pytest.mark.asyncio
+async def test_poll_agent_loop_events_tracks_last_copied_event(saas_manager):
+    event_store = MagicMock()
+    event_store.search_events.side_effect = [
+        [_mock_event(0), _mock_event(1)],
+        [_mock_event(2)],
+    ]
+    agent_loop_info = AgentLoopInfo(
+        conversation_id='conv-1',
+        url=None,
+        session_api_key=None,
+        event_store=event_store,
+        status=ConversationStatus.RUNNING,
+    )
+    conversation_metadata = MagicMock()
+    conversation_metadata.last_updated_at = datetime.now(UTC)
+
+    with (
+        patch(
+            'server.saas_nested_conversation_manager.event_to_dict',
+            return_value={},
+        ),
+        patch(
+            'server.saas_nested_conversation_manager.process_event',
+            new=AsyncMock(),
+        ),
+        patch('server.saas_nested_conversation_manager.update_conversation_metadata'),
+        patch.object(
+            saas_manager,
+            '_get_last_stored_event_id',
+            wraps=saas_manager._get_last_stored_event_id,
+        ) as get_last_stored_event_id,
+    ):
+        await saas_manager._poll_agent_loop_events(
+            agent_loop_info, conversation_metadata, 'user-1'
+        )
+        await saas_manager._poll_agent_loop_events(
+            agent_loop_info, conversation_metadata, 'user-1'
+        )
+
+    # The file store is only listed the first time the conversation is polled
+    get_last_stored_event_id.assert_called_once_with('conv-1', 'user-1')
+    assert [c.kwargs['start_id'] for c in event_store.search_events.call_args_list] == [
+        0,
+        2,
+    ]
+    assert saas_manager._last_copied_event_ids == {'conv-1': 2}
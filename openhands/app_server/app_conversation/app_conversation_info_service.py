@@ -116,6 +116,15 @@ class AppConversationInfoService(ABC):
             conversation_id: The ID of the conversation to update
         """
 
+    @abstractmethod
+    async def flush_conversation_statistics(self, conversation_id: UUID) -> None:
+        """Write any statistics for the conversation which are still pending from
+        process_stats_event.
+
+        Args:
+            conversation_id: The ID of the conversation to flush
+        """
+
 
 class AppConversationInfoServiceInjector(
     DiscriminatedUnionMixin, Injector[AppConversationInfoService], ABC
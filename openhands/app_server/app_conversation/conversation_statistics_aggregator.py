@@ -0,0 +1,186 @@
+"""Write-behind aggregation of conversation statistics.
+
+Agents emit a stats event after every LLM call. Rather than issuing a SELECT and a
+commit for each of these, the latest statistics for each conversation are kept in
+memory and written to the conversation_metadata table in bulk - on an interval, when
+a conversation is paused / finished, and on shutdown.
+
+The bulk write updates rows by conversation id alone, so statistics must only be
+added for conversations the user may access. The services check this with their own
+secure select the first time a user sends statistics for a conversation, and the
+aggregator remembers the result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from openhands.agent_server.utils import utc_now
+from openhands.app_server.app_conversation.sql_app_conversation_info_service import (
+    STATISTICS_COLUMNS,
+    StoredConversationMetadata,
+    get_statistics_values,
+)
+from openhands.sdk import ConversationStats
+
+logger = logging.getLogger(__name__)
+
+_aggregators: weakref.WeakSet[ConversationStatisticsAggregator] = weakref.WeakSet()
+_MAX_WRITABLE_CONVERSATIONS = 10_000
+
+
+def _build_bulk_update():
+    """Build a single UPDATE statement, executed once with one parameter set per
+    conversation. Columns with a NULL parameter keep their stored value."""
+    table = StoredConversationMetadata.__table__
+    column_values: dict[str, Any] = {
+        key: func.coalesce(bindparam(f'v_{key}', type_=table.c[key].type), table.c[key])
+        for key in STATISTICS_COLUMNS
+    }
+    column_values['last_updated_at'] = bindparam(
+        'v_last_updated_at', type_=table.c.last_updated_at.type
+    )
+    return (
+        update(table)
+        .where(
+            table.c.conversation_id == bindparam('v_conversation_id'),
+            table.c.conversation_version == 'V1',
+        )
+        .values(column_values)
+    )
+
+
+@dataclass(eq=False)
+class ConversationStatisticsAggregator:
+    """Keeps the latest statistics for each conversation in memory and flushes them
+    to the database in bulk."""
+
+    session_maker: async_sessionmaker
+    flush_interval: float = 5.0
+    _pending: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _flush_task: asyncio.Task | None = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # The user and conversation ids of the conversations found to be accessible
+    _writable: OrderedDict[tuple[str | None, str], None] = field(
+        default_factory=OrderedDict
+    )
+
+    def __post_init__(self):
+        _aggregators.add(self)
+
+    def is_writable(self, user_id: str | None, conversation_id: UUID) -> bool:
+        """Whether the user was found to have access to the conversation."""
+        key = (user_id, str(conversation_id))
+        if key not in self._writable:
+            return False
+        self._writable.move_to_end(key)
+        return True
+
+    def set_writable(self, user_id: str | None, conversation_id: UUID) -> None:
+        """Record that the user has access to the conversation."""
+        key = (user_id, str(conversation_id))
+        self._writable[key] = None
+        self._writable.move_to_end(key)
+        while len(self._writable) > _MAX_WRITABLE_CONVERSATIONS:
+            self._writable.popitem(last=False)
+
+    def add(self, conversation_id: UUID, stats: ConversationStats) -> None:
+        """Record the latest statistics for the conversation. The caller must have
+        checked that the user has access to the conversation (See is_writable)."""
+        values = get_statistics_values(stats)
+        if values is None:
+            logger.debug(
+                'No agent metrics found in stats for conversation %s', conversation_id
+            )
+            return
+        values['last_updated_at'] = utc_now()
+        # Later events carry the accumulated totals, so the latest value wins -
+        # but a missing value must not discard one which is still pending.
+        pending = self._pending.setdefault(str(conversation_id), {})
+        for key, value in values.items():
+            if value is not None or key not in pending:
+                pending[key] = value
+        self._ensure_flush_task()
+
+    async def flush(self, conversation_ids: list[UUID] | None = None) -> int:
+        """Write pending statistics to the database.
+
+        Args:
+            conversation_ids: Only flush these conversations (All if None)
+
+        Returns:
+            The number of conversations flushed
+        """
+        async with self._lock:
+            if conversation_ids is None:
+                batch = self._pending
+                self._pending = {}
+            else:
+                batch = {}
+                for conversation_id in conversation_ids:
+                    values = self._pending.pop(str(conversation_id), None)
+                    if values is not None:
+                        batch[str(conversation_id)] = values
+            if not batch:
+                return 0
+
+            params = [
+                {
+                    'v_conversation_id': conversation_id,
+                    **{f'v_{key}': value for key, value in values.items()},
+                }
+                for conversation_id, values in batch.items()
+            ]
+            try:
+                async with self.session_maker() as db_session:
+                    await db_session.execute(_build_bulk_update(), params)
+                    await db_session.commit()
+            except BaseException:
+                # Put the statistics back unless something newer arrived meanwhile
+                for conversation_id, values in batch.items():
+                    self._pending.setdefault(conversation_id, values)
+                raise
+            return len(batch)
+
+    async def close(self) -> None:
+        """Stop the background flush and write anything still pending."""
+        flush_task = self._flush_task
+        self._flush_task = None
+        if flush_task:
+            flush_task.cancel()
+            try:
+                await flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    def _ensure_flush_task(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                count = await self.flush()
+                logger.debug('Flushed statistics for %s conversations', count)
+            except Exception:
+                logger.exception('Error flushing conversation statistics')
+
+
+async def close_conversation_statistics_aggregators() -> None:
+    """Flush all pending statistics. Invoked when the server shuts down."""
+    for aggregator in list(_aggregators):
+        try:
+            await aggregator.close()
+        except Exception:
+            logger.exception('Error flushing conversation statistics on shutdown')
@@ -21,10 +21,11 @@ import logging
 import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import AsyncGenerator
+from typing import TYPE_CHECKING, Any, AsyncGenerator
 from uuid import UUID
 
 from fastapi import Request
+from pydantic import Field, PrivateAttr
 from sqlalchemy import (
     Boolean,
     Column,
@@ -60,8 +61,26 @@ from openhands.sdk.event import ConversationStateUpdateEvent
 from openhands.sdk.llm import MetricsSnapshot, TokenUsage
 from openhands.storage.data_models.conversation_metadata import ConversationTrigger
 
+if TYPE_CHECKING:
+    from openhands.app_server.app_conversation.conversation_statistics_aggregator import (  # noqa: E501
+        ConversationStatisticsAggregator,
+    )
+
 logger = logging.getLogger(__name__)
 
+# Columns updated from the agent metrics of a stats event
+STATISTICS_COLUMNS = (
+    'accumulated_cost',
+    'max_budget_per_task',
+    'prompt_tokens',
+    'completion_tokens',
+    'cache_read_tokens',
+    'cache_write_tokens',
+    'reasoning_tokens',
+    'context_window',
+    'per_turn_token',
+)
+
 
 class StoredConversationMetadata(Base):  # type: ignore
     __tablename__ = 'conversation_metadata'
@@ -104,6 +123,25 @@ class StoredConversationMetadata(Base):  # type: ignore
     tags = Column(create_json_type_decorator(dict[str, str]), nullable=True)
 
 
+def get_statistics_values(stats: ConversationStats) -> dict[str, Any] | None:
+    """Extract the values of the STATISTICS_COLUMNS from the agent metrics in the
+    stats given. A value of None means the stored value should be retained.
+
+    Returns None if there are no agent metrics in the stats.
+    """
+    agent_metrics = stats.usage_to_metrics.get('agent')
+    if not agent_metrics:
+        return None
+    usage = agent_metrics.accumulated_token_usage
+    values: dict[str, Any] = {
+        'accumulated_cost': agent_metrics.accumulated_cost,
+        'max_budget_per_task': agent_metrics.max_budget_per_task,
+    }
+    for key in STATISTICS_COLUMNS[2:]:
+        values[key] = getattr(usage, key) if usage else None
+    return values
+
+
 @dataclass
 class SQLAppConversationInfoService(AppConversationInfoService):
     """SQL implementation of AppConversationInfoService focused on db operations.
@@ -113,6 +151,8 @@ class SQLAppConversationInfoService(AppConversationInfoService):
 
     db_session: AsyncSession
     user_context: UserContext
+    # When set, statistics from stats events are written behind in bulk
+    statistics_aggregator: ConversationStatisticsAggregator | None = None
 
     async def search_app_conversation_info(
         self,
@@ -382,11 +422,8 @@ class SQLAppConversationInfoService(AppConversationInfoService):
             conversation_id: The ID of the conversation to update
             stats: ConversationStats object containing usage_to_metrics data from stats event
         """
-        # Extract agent metrics from usage_to_metrics
-        usage_to_metrics = stats.usage_to_metrics
-        agent_metrics = usage_to_metrics.get('agent')
-
-        if not agent_metrics:
+        values = get_statistics_values(stats)
+        if values is None:
             logger.debug(
                 'No agent metrics found in stats for conversation %s', conversation_id
             )
@@ -407,48 +444,10 @@ class SQLAppConversationInfoService(AppConversationInfoService):
             )
             return
 
-        # Extract accumulated_cost and max_budget_per_task from Metrics object
-        accumulated_cost = agent_metrics.accumulated_cost
-        max_budget_per_task = agent_metrics.max_budget_per_task
-
-        # Extract accumulated_token_usage from Metrics object
-        accumulated_token_usage = agent_metrics.accumulated_token_usage
-        if accumulated_token_usage:
-            prompt_tokens = accumulated_token_usage.prompt_tokens
-            completion_tokens = accumulated_token_usage.completion_tokens
-            cache_read_tokens = accumulated_token_usage.cache_read_tokens
-            cache_write_tokens = accumulated_token_usage.cache_write_tokens
-            reasoning_tokens = accumulated_token_usage.reasoning_tokens
-            context_window = accumulated_token_usage.context_window
-            per_turn_token = accumulated_token_usage.per_turn_token
-        else:
-            prompt_tokens = None
-            completion_tokens = None
-            cache_read_tokens = None
-            cache_write_tokens = None
-            reasoning_tokens = None
-            context_window = None
-            per_turn_token = None
-
         # Update fields only if values are provided (not None)
-        if accumulated_cost is not None:
-            stored.accumulated_cost = accumulated_cost
-        if max_budget_per_task is not None:
-            stored.max_budget_per_task = max_budget_per_task
-        if prompt_tokens is not None:
-            stored.prompt_tokens = prompt_tokens
-        if completion_tokens is not None:
-            stored.completion_tokens = completion_tokens
-        if cache_read_tokens is not None:
-            stored.cache_read_tokens = cache_read_tokens
-        if cache_write_tokens is not None:
-            stored.cache_write_tokens = cache_write_tokens
-        if reasoning_tokens is not None:
-            stored.reasoning_tokens = reasoning_tokens
-        if context_window is not None:
-            stored.context_window = context_window
-        if per_turn_token is not None:
-            stored.per_turn_token = per_turn_token
+        for key, value in values.items():
+            if value is not None:
+                setattr(stored, key, value)
 
         # Update last_updated_at timestamp
         stored.last_updated_at = utc_now()
@@ -486,10 +485,18 @@ class SQLAppConversationInfoService(AppConversationInfoService):
                 conversation_stats = ConversationStats.model_validate(stats_dict)
 
             if conversation_stats and conversation_stats.usage_to_metrics:
-                # Pass ConversationStats object directly for type safety
-                await self.update_conversation_statistics(
-                    conversation_id, conversation_stats
-                )
+                if self.statistics_aggregator:
+                    # The bulk write is not filtered by user, so the statistics
+                    # are only added for conversations this user may access
+                    if await self._is_statistics_writable(conversation_id):
+                        self.statistics_aggregator.add(
+                            conversation_id, conversation_stats
+                        )
+                else:
+                    # Pass ConversationStats object directly for type safety
+                    await self.update_conversation_statistics(
+                        conversation_id, conversation_stats
+                    )
         except Exception:
             logger.exception(
                 'Error updating conversation statistics for conversation %s',
@@ -497,6 +504,34 @@ class SQLAppConversationInfoService(AppConversationInfoService):
                 stack_info=True,
             )
 
+    async def flush_conversation_statistics(self, conversation_id: UUID) -> None:
+        if self.statistics_aggregator:
+            await self.statistics_aggregator.flush([conversation_id])
+
+    async def _is_statistics_writable(self, conversation_id: UUID) -> bool:
+        """Whether the conversation is accessible through the secure select, as
+        update_conversation_statistics requires. The aggregator remembers
+        conversations found to be accessible, so that this is only queried once per
+        user and conversation."""
+        aggregator = self.statistics_aggregator
+        assert aggregator is not None
+        user_id = await self.user_context.get_user_id()
+        if aggregator.is_writable(user_id, conversation_id):
+            return True
+        query = await self._secure_select()
+        query = query.where(
+            StoredConversationMetadata.conversation_id == str(conversation_id)
+        )
+        result = await self.db_session.execute(query)
+        if result.scalar_one_or_none() is None:
+            logger.debug(
+                'Conversation %s not found or not accessible, skipping statistics update',
+                conversation_id,
+            )
+            return False
+        aggregator.set_writable(user_id, conversation_id)
+        return True
+
     async def _secure_select(self):
         query = select(StoredConversationMetadata).where(
             StoredConversationMetadata.conversation_version == 'V1'
@@ -589,6 +624,40 @@ class SQLAppConversationInfoService(AppConversationInfoService):
 
 
 class SQLAppConversationInfoServiceInjector(AppConversationInfoServiceInjector):
+    statistics_flush_interval: float = Field(
+        default=5.0,
+        description=(
+            'Seconds between bulk writes of conversation statistics. '
+            '0 writes the statistics from each stats event immediately.'
+        ),
+    )
+    _statistics_aggregator: ConversationStatisticsAggregator | None = PrivateAttr(
+        default=None
+    )
+
+    async def get_statistics_aggregator(
+        self,
+    ) -> ConversationStatisticsAggregator | None:
+        if self.statistics_flush_interval <= 0:
+            return None
+        aggregator = self._statistics_aggregator
+        if aggregator is None:
+            # Define inline to prevent circular lookup
+            from openhands.app_server.app_conversation.conversation_statistics_aggregator import (  # noqa: E501
+                ConversationStatisticsAggregator,
+            )
+            from openhands.app_server.config import get_global_config
+
+            session_maker = (
+                await get_global_config().db_session.get_async_session_maker()
+            )
+            aggregator = ConversationStatisticsAggregator(
+                session_maker=session_maker,
+                flush_interval=self.statistics_flush_interval,
+            )
+            self._statistics_aggregator = aggregator
+        return aggregator
+
     async def inject(
         self, state: InjectorState, request: Request | None = None
     ) -> AsyncGenerator[AppConversationInfoService, None]:
@@ -603,6 +672,8 @@ class SQLAppConversationInfoServiceInjector(AppConversationInfoServiceInjector):
             get_db_session(state, request) as db_session,
         ):
             service = SQLAppConversationInfoService(
-                db_session=db_session, user_context=user_context
+                db_session=db_session,
+                user_context=user_context,
+                statistics_aggregator=await self.get_statistics_aggregator(),
             )
             yield service
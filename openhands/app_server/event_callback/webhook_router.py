@@ -215,6 +215,12 @@ async def on_conversation_update(
         sandbox_id=sandbox_info.id,
     )
 
+    # Write pending statistics first so they can't overwrite the metrics below.
+    # (Updates are sent when a conversation starts, pauses or finishes)
+    await app_conversation_info_service.flush_conversation_statistics(
+        conversation_info.id
+    )
+
     app_conversation_info = AppConversationInfo(
         id=conversation_info.id,
         title=existing.title or f'Conversation {conversation_info.id.hex}',
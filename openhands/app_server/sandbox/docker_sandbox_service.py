@@ -11,11 +11,17 @@ import docker
 import httpx
 from docker.errors import APIError, NotFound
 from fastapi import Request
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from openhands.agent_server.utils import utc_now
 from openhands.app_server.errors import SandboxError
 from openhands.app_server.sandbox.docker_sandbox_spec_service import get_docker_client
+from openhands.app_server.sandbox.sandbox_health_monitor import (
+    SandboxHealth,
+    SandboxHealthMonitor,
+    probe_concurrently,
+    probe_each,
+)
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
     VSCODE,
@@ -58,6 +64,17 @@ def _get_kvm_enabled_default() -> bool:
     return value.lower() in ('true', '1', 'yes')
 
 
+async def _probe_health_url(httpx_client: httpx.AsyncClient, url: str) -> SandboxHealth:
+    try:
+        response = await httpx_client.get(url)
+        response.raise_for_status()
+        return SandboxHealth(healthy=True)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        return SandboxHealth(healthy=False, error=str(exc))
+
+
 class VolumeMount(BaseModel):
     """Mounted volume within the container."""
 
@@ -102,6 +119,7 @@ class DockerSandboxService(SandboxService):
     startup_grace_seconds: int = STARTUP_GRACE_SECONDS
     use_host_network: bool = False
     kvm_enabled: bool = False
+    health_monitor: SandboxHealthMonitor[SandboxHealth] | None = None
 
     def _find_unused_port(self) -> int:
         """Find an unused port on the host machine."""
@@ -230,75 +248,102 @@ class DockerSandboxService(SandboxService):
             created_at=created_at,
         )
 
-    async def _container_to_checked_sandbox_info(self, container) -> SandboxInfo | None:
-        sandbox_info = await self._container_to_sandbox_info(container)
-        if (
-            sandbox_info
-            and self.health_check_path is not None
-            and sandbox_info.exposed_urls
-        ):
-            app_server_url = next(
-                exposed_url.url
-                for exposed_url in sandbox_info.exposed_urls
-                if exposed_url.name == AGENT_SERVER
+    def _get_health_check_url(self, sandbox_info: SandboxInfo) -> str | None:
+        if self.health_check_path is None or not sandbox_info.exposed_urls:
+            return None
+        app_server_url = next(
+            exposed_url.url
+            for exposed_url in sandbox_info.exposed_urls
+            if exposed_url.name == AGENT_SERVER
+        )
+        # When running in Docker, replace localhost hostname with host.docker.internal for internal requests
+        app_server_url = replace_localhost_hostname_for_docker(app_server_url)
+        return f'{app_server_url}{self.health_check_path}'
+
+    async def _check_health(
+        self, urls: list[str], force_refresh: bool = False
+    ) -> dict[str, SandboxHealth | None]:
+        if self.health_monitor:
+            return await self.health_monitor.get_many(
+                urls, force_refresh, self.httpx_client
             )
-            try:
-                # When running in Docker, replace localhost hostname with host.docker.internal for internal requests
-                app_server_url = replace_localhost_hostname_for_docker(app_server_url)
-
-                response = await self.httpx_client.get(
-                    f'{app_server_url}{self.health_check_path}'
+        return await probe_concurrently(self.httpx_client, urls, _probe_health_url)
+
+    def _apply_health(
+        self, container, sandbox_info: SandboxInfo, url: str, health: SandboxHealth
+    ) -> None:
+        if health.healthy:
+            return
+        # Get the started_at from the docker container info and fallback to sandbox created_at
+        try:
+            state = container.attrs['State']
+            started_at = datetime.fromisoformat(state['StartedAt'])
+        except Exception:
+            _logger.debug('Error getting container start time')
+            started_at = sandbox_info.created_at
+
+        # If the server has exceeded the startup grace period, it's an error
+        if started_at < utc_now() - timedelta(seconds=self.startup_grace_seconds):
+            _logger.info(f'Sandbox server not running: {url} : {health.error}')
+            sandbox_info.status = SandboxStatus.ERROR
+        else:
+            _logger.debug(
+                f'Sandbox server not yet available (still starting): '
+                f'{url} : {health.error}'
+            )
+            sandbox_info.status = SandboxStatus.STARTING
+        sandbox_info.exposed_urls = None
+        sandbox_info.session_api_key = None
+
+    async def _containers_to_checked_sandbox_infos(
+        self, containers: list, force_refresh: bool = False
+    ) -> list[SandboxInfo]:
+        """Convert containers to sandbox infos, checking the health of all running
+        sandboxes concurrently."""
+        checks = []
+        for container in containers:
+            sandbox_info = await self._container_to_sandbox_info(container)
+            if sandbox_info:
+                url = self._get_health_check_url(sandbox_info)
+                checks.append((container, sandbox_info, url))
+
+        urls = [url for _, _, url in checks if url]
+        health_by_url = await self._check_health(urls, force_refresh) if urls else {}
+        for container, sandbox_info, url in checks:
+            if url:
+                health = health_by_url.get(url) or SandboxHealth(
+                    healthy=False, error='No health check result'
                 )
-                response.raise_for_status()
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                # Get the started_at from the docker container info and fallback to sandbox created_at
-                try:
-                    state = container.attrs['State']
-                    started_at = datetime.fromisoformat(state['StartedAt'])
-                except Exception:
-                    _logger.debug('Error getting container start time')
-                    started_at = sandbox_info.created_at
-
-                # If the server has exceeded the startup grace period, it's an error
-                if started_at < utc_now() - timedelta(
-                    seconds=self.startup_grace_seconds
-                ):
-                    _logger.info(
-                        f'Sandbox server not running: {app_server_url} : {exc}'
-                    )
-                    sandbox_info.status = SandboxStatus.ERROR
-                else:
-                    _logger.debug(
-                        f'Sandbox server not yet available (still starting): '
-                        f'{app_server_url} : {exc}'
-                    )
-                    sandbox_info.status = SandboxStatus.STARTING
-                sandbox_info.exposed_urls = None
-                sandbox_info.session_api_key = None
-        return sandbox_info
+                self._apply_health(container, sandbox_info, url, health)
+        return [sandbox_info for _, sandbox_info, _ in checks]
+
+    async def _container_to_checked_sandbox_info(
+        self, container, force_refresh: bool = False
+    ) -> SandboxInfo | None:
+        sandbox_infos = await self._containers_to_checked_sandbox_infos(
+            [container], force_refresh
+        )
+        return sandbox_infos[0] if sandbox_infos else None
 
     async def search_sandboxes(
         self,
         page_id: str | None = None,
         limit: int = 100,
+        force_refresh: bool = False,
     ) -> SandboxPage:
         """Search for sandboxes."""
         try:
             # Get all containers with our prefix
             all_containers = self.docker_client.containers.list(all=True)
-            sandboxes = []
-
-            for container in all_containers:
-                if container.name and container.name.startswith(
-                    self.container_name_prefix
-                ):
-                    sandbox_info = await self._container_to_checked_sandbox_info(
-                        container
-                    )
-                    if sandbox_info:
-                        sandboxes.append(sandbox_info)
+            sandboxes = await self._containers_to_checked_sandbox_infos(
+                [
+                    container
+                    for container in all_containers
+                    if container.name
+                    and container.name.startswith(self.container_name_prefix)
+                ],
+                force_refresh,
+            )
 
             # Sort by creation time (newest first)
             sandboxes.sort(key=lambda x: x.created_at, reverse=True)
@@ -324,16 +369,41 @@ class DockerSandboxService(SandboxService):
         except APIError:
             return SandboxPage(items=[], next_page_id=None)
 
-    async def get_sandbox(self, sandbox_id: str) -> SandboxInfo | None:
+    async def get_sandbox(
+        self, sandbox_id: str, force_refresh: bool = False
+    ) -> SandboxInfo | None:
         """Get a single sandbox info."""
         try:
             if not sandbox_id.startswith(self.container_name_prefix):
                 return None
             container = self.docker_client.containers.get(sandbox_id)
-            return await self._container_to_checked_sandbox_info(container)
+            return await self._container_to_checked_sandbox_info(
+                container, force_refresh
+            )
         except (NotFound, APIError):
             return None
 
+    async def batch_get_sandboxes(
+        self, sandbox_ids: list[str], force_refresh: bool = False
+    ) -> list[SandboxInfo | None]:
+        """Get a batch of sandboxes, checking their health concurrently."""
+        containers_by_id = {}
+        for sandbox_id in sandbox_ids:
+            if sandbox_id.startswith(self.container_name_prefix):
+                try:
+                    containers_by_id[sandbox_id] = self.docker_client.containers.get(
+                        sandbox_id
+                    )
+                except (NotFound, APIError):
+                    pass
+        sandbox_infos = await self._containers_to_checked_sandbox_infos(
+            list(containers_by_id.values()), force_refresh
+        )
+        sandbox_infos_by_id = {
+            sandbox_info.id: sandbox_info for sandbox_info in sandbox_infos
+        }
+        return [sandbox_infos_by_id.get(sandbox_id) for sandbox_id in sandbox_ids]
+
     async def get_sandbox_by_session_api_key(
         self, session_api_key: str
     ) -> SandboxInfo | None:
@@ -655,6 +725,38 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
             'Configure via SANDBOX_KVM_ENABLED environment variable.'
         ),
     )
+    health_check_interval: float = Field(
+        default=5.0,
+        description=(
+            'Number of seconds between background health checks of recently viewed '
+            'sandboxes. Health check results are cached for twice this long. '
+            'Set to 0 to check health on every request.'
+        ),
+    )
+    health_check_concurrency: int = Field(
+        default=16,
+        description='Maximum number of concurrent sandbox health checks',
+    )
+    _health_monitor: SandboxHealthMonitor[SandboxHealth] | None = PrivateAttr(
+        default=None
+    )
+
+    def get_health_monitor(
+        self, timeout: float
+    ) -> SandboxHealthMonitor[SandboxHealth] | None:
+        """The monitor of the sandboxes, whose own probes use the timeout given."""
+        if self.health_check_interval <= 0:
+            return None
+        health_monitor = self._health_monitor
+        if health_monitor is None:
+            health_monitor = SandboxHealthMonitor(
+                probe_many=probe_each(_probe_health_url, self.health_check_concurrency),
+                refresh_interval=self.health_check_interval,
+                max_age=self.health_check_interval * 2,
+                timeout=timeout,
+            )
+            self._health_monitor = health_monitor
+        return health_monitor
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -690,4 +792,5 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
                 startup_grace_seconds=self.startup_grace_seconds,
                 use_host_network=self.use_host_network,
                 kvm_enabled=self.kvm_enabled,
+                health_monitor=self.get_health_monitor(config.httpx.timeout),
             )
@@ -19,10 +19,16 @@ import base62
 import httpx
 import psutil
 from fastapi import Request
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from openhands.agent_server.utils import utc_now
 from openhands.app_server.errors import SandboxError
+from openhands.app_server.sandbox.sandbox_health_monitor import (
+    SandboxHealth,
+    SandboxHealthMonitor,
+    probe_concurrently,
+    probe_each,
+)
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
     ExposedUrl,
@@ -44,6 +50,20 @@ from openhands.app_server.utils.docker_utils import (
 _logger = logging.getLogger(__name__)
 
 
+async def _probe_health_url(httpx_client: httpx.AsyncClient, url: str) -> SandboxHealth:
+    try:
+        response = await httpx_client.get(url, timeout=5.0)
+        if response.status_code == 200:
+            return SandboxHealth(healthy=True)
+        return SandboxHealth(
+            healthy=False, error=f'Unexpected status: {response.status_code}'
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        return SandboxHealth(healthy=False, error=str(exc))
+
+
 class ProcessInfo(BaseModel):
     """Information about a running process."""
 
@@ -81,6 +101,7 @@ class ProcessSandboxService(SandboxService):
     agent_server_module: str
     health_check_path: str
     httpx_client: httpx.AsyncClient
+    health_monitor: SandboxHealthMonitor[SandboxHealth] | None = None
 
     def __post_init__(self):
         """Initialize the service after dataclass creation."""
@@ -191,23 +212,44 @@ class ProcessSandboxService(SandboxService):
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             return SandboxStatus.MISSING
 
-    async def _process_to_sandbox_info(
-        self, sandbox_id: str, process_info: ProcessInfo
-    ) -> SandboxInfo:
-        """Convert process info to sandbox info."""
-        status = self._get_process_status(process_info)
-
-        exposed_urls = None
-        session_api_key = None
+    def _get_health_check_url(self, process_info: ProcessInfo) -> str:
+        return replace_localhost_hostname_for_docker(
+            f'http://localhost:{process_info.port}{self.health_check_path}'
+        )
 
-        if status == SandboxStatus.RUNNING:
-            # Check if server is actually responding
-            try:
-                url = replace_localhost_hostname_for_docker(
-                    f'http://localhost:{process_info.port}{self.health_check_path}'
+    async def _processes_to_sandbox_infos(
+        self,
+        processes: list[tuple[str, ProcessInfo]],
+        force_refresh: bool = False,
+    ) -> list[SandboxInfo]:
+        """Convert process infos to sandbox infos, checking whether the servers of
+        all running processes are responding concurrently."""
+        statuses = [
+            self._get_process_status(process_info) for _, process_info in processes
+        ]
+        urls = [
+            self._get_health_check_url(process_info)
+            for (_, process_info), status in zip(processes, statuses)
+            if status == SandboxStatus.RUNNING
+        ]
+        health_by_url: dict[str, SandboxHealth | None] = {}
+        if urls:
+            if self.health_monitor:
+                health_by_url = await self.health_monitor.get_many(
+                    urls, force_refresh, self.httpx_client
                 )
-                response = await self.httpx_client.get(url, timeout=5.0)
-                if response.status_code == 200:
+            else:
+                health_by_url = await probe_concurrently(
+                    self.httpx_client, urls, _probe_health_url
+                )
+
+        results = []
+        for (sandbox_id, process_info), status in zip(processes, statuses):
+            exposed_urls = None
+            session_api_key = None
+            if status == SandboxStatus.RUNNING:
+                health = health_by_url.get(self._get_health_check_url(process_info))
+                if health and health.healthy:
                     exposed_urls = [
                         ExposedUrl(
                             name=AGENT_SERVER,
@@ -218,23 +260,33 @@ class ProcessSandboxService(SandboxService):
                     session_api_key = process_info.session_api_key
                 else:
                     status = SandboxStatus.ERROR
-            except Exception:
-                status = SandboxStatus.ERROR
+            results.append(
+                SandboxInfo(
+                    id=sandbox_id,
+                    created_by_user_id=process_info.user_id,
+                    sandbox_spec_id=process_info.sandbox_spec_id,
+                    status=status,
+                    session_api_key=session_api_key,
+                    exposed_urls=exposed_urls,
+                    created_at=process_info.created_at,
+                )
+            )
+        return results
 
-        return SandboxInfo(
-            id=sandbox_id,
-            created_by_user_id=process_info.user_id,
-            sandbox_spec_id=process_info.sandbox_spec_id,
-            status=status,
-            session_api_key=session_api_key,
-            exposed_urls=exposed_urls,
-            created_at=process_info.created_at,
+    async def _process_to_sandbox_info(
+        self, sandbox_id: str, process_info: ProcessInfo, force_refresh: bool = False
+    ) -> SandboxInfo:
+        """Convert process info to sandbox info."""
+        sandbox_infos = await self._processes_to_sandbox_infos(
+            [(sandbox_id, process_info)], force_refresh
         )
+        return sandbox_infos[0]
 
     async def search_sandboxes(
         self,
         page_id: str | None = None,
         limit: int = 100,
+        force_refresh: bool = False,
     ) -> SandboxPage:
         """Search for sandboxes."""
         # Get all process infos
@@ -255,10 +307,9 @@ class ProcessSandboxService(SandboxService):
         paginated_processes = all_processes[start_idx:end_idx]
 
         # Convert to sandbox infos
-        items = []
-        for sandbox_id, process_info in paginated_processes:
-            sandbox_info = await self._process_to_sandbox_info(sandbox_id, process_info)
-            items.append(sandbox_info)
+        items = await self._processes_to_sandbox_infos(
+            paginated_processes, force_refresh
+        )
 
         # Determine next page ID
         next_page_id = None
@@ -267,13 +318,32 @@ class ProcessSandboxService(SandboxService):
 
         return SandboxPage(items=items, next_page_id=next_page_id)
 
-    async def get_sandbox(self, sandbox_id: str) -> SandboxInfo | None:
+    async def get_sandbox(
+        self, sandbox_id: str, force_refresh: bool = False
+    ) -> SandboxInfo | None:
         """Get a single sandbox."""
         process_info = _processes.get(sandbox_id)
         if process_info is None:
             return None
 
-        return await self._process_to_sandbox_info(sandbox_id, process_info)
+        return await self._process_to_sandbox_info(
+            sandbox_id, process_info, force_refresh
+        )
+
+    async def batch_get_sandboxes(
+        self, sandbox_ids: list[str], force_refresh: bool = False
+    ) -> list[SandboxInfo | None]:
+        """Get a batch of sandboxes, checking their health concurrently."""
+        processes = [
+            (sandbox_id, _processes[sandbox_id])
+            for sandbox_id in dict.fromkeys(sandbox_ids)
+            if sandbox_id in _processes
+        ]
+        sandbox_infos = await self._processes_to_sandbox_infos(processes, force_refresh)
+        sandbox_infos_by_id = {
+            sandbox_info.id: sandbox_info for sandbox_info in sandbox_infos
+        }
+        return [sandbox_infos_by_id.get(sandbox_id) for sandbox_id in sandbox_ids]
 
     async def get_sandbox_by_session_api_key(
         self, session_api_key: str
@@ -429,12 +499,45 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
     health_check_path: str = Field(
         default='/alive', description='Health check endpoint path'
     )
+    health_check_interval: float = Field(
+        default=5.0,
+        description=(
+            'Number of seconds between background health checks of recently viewed '
+            'sandboxes. Health check results are cached for twice this long. '
+            'Set to 0 to check health on every request.'
+        ),
+    )
+    health_check_concurrency: int = Field(
+        default=16,
+        description='Maximum number of concurrent sandbox health checks',
+    )
+    _health_monitor: SandboxHealthMonitor[SandboxHealth] | None = PrivateAttr(
+        default=None
+    )
+
+    def get_health_monitor(
+        self, timeout: float
+    ) -> SandboxHealthMonitor[SandboxHealth] | None:
+        """The monitor of the sandboxes, whose own probes use the timeout given."""
+        if self.health_check_interval <= 0:
+            return None
+        health_monitor = self._health_monitor
+        if health_monitor is None:
+            health_monitor = SandboxHealthMonitor(
+                probe_many=probe_each(_probe_health_url, self.health_check_concurrency),
+                refresh_interval=self.health_check_interval,
+                max_age=self.health_check_interval * 2,
+                timeout=timeout,
+            )
+            self._health_monitor = health_monitor
+        return health_monitor
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
     ) -> AsyncGenerator[SandboxService, None]:
         # Define inline to prevent circular lookup
         from openhands.app_server.config import (
+            get_global_config,
             get_httpx_client,
             get_sandbox_spec_service,
             get_user_context,
@@ -455,4 +558,7 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
                 agent_server_module=self.agent_server_module,
                 health_check_path=self.health_check_path,
                 httpx_client=httpx_client,
+                health_monitor=self.get_health_monitor(
+                    get_global_config().httpx.timeout
+                ),
             )
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import hashlib
 import logging
 import os
@@ -10,7 +11,7 @@ from uuid import UUID
 import base62
 import httpx
 from fastapi import Request
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from sqlalchemy import Column, String, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -27,6 +28,7 @@ from openhands.app_server.event.event_service import EventService
 from openhands.app_server.event_callback.event_callback_service import (
     EventCallbackService,
 )
+from openhands.app_server.sandbox.sandbox_health_monitor import SandboxHealthMonitor
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
     VSCODE,
@@ -106,22 +108,19 @@ class RemoteSandboxService(SandboxService):
     user_context: UserContext
     httpx_client: httpx.AsyncClient
     db_session: AsyncSession
+    runtime_monitor: SandboxHealthMonitor[dict[str, Any]] | None = None
 
     async def _send_runtime_api_request(
         self, method: str, path: str, **kwargs: Any
     ) -> httpx.Response:
         """Send a request to the remote runtime API."""
-        try:
-            url = self.api_url + path
-            return await self.httpx_client.request(
-                method, url, headers={'X-API-Key': self.api_key}, **kwargs
-            )
-        except httpx.TimeoutException:
-            _logger.error(f'No response received within timeout for URL: {url}')
-            raise
-        except httpx.HTTPError as e:
-            _logger.error(f'HTTP error for URL {url}: {e}')
-            raise
+        return await _send_runtime_api_request(
+            self.httpx_client, self.api_url, self.api_key, method, path, **kwargs
+        )
+
+    def _invalidate_runtime(self, sandbox_id: str) -> None:
+        if self.runtime_monitor:
+            self.runtime_monitor.invalidate(sandbox_id)
 
     def _to_sandbox_info(
         self, stored: StoredRemoteSandbox, runtime: dict[str, Any] | None = None
@@ -221,12 +220,13 @@ class RemoteSandboxService(SandboxService):
         return runtime_data
 
     async def _get_runtimes_batch(
-        self, sandbox_ids: list[str]
+        self, sandbox_ids: list[str], force_refresh: bool = False
     ) -> dict[str, dict[str, Any]]:
         """Get multiple runtimes in a single batch request.
 
         Args:
             sandbox_ids: List of sandbox IDs to fetch
+            force_refresh: Do not use cached runtime data
 
         Returns:
             Dictionary mapping sandbox_id to runtime data
@@ -234,25 +234,19 @@ class RemoteSandboxService(SandboxService):
         if not sandbox_ids:
             return {}
 
-        # Build query parameters for the batch endpoint
-        params = [('ids', sandbox_id) for sandbox_id in sandbox_ids]
+        if self.runtime_monitor:
+            runtimes = await self.runtime_monitor.get_many(
+                sandbox_ids, force_refresh, self.httpx_client
+            )
+            return {
+                sandbox_id: runtime
+                for sandbox_id, runtime in runtimes.items()
+                if runtime is not None
+            }
 
-        response = await self._send_runtime_api_request(
-            'GET',
-            '/sessions/batch',
-            params=params,
+        return await _fetch_runtimes_batch(
+            self.httpx_client, sandbox_ids, self.api_url, self.api_key
         )
-        response.raise_for_status()
-        batch_data = response.json()
-
-        # The batch endpoint should return a list of runtimes
-        # Convert to a dictionary keyed by session_id for easy lookup
-        runtimes_by_id = {}
-        for runtime in batch_data:
-            if runtime and 'session_id' in runtime:
-                runtimes_by_id[runtime['session_id']] = runtime
-
-        return runtimes_by_id
 
     async def _init_environment(
         self, sandbox_spec: SandboxSpecInfo, sandbox_id: str
@@ -279,6 +273,7 @@ class RemoteSandboxService(SandboxService):
         self,
         page_id: str | None = None,
         limit: int = 100,
+        force_refresh: bool = False,
     ) -> SandboxPage:
         stmt = await self._secure_select()
 
@@ -312,7 +307,7 @@ class RemoteSandboxService(SandboxService):
 
         # Batch fetch runtime data for all sandboxes
         sandbox_ids = [stored_sandbox.id for stored_sandbox in stored_sandboxes]
-        runtimes_by_id = await self._get_runtimes_batch(sandbox_ids)
+        runtimes_by_id = await self._get_runtimes_batch(sandbox_ids, force_refresh)
 
         # Convert stored sandboxes to domain models with runtime data
         items = [
@@ -322,7 +317,9 @@ class RemoteSandboxService(SandboxService):
 
         return SandboxPage(items=items, next_page_id=next_page_id)
 
-    async def get_sandbox(self, sandbox_id: str) -> Union[SandboxInfo, None]:
+    async def get_sandbox(
+        self, sandbox_id: str, force_refresh: bool = False
+    ) -> Union[SandboxInfo, None]:
         """Get a single sandbox by checking its corresponding runtime."""
         stored_sandbox = await self._get_stored_sandbox(sandbox_id)
         if stored_sandbox is None:
@@ -330,7 +327,13 @@ class RemoteSandboxService(SandboxService):
 
         runtime = None
         try:
-            runtime = await self._get_runtime(stored_sandbox.id)
+            if self.runtime_monitor:
+                runtimes = await self._get_runtimes_batch(
+                    [stored_sandbox.id], force_refresh
+                )
+                runtime = runtimes.get(stored_sandbox.id)
+            else:
+                runtime = await self._get_runtime(stored_sandbox.id)
         except Exception:
             _logger.exception(
                 f'Error getting runtime: {stored_sandbox.id}', stack_info=True
@@ -490,6 +493,7 @@ class RemoteSandboxService(SandboxService):
                 '/start',
                 json=start_request,
             )
+            self._invalidate_runtime(sandbox_id)
             response.raise_for_status()
             runtime_data = response.json()
 
@@ -524,6 +528,7 @@ class RemoteSandboxService(SandboxService):
                 '/resume',
                 json={'runtime_id': runtime_data['runtime_id']},
             )
+            self._invalidate_runtime(sandbox_id)
             if response.status_code == 404:
                 return False
             response.raise_for_status()
@@ -543,6 +548,7 @@ class RemoteSandboxService(SandboxService):
                 '/pause',
                 json={'runtime_id': runtime_data['runtime_id']},
             )
+            self._invalidate_runtime(sandbox_id)
             if response.status_code == 404:
                 return False
             response.raise_for_status()
@@ -565,6 +571,7 @@ class RemoteSandboxService(SandboxService):
                 '/stop',
                 json={'runtime_id': runtime_data['runtime_id']},
             )
+            self._invalidate_runtime(sandbox_id)
             if response.status_code != 404:
                 response.raise_for_status()
             return True
@@ -622,7 +629,7 @@ class RemoteSandboxService(SandboxService):
         return paused_sandbox_ids
 
     async def batch_get_sandboxes(
-        self, sandbox_ids: list[str]
+        self, sandbox_ids: list[str], force_refresh: bool = False
     ) -> list[SandboxInfo | None]:
         """Get a batch of sandboxes, returning None for any which were not found."""
         if not sandbox_ids:
@@ -635,7 +642,7 @@ class RemoteSandboxService(SandboxService):
             for stored_remote_sandbox in stored_remote_sandboxes
         }
         runtimes_by_id = await self._get_runtimes_batch(
-            list(stored_remote_sandboxes_by_id)
+            list(stored_remote_sandboxes_by_id), force_refresh
         )
         results = []
         for sandbox_id in sandbox_ids:
@@ -648,6 +655,67 @@ class RemoteSandboxService(SandboxService):
         return results
 
 
+async def _send_runtime_api_request(
+    httpx_client: httpx.AsyncClient,
+    api_url: str,
+    api_key: str,
+    method: str,
+    path: str,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request to the remote runtime API."""
+    try:
+        url = api_url + path
+        return await httpx_client.request(
+            method, url, headers={'X-API-Key': api_key}, **kwargs
+        )
+    except httpx.TimeoutException:
+        _logger.error(f'No response received within timeout for URL: {url}')
+        raise
+    except httpx.HTTPError as e:
+        _logger.error(f'HTTP error for URL {url}: {e}')
+        raise
+
+
+async def _fetch_runtimes_batch(
+    httpx_client: httpx.AsyncClient,
+    sandbox_ids: list[str],
+    api_url: str,
+    api_key: str,
+    batch_size: int = 100,
+) -> dict[str, dict[str, Any]]:
+    """Fetch runtimes from the runtime API batch endpoint, in chunks of batch_size.
+
+    Returns:
+        Dictionary mapping sandbox_id to runtime data
+    """
+
+    async def fetch(chunk: list[str]) -> list[dict[str, Any]]:
+        response = await _send_runtime_api_request(
+            httpx_client,
+            api_url,
+            api_key,
+            'GET',
+            '/sessions/batch',
+            params=[('ids', sandbox_id) for sandbox_id in chunk],
+        )
+        response.raise_for_status()
+        return response.json()
+
+    batches = await asyncio.gather(
+        *[
+            fetch(sandbox_ids[i : i + batch_size])
+            for i in range(0, len(sandbox_ids), batch_size)
+        ]
+    )
+    return {
+        runtime['session_id']: runtime
+        for batch_data in batches
+        for runtime in batch_data
+        if runtime and 'session_id' in runtime
+    }
+
+
 def _build_service_url(url: str, service_name: str, runtime_id: str) -> str:
     """Build a service URL for the given service name.
 
@@ -853,6 +921,36 @@ class RemoteSandboxServiceInjector(SandboxServiceInjector):
         default=10,
         description='Maximum number of sandboxes allowed to run simultaneously',
     )
+    status_check_interval: float = Field(
+        default=5.0,
+        description=(
+            'Number of seconds between background status checks of recently viewed '
+            'sandboxes against the runtime API. Results are cached for twice this '
+            'long. Set to 0 to check status on every request.'
+        ),
+    )
+    _runtime_monitor: SandboxHealthMonitor[dict[str, Any]] | None = PrivateAttr(
+        default=None
+    )
+
+    def get_runtime_monitor(
+        self, timeout: float
+    ) -> SandboxHealthMonitor[dict[str, Any]] | None:
+        """The monitor of the sandboxes, whose own probes use the timeout given."""
+        if self.status_check_interval <= 0:
+            return None
+        runtime_monitor = self._runtime_monitor
+        if runtime_monitor is None:
+            runtime_monitor = SandboxHealthMonitor(
+                probe_many=functools.partial(
+                    _fetch_runtimes_batch, api_url=self.api_url, api_key=self.api_key
+                ),
+                refresh_interval=self.status_check_interval,
+                max_age=self.status_check_interval * 2,
+                timeout=timeout,
+            )
+            self._runtime_monitor = runtime_monitor
+        return runtime_monitor
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -898,4 +996,5 @@ class RemoteSandboxServiceInjector(SandboxServiceInjector):
                 user_context=user_context,
                 httpx_client=httpx_client,
                 db_session=db_session,
+                runtime_monitor=self.get_runtime_monitor(config.httpx.timeout),
             )
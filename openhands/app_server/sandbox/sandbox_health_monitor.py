@@ -0,0 +1,213 @@
+"""Cached, concurrent health probing for sandboxes.
+
+Listing sandboxes used to probe each running sandbox in series on every call. The
+SandboxHealthMonitor probes sandboxes concurrently, caches the results with the time
+they were checked, and keeps probing recently requested sandboxes in the background
+so that listings can be served from the cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Generic, TypeVar
+
+import httpx
+
+from openhands.agent_server.utils import utc_now
+
+_logger = logging.getLogger(__name__)
+_monitors: weakref.WeakSet[SandboxHealthMonitor] = weakref.WeakSet()
+
+T = TypeVar('T')
+Probe = Callable[[httpx.AsyncClient, str], Awaitable[T]]
+ProbeMany = Callable[[httpx.AsyncClient, list[str]], Awaitable[dict[str, T]]]
+
+
+@dataclass
+class SandboxHealth:
+    """Result of probing the health check url of a sandbox agent server."""
+
+    healthy: bool
+    error: str | None = None
+
+
+@dataclass
+class SandboxProbeResult(Generic[T]):
+    value: T | None
+    checked_at: datetime
+    checked_at_monotonic: float
+
+
+async def probe_concurrently(
+    httpx_client: httpx.AsyncClient,
+    keys: list[str],
+    probe: Probe[T],
+    concurrency: int = 16,
+) -> dict[str, T]:
+    """Run the probe for each key concurrently, with at most concurrency in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key: str) -> T:
+        async with semaphore:
+            return await probe(httpx_client, key)
+
+    unique_keys = list(dict.fromkeys(keys))
+    values = await asyncio.gather(*[run(key) for key in unique_keys])
+    return dict(zip(unique_keys, values))
+
+
+def probe_each(probe: Probe[T], concurrency: int = 16) -> ProbeMany[T]:
+    """Build a ProbeMany which runs a single key probe concurrently."""
+
+    async def probe_many(httpx_client: httpx.AsyncClient, keys: list[str]):
+        return await probe_concurrently(httpx_client, keys, probe, concurrency)
+
+    return probe_many
+
+
+@dataclass(eq=False)
+class SandboxHealthMonitor(Generic[T]):
+    """Caches probe results for sandboxes, keyed by an arbitrary string (Typically a
+    health check url or a sandbox id).
+
+    Results younger than max_age are served from the cache. Keys requested within the
+    last idle_expiry seconds are re-probed in the background every refresh_interval,
+    so a cached result is usually available. Keys are probed with the client of the
+    request which needs them where one is given. The background probes outlive the
+    requests (And their clients), so they use a client owned by the monitor, created
+    with the timeout of the configured httpx client.
+    """
+
+    probe_many: ProbeMany[T]
+    refresh_interval: float = 5.0
+    max_age: float = 10.0
+    idle_expiry: float = 300.0
+    timeout: float = 15.0
+    _results: dict[str, SandboxProbeResult[T]] = field(default_factory=dict)
+    _last_requested: dict[str, float] = field(default_factory=dict)
+    _httpx_client: httpx.AsyncClient | None = None
+    _refresh_task: asyncio.Task | None = None
+
+    def __post_init__(self):
+        _monitors.add(self)
+
+    async def get_many(
+        self,
+        keys: list[str],
+        force_refresh: bool = False,
+        httpx_client: httpx.AsyncClient | None = None,
+    ) -> dict[str, T | None]:
+        """Get the result for each key, probing any which are not cached or stale.
+
+        Args:
+            keys: The keys to get results for
+            force_refresh: Probe all the keys, even if a cached result is available
+            httpx_client: The client to probe with (The monitor's own if None)
+        """
+        now = time.monotonic()
+        for key in keys:
+            self._last_requested[key] = now
+        if force_refresh:
+            keys_to_probe = keys
+        else:
+            keys_to_probe = [
+                key
+                for key in keys
+                if key not in self._results
+                or now - self._results[key].checked_at_monotonic > self.max_age
+            ]
+        if keys_to_probe:
+            await self._probe(keys_to_probe, httpx_client)
+        self._ensure_refresh_task()
+        results = {}
+        for key in keys:
+            result = self._results.get(key)
+            results[key] = result.value if result else None
+        return results
+
+    async def get(
+        self,
+        key: str,
+        force_refresh: bool = False,
+        httpx_client: httpx.AsyncClient | None = None,
+    ) -> T | None:
+        results = await self.get_many([key], force_refresh, httpx_client)
+        return results[key]
+
+    def get_cached(self, key: str) -> SandboxProbeResult[T] | None:
+        """Get the cached result for a key (If any) without probing."""
+        return self._results.get(key)
+
+    def invalidate(self, key: str) -> None:
+        """Discard the cached result for a key, so it is probed on next access."""
+        self._results.pop(key, None)
+
+    async def close(self) -> None:
+        refresh_task = self._refresh_task
+        self._refresh_task = None
+        if refresh_task:
+            refresh_task.cancel()
+            try:
+                await refresh_task
+            except asyncio.CancelledError:
+                pass
+        httpx_client = self._httpx_client
+        self._httpx_client = None
+        if httpx_client:
+            await httpx_client.aclose()
+
+    def _get_httpx_client(self) -> httpx.AsyncClient:
+        httpx_client = self._httpx_client
+        if httpx_client is None or httpx_client.is_closed:
+            httpx_client = httpx.AsyncClient(timeout=self.timeout)
+            self._httpx_client = httpx_client
+        return httpx_client
+
+    async def _probe(
+        self, keys: list[str], httpx_client: httpx.AsyncClient | None = None
+    ) -> None:
+        if httpx_client is None or httpx_client.is_closed:
+            httpx_client = self._get_httpx_client()
+        values = await self.probe_many(httpx_client, keys)
+        checked_at = utc_now()
+        checked_at_monotonic = time.monotonic()
+        for key in keys:
+            self._results[key] = SandboxProbeResult(
+                value=values.get(key),
+                checked_at=checked_at,
+                checked_at_monotonic=checked_at_monotonic,
+            )
+
+    def _ensure_refresh_task(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def _refresh_periodically(self) -> None:
+        while self._last_requested:
+            await asyncio.sleep(self.refresh_interval)
+            expired_before = time.monotonic() - self.idle_expiry
+            for key, last_requested in list(self._last_requested.items()):
+                if last_requested < expired_before:
+                    del self._last_requested[key]
+                    self._results.pop(key, None)
+            keys = list(self._last_requested)
+            if not keys:
+                continue
+            try:
+                await self._probe(keys)
+            except Exception:
+                _logger.exception('Error refreshing sandbox health')
+
+
+async def close_sandbox_health_monitors() -> None:
+    """Stop background probing. Invoked when the server shuts down."""
+    for monitor in list(_monitors):
+        try:
+            await monitor.close()
+        except Exception:
+            _logger.exception('Error closing sandbox health monitor')
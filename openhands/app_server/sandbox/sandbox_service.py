@@ -1,4 +1,6 @@
 import asyncio
+import functools
+import inspect
 import logging
 import time
 from abc import ABC, abstractmethod
@@ -34,12 +36,22 @@ class SandboxService(ABC):
         self,
         page_id: str | None = None,
         limit: int = 100,
+        force_refresh: bool = False,
     ) -> SandboxPage:
-        """Search for sandboxes."""
+        """Search for sandboxes.
+
+        The health of running sandboxes may be served from a cache, unless
+        force_refresh is set."""
 
     @abstractmethod
-    async def get_sandbox(self, sandbox_id: str) -> SandboxInfo | None:
-        """Get a single sandbox. Return None if the sandbox was not found."""
+    async def get_sandbox(
+        self, sandbox_id: str, force_refresh: bool = False
+    ) -> SandboxInfo | None:
+        """Get a single sandbox. Return None if the sandbox was not found.
+
+        The health of a running sandbox may be served from a cache, unless
+        force_refresh is set. Implementations without a cache may leave out the
+        force_refresh parameter."""
 
     @abstractmethod
     async def get_sandbox_by_session_api_key(
@@ -48,14 +60,26 @@ class SandboxService(ABC):
         """Get a single sandbox by session API key. Return None if the sandbox was not found."""
 
     async def batch_get_sandboxes(
-        self, sandbox_ids: list[str]
+        self, sandbox_ids: list[str], force_refresh: bool = False
     ) -> list[SandboxInfo | None]:
         """Get a batch of sandboxes, returning None for any which were not found."""
         results = await asyncio.gather(
-            *[self.get_sandbox(sandbox_id) for sandbox_id in sandbox_ids]
+            *[
+                self._get_sandbox(sandbox_id, force_refresh)
+                for sandbox_id in sandbox_ids
+            ]
         )
         return results
 
+    async def _get_sandbox(
+        self, sandbox_id: str, force_refresh: bool
+    ) -> SandboxInfo | None:
+        """Get a sandbox, passing force_refresh only to implementations which take
+        it."""
+        if force_refresh and _takes_force_refresh(type(self)):
+            return await self.get_sandbox(sandbox_id, force_refresh=True)
+        return await self.get_sandbox(sandbox_id)
+
     @abstractmethod
     async def start_sandbox(
         self, sandbox_spec_id: str | None = None, sandbox_id: str | None = None
@@ -103,7 +127,8 @@ class SandboxService(ABC):
         """
         start = time.time()
         while time.time() - start <= timeout:
-            sandbox = await self.get_sandbox(sandbox_id)
+            # Cached health could hide the sandbox becoming ready
+            sandbox = await self._get_sandbox(sandbox_id, force_refresh=True)
             if sandbox is None:
                 raise SandboxError(f'Sandbox not found: {sandbox_id}')
 
@@ -229,5 +254,14 @@ class SandboxService(ABC):
         return paused_sandbox_ids
 
 
+@functools.cache
+def _takes_force_refresh(service_type: type[SandboxService]) -> bool:
+    parameters = inspect.signature(service_type.get_sandbox).parameters
+    return 'force_refresh' in parameters or any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters.values()
+    )
+
+
 class SandboxServiceInjector(DiscriminatedUnionMixin, Injector[SandboxService], ABC):
     pass
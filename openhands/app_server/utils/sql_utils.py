@@ -1,11 +1,21 @@
+import base64
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import UTC, datetime
 from enum import Enum
-from typing import TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from pydantic import SecretStr, TypeAdapter
 from sqlalchemy import JSON, DateTime, String, TypeDecorator
 from sqlalchemy.orm import DeclarativeBase
 
+if TYPE_CHECKING:
+    from openhands.app_server.services.jwt_service import JwtService
+
 
 class Base(DeclarativeBase):
     """
@@ -41,32 +51,164 @@ def create_json_type_decorator(object_type: type):
     return JsonTypeDecorator
 
 
+class DecryptedSecretCache:
+    """Bounded in memory cache of decrypted secret values, keyed by the id of the
+    key used to encrypt them and the ciphertext. Entries expire after ttl seconds.
+
+    The cache also remembers the ciphertext each loaded value was decrypted from, so
+    that the value can be written back without re-encrypting it.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        # The loaded values and the key id and ciphertext of each, by object id
+        self._stored_tokens: OrderedDict[
+            int, tuple[weakref.ref[SecretStr], str, str]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key_id: str, token: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get((key_id, token))
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[(key_id, token)]
+                return None
+            self._entries.move_to_end((key_id, token))
+            return value
+
+    def put(self, key_id: str, token: str, value: str) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[(key_id, token)] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end((key_id, token))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def remember_token(self, value: SecretStr, key_id: str, token: str) -> None:
+        """Remember the ciphertext a value was loaded from."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._stored_tokens[id(value)] = (weakref.ref(value), key_id, token)
+            self._stored_tokens.move_to_end(id(value))
+            while len(self._stored_tokens) > self.max_size:
+                self._stored_tokens.popitem(last=False)
+
+    def get_stored_token(self, value: SecretStr, key_id: str) -> str | None:
+        """The ciphertext a value was loaded from, if it was encrypted with the key
+        given. Only the loaded object itself matches - an equal value created
+        elsewhere is encrypted afresh."""
+        with self._lock:
+            entry = self._stored_tokens.get(id(value))
+            if entry is None:
+                return None
+            value_ref, stored_key_id, token = entry
+            if value_ref() is not value:
+                # The loaded value is gone, and its id was reused
+                del self._stored_tokens[id(value)]
+                return None
+            self._stored_tokens.move_to_end(id(value))
+        return token if stored_key_id == key_id else None
+
+    def clear(self, key_id: str | None = None) -> None:
+        """Remove all entries, or only those for the key given."""
+        with self._lock:
+            if key_id is None:
+                self._entries.clear()
+                self._stored_tokens.clear()
+                return
+            for entry_key in [k for k in self._entries if k[0] == key_id]:
+                del self._entries[entry_key]
+            for value_id in [
+                k for k, entry in self._stored_tokens.items() if entry[1] == key_id
+            ]:
+                del self._stored_tokens[value_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_decrypted_secret_cache = DecryptedSecretCache(
+    max_size=int(os.getenv('SECRET_CACHE_MAX_SIZE', '10000')),
+    ttl=float(os.getenv('SECRET_CACHE_TTL', '300')),
+)
+_jwt_service_resolution: tuple[Any, 'JwtService'] | None = None
+
+
+def get_decrypted_secret_cache() -> DecryptedSecretCache:
+    return _decrypted_secret_cache
+
+
+def _get_jwt_service() -> 'JwtService':
+    """Get the jwt service from the global config, resolving it only once for each
+    injector."""
+    global _jwt_service_resolution
+    from openhands.app_server.config import get_global_config
+
+    jwt_service_injector = get_global_config().jwt
+    assert jwt_service_injector is not None
+    resolution = _jwt_service_resolution
+    if resolution is None or resolution[0] is not jwt_service_injector:
+        # The config (And so maybe the keys) changed - nothing cached still applies
+        _decrypted_secret_cache.clear()
+        resolution = (jwt_service_injector, jwt_service_injector.get_jwt_service())
+        _jwt_service_resolution = resolution
+    return resolution[1]
+
+
+def _get_key_id(token: str) -> str | None:
+    """Read the key id from the protected header of a compact JWE token without
+    decrypting it."""
+    try:
+        header = token.split('.', 1)[0]
+        header += '=' * (-len(header) % 4)
+        return json.loads(base64.urlsafe_b64decode(header)).get('kid')
+    except (ValueError, AttributeError):
+        return None
+
+
 class StoredSecretStr(TypeDecorator):
-    """TypeDecorator for secret strings. Encrypts the value using the default key before storing."""
+    """TypeDecorator for secret strings. Encrypts the value using the default key before storing.
+
+    Decrypted values are cached in memory, and values loaded from the database are
+    written back without re-encryption while the default key has not changed.
+    """
 
     impl = String
     cache_ok = True
 
     def process_bind_param(self, value, dialect):
         if value is not None:
-            from openhands.app_server.config import get_global_config
-
-            jwt_service_injector = get_global_config().jwt
-            assert jwt_service_injector is not None
-            jwt_service = jwt_service_injector.get_jwt_service()
+            jwt_service = _get_jwt_service()
+            stored_token = _decrypted_secret_cache.get_stored_token(
+                value, jwt_service.default_key_id
+            )
+            if stored_token is not None:
+                return stored_token
             token = jwt_service.create_jwe_token({'v': value.get_secret_value()})
             return token
         return None
 
     def process_result_param(self, value, dialect):
         if value is not None:
-            from openhands.app_server.config import get_global_config
-
-            jwt_service_injector = get_global_config().jwt
-            assert jwt_service_injector is not None
-            jwt_service = jwt_service_injector.get_jwt_service()
-            token = jwt_service.decrypt_jwe_token(value)
-            return SecretStr(token['v'])
+            jwt_service = _get_jwt_service()
+            key_id = _get_key_id(value)
+            secret = _decrypted_secret_cache.get(key_id, value) if key_id else None
+            if secret is None:
+                secret = jwt_service.decrypt_jwe_token(value)['v']
+                if key_id:
+                    _decrypted_secret_cache.put(key_id, value, secret)
+            result = SecretStr(secret)
+            if key_id:
+                # Remember the ciphertext so an unchanged value is not re-encrypted
+                _decrypted_secret_cache.remember_token(result, key_id, value)
+            return result
         return None
 
 
@@ -8,8 +8,10 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import os
 import pickle
+import zlib
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
@@ -40,6 +42,25 @@ RESUMABLE_STATES = [
 ]
 
 
+# Prefix of the compressed snapshots. Snapshots without it are base64 encoded pickles,
+# as saved by older versions.
+SNAPSHOT_PREFIX = 'v2:'
+SNAPSHOT_COMPRESSION_LEVEL = int(os.getenv('STATE_SNAPSHOT_COMPRESSION_LEVEL', '6'))
+
+
+def _encode_snapshot(pickled: bytes) -> str:
+    """Encode a pickled state as text, as not all file stores can read binary files."""
+    compressed = zlib.compress(pickled, SNAPSHOT_COMPRESSION_LEVEL)
+    return SNAPSHOT_PREFIX + base64.b64encode(compressed).decode('utf-8')
+
+
+def _decode_snapshot(encoded: str) -> State:
+    if encoded.startswith(SNAPSHOT_PREFIX):
+        compressed = base64.b64decode(encoded[len(SNAPSHOT_PREFIX) :])
+        return pickle.loads(zlib.decompress(compressed))
+    return pickle.loads(base64.b64decode(encoded))
+
+
 # NOTE: this is deprecated
 class TrafficControlState(str, Enum):
     # default state, no rate limiting
@@ -132,26 +153,36 @@ class State:
         conversation_stats = self.conversation_stats
         self.conversation_stats = None  # Don't save conversation stats, handles itself
 
-        pickled = pickle.dumps(self)
+        try:
+            pickled = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            self.conversation_stats = conversation_stats  # restore reference
+
+        filename = get_conversation_agent_state_filename(sid, user_id)
+        digest = hashlib.sha256(pickled).hexdigest()
+        last_saved = getattr(self, '_last_saved_snapshot', None)
+        # The state is saved on every change of the agent state, often without any
+        # change to the snapshot, and remote file stores rewrite the whole file.
+        if last_saved == (filename, digest):
+            return
+
         logger.debug(f'Saving state to session {sid}:{self.agent_state}')
-        encoded = base64.b64encode(pickled).decode('utf-8')
+        encoded = _encode_snapshot(pickled)
         try:
-            file_store.write(
-                get_conversation_agent_state_filename(sid, user_id), encoded
-            )
+            file_store.write(filename, encoded)
 
             # see if state is in the old directory on saas/remote use cases and delete it.
-            if user_id:
-                filename = get_conversation_agent_state_filename(sid)
+            if user_id and last_saved is None:
+                old_filename = get_conversation_agent_state_filename(sid)
                 try:
-                    file_store.delete(filename)
+                    file_store.delete(old_filename)
                 except Exception:
                     pass
         except Exception as e:
             logger.error(f'Failed to save state to session: {e}')
             raise e
 
-        self.conversation_stats = conversation_stats  # restore reference
+        self._last_saved_snapshot = (filename, digest)
 
     @staticmethod
     def restore_from_session(
@@ -163,16 +194,14 @@ class State:
             encoded = file_store.read(
                 get_conversation_agent_state_filename(sid, user_id)
             )
-            pickled = base64.b64decode(encoded)
-            state = pickle.loads(pickled)
+            state = _decode_snapshot(encoded)
         except FileNotFoundError:
             # if user_id is provided, we are in a saas/remote use case
             # and we need to check if the state is in the old directory.
             if user_id:
                 filename = get_conversation_agent_state_filename(sid)
                 encoded = file_store.read(filename)
-                pickled = base64.b64decode(encoded)
-                state = pickle.loads(pickled)
+                state = _decode_snapshot(encoded)
             else:
                 raise FileNotFoundError(
                     f'Could not restore state from session file for sid: {sid}'
@@ -204,6 +233,7 @@ class State:
         # history after that gets reloaded.
         state.pop('_history_checksum', None)
         state.pop('_view', None)
+        state.pop('_last_saved_snapshot', None)
 
         # Remove deprecated fields before pickling
         state.pop('iteration', None)
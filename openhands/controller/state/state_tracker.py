@@ -5,24 +5,60 @@
 #   - V1 application server (in this repo): openhands/app_server/
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
+import os
+
 from openhands.controller.state.control_flags import (
     BudgetControlFlag,
     IterationControlFlag,
 )
 from openhands.controller.state.state import State
 from openhands.core.logger import openhands_logger as logger
-from openhands.events.action.agent import AgentDelegateAction, ChangeAgentStateAction
+from openhands.core.schema import ActionType, ObservationType
+from openhands.events.action.agent import (
+    AgentDelegateAction,
+    ChangeAgentStateAction,
+    CondensationAction,
+)
 from openhands.events.action.empty import NullAction
-from openhands.events.event import Event
+from openhands.events.event import Event, EventSource
 from openhands.events.event_filter import EventFilter
 from openhands.events.observation.agent import AgentStateChangedObservation
 from openhands.events.observation.delegate import AgentDelegateObservation
 from openhands.events.observation.empty import NullObservation
-from openhands.events.serialization.event import event_to_trajectory
+from openhands.events.serialization.event import (
+    event_from_dict,
+    event_to_trajectory,
+)
 from openhands.events.stream import EventStream
 from openhands.server.services.conversation_stats import ConversationStats
 from openhands.storage.files import FileStore
 
+# Whether to skip the events forgotten by condensations when restoring the history
+LAZY_HISTORY_RESTORE = os.getenv('LAZY_HISTORY_RESTORE', 'false').lower() in (
+    'true',
+    '1',
+)
+
+
+def _is_always_restored(data: dict) -> bool:
+    """Whether a serialized event is needed to work out which events are part of the
+    history (Delegate and condensation events), or is looked up by the agent
+    regardless of condensation (User messages)."""
+    action = data.get('action')
+    if action in (
+        ActionType.DELEGATE,
+        ActionType.CONDENSATION,
+        ActionType.CONDENSATION_REQUEST,
+    ):
+        return True
+    if action == ActionType.MESSAGE:
+        return data.get('source') == EventSource.USER
+    return data.get('observation') == ObservationType.DELEGATE
+
+
+def _get_entry_id(entry: Event | dict) -> int:
+    return entry.id if isinstance(entry, Event) else entry['id']
+
 
 class StateTracker:
     """Manages and synchronizes the state of an agent throughout its lifecycle.
@@ -108,7 +144,9 @@ class StateTracker:
 
             state.conversation_stats = conversation_stats
 
-    def _init_history(self, event_stream: EventStream) -> None:
+    def _init_history(
+        self, event_stream: EventStream, lazy: bool = LAZY_HISTORY_RESTORE
+    ) -> None:
         """Initializes the agent's history from the event stream.
 
         The history is a list of events that:
@@ -117,6 +155,15 @@ class StateTracker:
         - For delegate events (between AgentDelegateAction and AgentDelegateObservation):
             - Excludes all events between the action and observation
             - Includes the delegate action and observation themselves
+
+        Events are read a cache page at a time, and only deserialized once they are
+        known to be part of the history.
+
+        Args:
+            event_stream: The event stream to restore the history from.
+            lazy: Whether to also skip the events forgotten by the condensations in
+                the history. The condensed view of the history is unchanged, but
+                the forgotten events are not available to anything else.
         """
         # define range of events to fetch
         # delegates start with a start_id and initially won't find any events
@@ -136,67 +183,81 @@ class StateTracker:
             self.state.history = []
             return
 
-        events: list[Event] = []
-
-        # Get rest of history
-        events_to_add = list(
-            event_stream.search_events(
-                start_id=start_id,
-                end_id=end_id,
-                reverse=False,
-                filter=self.agent_history_filter,
-            )
-        )
-        events.extend(events_to_add)
+        # Deserialize the events which decide what else is part of the history, and
+        # keep the rest serialized for now
+        entries: list[Event | dict] = []
+        for data in event_stream.search_event_dicts(start_id=start_id, end_id=end_id):
+            if _is_always_restored(data):
+                event = event_from_dict(data)
+                if self.agent_history_filter.include(event):
+                    entries.append(event)
+            else:
+                entries.append(data)
 
         # Find all delegate action/observation pairs
         delegate_ranges: list[tuple[int, int]] = []
         delegate_action_ids: list[int] = []  # stack of unmatched delegate action IDs
 
-        for event in events:
-            if isinstance(event, AgentDelegateAction):
-                delegate_action_ids.append(event.id)
+        for entry in entries:
+            if isinstance(entry, AgentDelegateAction):
+                delegate_action_ids.append(entry.id)
                 # Note: we can get agent=event.agent and task=event.inputs.get('task','')
                 # if we need to track these in the future
 
-            elif isinstance(event, AgentDelegateObservation):
+            elif isinstance(entry, AgentDelegateObservation):
                 # Match with most recent unmatched delegate action
                 if not delegate_action_ids:
                     logger.warning(
-                        f'Found AgentDelegateObservation without matching action at id={event.id}',
+                        f'Found AgentDelegateObservation without matching action at id={entry.id}',
                     )
                     continue
 
                 action_id = delegate_action_ids.pop()
-                delegate_ranges.append((action_id, event.id))
-
-        # Filter out events between delegate action/observation pairs
-        if delegate_ranges:
-            filtered_events: list[Event] = []
-            current_idx = 0
-
-            for start_id, end_id in sorted(delegate_ranges):
-                # Add events before delegate range
-                filtered_events.extend(
-                    event for event in events[current_idx:] if event.id < start_id
-                )
-
-                # Add delegate action and observation
-                filtered_events.extend(
-                    event for event in events if event.id in (start_id, end_id)
-                )
-
-                # Update index to after delegate range
-                current_idx = next(
-                    (i for i, e in enumerate(events) if e.id > end_id), len(events)
-                )
-
-            # Add any remaining events after last delegate range
-            filtered_events.extend(events[current_idx:])
-
-            self.state.history = filtered_events
-        else:
-            self.state.history = events
+                delegate_ranges.append((action_id, entry.id))
+
+        # Filter out events between delegate action/observation pairs, in a single
+        # pass. Ranges are either disjoint or nested, and the events of a nested
+        # delegate are between the action and observation of the outer one.
+        outer_ranges: list[tuple[int, int]] = []
+        for delegate_start_id, delegate_end_id in sorted(delegate_ranges):
+            if not outer_ranges or delegate_start_id > outer_ranges[-1][1]:
+                outer_ranges.append((delegate_start_id, delegate_end_id))
+
+        if outer_ranges:
+            kept_entries: list[Event | dict] = []
+            range_index = 0
+            for entry in entries:
+                entry_id = _get_entry_id(entry)
+                while (
+                    range_index < len(outer_ranges)
+                    and entry_id > outer_ranges[range_index][1]
+                ):
+                    range_index += 1
+                if (
+                    range_index < len(outer_ranges)
+                    and outer_ranges[range_index][0]
+                    < entry_id
+                    < outer_ranges[range_index][1]
+                ):
+                    continue
+                kept_entries.append(entry)
+            entries = kept_entries
+
+        forgotten_event_ids: set[int] = set()
+        if lazy:
+            for entry in entries:
+                if isinstance(entry, CondensationAction):
+                    forgotten_event_ids.update(entry.forgotten)
+
+        history: list[Event] = []
+        for entry in entries:
+            if isinstance(entry, Event):
+                history.append(entry)
+            elif _get_entry_id(entry) not in forgotten_event_ids:
+                event = event_from_dict(entry)
+                if self.agent_history_filter.include(event):
+                    history.append(event)
+        self.state.history = history
 
         # make sure history is in sync
         self.state.start_id = start_id
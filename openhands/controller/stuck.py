@@ -5,8 +5,10 @@
 #   - V1 application server (in this repo): openhands/app_server/
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
+from collections import deque
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, overload
 
 from openhands.controller.state.state import State
 from openhands.core.logger import openhands_logger as logger
@@ -25,6 +27,35 @@ from openhands.events.observation.error import ErrorObservation
 from openhands.events.observation.observation import Observation
 
 
+class _FilteredHistory(Sequence[Event]):
+    """Read only view of the filtered history from start onwards, so that it does not
+    need to be copied on each check."""
+
+    def __init__(self, events: list[Event], start: int = 0):
+        self._events = events
+        self._start = start
+
+    def __len__(self) -> int:
+        return len(self._events) - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> Event: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Event]: ...
+
+    def __getitem__(self, index: int | slice) -> Event | list[Event]:
+        if isinstance(index, slice):
+            return [
+                self._events[self._start + i] for i in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('filtered history index out of range')
+        return self._events[self._start + index]
+
+
 class StuckDetector:
     SYNTAX_ERROR_MESSAGES = [
         'SyntaxError: unterminated string literal (detected at line',
@@ -41,10 +72,72 @@ class StuckDetector:
     def __init__(self, state: State):
         self.state = state
         self.stuck_analysis: Optional[StuckDetector.StuckAnalysis] = None
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        """Discard the incrementally maintained view of the history."""
+        self._history: list[Event] | None = None
+        self._processed = 0
+        self._last_processed_event: Event | None = None
+        # History without user messages and null events
+        self._filtered: list[Event] = []
+        # Where the history after the last user message starts, in the filtered
+        # history and in the full history (For interactive mode)
+        self._segment_start = 0
+        self._segment_offset = 0
+        # The most recent events the checks look at, with their filtered index
+        self._actions: deque[tuple[int, Event]] = deque(maxlen=6)
+        self._observations: deque[tuple[int, Event]] = deque(maxlen=6)
+        self._agent_messages: deque[tuple[int, Event]] = deque(maxlen=3)
+        self._condensations: deque[tuple[int, Event]] = deque(maxlen=10)
+
+    def _update_window(self) -> None:
+        """Process the events appended to the history since the last check. Starts over
+        if the history was replaced or truncated."""
+        history = self.state.history
+        if (
+            history is not self._history
+            or len(history) < self._processed
+            or (
+                self._processed
+                and history[self._processed - 1] is not self._last_processed_event
+            )
+        ):
+            self._reset_window()
+            self._history = history
+
+        for index in range(self._processed, len(history)):
+            event = history[index]
+            if isinstance(event, MessageAction) and event.source == EventSource.USER:
+                self._segment_start = len(self._filtered)
+                self._segment_offset = index + 1
+                continue
+            # there might be some NullAction or NullObservation in the history at least for now
+            if isinstance(event, (NullAction, NullObservation)):
+                continue
+            filtered_index = len(self._filtered)
+            self._filtered.append(event)
+            if isinstance(event, Action):
+                self._actions.append((filtered_index, event))
+                if (
+                    isinstance(event, MessageAction)
+                    and event.source == EventSource.AGENT
+                ):
+                    self._agent_messages.append((filtered_index, event))
+            elif isinstance(event, Observation):
+                self._observations.append((filtered_index, event))
+                if isinstance(event, AgentCondensationObservation):
+                    self._condensations.append((filtered_index, event))
+
+        self._processed = len(history)
+        self._last_processed_event = history[-1] if history else None
 
     def is_stuck(self, headless_mode: bool = True) -> bool:
         """Checks if the agent is stuck in a loop.
 
+        The events the checks look at are maintained as the history grows, so the
+        cost of a check does not depend on the length of the history.
+
         Args:
             headless_mode: Matches AgentController's headless_mode.
                           If True: Consider all history (automated/testing)
@@ -53,83 +146,72 @@ class StuckDetector:
         Returns:
             bool: True if the agent is stuck in a loop, False otherwise.
         """
-        filtered_history_offset = 0
-        if not headless_mode:
-            # In interactive mode, only look at history after the last user message
-            last_user_msg_idx = -1
-            for i, event in enumerate(reversed(self.state.history)):
-                if (
-                    isinstance(event, MessageAction)
-                    and event.source == EventSource.USER
-                ):
-                    last_user_msg_idx = len(self.state.history) - i - 1
-                    break
-            filtered_history_offset = last_user_msg_idx + 1
-            history_to_check = self.state.history[last_user_msg_idx + 1 :]
+        self._update_window()
+
+        # The history without user messages and null events:
+        # - In headless: all of it
+        # - In non-headless: only the part after the last user message
+        if headless_mode:
+            start = 0
+            filtered_history_offset = 0
         else:
-            # In headless mode, look at all history
-            history_to_check = self.state.history
-
-        # Filter out user messages and null events
-        filtered_history = [
-            event
-            for event in history_to_check
-            if not (
-                # Filter works elegantly in both modes:
-                # - In headless: actively filters out user messages from full history
-                # - In non-headless: no-op since we already sliced after last user message
-                (isinstance(event, MessageAction) and event.source == EventSource.USER)
-                # there might be some NullAction or NullObservation in the history at least for now
-                or isinstance(event, (NullAction, NullObservation))
-            )
-        ]
+            start = self._segment_start
+            filtered_history_offset = self._segment_offset
+        filtered_history = _FilteredHistory(self._filtered, start)
 
         # it takes 3 actions minimum to detect a loop, otherwise nothing to do here
         if len(filtered_history) < 3:
             return False
 
-        # the first few scenarios detect 3 or 4 repeated steps
-        # prepare the last 4 actions and observations, to check them out
-        last_actions: list[Event] = []
-        last_observations: list[Event] = []
-
-        # retrieve the last four actions and observations starting from the end of history, wherever they are
-        for event in reversed(filtered_history):
-            if isinstance(event, Action) and len(last_actions) < 4:
-                last_actions.append(event)
-            elif isinstance(event, Observation) and len(last_observations) < 4:
-                last_observations.append(event)
-
-            if len(last_actions) == 4 and len(last_observations) == 4:
-                break
+        # the last actions and observations starting from the end of history
+        last_actions = [event for i, event in reversed(self._actions) if i >= start]
+        last_observations = [
+            event for i, event in reversed(self._observations) if i >= start
+        ]
 
+        # the first few scenarios detect 3 or 4 repeated steps
         # scenario 1: same action, same observation
         if self._is_stuck_repeating_action_observation(
-            last_actions, last_observations, filtered_history, filtered_history_offset
+            last_actions[:4],
+            last_observations[:4],
+            filtered_history,
+            filtered_history_offset,
         ):
             return True
 
         # scenario 2: same action, errors
         if self._is_stuck_repeating_action_error(
-            last_actions, last_observations, filtered_history, filtered_history_offset
+            last_actions[:4],
+            last_observations[:4],
+            filtered_history,
+            filtered_history_offset,
         ):
             return True
 
         # scenario 3: monologue
-        if self._is_stuck_monologue(filtered_history, filtered_history_offset):
+        if self._is_stuck_monologue(
+            filtered_history,
+            filtered_history_offset,
+            [(i - start, event) for i, event in self._agent_messages if i >= start],
+        ):
             return True
 
         # scenario 4: action, observation pattern on the last six steps
         if len(filtered_history) >= 6:
             if self._is_stuck_action_observation_pattern(
-                filtered_history, filtered_history_offset
+                filtered_history,
+                filtered_history_offset,
+                last_actions,
+                last_observations,
             ):
                 return True
 
         # scenario 5: context window error loop
         if len(filtered_history) >= 10:
             if self._is_stuck_context_window_error(
-                filtered_history, filtered_history_offset
+                filtered_history,
+                filtered_history_offset,
+                [(i - start, event) for i, event in self._condensations if i >= start],
             ):
                 return True
 
@@ -141,7 +223,7 @@ class StuckDetector:
         self,
         last_actions: list[Event],
         last_observations: list[Event],
-        filtered_history: list[Event],
+        filtered_history: Sequence[Event],
         filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 1: same action, same observation
@@ -174,7 +256,7 @@ class StuckDetector:
         self,
         last_actions: list[Event],
         last_observations: list[Event],
-        filtered_history: list[Event],
+        filtered_history: Sequence[Event],
         filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 2: same action, errors
@@ -316,16 +398,21 @@ class StuckDetector:
         return len(error_lines) == 3 and len(set(error_lines)) == 1
 
     def _is_stuck_monologue(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self,
+        filtered_history: Sequence[Event],
+        filtered_history_offset: int = 0,
+        agent_message_actions: list[tuple[int, Event]] | None = None,
     ) -> bool:
         # scenario 3: monologue
         # check for repeated MessageActions with source=AGENT
         # see if the agent is engaged in a good old monologue, telling itself the same thing over and over
-        agent_message_actions = [
-            (i, event)
-            for i, event in enumerate(filtered_history)
-            if isinstance(event, MessageAction) and event.source == EventSource.AGENT
-        ]
+        if agent_message_actions is None:
+            agent_message_actions = [
+                (i, event)
+                for i, event in enumerate(filtered_history)
+                if isinstance(event, MessageAction)
+                and event.source == EventSource.AGENT
+            ]
 
         # last three message actions will do for this check
         if len(agent_message_actions) >= 3:
@@ -357,7 +444,11 @@ class StuckDetector:
         return False
 
     def _is_stuck_action_observation_pattern(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self,
+        filtered_history: Sequence[Event],
+        filtered_history_offset: int = 0,
+        last_actions: list[Event] | None = None,
+        last_observations: list[Event] | None = None,
     ) -> bool:
         # scenario 4: action, observation pattern on the last six steps
         # check if the agent repeats the same (Action, Observation)
@@ -365,15 +456,19 @@ class StuckDetector:
         last_six_actions: list[Event] = []
         last_six_observations: list[Event] = []
 
-        # the end of history is most interesting
-        for event in reversed(filtered_history):
-            if isinstance(event, Action) and len(last_six_actions) < 6:
-                last_six_actions.append(event)
-            elif isinstance(event, Observation) and len(last_six_observations) < 6:
-                last_six_observations.append(event)
-
-            if len(last_six_actions) == 6 and len(last_six_observations) == 6:
-                break
+        if last_actions is not None and last_observations is not None:
+            last_six_actions = last_actions[:6]
+            last_six_observations = last_observations[:6]
+        else:
+            # the end of history is most interesting
+            for event in reversed(filtered_history):
+                if isinstance(event, Action) and len(last_six_actions) < 6:
+                    last_six_actions.append(event)
+                elif isinstance(event, Observation) and len(last_six_observations) < 6:
+                    last_six_observations.append(event)
+
+                if len(last_six_actions) == 6 and len(last_six_observations) == 6:
+                    break
 
         # this pattern is every other step, like:
         # (action_1, obs_1), (action_2, obs_2), (action_1, obs_1), (action_2, obs_2),...
@@ -407,7 +502,10 @@ class StuckDetector:
         return False
 
     def _is_stuck_context_window_error(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self,
+        filtered_history: Sequence[Event],
+        filtered_history_offset: int = 0,
+        condensation_events: list[tuple[int, Event]] | None = None,
     ) -> bool:
         """Detects if we're stuck in a loop of context window errors.
 
@@ -418,16 +516,20 @@ class StuckDetector:
 
         Args:
             filtered_history: List of filtered events to check
+            filtered_history_offset: Offset of the filtered events in the history
+            condensation_events: The (Last 10 or more) condensation events in the
+                filtered events, with their index. Found in filtered_history if None.
 
         Returns:
             bool: True if we detect a context window error loop
         """
         # Look for AgentCondensationObservation events
-        condensation_events = [
-            (i, event)
-            for i, event in enumerate(filtered_history)
-            if isinstance(event, AgentCondensationObservation)
-        ]
+        if condensation_events is None:
+            condensation_events = [
+                (i, event)
+                for i, event in enumerate(filtered_history)
+                if isinstance(event, AgentCondensationObservation)
+            ]
 
         # Need at least 10 condensation events to detect a loop
         if len(condensation_events) < 10:
@@ -441,12 +543,9 @@ class StuckDetector:
             start_idx = last_condensation_events[i][0]
             end_idx = last_condensation_events[i + 1][0]
 
-            # Look for any non-condensation events between these two
-            has_other_events = False
-            for event in filtered_history[start_idx + 1 : end_idx]:
-                if not isinstance(event, AgentCondensationObservation):
-                    has_other_events = True
-                    break
+            # Any events between two consecutive condensation events are
+            # non-condensation events
+            has_other_events = end_idx > start_idx + 1
 
             if not has_other_events:
                 logger.warning(
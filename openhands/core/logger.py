@@ -5,15 +5,18 @@
 #   - V1 application server (in this repo): openhands/app_server/
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
+import atexit
 import copy
 import logging
 import os
+import queue
 import re
 import sys
+import threading
 import traceback
 import warnings
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from types import TracebackType
 from typing import Any, Literal, Mapping, MutableMapping, TextIO
 
@@ -40,6 +43,13 @@ DEBUG_LLM = os.getenv('DEBUG_LLM', 'False').lower() in ['true', '1', 'yes']
 LOG_JSON = os.getenv('LOG_JSON', 'False').lower() in ['true', '1', 'yes']
 LOG_JSON_LEVEL_KEY = os.getenv('LOG_JSON_LEVEL_KEY', 'level')
 
+# Emit log records through a bounded queue, so that formatting and I/O happen on a
+# background thread rather than the emitting thread. Disabled by default.
+LOG_QUEUE = os.getenv('LOG_QUEUE', 'False').lower() in ['true', '1', 'yes']
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+# What to do when the queue is full: 'drop' the record, or 'block' until there is room
+LOG_QUEUE_OVERFLOW = os.getenv('LOG_QUEUE_OVERFLOW', 'drop').lower()
+
 
 # Configure litellm logging based on DEBUG_LLM
 if DEBUG_LLM:
@@ -255,50 +265,92 @@ class RollingLogger:
         sys.stdout.flush()
 
 
-class SensitiveDataFilter(logging.Filter):
-    def filter(self, record: logging.LogRecord) -> bool:
-        # Gather sensitive values which should not ever appear in the logs.
-        sensitive_values = []
-        for key, value in os.environ.items():
-            key_upper = key.upper()
-            if (
-                len(value) > 2
-                and value != 'default'
-                and any(s in key_upper for s in ('SECRET', '_KEY', '_CODE', '_TOKEN'))
-            ):
-                sensitive_values.append(value)
+# Names of attributes whose values are masked when they appear in a log message,
+# e.g. "llm_api_key='abc'" (Both lower and upper case are matched)
+SENSITIVE_ATTRIBUTES = (
+    'api_key',
+    'aws_access_key_id',
+    'aws_secret_access_key',
+    'e2b_api_key',
+    'github_token',
+    'jwt_secret',
+    'modal_api_token_id',
+    'modal_api_token_secret',
+    'llm_api_key',
+    'sandbox_env_github_token',
+    'runloop_api_key',
+    'daytona_api_key',
+)
+_SENSITIVE_ATTRIBUTE_PATTERN = re.compile(
+    '('
+    + '|'.join(
+        list(SENSITIVE_ATTRIBUTES) + [attr.upper() for attr in SENSITIVE_ATTRIBUTES]
+    )
+    + r")='?[\w-]+'?"
+)
+
+
+def _is_sensitive_env_var(key: str, value: str) -> bool:
+    return (
+        len(value) > 2
+        and value != 'default'
+        and any(s in key.upper() for s in ('SECRET', '_KEY', '_CODE', '_TOKEN'))
+    )
+
+
+class SensitiveDataRedactor:
+    """Masks sensitive values in log messages.
+
+    Values of sensitive environment variables are gathered into a single compiled
+    pattern, which is only rebuilt when the environment changes.
+    """
+
+    def __init__(self) -> None:
+        self._env_snapshot: dict | None = None
+        self._value_pattern: re.Pattern | None = None
+
+    def refresh(self) -> None:
+        """Gather sensitive values from the environment again."""
+        env_snapshot = dict(getattr(os.environ, '_data', os.environ))
+        sensitive_values = {
+            value
+            for key, value in os.environ.items()
+            if _is_sensitive_env_var(key, value)
+        }
+        if sensitive_values:
+            # Longest first, so a value containing another is masked completely
+            self._value_pattern = re.compile(
+                '|'.join(
+                    re.escape(value)
+                    for value in sorted(sensitive_values, key=len, reverse=True)
+                )
+            )
+        else:
+            self._value_pattern = None
+        self._env_snapshot = env_snapshot
+
+    def redact(self, msg: str) -> str:
+        # Comparing against a snapshot is much cheaper than inspecting every variable
+        if getattr(os.environ, '_data', os.environ) != self._env_snapshot:
+            self.refresh()
 
         # Replace sensitive values from env!
-        msg = record.getMessage()
-        for sensitive_value in sensitive_values:
-            msg = msg.replace(sensitive_value, '******')
+        if self._value_pattern is not None:
+            msg = self._value_pattern.sub('******', msg)
 
         # Replace obvious sensitive values from log itself...
-        sensitive_patterns = [
-            'api_key',
-            'aws_access_key_id',
-            'aws_secret_access_key',
-            'e2b_api_key',
-            'github_token',
-            'jwt_secret',
-            'modal_api_token_id',
-            'modal_api_token_secret',
-            'llm_api_key',
-            'sandbox_env_github_token',
-            'runloop_api_key',
-            'daytona_api_key',
-        ]
-
-        # add env var names
-        env_vars = [attr.upper() for attr in sensitive_patterns]
-        sensitive_patterns.extend(env_vars)
-
-        for attr in sensitive_patterns:
-            pattern = rf"{attr}='?([\w-]+)'?"
-            msg = re.sub(pattern, f"{attr}='******'", msg)
+        if '=' in msg:
+            msg = _SENSITIVE_ATTRIBUTE_PATTERN.sub(r"\1='******'", msg)
+        return msg
+
+
+_sensitive_data_redactor = SensitiveDataRedactor()
 
+
+class SensitiveDataFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
         # Update the record
-        record.msg = msg
+        record.msg = _sensitive_data_redactor.redact(record.getMessage())
         record.args = ()
 
         return True
@@ -357,6 +409,88 @@ def json_log_handler(
     return handler
 
 
+class _LogQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than failing if the queue is full when stopping
+        self.queue.put(self._sentinel)
+
+    def is_listener_thread(self) -> bool:
+        return getattr(self, '_thread', None) is threading.current_thread()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Puts records on a bounded queue, to be formatted and written by the handlers
+    of a listener on a background thread.
+
+    When the queue is full, records are either dropped (And the number dropped is
+    reported once there is room again) or the emitting thread blocks.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = 'drop') -> None:
+        super().__init__(log_queue)
+        if overflow not in ('drop', 'block'):
+            raise ValueError(f'Unknown log queue overflow policy: {overflow}')
+        self.overflow = overflow
+        self.dropped = 0
+        self.listener: _LogQueueListener | None = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the default, do not format the record here - only merge the args,
+        # as they may be changed by the caller before the record is handled.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        listener = self.listener
+        if self.overflow == 'block' and not (
+            listener and listener.is_listener_thread()
+        ):
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            try:
+                self.queue.put_nowait(
+                    logging.makeLogRecord(
+                        {
+                            'name': record.name,
+                            'levelno': logging.WARNING,
+                            'levelname': 'WARNING',
+                            'msg': f'Dropped {dropped} log records as the log queue was full',
+                        }
+                    )
+                )
+            except queue.Full:
+                self.dropped += dropped
+
+
+def add_handlers(logger: logging.Logger, *handlers: logging.Handler) -> None:
+    """Add the handlers to the logger. If LOG_QUEUE is set, the handlers are run
+    on a background thread, fed by a bounded queue."""
+    if not LOG_QUEUE:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return
+    queue_handler = BoundedQueueHandler(
+        queue.Queue(maxsize=LOG_QUEUE_SIZE), LOG_QUEUE_OVERFLOW
+    )
+    listener = _LogQueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    queue_handler.listener = listener
+    listener.start()
+    # Write anything still queued before the interpreter exits
+    atexit.register(listener.stop)
+    logger.addHandler(queue_handler)
+
+
 # Set up logging
 logging.basicConfig(level=logging.ERROR)
 
@@ -393,29 +527,32 @@ if DEBUG:
 if current_log_level == logging.DEBUG:
     openhands_logger.debug('DEBUG mode enabled.')
 
+LOG_DIR = os.path.join(
+    # parent dir of openhands/core (i.e., root of the repo)
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'logs',
+)
+
+openhands_handlers: list[logging.Handler] = []
 if LOG_JSON:
-    openhands_logger.addHandler(json_log_handler(current_log_level))
+    openhands_handlers.append(json_log_handler(current_log_level))
     # Configure concurrent.futures logger to use JSON formatting as well
     cf_logger = logging.getLogger('concurrent.futures')
     cf_logger.setLevel(current_log_level)
-    cf_logger.addHandler(json_log_handler(current_log_level))
+    add_handlers(cf_logger, json_log_handler(current_log_level))
 else:
-    openhands_logger.addHandler(get_console_handler(current_log_level))
+    openhands_handlers.append(get_console_handler(current_log_level))
+if LOG_TO_FILE:
+    # default log to project root
+    openhands_handlers.append(get_file_handler(LOG_DIR, current_log_level))
+add_handlers(openhands_logger, *openhands_handlers)
 
+# Redaction stays on the logger (Rather than behind the queue) so that it also
+# applies to handlers added elsewhere.
 openhands_logger.addFilter(SensitiveDataFilter(openhands_logger.name))
 openhands_logger.propagate = False
 openhands_logger.debug('Logging initialized')
-
-LOG_DIR = os.path.join(
-    # parent dir of openhands/core (i.e., root of the repo)
-    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-    'logs',
-)
-
 if LOG_TO_FILE:
-    openhands_logger.addHandler(
-        get_file_handler(LOG_DIR, current_log_level)
-    )  # default log to project root
     openhands_logger.debug(f'Logging to file in: {LOG_DIR}')
 
 # Exclude LiteLLM from logging output as it can leak keys
@@ -507,7 +644,7 @@ def _setup_llm_logger(name: str, log_level: int) -> logging.Logger:
     logger.propagate = False
     logger.setLevel(log_level)
     if LOG_TO_FILE:
-        logger.addHandler(_get_llm_file_handler(name, log_level))
+        add_handlers(logger, _get_llm_file_handler(name, log_level))
     return logger
 
 
@@ -0,0 +1,174 @@
+"""Builds the cache pages of conversations in the background.
+
+The event stream stores a cache page once it has written a full page of events, so
+the last page of a conversation is never cached, and neither are conversations
+written before pages were introduced (Or with another page size). Reading the events
+of those falls back to one file store read per event.
+
+Conversations with missing pages are compacted once they have been idle (Neither
+read with missing pages nor closed) for EVENT_CACHE_COMPACTION_DELAY seconds. The
+last page is written even though it is not full, and rewritten by later compactions
+as the conversation grows.
+"""
+
+import os
+import threading
+import time
+
+from openhands.core.logger import openhands_logger as logger
+from openhands.events.event_store import (
+    EVENT_CACHE_PAGE_SIZE,
+    EventStore,
+    decode_cache_page,
+    encode_cache_page,
+)
+from openhands.io import json
+from openhands.storage.files import FileStore
+
+EVENT_CACHE_COMPACTION = os.getenv('EVENT_CACHE_COMPACTION', 'true').lower() in (
+    'true',
+    '1',
+)
+EVENT_CACHE_COMPACTION_DELAY = float(os.getenv('EVENT_CACHE_COMPACTION_DELAY', '60'))
+
+
+def compact_event_cache(event_store: EventStore, compress: bool | None = None) -> int:
+    """Write the missing cache pages of a conversation, and the last page if it is
+    not full.
+
+    Returns:
+        int: The number of pages written.
+    """
+    page_size = event_store.cache_size
+    cur_id = event_store._calculate_cur_id()
+    cache_dir = event_store._get_filename_for_cache(0, page_size).rsplit('/', 1)[0]
+    try:
+        existing_pages = {
+            filename.rstrip('/').rsplit('/', 1)[-1]
+            for filename in event_store.file_store.list(cache_dir)
+        }
+    except FileNotFoundError:
+        existing_pages = set()
+
+    num_written = 0
+    for start in range(0, cur_id, page_size):
+        end = start + page_size
+        cache_filename = event_store._get_filename_for_cache(start, end)
+        page_exists = cache_filename.rsplit('/', 1)[-1] in existing_pages
+        if page_exists and end <= cur_id:
+            continue
+
+        events: list[dict] = []
+        if page_exists:
+            try:
+                events = decode_cache_page(event_store.file_store.read(cache_filename))
+            except FileNotFoundError:
+                pass
+        num_stored = len(events)
+        # Events are looked up by their position in the page, so the page stops at
+        # the first missing event
+        for index in range(start + len(events), min(end, cur_id)):
+            try:
+                data = event_store.get_event_dict(index)
+            except FileNotFoundError:
+                break
+            if data.get('id') != index:
+                break
+            events.append(data)
+        if len(events) == num_stored:
+            continue
+
+        event_store.file_store.write(
+            cache_filename, encode_cache_page(json.dumps(events), compress)
+        )
+        num_written += 1
+    return num_written
+
+
+class EventCacheCompactor:
+    """Compacts the scheduled conversations on a background thread."""
+
+    def __init__(self, delay: float = EVENT_CACHE_COMPACTION_DELAY):
+        self.delay = delay
+        self._pending: dict[tuple[str, str | None], tuple[float, EventStore]] = {}
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def schedule(
+        self,
+        sid: str,
+        file_store: FileStore,
+        user_id: str | None,
+        cache_size: int = EVENT_CACHE_PAGE_SIZE,
+    ) -> None:
+        """Compact a conversation once it has been idle for the delay. Scheduling a
+        conversation which is already scheduled postpones it."""
+        if not EVENT_CACHE_COMPACTION:
+            return
+        due = time.monotonic() + self.delay
+        with self._condition:
+            if self._closed:
+                return
+            key = (sid, user_id)
+            pending = self._pending.get(key)
+            if (
+                pending is not None
+                and pending[1].file_store is file_store
+                and pending[1].cache_size == cache_size
+            ):
+                event_store = pending[1]
+            else:
+                event_store = EventStore(sid, file_store, user_id, cache_size)
+            self._pending[key] = (due, event_store)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Stop the background thread. Pending compactions are discarded."""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    due_keys = [
+                        key for key, (due, _) in self._pending.items() if due <= now
+                    ]
+                    if due_keys:
+                        break
+                    timeout = None
+                    if self._pending:
+                        timeout = min(due for due, _ in self._pending.values()) - now
+                    self._condition.wait(timeout)
+                event_stores = [self._pending.pop(key)[1] for key in due_keys]
+
+            for event_store in event_stores:
+                try:
+                    num_written = compact_event_cache(event_store)
+                    if num_written:
+                        logger.debug(
+                            f'Wrote {num_written} event cache pages for {event_store.sid}'
+                        )
+                except Exception as e:
+                    logger.warning(
+                        f'Error compacting event cache of {event_store.sid}: {e}'
+                    )
+
+
+_event_cache_compactor = EventCacheCompactor()
+
+
+def get_event_cache_compactor() -> EventCacheCompactor:
+    return _event_cache_compactor
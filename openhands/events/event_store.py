@@ -1,4 +1,7 @@
+import base64
 import json
+import os
+import zlib
 from dataclasses import dataclass
 from typing import Iterable
 
@@ -11,10 +14,42 @@ from openhands.storage.files import FileStore
 from openhands.storage.locations import (
     get_conversation_dir,
     get_conversation_event_filename,
+    get_conversation_events_cur_id_filename,
     get_conversation_events_dir,
 )
 from openhands.utils.shutdown_listener import should_continue
 
+# The number of events in each cache page. Changing it leaves the existing pages
+# unused until the event cache compactor rebuilds them.
+EVENT_CACHE_PAGE_SIZE = int(os.getenv('EVENT_CACHE_PAGE_SIZE', '25'))
+# Whether to compress the cache pages written from now on. Both kinds are readable.
+EVENT_CACHE_COMPRESSION = os.getenv('EVENT_CACHE_COMPRESSION', 'false').lower() in (
+    'true',
+    '1',
+)
+_COMPRESSED_PAGE_PREFIX = 'zlib:'
+# Whether the event stream records the next event id with each cache page and when it
+# is closed, so that loading a conversation does not need to list all of its events
+EVENT_CUR_ID_MARKER = os.getenv('EVENT_CUR_ID_MARKER', 'false').lower() in (
+    'true',
+    '1',
+)
+
+
+def encode_cache_page(contents: str, compress: bool | None = None) -> str:
+    """Encode the JSON contents of a cache page for storage."""
+    if not (EVENT_CACHE_COMPRESSION if compress is None else compress):
+        return contents
+    compressed = zlib.compress(contents.encode('utf-8'))
+    return _COMPRESSED_PAGE_PREFIX + base64.b64encode(compressed).decode('utf-8')
+
+
+def decode_cache_page(contents: str) -> list[dict]:
+    if contents.startswith(_COMPRESSED_PAGE_PREFIX):
+        compressed = base64.b64decode(contents[len(_COMPRESSED_PAGE_PREFIX) :])
+        contents = zlib.decompress(compressed).decode('utf-8')
+    return json.loads(contents)
+
 
 @dataclass(frozen=True)
 class _CachePage:
@@ -30,11 +65,20 @@ class _CachePage:
         return True
 
     def get_event(self, global_index: int) -> Event | None:
+        data = self.get_event_dict(global_index)
+        if data is None:
+            return None
+        return event_from_dict(data)
+
+    def get_event_dict(self, global_index: int) -> dict | None:
         # If there was not actually a cached page, return None
         if not self.events:
             return None
         local_index = global_index - self.start
-        return event_from_dict(self.events[local_index])
+        # The last page of a conversation may not be full
+        if local_index >= len(self.events):
+            return None
+        return self.events[local_index]
 
 
 _DUMMY_PAGE = _CachePage(None, 1, -1)
@@ -47,7 +91,7 @@ class EventStore(EventStoreABC):
     sid: str
     file_store: FileStore
     user_id: str | None
-    cache_size: int = 25
+    cache_size: int = EVENT_CACHE_PAGE_SIZE
     _cur_id: int | None = None  # Private field to cache the calculated value
 
     @property
@@ -64,6 +108,11 @@ class EventStore(EventStoreABC):
 
     def _calculate_cur_id(self) -> int:
         """Calculate the current event ID based on file system content."""
+        if EVENT_CUR_ID_MARKER:
+            cur_id = self._read_cur_id_marker()
+            if cur_id is not None:
+                return cur_id
+
         events = []
         try:
             events_dir = get_conversation_events_dir(self.sid, self.user_id)
@@ -82,6 +131,18 @@ class EventStore(EventStoreABC):
                 max_id = id
         return max_id + 1
 
+    def _read_cur_id_marker(self) -> int | None:
+        """Read the next event ID recorded by the event stream, or None if there is
+        none. The events written after the marker (At most a page of them, unless the
+        stream was not closed) are found by checking for them one at a time."""
+        try:
+            cur_id = int(self.file_store.read(self._get_filename_for_cur_id()))
+        except (FileNotFoundError, ValueError):
+            return None
+        while self.file_store.exists(self._get_filename_for_id(cur_id, self.user_id)):
+            cur_id += 1
+        return cur_id
+
     def search_events(
         self,
         start_id: int = 0,
@@ -135,11 +196,43 @@ class EventStore(EventStoreABC):
                     if limit and limit <= num_results:
                         return
 
+    def search_event_dicts(
+        self, start_id: int = 0, end_id: int | None = None
+    ) -> Iterable[dict]:
+        """Retrieve the serialized events from the event stream in order, without
+        deserializing them. Events are read a cache page at a time where possible, so
+        callers only pay for deserializing the events they need.
+
+        Args:
+            start_id: The ID of the first event to retrieve. Defaults to 0.
+            end_id: The ID of the last event to retrieve. Defaults to the last event in the stream.
+
+        Yields:
+            The serialized events from the stream.
+        """
+        end_id = self.cur_id if end_id is None else end_id + 1
+        cache_page = _DUMMY_PAGE
+        for index in range(start_id, end_id):
+            if not should_continue():
+                return
+            if not cache_page.covers(index):
+                cache_page = self._load_cache_page_for_index(index)
+            data = cache_page.get_event_dict(index)
+            if data is None:
+                try:
+                    data = self.get_event_dict(index)
+                except FileNotFoundError:
+                    continue
+            if data:
+                yield data
+
     def get_event(self, id: int) -> Event:
+        return event_from_dict(self.get_event_dict(id))
+
+    def get_event_dict(self, id: int) -> dict:
         filename = self._get_filename_for_id(id, self.user_id)
         content = self.file_store.read(filename)
-        data = json.loads(content)
-        return event_from_dict(data)
+        return json.loads(content)
 
     def get_latest_event(self) -> Event:
         return self.get_event(self.cur_id - 1)
@@ -158,17 +251,30 @@ class EventStore(EventStoreABC):
     def _get_filename_for_cache(self, start: int, end: int) -> str:
         return f'{get_conversation_dir(self.sid, self.user_id)}event_cache/{start}-{end}.json'
 
+    def _get_filename_for_cur_id(self) -> str:
+        return get_conversation_events_cur_id_filename(self.sid, self.user_id)
+
     def _load_cache_page(self, start: int, end: int) -> _CachePage:
         """Read a page from the cache. Reading individual events is slow when there are a lot of them, so we use pages."""
         cache_filename = self._get_filename_for_cache(start, end)
         try:
             content = self.file_store.read(cache_filename)
-            events = json.loads(content)
+            events = decode_cache_page(content)
         except FileNotFoundError:
             events = None
+            self._schedule_cache_compaction()
         page = _CachePage(events, start, end)
         return page
 
+    def _schedule_cache_compaction(self) -> None:
+        """Have the missing cache pages built in the background, so that the next
+        reads of the conversation are page based."""
+        from openhands.events.event_cache_compactor import get_event_cache_compactor
+
+        get_event_cache_compactor().schedule(
+            self.sid, self.file_store, self.user_id, self.cache_size
+        )
+
     def _load_cache_page_for_index(self, index: int) -> _CachePage:
         offset = index % self.cache_size
         index -= offset
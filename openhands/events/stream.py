@@ -1,16 +1,20 @@
-import asyncio
-import queue
 import threading
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
-from functools import partial
 from typing import Any, Callable
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.events.event import Event, EventSource
-from openhands.events.event_store import EventStore
+from openhands.events.event_store import (
+    EVENT_CUR_ID_MARKER,
+    EventStore,
+    encode_cache_page,
+)
 from openhands.events.serialization.event import event_from_dict, event_to_dict
+from openhands.events.subscriber_dispatcher import (
+    CallbackQueue,
+    get_subscriber_dispatcher,
+)
 from openhands.io import json
 from openhands.storage import FileStore
 from openhands.storage.locations import (
@@ -30,6 +34,10 @@ class EventStreamSubscriber(str, Enum):
     TEST = 'test'
 
 
+# Subscribers whose callbacks block until an action completes, which may take minutes
+_BLOCKING_SUBSCRIBERS = {EventStreamSubscriber.RUNTIME}
+
+
 async def session_exists(
     sid: str, file_store: FileStore, user_id: str | None = None
 ) -> bool:
@@ -46,39 +54,27 @@ class EventStream(EventStore):
     # when there are multiple listeners
     _subscribers: dict[str, dict[str, Callable]]
     _lock: threading.Lock
-    _queue: queue.Queue[Event]
-    _queue_thread: threading.Thread
-    _queue_loop: asyncio.AbstractEventLoop | None
-    _thread_pools: dict[str, dict[str, ThreadPoolExecutor]]
-    _thread_loops: dict[str, dict[str, asyncio.AbstractEventLoop]]
+    # The events waiting for each callback, which are called on the workers shared by
+    # all event streams
+    _callback_queues: dict[str, dict[str, CallbackQueue]]
     _write_page_cache: list[dict]
 
     def __init__(self, sid: str, file_store: FileStore, user_id: str | None = None):
         super().__init__(sid, file_store, user_id)
         self._stop_flag = threading.Event()
-        self._queue: queue.Queue[Event] = queue.Queue()
-        self._thread_pools = {}
-        self._thread_loops = {}
-        self._queue_loop = None
-        self._queue_thread = threading.Thread(target=self._run_queue_loop)
-        self._queue_thread.daemon = True
-        self._queue_thread.start()
+        self._callback_queues = {}
         self._subscribers = {}
         self._lock = threading.Lock()
         self.secrets = {}
         self._write_page_cache = []
 
-    def _init_thread_loop(self, subscriber_id: str, callback_id: str) -> None:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        if subscriber_id not in self._thread_loops:
-            self._thread_loops[subscriber_id] = {}
-        self._thread_loops[subscriber_id][callback_id] = loop
-
     def close(self) -> None:
         self._stop_flag.set()
-        if self._queue_thread.is_alive():
-            self._queue_thread.join()
+        # The last page of the conversation is not full, so it is not cached yet
+        if self._cur_id and self._cur_id % self.cache_size:
+            self._schedule_cache_compaction()
+        if self._cur_id:
+            self._write_cur_id_marker(self._cur_id)
 
         subscriber_ids = list(self._subscribers.keys())
         for subscriber_id in subscriber_ids:
@@ -86,10 +82,6 @@ class EventStream(EventStore):
             for callback_id in callback_ids:
                 self._clean_up_subscriber(subscriber_id, callback_id)
 
-        # Clear queue
-        while not self._queue.empty():
-            self._queue.get()
-
     def _clean_up_subscriber(self, subscriber_id: str, callback_id: str) -> None:
         if subscriber_id not in self._subscribers:
             logger.warning(f'Subscriber not found during cleanup: {subscriber_id}')
@@ -97,34 +89,8 @@ class EventStream(EventStore):
         if callback_id not in self._subscribers[subscriber_id]:
             logger.warning(f'Callback not found during cleanup: {callback_id}')
             return
-        if (
-            subscriber_id in self._thread_loops
-            and callback_id in self._thread_loops[subscriber_id]
-        ):
-            loop = self._thread_loops[subscriber_id][callback_id]
-            current_task = asyncio.current_task(loop)
-            pending = [
-                task for task in asyncio.all_tasks(loop) if task is not current_task
-            ]
-            for task in pending:
-                task.cancel()
-            try:
-                loop.stop()
-                loop.close()
-            except Exception as e:
-                logger.warning(
-                    f'Error closing loop for {subscriber_id}/{callback_id}: {e}'
-                )
-            del self._thread_loops[subscriber_id][callback_id]
-
-        if (
-            subscriber_id in self._thread_pools
-            and callback_id in self._thread_pools[subscriber_id]
-        ):
-            pool = self._thread_pools[subscriber_id][callback_id]
-            pool.shutdown()
-            del self._thread_pools[subscriber_id][callback_id]
-
+        # The events already queued for the callback are still passed to it
+        self._callback_queues[subscriber_id].pop(callback_id).close()
         del self._subscribers[subscriber_id][callback_id]
 
     def subscribe(
@@ -133,19 +99,24 @@ class EventStream(EventStore):
         callback: Callable[[Event], None],
         callback_id: str,
     ) -> None:
-        initializer = partial(self._init_thread_loop, subscriber_id, callback_id)
-        pool = ThreadPoolExecutor(max_workers=1, initializer=initializer)
         if subscriber_id not in self._subscribers:
             self._subscribers[subscriber_id] = {}
-            self._thread_pools[subscriber_id] = {}
+            self._callback_queues[subscriber_id] = {}
 
         if callback_id in self._subscribers[subscriber_id]:
             raise ValueError(
                 f'Callback ID on subscriber {subscriber_id} already exists: {callback_id}'
             )
 
+        self._callback_queues[subscriber_id][callback_id] = (
+            get_subscriber_dispatcher().create_queue(
+                subscriber_id,
+                callback_id,
+                callback,
+                blocking=subscriber_id in _BLOCKING_SUBSCRIBERS,
+            )
+        )
         self._subscribers[subscriber_id][callback_id] = callback
-        self._thread_pools[subscriber_id][callback_id] = pool
 
     def unsubscribe(
         self, subscriber_id: EventStreamSubscriber, callback_id: str
@@ -171,6 +142,10 @@ class EventStream(EventStore):
             event._id = self.cur_id  # type: ignore [attr-defined]
             self.cur_id += 1
 
+            # After a restart the first page may already have events
+            if not self._write_page_cache and event.id % self.cache_size:
+                self._write_page_cache = self._load_write_page(event.id)
+
             # Take a copy of the current write page
             current_write_page = self._write_page_cache
 
@@ -180,7 +155,7 @@ class EventStream(EventStore):
             current_write_page.append(data)
 
             # If the page is full, create a new page for future events / other threads to use
-            if len(current_write_page) == self.cache_size:
+            if (event.id + 1) % self.cache_size == 0:
                 self._write_page_cache = []
 
         if event.id is not None:
@@ -200,17 +175,37 @@ class EventStream(EventStore):
 
             # Store the cache page last - if it is not present during reads then it will simply be bypassed.
             self._store_cache_page(current_write_page)
-        self._queue.put(event)
+        self._dispatch(event)
 
     def _store_cache_page(self, current_write_page: list[dict]):
         """Store a page in the cache. Reading individual events is slow when there are a lot of them, so we use pages."""
         if len(current_write_page) < self.cache_size:
             return
         start = current_write_page[0]['id']
+        # Pages are only ever looked up at multiples of the page size
+        if start % self.cache_size:
+            return
         end = start + self.cache_size
-        contents = json.dumps(current_write_page)
+        contents = encode_cache_page(json.dumps(current_write_page))
         cache_filename = self._get_filename_for_cache(start, end)
         self.file_store.write(cache_filename, contents)
+        self._write_cur_id_marker(end)
+
+    def _write_cur_id_marker(self, cur_id: int) -> None:
+        """Record the next event ID, for loading the conversation without listing its
+        events. The marker may lag behind the IDs handed out, but never exceeds them."""
+        if EVENT_CUR_ID_MARKER:
+            self.file_store.write(self._get_filename_for_cur_id(), str(cur_id))
+
+    def _load_write_page(self, next_id: int) -> list[dict]:
+        """Load the events already in the page of next_id, so the page can be stored
+        once it is full. Returns an empty page (Which is never stored) if any of
+        them are missing."""
+        start = next_id - next_id % self.cache_size
+        events = list(self.search_event_dicts(start, next_id - 1))
+        if [data.get('id') for data in events] != list(range(start, next_id)):
+            return []
+        return events
 
     def set_secrets(self, secrets: dict[str, str]) -> None:
         self.secrets = secrets.copy()
@@ -243,49 +238,12 @@ class EventStream(EventStore):
                     data[key] = data[key].replace(secret, '<secret_hidden>')
         return data
 
-    def _run_queue_loop(self) -> None:
-        self._queue_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._queue_loop)
-        try:
-            self._queue_loop.run_until_complete(self._process_queue())
-        finally:
-            self._queue_loop.close()
-
-    async def _process_queue(self) -> None:
-        while should_continue() and not self._stop_flag.is_set():
-            event = None
-            try:
-                event = self._queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-
-            # pass each event to each callback in order
-            for key in sorted(self._subscribers.keys()):
-                callbacks = self._subscribers[key]
-                # Create a copy of the keys to avoid "dictionary changed size during iteration" error
-                callback_ids = list(callbacks.keys())
-                for callback_id in callback_ids:
-                    # Check if callback_id still exists (might have been removed during iteration)
-                    if callback_id in callbacks:
-                        callback = callbacks[callback_id]
-                        pool = self._thread_pools[key][callback_id]
-                        future = pool.submit(callback, event)
-                        future.add_done_callback(
-                            self._make_error_handler(callback_id, key)
-                        )
-
-    def _make_error_handler(
-        self, callback_id: str, subscriber_id: str
-    ) -> Callable[[Any], None]:
-        def _handle_callback_error(fut: Any) -> None:
-            try:
-                # This will raise any exception that occurred during callback execution
-                fut.result()
-            except Exception as e:
-                logger.error(
-                    f'Error in event callback {callback_id} for subscriber {subscriber_id}: {str(e)}',
-                )
-                # Re-raise in the main thread so the error is not swallowed
-                raise e
-
-        return _handle_callback_error
+    def _dispatch(self, event: Event) -> None:
+        if not should_continue() or self._stop_flag.is_set():
+            return
+        # pass each event to each callback in order
+        for key in sorted(self._callback_queues.keys()):
+            callback_queues = self._callback_queues[key]
+            # Create a copy of the queues to avoid "dictionary changed size during iteration" error
+            for callback_queue in list(callback_queues.values()):
+                callback_queue.put(event)
@@ -0,0 +1,283 @@
+"""Runs the callbacks of event stream subscribers on a shared pool of threads.
+
+The events of each callback are queued, and the callback is called with them one at a
+time and in order, on whichever worker is free. The callbacks of all the event streams
+share EVENT_STREAM_DISPATCH_WORKERS workers, instead of a thread (And a thread polling
+the queue of each stream) for every callback of every conversation.
+
+Each callback still has an event loop of its own, which is the current loop of the
+worker while the callback runs: the callbacks run coroutines with
+asyncio.get_event_loop().run_until_complete(), and may keep objects bound to the loop
+between events.
+
+A callback holds a worker for as long as it runs, so the number of workers bounds how
+many callbacks run at once across all conversations. Callbacks which block for long,
+such as the runtime's which waits for each action to complete, are created as blocking
+and run on a thread of their own while they have events instead, so that they can not
+take all the workers and hold up the callbacks of other conversations.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable
+
+from openhands.core.logger import openhands_logger as logger
+from openhands.events.event import Event
+
+EVENT_STREAM_DISPATCH_WORKERS = int(os.getenv('EVENT_STREAM_DISPATCH_WORKERS', '64'))
+# The number of events a callback is called with before its worker moves on to other
+# callbacks, so that a busy callback does not keep the others waiting
+_MAX_EVENTS_PER_RUN = 10
+# Seconds given to each coroutine run before the event loop of a callback is closed
+_BEFORE_LOOP_CLOSES_TIMEOUT = 10.0
+
+
+@dataclass
+class CallbackStats:
+    """The calls made to the callbacks of a subscriber."""
+
+    calls: int = 0
+    errors: int = 0
+    # Seconds from an event being queued to the callback being called with it
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    # Seconds spent in the callback
+    total_run_time: float = 0.0
+    max_run_time: float = 0.0
+
+
+class CallbackQueue:
+    """The events waiting for a subscriber callback."""
+
+    def __init__(
+        self,
+        dispatcher: 'SubscriberDispatcher',
+        subscriber_id: str,
+        callback_id: str,
+        callback: Callable[[Event], None],
+        blocking: bool = False,
+    ):
+        self.dispatcher = dispatcher
+        self.subscriber_id = subscriber_id
+        self.callback_id = callback_id
+        self.callback = callback
+        self.blocking = blocking
+        self._events: deque[tuple[float, Event]] = deque()
+        self._condition = threading.Condition()
+        # Whether a worker has been asked to call the callback with the events
+        self._scheduled = False
+        self._closed = False
+        # Whether the last run closes the loop, as close() did not wait for it
+        self._close_on_last_run = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Coroutine functions run on the loop before it is closed
+        self._before_loop_closes: list[Callable[[], Awaitable[None]]] = []
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def put(self, event: Event) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            self._events.append((time.monotonic(), event))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.dispatcher._submit(self)
+
+    def close(self) -> None:
+        """Stop accepting events. The events already queued are still handled, and
+        waited for unless this is called from a dispatch worker (Such as from a
+        callback), as that could wait on itself."""
+        with self._condition:
+            self._closed = True
+            if not self.dispatcher.is_worker_thread():
+                while self._scheduled:
+                    self._condition.wait()
+            if self._scheduled:
+                self._close_on_last_run = True
+                return
+        self._close_loop()
+
+    def _run(self) -> None:
+        for _ in range(_MAX_EVENTS_PER_RUN):
+            with self._condition:
+                if not self._events:
+                    self._scheduled = False
+                    self._condition.notify_all()
+                    close_loop = self._close_on_last_run
+                    break
+                queued_at, event = self._events.popleft()
+            self._call(queued_at, event)
+        else:
+            self.dispatcher._submit(self)
+            return
+        if close_loop:
+            self._close_loop()
+
+    def _call(self, queued_at: float, event: Event) -> None:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self.dispatcher._worker.callback_queue = self
+        started_at = time.monotonic()
+        error = False
+        try:
+            self.callback(event)
+        except Exception as e:
+            error = True
+            logger.error(
+                f'Error in event callback {self.callback_id} for subscriber {self.subscriber_id}: {str(e)}',
+            )
+        finally:
+            asyncio.set_event_loop(None)
+            self.dispatcher._worker.callback_queue = None
+            finished_at = time.monotonic()
+            self.dispatcher._record(
+                self.subscriber_id,
+                started_at - queued_at,
+                finished_at - started_at,
+                error,
+            )
+
+    def _close_loop(self) -> None:
+        with self._condition:
+            loop = self._loop
+            self._loop = None
+            before_loop_closes = self._before_loop_closes
+            self._before_loop_closes = []
+        if loop is None:
+            return
+        for coroutine_function in before_loop_closes:
+            try:
+                loop.run_until_complete(
+                    asyncio.wait_for(
+                        coroutine_function(), timeout=_BEFORE_LOOP_CLOSES_TIMEOUT
+                    )
+                )
+            except Exception as e:
+                logger.warning(
+                    f'Error before closing loop for {self.subscriber_id}/{self.callback_id}: {e}'
+                )
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        try:
+            loop.close()
+        except Exception as e:
+            logger.warning(
+                f'Error closing loop for {self.subscriber_id}/{self.callback_id}: {e}'
+            )
+
+
+class SubscriberDispatcher:
+    """The workers shared by the callbacks of all event streams, and the statistics
+    of the calls made to them."""
+
+    def __init__(self, max_workers: int = EVENT_STREAM_DISPATCH_WORKERS):
+        self._worker = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='event_dispatch',
+            initializer=self._init_worker,
+        )
+        self._queues: weakref.WeakSet[CallbackQueue] = weakref.WeakSet()
+        self._stats: dict[str, CallbackStats] = {}
+        self._lock = threading.Lock()
+
+    def create_queue(
+        self,
+        subscriber_id: str,
+        callback_id: str,
+        callback: Callable[[Event], None],
+        blocking: bool = False,
+    ) -> CallbackQueue:
+        """Create the queue of a callback. A blocking callback is called on a thread of
+        its own rather than on the shared workers."""
+        callback_queue = CallbackQueue(
+            self, subscriber_id, callback_id, callback, blocking
+        )
+        with self._lock:
+            self._queues.add(callback_queue)
+        return callback_queue
+
+    def is_worker_thread(self) -> bool:
+        return getattr(self._worker, 'is_worker', False)
+
+    def call_before_loop_closes(
+        self, coroutine_function: Callable[[], Awaitable[None]]
+    ) -> bool:
+        """Run a coroutine function on the event loop of the callback running on this
+        thread before the loop is closed, e.g. to close the connections the callback
+        opened on it.
+
+        Returns:
+            False if no callback is running on this thread.
+        """
+        callback_queue: CallbackQueue | None = getattr(
+            self._worker, 'callback_queue', None
+        )
+        if callback_queue is None:
+            return False
+        with callback_queue._condition:
+            callback_queue._before_loop_closes.append(coroutine_function)
+        return True
+
+    def queue_depth(self) -> int:
+        """The number of events waiting for callbacks."""
+        with self._lock:
+            callback_queues = list(self._queues)
+        return sum(len(callback_queue) for callback_queue in callback_queues)
+
+    def get_stats(self) -> dict[str, CallbackStats]:
+        """The statistics of the calls made to the callbacks, by subscriber."""
+        with self._lock:
+            return {
+                subscriber_id: replace(stats)
+                for subscriber_id, stats in self._stats.items()
+            }
+
+    def _init_worker(self) -> None:
+        self._worker.is_worker = True
+
+    def _submit(self, callback_queue: CallbackQueue) -> None:
+        if callback_queue.blocking:
+            threading.Thread(
+                target=self._run_blocking,
+                args=(callback_queue,),
+                name=f'event_dispatch_{callback_queue.subscriber_id}',
+                daemon=True,
+            ).start()
+        else:
+            self._executor.submit(callback_queue._run)
+
+    def _run_blocking(self, callback_queue: CallbackQueue) -> None:
+        self._init_worker()
+        callback_queue._run()
+
+    def _record(
+        self, subscriber_id: str, wait_time: float, run_time: float, error: bool
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get(subscriber_id)
+            if stats is None:
+                stats = self._stats[subscriber_id] = CallbackStats()
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.total_wait_time += wait_time
+            stats.max_wait_time = max(stats.max_wait_time, wait_time)
+            stats.total_run_time += run_time
+            stats.max_run_time = max(stats.max_run_time, run_time)
+
+
+_subscriber_dispatcher = SubscriberDispatcher()
+
+
+def get_subscriber_dispatcher() -> SubscriberDispatcher:
+    return _subscriber_dispatcher
@@ -25,6 +25,10 @@ from openhands.integrations.service_types import (
     ProviderType,
     RequestMethod,
 )
+from openhands.utils.http_session import (
+    GIT_PROVIDER_UPSTREAM,
+    get_shared_async_transport,
+)
 from openhands.utils.import_utils import get_impl
 
 
@@ -186,7 +190,9 @@ class AzureDevOpsService(
         method: RequestMethod = RequestMethod.GET,
     ) -> tuple[Any, dict]:
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(
+                transport=get_shared_async_transport(GIT_PROVIDER_UPSTREAM)
+            ) as client:
                 azure_devops_headers = await self._get_azure_devops_headers()
 
                 # Make initial request
@@ -15,7 +15,10 @@ from openhands.integrations.service_types import (
     ResourceNotFoundError,
     User,
 )
-from openhands.utils.http_session import httpx_verify_option
+from openhands.utils.http_session import (
+    GIT_PROVIDER_UPSTREAM,
+    get_shared_async_transport,
+)
 
 
 class BitBucketMixinBase(BaseGitService, HTTPClient):
@@ -97,7 +100,9 @@ class BitBucketMixinBase(BaseGitService, HTTPClient):
 
         """
         try:
-            async with httpx.AsyncClient(verify=httpx_verify_option()) as client:
+            async with httpx.AsyncClient(
+                transport=get_shared_async_transport(GIT_PROVIDER_UPSTREAM)
+            ) as client:
                 bitbucket_headers = await self._get_headers()
                 response = await self.execute_request(
                     client, url, bitbucket_headers, params, method
@@ -18,7 +18,10 @@ from openhands.integrations.service_types import (
     UnknownException,
     User,
 )
-from openhands.utils.http_session import httpx_verify_option
+from openhands.utils.http_session import (
+    GIT_PROVIDER_UPSTREAM,
+    get_shared_async_transport,
+)
 
 
 class ForgejoMixinBase(BaseGitService, HTTPClient):
@@ -86,7 +89,9 @@ class ForgejoMixinBase(BaseGitService, HTTPClient):
         method: RequestMethod = RequestMethod.GET,
     ) -> tuple[Any, dict]:
         try:
-            async with httpx.AsyncClient(verify=httpx_verify_option()) as client:
+            async with httpx.AsyncClient(
+                transport=get_shared_async_transport(GIT_PROVIDER_UPSTREAM)
+            ) as client:
                 headers = await self._get_headers()
                 response = await self.execute_request(
                     client=client,
@@ -6,13 +6,21 @@ from pydantic import SecretStr
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.integrations.protocols.http_client import HTTPClient
+from openhands.integrations.response_cache import (
+    CachedResponse,
+    ResponseCacheKey,
+    get_response_cache,
+)
 from openhands.integrations.service_types import (
     BaseGitService,
     RequestMethod,
     UnknownException,
     User,
 )
-from openhands.utils.http_session import httpx_verify_option
+from openhands.utils.http_session import (
+    GIT_PROVIDER_UPSTREAM,
+    get_shared_async_transport,
+)
 
 
 class GitHubMixinBase(BaseGitService, HTTPClient):
@@ -56,10 +64,56 @@ class GitHubMixinBase(BaseGitService, HTTPClient):
         url: str,
         params: dict | None = None,
         method: RequestMethod = RequestMethod.GET,
+        max_age: float | None = None,
     ) -> tuple[Any, dict]:  # type: ignore[override]
+        """Make a request to the GitHub API.
+
+        Args:
+            url: The URL to request
+            params: Optional parameters for the request
+            method: The HTTP method to use
+            max_age: Cache the GET response for the token if it has an ETag. Cached
+                responses younger than this many seconds are served without making a
+                request, and older ones are served while being revalidated in the
+                background for a further GIT_RESPONSE_CACHE_STALE_WHILE_REVALIDATE
+                seconds. After that (Or always, if max_age is 0), they are revalidated
+                with If-None-Match - a 304 Not Modified does not count against the
+                rate limit. Only listings which are fetched repeatedly should be
+                cached.
+        """
+        if method != RequestMethod.GET or max_age is None:
+            return await self._send_request(url, params, method)
+
+        cache = get_response_cache()
+        github_headers = await self._get_headers()
+        key = cache.key(github_headers['Authorization'], url, params)
+        cached = cache.get(key)
+        if cached and max_age:
+            age = cached.age()
+            if age < max_age:
+                return cached.json(), dict(cached.headers)
+            if age < max_age + cache.stale_while_revalidate:
+                cache.refresh_in_background(
+                    key, lambda: self._send_request(url, params, method, key, cached)
+                )
+                return cached.json(), dict(cached.headers)
+        return await self._send_request(url, params, method, key, cached)
+
+    async def _send_request(
+        self,
+        url: str,
+        params: dict | None,
+        method: RequestMethod,
+        cache_key: ResponseCacheKey | None = None,
+        cached: CachedResponse | None = None,
+    ) -> tuple[Any, dict]:
         try:
-            async with httpx.AsyncClient(verify=httpx_verify_option()) as client:
+            async with httpx.AsyncClient(
+                transport=get_shared_async_transport(GIT_PROVIDER_UPSTREAM)
+            ) as client:
                 github_headers = await self._get_headers()
+                if cached:
+                    github_headers['If-None-Match'] = cached.etag
 
                 # Make initial request
                 response = await self.execute_request(
@@ -74,6 +128,12 @@ class GitHubMixinBase(BaseGitService, HTTPClient):
                 if self.refresh and self._has_token_expired(response.status_code):
                     await self.get_latest_token()
                     github_headers = await self._get_headers()
+                    if cache_key:
+                        # The response is cached for the token it was fetched with
+                        cache_key = get_response_cache().key(
+                            github_headers['Authorization'], url, params
+                        )
+                        cached = None
                     response = await self.execute_request(
                         client=client,
                         url=url,
@@ -82,11 +142,25 @@ class GitHubMixinBase(BaseGitService, HTTPClient):
                         method=method,
                     )
 
+                if cache_key and cached and response.status_code == 304:
+                    get_response_cache().touch(cache_key)
+                    return cached.json(), dict(cached.headers)
+
                 response.raise_for_status()
                 headers: dict = {}
                 if 'Link' in response.headers:
                     headers['Link'] = response.headers['Link']
 
+                if cache_key and 'ETag' in response.headers:
+                    get_response_cache().put(
+                        cache_key,
+                        CachedResponse(
+                            etag=response.headers['ETag'],
+                            content=response.content,
+                            headers=headers,
+                        ),
+                    )
+
                 return response.json(), headers
 
         except httpx.HTTPStatusError as e:
@@ -98,7 +172,9 @@ class GitHubMixinBase(BaseGitService, HTTPClient):
         self, query: str, variables: dict[str, Any]
     ) -> dict[str, Any]:
         try:
-            async with httpx.AsyncClient(verify=httpx_verify_option()) as client:
+            async with httpx.AsyncClient(
+                transport=get_shared_async_transport(GIT_PROVIDER_UPSTREAM)
+            ) as client:
                 github_headers = await self._get_headers()
 
                 response = await client.post(
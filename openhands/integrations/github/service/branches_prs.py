@@ -3,6 +3,7 @@ from openhands.integrations.github.queries import (
     search_branches_graphql_query,
 )
 from openhands.integrations.github.service.base import GitHubMixinBase
+from openhands.integrations.response_cache import GIT_RESPONSE_CACHE_MAX_AGE
 from openhands.integrations.service_types import Branch, PaginatedBranchesResponse
 
 
@@ -25,7 +26,9 @@ class GitHubBranchesMixin(GitHubMixinBase):
         # Fetch up to 10 pages of branches
         while len(all_branches) < MAX_BRANCHES:
             params = {'per_page': str(PER_PAGE), 'page': str(page)}
-            response, headers = await self._make_request(url, params)
+            response, headers = await self._make_request(
+                url, params, max_age=GIT_RESPONSE_CACHE_MAX_AGE
+            )
 
             if not response:  # No more branches
                 break
@@ -64,7 +67,9 @@ class GitHubBranchesMixin(GitHubMixinBase):
         url = f'{self.BASE_URL}/repos/{repository}/branches'
 
         params = {'per_page': str(per_page), 'page': str(page)}
-        response, headers = await self._make_request(url, params)
+        response, headers = await self._make_request(
+            url, params, max_age=GIT_RESPONSE_CACHE_MAX_AGE
+        )
 
         branches: list[Branch] = []
         for branch_data in response:
@@ -1,59 +1,194 @@
+import asyncio
+import math
+import re
 from datetime import datetime
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.integrations.github.service.base import GitHubMixinBase
+from openhands.integrations.response_cache import GIT_RESPONSE_CACHE_MAX_AGE
 from openhands.integrations.service_types import OwnerType, ProviderType, Repository
 from openhands.server.types import AppMode
 
+_LAST_PAGE_PATTERN = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+def _get_min_repos(repos: list[dict], link_header: str) -> int:
+    """The fewest repositories there can be, given the first page of a listing."""
+    if 'rel="next"' not in link_header:
+        return len(repos)
+    last_page_match = _LAST_PAGE_PATTERN.search(link_header)
+    if last_page_match is None:
+        return len(repos) + 1
+    # Every page but the last is full, and the last has at least one repository
+    return (int(last_page_match.group(1)) - 1) * len(repos) + 1
+
 
 class GitHubReposMixin(GitHubMixinBase):
     """
     Methods for interacting with GitHub repositories (from both personal and app installations)
     """
 
+    # Maximum number of requests issued concurrently when listing repositories
+    MAX_CONCURRENT_REQUESTS = 8
+
     async def get_installations(self) -> list[str]:
         url = f'{self.BASE_URL}/user/installations'
-        response, _ = await self._make_request(url)
+        response, _ = await self._make_request(url, max_age=GIT_RESPONSE_CACHE_MAX_AGE)
         installations = response.get('installations', [])
         return [str(i['id']) for i in installations]
 
     async def _fetch_paginated_repos(
-        self, url: str, params: dict, max_repos: int, extract_key: str | None = None
+        self,
+        url: str,
+        params: dict,
+        max_repos: int,
+        extract_key: str | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+        first_page: tuple[list[dict], str] | None = None,
     ) -> list[dict]:
         """Fetch repositories with pagination support.
 
+        The first page is fetched on its own. If its Link header includes the last
+        page, the remaining pages are then fetched concurrently.
+
         Args:
             url: The API endpoint URL
             params: Query parameters for the request
             max_repos: Maximum number of repositories to fetch
             extract_key: If provided, extract repositories from this key in the response
+            semaphore: Limits the number of concurrent requests (Shared between calls)
+            first_page: The repositories and Link header of the first page, if it
+                was already fetched
 
         Returns:
             List of repository dictionaries
         """
-        repos: list[dict] = []
-        page = 1
+        if max_repos <= 0:
+            return []
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def fetch_page(page: int) -> tuple[list[dict], str]:
+            return await self._fetch_repos_page(
+                url, params, page, extract_key, semaphore
+            )
+
+        repos, link_header = first_page or await fetch_page(1)
+        repos = list(repos)
+        if not repos or 'rel="next"' not in link_header:
+            return repos[:max_repos]
+
+        last_page_match = _LAST_PAGE_PATTERN.search(link_header)
+        if last_page_match:
+            # Fetch the rest of the pages we need concurrently
+            pages_needed = math.ceil(max_repos / len(repos))
+            last_page = min(int(last_page_match.group(1)), pages_needed)
+            pages = await asyncio.gather(
+                *(fetch_page(page) for page in range(2, last_page + 1))
+            )
+            for page_repos, _ in pages:
+                if not page_repos:  # No more repositories
+                    break
+                repos.extend(page_repos)
+            return repos[:max_repos]
 
+        # No last page to go on, so follow the next links one at a time
+        page = 2
         while len(repos) < max_repos:
-            page_params = {**params, 'page': str(page)}
-            response, headers = await self._make_request(url, page_params)
-
-            # Extract repositories from response
-            page_repos = response.get(extract_key, []) if extract_key else response
-
+            page_repos, link_header = await fetch_page(page)
             if not page_repos:  # No more repositories
                 break
-
             repos.extend(page_repos)
             page += 1
 
             # Check if we've reached the last page
-            link_header = headers.get('Link', '')
             if 'rel="next"' not in link_header:
                 break
 
         return repos[:max_repos]  # Trim to max_repos if needed
 
+    async def _fetch_repos_page(
+        self,
+        url: str,
+        params: dict,
+        page: int,
+        extract_key: str | None,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[list[dict], str]:
+        """Fetch a page of repositories. Returns the repositories and Link header."""
+        page_params = {**params, 'page': str(page)}
+        async with semaphore:
+            response, headers = await self._make_request(
+                url, page_params, max_age=GIT_RESPONSE_CACHE_MAX_AGE
+            )
+        # Extract repositories from response
+        page_repos = response.get(extract_key, []) if extract_key else response
+        return page_repos, headers.get('Link', '')
+
+    async def _fetch_installation_repos(
+        self, installation_ids: list[str], params: dict, max_repos: int
+    ) -> list[dict]:
+        """Fetch the repositories of installations, in installation order, keeping at
+        most max_repos.
+
+        The first pages of the installations are fetched concurrently, a batch at a
+        time. The Link header of a first page gives the number of pages of its
+        installation, and so a lower bound on its number of repositories. No more
+        pages are fetched once the installations before them are known to have
+        max_repos repositories, so users with many large installations do not spend
+        their rate limit on pages which would be dropped.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        def get_url(installation_id: str) -> str:
+            return f'{self.BASE_URL}/user/installations/{installation_id}/repositories'
+
+        # The first page of each installation needed, and the minimum number of
+        # repositories before it
+        first_pages: list[tuple[str, tuple[list[dict], str], int]] = []
+        min_repos = 0
+        remaining_ids = list(installation_ids)
+        while remaining_ids and min_repos < max_repos:
+            batch_ids = remaining_ids[: self.MAX_CONCURRENT_REQUESTS]
+            del remaining_ids[: len(batch_ids)]
+            batch_pages = await asyncio.gather(
+                *(
+                    self._fetch_repos_page(
+                        get_url(installation_id),
+                        params,
+                        1,
+                        'repositories',
+                        semaphore,
+                    )
+                    for installation_id in batch_ids
+                )
+            )
+            for installation_id, first_page in zip(batch_ids, batch_pages):
+                if min_repos >= max_repos:
+                    break
+                first_pages.append((installation_id, first_page, min_repos))
+                min_repos += _get_min_repos(*first_page)
+
+        installation_repos = await asyncio.gather(
+            *(
+                self._fetch_paginated_repos(
+                    get_url(installation_id),
+                    params,
+                    max_repos - repos_before,
+                    extract_key='repositories',
+                    semaphore=semaphore,
+                    first_page=first_page,
+                )
+                for installation_id, first_page, repos_before in first_pages
+            )
+        )
+
+        # Combine in installation order, keeping at most max_repos
+        all_repos: list[dict] = []
+        for repos in installation_repos:
+            all_repos.extend(repos[: max_repos - len(all_repos)])
+        return all_repos
+
     def parse_pushed_at_date(self, repo):
         ts = repo.get('pushed_at')
         return datetime.strptime(ts, '%Y-%m-%dT%H:%M:%SZ') if ts else datetime.min
@@ -96,12 +231,16 @@ class GitHubReposMixin(GitHubMixinBase):
         params = {'page': str(page), 'per_page': str(per_page)}
         if installation_id:
             url = f'{self.BASE_URL}/user/installations/{installation_id}/repositories'
-            response, headers = await self._make_request(url, params)
+            response, headers = await self._make_request(
+                url, params, max_age=GIT_RESPONSE_CACHE_MAX_AGE
+            )
             response = response.get('repositories', [])
         else:
             url = f'{self.BASE_URL}/user/repos'
             params['sort'] = sort
-            response, headers = await self._make_request(url, params)
+            response, headers = await self._make_request(
+                url, params, max_age=GIT_RESPONSE_CACHE_MAX_AGE
+            )
 
         next_link: str = headers.get('Link', '')
         return [
@@ -116,26 +255,11 @@ class GitHubReposMixin(GitHubMixinBase):
         all_repos: list[dict] = []
 
         if app_mode == AppMode.SAAS:
-            # Get all installation IDs and fetch repos for each one
+            # Get all installation IDs and fetch repos for each one concurrently
             installation_ids = await self.get_installations()
-
-            # Iterate through each installation ID
-            for installation_id in installation_ids:
-                params = {'per_page': str(PER_PAGE)}
-                url = (
-                    f'{self.BASE_URL}/user/installations/{installation_id}/repositories'
-                )
-
-                # Fetch repositories for this installation
-                installation_repos = await self._fetch_paginated_repos(
-                    url, params, MAX_REPOS - len(all_repos), extract_key='repositories'
-                )
-
-                all_repos.extend(installation_repos)
-
-                # If we've already reached MAX_REPOS, no need to check other installations
-                if len(all_repos) >= MAX_REPOS:
-                    break
+            all_repos = await self._fetch_installation_repos(
+                installation_ids, {'per_page': str(PER_PAGE)}, MAX_REPOS
+            )
 
             if sort == 'pushed':
                 all_repos.sort(key=self.parse_pushed_at_date, reverse=True)
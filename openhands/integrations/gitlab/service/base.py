@@ -10,7 +10,10 @@ from openhands.integrations.service_types import (
     UnknownException,
     User,
 )
-from openhands.utils.http_session import httpx_verify_option
+from openhands.utils.http_session import (
+    GIT_PROVIDER_UPSTREAM,
+    get_shared_async_transport,
+)
 
 
 class GitLabMixinBase(BaseGitService, HTTPClient):
@@ -42,7 +45,9 @@ class GitLabMixinBase(BaseGitService, HTTPClient):
         method: RequestMethod = RequestMethod.GET,
     ) -> tuple[Any, dict]:  # type: ignore[override]
         try:
-            async with httpx.AsyncClient(verify=httpx_verify_option()) as client:
+            async with httpx.AsyncClient(
+                transport=get_shared_async_transport(GIT_PROVIDER_UPSTREAM)
+            ) as client:
                 gitlab_headers = await self._get_headers()
 
                 # Make initial request
@@ -100,7 +105,9 @@ class GitLabMixinBase(BaseGitService, HTTPClient):
         if variables is None:
             variables = {}
         try:
-            async with httpx.AsyncClient(verify=httpx_verify_option()) as client:
+            async with httpx.AsyncClient(
+                transport=get_shared_async_transport(GIT_PROVIDER_UPSTREAM)
+            ) as client:
                 gitlab_headers = await self._get_headers()
                 # Add content type header for GraphQL
                 gitlab_headers['Content-Type'] = 'application/json'
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from collections.abc import Mapping
 from types import MappingProxyType
-from typing import Any, Coroutine, Literal, cast, overload
+from typing import Any, Awaitable, Callable, Coroutine, Literal, TypeVar, cast, overload
 from urllib.parse import quote
 
 import httpx
@@ -103,6 +104,11 @@ class CustomSecret(BaseModel):
 PROVIDER_TOKEN_TYPE = Mapping[ProviderType, ProviderToken]
 CUSTOM_SECRETS_TYPE = Mapping[str, CustomSecret]
 
+# Maximum time to wait for a single provider when querying all of them at once
+PROVIDER_TIMEOUT = float(os.getenv('PROVIDER_TIMEOUT', '60'))
+
+T = TypeVar('T')
+
 
 class ProviderHandler:
     # Class variable for provider domains
@@ -122,6 +128,7 @@ class ProviderHandler:
         external_token_manager: bool = False,
         session_api_key: str | None = None,
         sid: str | None = None,
+        provider_timeout: float = PROVIDER_TIMEOUT,
     ):
         if not isinstance(provider_tokens, MappingProxyType):
             raise TypeError(
@@ -142,6 +149,7 @@ class ProviderHandler:
         self.external_token_manager = external_token_manager
         self.session_api_key = session_api_key
         self.sid = sid
+        self.provider_timeout = provider_timeout
         self._provider_tokens = provider_tokens
         WEB_HOST = os.getenv('WEB_HOST', '').strip()
         self.REFRESH_TOKEN_URL = (
@@ -297,30 +305,36 @@ class ProviderHandler:
                 page, per_page, sort, installation_id
             )
 
+        results = await self._call_providers(
+            lambda provider, service: service.get_all_repositories(sort, app_mode)
+        )
         all_repos: list[Repository] = []
-        for provider in self.provider_tokens:
-            try:
-                service = self.get_service(provider)
-                service_repos = await service.get_all_repositories(sort, app_mode)
-                all_repos.extend(service_repos)
-            except ProviderTimeoutError:
-                # Propagate timeout errors so callers can handle them appropriately
-                raise
-            except Exception as e:
-                logger.warning(f'Error fetching repos from {provider}: {e}')
+        timeouts: list[ProviderTimeoutError] = []
+        for provider, result in results.items():
+            if isinstance(result, ProviderTimeoutError):
+                timeouts.append(result)
+            if isinstance(result, BaseException):
+                logger.warning(f'Error fetching repos from {provider}: {result}')
+            else:
+                all_repos.extend(result)
 
+        # A provider which times out is skipped so the others still return their
+        # repos - timeouts are only propagated when every provider failed.
+        if timeouts and all(isinstance(r, BaseException) for r in results.values()):
+            raise timeouts[0]
         return all_repos
 
     async def get_suggested_tasks(self) -> list[SuggestedTask]:
         """Get suggested tasks from providers"""
+        results = await self._call_providers(
+            lambda provider, service: service.get_suggested_tasks()
+        )
         tasks: list[SuggestedTask] = []
-        for provider in self.provider_tokens:
-            try:
-                service = self.get_service(provider)
-                service_repos = await service.get_suggested_tasks()
-                tasks.extend(service_repos)
-            except Exception as e:
-                logger.warning(f'Error fetching repos from {provider}: {e}')
+        for provider, result in results.items():
+            if isinstance(result, BaseException):
+                logger.warning(f'Error fetching repos from {provider}: {result}')
+            else:
+                tasks.extend(result)
 
         return tasks
 
@@ -368,20 +382,58 @@ class ProviderHandler:
             )
             return self._deduplicate_repositories(user_repos)
 
+        results = await self._call_providers(
+            lambda provider, service: service.search_repositories(
+                query,
+                per_page,
+                sort,
+                order,
+                self._is_repository_url(query, provider),
+                app_mode,
+            )
+        )
         all_repos: list[Repository] = []
-        for provider in self.provider_tokens:
+        for provider, result in results.items():
+            if isinstance(result, BaseException):
+                logger.warning(f'Error searching repos from {provider}: {result}')
+            else:
+                all_repos.extend(result)
+
+        return all_repos
+
+    async def _call_providers(
+        self,
+        call: Callable[[ProviderType, GitService], Awaitable[list[T]]],
+    ) -> dict[ProviderType, list[T] | BaseException]:
+        """Invoke call for each provider concurrently, so the total latency is that of
+        the slowest provider rather than the sum of all of them.
+
+        Results are returned in provider order. A provider which raises, or does not
+        respond within provider_timeout, has its exception returned in place of a
+        result, so results from the remaining providers are not lost.
+        """
+
+        async def call_provider(provider: ProviderType) -> list[T]:
+            service = self.get_service(provider)
             try:
-                service = self.get_service(provider)
-                public = self._is_repository_url(query, provider)
-                service_repos = await service.search_repositories(
-                    query, per_page, sort, order, public, app_mode
+                return await asyncio.wait_for(
+                    call(provider, service), self.provider_timeout
+                )
+            except asyncio.TimeoutError:
+                raise ProviderTimeoutError(
+                    f'{provider.value} did not respond within {self.provider_timeout}s'
                 )
-                all_repos.extend(service_repos)
-            except Exception as e:
-                logger.warning(f'Error searching repos from {provider}: {e}')
-                continue
 
-        return all_repos
+        providers = list(self.provider_tokens)
+        results = await asyncio.gather(
+            *(call_provider(provider) for provider in providers),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                # Do not swallow cancellation
+                raise result
+        return dict(zip(providers, results))
 
     def _is_repository_url(self, query: str, provider: ProviderType) -> bool:
         """Check if the query is a repository URL."""
@@ -0,0 +1,144 @@
+"""Cache of git provider API responses, revalidated with conditional requests.
+
+Listing the repositories (Or branches) of a user may take dozens of requests, and is
+repeated every time the repository selector is opened. Responses are cached per set
+of credentials along with their ETag:
+
+* Responses younger than max_age are served without making a request.
+* Older responses are still served immediately for a while, but revalidated in the
+  background so the next read is fresh.
+* Otherwise the request is made with If-None-Match, and a 304 Not Modified response
+  (Which does not count against the GitHub rate limit) reuses the cached body.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from openhands.core.logger import openhands_logger as logger
+
+# How long a cached listing is served without revalidation
+GIT_RESPONSE_CACHE_MAX_AGE = float(os.getenv('GIT_RESPONSE_CACHE_MAX_AGE', '30'))
+# How long after max_age a cached listing is served while revalidating in the background
+GIT_RESPONSE_CACHE_STALE_WHILE_REVALIDATE = float(
+    os.getenv('GIT_RESPONSE_CACHE_STALE_WHILE_REVALIDATE', '300')
+)
+GIT_RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv('GIT_RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024))
+)
+
+ResponseCacheKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    content: bytes
+    headers: dict[str, str]
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """LRU cache of responses, bounded by the total size of the response bodies."""
+
+    def __init__(
+        self,
+        max_bytes: int = GIT_RESPONSE_CACHE_MAX_BYTES,
+        stale_while_revalidate: float = GIT_RESPONSE_CACHE_STALE_WHILE_REVALIDATE,
+    ):
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self._entries: OrderedDict[ResponseCacheKey, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._refresh_tasks: dict[ResponseCacheKey, asyncio.Task] = {}
+
+    @staticmethod
+    def key(credentials: str, url: str, params: dict | None) -> ResponseCacheKey:
+        """Build the key for a request. Credentials are hashed rather than stored."""
+        credentials_hash = hashlib.sha256(credentials.encode()).hexdigest()
+        sorted_params = tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+        return (credentials_hash, url, sorted_params)
+
+    def get(self, key: ResponseCacheKey) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: ResponseCacheKey, entry: CachedResponse) -> None:
+        size = len(entry.content)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.content)
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.content)
+
+    def touch(self, key: ResponseCacheKey) -> None:
+        """Mark a cached response as fresh (Following a 304 Not Modified)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.fetched_at = time.monotonic()
+
+    def invalidate(self, key: ResponseCacheKey) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= len(entry.content)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def refresh_in_background(
+        self, key: ResponseCacheKey, refresh: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Run refresh in the background, unless a refresh of the key is running."""
+        task = self._refresh_tasks.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def run_refresh():
+            try:
+                await refresh()
+            except Exception as e:
+                # The stale entry expires on its own and is then fetched in the
+                # foreground, so the error reaches the caller.
+                logger.debug(f'Error refreshing cached response: {e}')
+            finally:
+                self._refresh_tasks.pop(key, None)
+
+        self._refresh_tasks[key] = asyncio.create_task(run_refresh())
+
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    return _response_cache
@@ -9,7 +9,7 @@ from fastmcp.client.transports import (
 )
 from mcp import McpError
 from mcp.types import CallToolResult
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from openhands.core.config.mcp_config import (
     MCPSHTTPServerConfig,
@@ -31,6 +31,8 @@ class MCPClient(BaseModel):
     tools: list[MCPClientTool] = Field(default_factory=list)
     tool_map: dict[str, MCPClientTool] = Field(default_factory=dict)
     server_timeout: Optional[float] = None  # Timeout from server config for tool calls
+    # Whether a session is kept open for the tool calls
+    _session_open: bool = PrivateAttr(default=False)
 
     async def _initialize_and_list_tools(self) -> None:
         """Initialize session and populate tool map."""
@@ -145,6 +147,32 @@ class MCPClient(BaseModel):
             )
             raise
 
+    async def open_session(self) -> None:
+        """Keep a session with the server open for the tool calls, instead of
+        connecting for each of them. Reconnects if the session was lost. The session
+        runs on the current event loop, so the client must only be used on it."""
+        if not self.client:
+            raise RuntimeError('Session not initialized.')
+        if self._session_open:
+            if self.client.is_connected():
+                return
+            logger.info('MCP session was lost, reconnecting')
+            await self.close_session()
+            # Start over with a client with fresh session state
+            self.client = self.client.new()
+        await self.client.__aenter__()
+        self._session_open = True
+
+    async def close_session(self) -> None:
+        """Close the session opened by open_session, if any."""
+        if not self._session_open or not self.client:
+            return
+        self._session_open = False
+        try:
+            await self.client.close()
+        except Exception as e:
+            logger.debug(f'Error closing MCP session: {e}')
+
     async def call_tool(self, tool_name: str, args: dict) -> CallToolResult:
         """Call a tool on the MCP server with timeout from server configuration.
 
@@ -165,7 +193,10 @@ class MCPClient(BaseModel):
         # The MCPClientTool is primarily for metadata; use the session to call the actual tool.
         if not self.client:
             raise RuntimeError('Client session is not available.')
+        if self._session_open:
+            await self.open_session()
 
+        # Reuses the open session, if there is one
         async with self.client:
             # Use server timeout if configured
             if self.server_timeout is not None:
@@ -0,0 +1,183 @@
+"""Connected MCP clients which are reused by the tool calls of conversations.
+
+Without the pool, each tool call connects to every MCP server of the conversation,
+lists their tools, and then connects again to call the tool. The pool keeps the
+clients, and a session with each server, open between calls.
+
+MCP sessions run on the event loop they were opened on, so the clients are pooled by
+event loop as well as by server and conversation, and are only ever closed on their
+loop: a conversation closed from another thread has its sessions closed the next time
+the loop gets clients, or before the loop is closed if it is the loop of an event
+stream callback (Where the runtime calls the tools).
+"""
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass, field
+
+from openhands.core.config.mcp_config import (
+    MCPSHTTPServerConfig,
+    MCPSSEServerConfig,
+    MCPStdioServerConfig,
+)
+from openhands.core.logger import openhands_logger as logger
+from openhands.events.subscriber_dispatcher import get_subscriber_dispatcher
+from openhands.mcp.client import MCPClient
+from openhands.mcp.utils import (
+    MCP_CONNECT_TIMEOUT,
+    _connect_mcp_client,
+    index_mcp_tools,
+)
+from openhands.utils._redact_compat import redact_text_secrets
+
+_ServerConfig = MCPSSEServerConfig | MCPSHTTPServerConfig | MCPStdioServerConfig
+# The type of server, its configuration and the conversation ID
+_ClientKey = tuple[str, str, str | None]
+
+
+@dataclass
+class _LoopClients:
+    """The clients whose sessions run on an event loop."""
+
+    clients: dict[_ClientKey, MCPClient] = field(default_factory=dict)
+    # The tool index for each list of clients returned
+    tool_indexes: dict[tuple[_ClientKey, ...], dict[str, MCPClient]] = field(
+        default_factory=dict
+    )
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Clients of closed conversations, to be closed on the loop
+    closing: list[MCPClient] = field(default_factory=list)
+
+
+class MCPClientPool:
+    def __init__(self):
+        self._loops: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _LoopClients
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    async def get_clients(
+        self,
+        sse_servers: list[MCPSSEServerConfig],
+        shttp_servers: list[MCPSHTTPServerConfig],
+        conversation_id: str | None = None,
+        stdio_servers: list[MCPStdioServerConfig] | None = None,
+    ) -> tuple[list[MCPClient], dict[str, MCPClient]]:
+        """Get connected clients for the servers, connecting to the servers which are
+        not connected yet concurrently. Servers which can not be connected to are left
+        out, and retried by the next call.
+
+        Returns:
+            The clients, and the clients by tool name (As from index_mcp_tools).
+        """
+        servers: list[_ServerConfig] = [
+            *sse_servers,
+            *shttp_servers,
+            *(stdio_servers or []),
+        ]
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_clients = self._loops.get(loop)
+            is_new_loop = loop_clients is None
+            if loop_clients is None:
+                loop_clients = self._loops[loop] = _LoopClients()
+            closing = loop_clients.closing
+            loop_clients.closing = []
+        if is_new_loop:
+            get_subscriber_dispatcher().call_before_loop_closes(
+                lambda: self._close_loop_clients(loop)
+            )
+        await _close_clients(closing)
+
+        keys = [_get_client_key(server, conversation_id) for server in servers]
+        async with loop_clients.lock:
+            missing = {
+                key: server
+                for key, server in zip(keys, servers)
+                if key not in loop_clients.clients
+            }
+            if missing:
+                results = await asyncio.gather(
+                    *(
+                        self._connect(server, conversation_id)
+                        for server in missing.values()
+                    )
+                )
+                for key, client in zip(missing, results):
+                    if client is not None:
+                        loop_clients.clients[key] = client
+                loop_clients.tool_indexes.clear()
+
+            connected_keys = tuple(key for key in keys if key in loop_clients.clients)
+            clients = [loop_clients.clients[key] for key in connected_keys]
+            tool_index = loop_clients.tool_indexes.get(connected_keys)
+            if tool_index is None:
+                tool_index = loop_clients.tool_indexes[connected_keys] = (
+                    index_mcp_tools(clients)
+                )
+        return clients, tool_index
+
+    def close(self, conversation_id: str | None) -> None:
+        """Close the sessions of the clients of a conversation. Sessions on the loop
+        running on this thread are closed in the background, and others on their loop
+        later."""
+        try:
+            running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        to_close: list[MCPClient] = []
+        with self._lock:
+            for loop, loop_clients in list(self._loops.items()):
+                for key in list(loop_clients.clients):
+                    if key[2] != conversation_id:
+                        continue
+                    client = loop_clients.clients.pop(key)
+                    loop_clients.tool_indexes.clear()
+                    if loop is running_loop:
+                        to_close.append(client)
+                    else:
+                        loop_clients.closing.append(client)
+        if to_close and running_loop is not None:
+            running_loop.create_task(_close_clients(to_close))
+
+    async def _close_loop_clients(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Close the sessions of all the clients on a loop which is being closed."""
+        with self._lock:
+            loop_clients = self._loops.pop(loop, None)
+        if loop_clients is not None:
+            await _close_clients(
+                [*loop_clients.clients.values(), *loop_clients.closing]
+            )
+
+    async def _connect(
+        self, server: _ServerConfig, conversation_id: str | None
+    ) -> MCPClient | None:
+        client = await _connect_mcp_client(server, conversation_id)
+        if client is None:
+            return None
+        try:
+            await asyncio.wait_for(client.open_session(), timeout=MCP_CONNECT_TIMEOUT)
+        except Exception as e:
+            logger.error(
+                f'Failed to open MCP session with {redact_text_secrets(str(server))}: {e}'
+            )
+            await client.close_session()
+            return None
+        return client
+
+
+def _get_client_key(server: _ServerConfig, conversation_id: str | None) -> _ClientKey:
+    return (type(server).__name__, server.model_dump_json(), conversation_id)
+
+
+async def _close_clients(clients: list[MCPClient]) -> None:
+    results = await asyncio.gather(
+        *(client.close_session() for client in clients), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.debug(f'Error closing MCP session: {result}')
+
+
+mcp_client_pool = MCPClientPool()
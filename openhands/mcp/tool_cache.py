@@ -0,0 +1,85 @@
+"""The tools listed by MCP servers, cached for the agents of later conversations.
+
+Each agent is given the tools of its MCP servers when it starts, which takes a
+connection to each server. Most conversations of a user have the same servers, so the
+tools of each server are cached for MCP_TOOLS_CACHE_TTL seconds by its configuration
+(Which includes its URL or command, and its API key or environment). The MCP server
+of a runtime is listed every time, as its tools are those of the stdio servers added
+to it, and its URL and API key may be those of an earlier runtime.
+
+Tools listed for a conversation are only cached for that conversation, as the server
+is sent its ID (In the X-OpenHands-ServerConversation-ID header) and may list other
+tools for other conversations.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from openhands.core.config.mcp_config import (
+    MCPSHTTPServerConfig,
+    MCPSSEServerConfig,
+    MCPStdioServerConfig,
+)
+
+# Seconds for which the tools of an MCP server are cached. 0 disables the cache.
+MCP_TOOLS_CACHE_TTL = float(os.getenv('MCP_TOOLS_CACHE_TTL', '300'))
+_MAX_CACHED_SERVERS = 256
+
+_ServerConfig = MCPSSEServerConfig | MCPSHTTPServerConfig | MCPStdioServerConfig
+
+
+class MCPToolCache:
+    def __init__(self):
+        # The time each server's tools expire, and its tools, by server
+        self._tools: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, server: _ServerConfig, conversation_id: str | None = None
+    ) -> list[dict] | None:
+        """The cached tools of a server, or None if they are not cached."""
+        key = _get_server_key(server, conversation_id)
+        with self._lock:
+            entry = self._tools.get(key)
+            if entry is None:
+                return None
+            expires_at, tools = entry
+            if time.monotonic() >= expires_at:
+                del self._tools[key]
+                return None
+            self._tools.move_to_end(key)
+        # The agent owns the tools it is given
+        return copy.deepcopy(tools)
+
+    def put(
+        self,
+        server: _ServerConfig,
+        tools: list[dict],
+        conversation_id: str | None = None,
+    ) -> None:
+        if MCP_TOOLS_CACHE_TTL <= 0:
+            return
+        key = _get_server_key(server, conversation_id)
+        entry = (time.monotonic() + MCP_TOOLS_CACHE_TTL, copy.deepcopy(tools))
+        with self._lock:
+            self._tools[key] = entry
+            self._tools.move_to_end(key)
+            while len(self._tools) > _MAX_CACHED_SERVERS:
+                self._tools.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tools.clear()
+
+
+def _get_server_key(server: _ServerConfig, conversation_id: str | None) -> str:
+    key = f'{type(server).__name__}:{server.model_dump_json()}'
+    if conversation_id is not None:
+        key += f':{conversation_id}'
+    return key
+
+
+mcp_tool_cache = MCPToolCache()
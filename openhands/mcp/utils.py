@@ -1,7 +1,8 @@
 import asyncio
 import json
+import os
 import shutil
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Mapping
 
 if TYPE_CHECKING:
     from openhands.controller.agent import Agent
@@ -22,7 +23,11 @@ from openhands.events.observation.mcp import MCPObservation
 from openhands.events.observation.observation import Observation
 from openhands.mcp.client import MCPClient
 from openhands.mcp.error_collector import mcp_error_collector
+from openhands.mcp.tool_cache import mcp_tool_cache
 from openhands.runtime.base import Runtime
+from openhands.runtime.impl.action_execution.action_execution_client import (
+    ActionExecutionClient,
+)
 from openhands.runtime.impl.cli.cli_runtime import CLIRuntime
 from openhands.utils._redact_compat import (
     redact_text_secrets,
@@ -30,6 +35,10 @@ from openhands.utils._redact_compat import (
     sanitize_config,
 )
 
+# Seconds to wait for each MCP server to connect and list its tools. The servers are
+# connected to concurrently, so a slow server does not delay the others.
+MCP_CONNECT_TIMEOUT = float(os.getenv('MCP_CONNECT_TIMEOUT', '30'))
+
 
 def convert_mcp_clients_to_tools(mcp_clients: list[MCPClient] | None) -> list[dict]:
     """Converts a list of MCPClient instances to ChatCompletionToolParam format
@@ -93,89 +102,132 @@ async def create_mcp_clients(
     if not servers:
         return []
 
-    mcp_clients = []
+    results = await asyncio.gather(
+        *(_connect_mcp_client(server, conversation_id) for server in servers)
+    )
+    return [client for client in results if client is not None]
 
-    for server in servers:
-        if isinstance(server, MCPStdioServerConfig):
-            # Validate that the command exists before connecting
-            if not shutil.which(server.command):
-                logger.error(
-                    f'Skipping MCP stdio server "{server.name}": command "{server.command}" not found. '
-                    f'Please install {server.command} or remove this server from your configuration.'
-                )
-                continue
 
-            logger.info(
-                f'Initializing MCP agent for {redact_text_secrets(str(server))} with stdio connection...'
+async def _connect_mcp_client(
+    server: MCPSSEServerConfig | MCPSHTTPServerConfig | MCPStdioServerConfig,
+    conversation_id: str | None = None,
+) -> MCPClient | None:
+    """Connect to an MCP server and list its tools, or return None if that fails or
+    takes longer than MCP_CONNECT_TIMEOUT."""
+    if isinstance(server, MCPStdioServerConfig):
+        # Validate that the command exists before connecting
+        if not shutil.which(server.command):
+            logger.error(
+                f'Skipping MCP stdio server "{server.name}": command "{server.command}" not found. '
+                f'Please install {server.command} or remove this server from your configuration.'
             )
-            client = MCPClient()
-            try:
-                await client.connect_stdio(server)
-
-                # Log which tools this specific server provides
-                tool_names = [tool.name for tool in client.tools]
-                server_name = getattr(
-                    server, 'name', f'{server.command} {" ".join(server.args or [])}'
-                )
-                logger.debug(
-                    f'Successfully connected to MCP stdio server {server_name} - '
-                    f'provides {len(tool_names)} tools: {tool_names}'
-                )
-
-                mcp_clients.append(client)
-            except Exception as e:
-                # Error is already logged and collected in client.connect_stdio()
-                logger.error(
-                    f'Failed to connect to {redact_text_secrets(str(server))}: {str(e)}',
-                    exc_info=True,
-                )
-            continue
-
-        is_shttp = isinstance(server, MCPSHTTPServerConfig)
+            return None
 
-        connection_type = 'SHTTP' if is_shttp else 'SSE'
         logger.info(
-            f'Initializing MCP agent for {redact_text_secrets(str(server))} with {connection_type} connection...'
+            f'Initializing MCP agent for {redact_text_secrets(str(server))} with stdio connection...'
         )
         client = MCPClient()
-
-        # Set server timeout for SHTTP servers
-        if isinstance(server, MCPSHTTPServerConfig) and server.timeout is not None:
-            client.server_timeout = float(server.timeout)
-            logger.debug(f'Set SHTTP server timeout to {server.timeout}s')
-
         try:
-            await client.connect_http(server, conversation_id=conversation_id)
+            await asyncio.wait_for(
+                client.connect_stdio(server), timeout=MCP_CONNECT_TIMEOUT
+            )
 
             # Log which tools this specific server provides
             tool_names = [tool.name for tool in client.tools]
+            server_name = getattr(
+                server, 'name', f'{server.command} {" ".join(server.args or [])}'
+            )
             logger.debug(
-                f'Successfully connected to MCP STTP server {redact_url_params(server.url)} - '
+                f'Successfully connected to MCP stdio server {server_name} - '
                 f'provides {len(tool_names)} tools: {tool_names}'
             )
-
-            # Only add the client to the list after a successful connection
-            mcp_clients.append(client)
-
+            return client
+        except asyncio.TimeoutError:
+            _report_connect_timeout(server.name, 'stdio')
+            return None
         except Exception as e:
-            # Error is already logged and collected in client.connect_http()
+            # Error is already logged and collected in client.connect_stdio()
             logger.error(
                 f'Failed to connect to {redact_text_secrets(str(server))}: {str(e)}',
                 exc_info=True,
             )
+            return None
+
+    is_shttp = isinstance(server, MCPSHTTPServerConfig)
+
+    connection_type = 'SHTTP' if is_shttp else 'SSE'
+    logger.info(
+        f'Initializing MCP agent for {redact_text_secrets(str(server))} with {connection_type} connection...'
+    )
+    client = MCPClient()
+
+    # Set server timeout for SHTTP servers
+    if isinstance(server, MCPSHTTPServerConfig) and server.timeout is not None:
+        client.server_timeout = float(server.timeout)
+        logger.debug(f'Set SHTTP server timeout to {server.timeout}s')
 
-    return mcp_clients
+    try:
+        await asyncio.wait_for(
+            client.connect_http(server, conversation_id=conversation_id),
+            timeout=MCP_CONNECT_TIMEOUT,
+        )
+
+        # Log which tools this specific server provides
+        tool_names = [tool.name for tool in client.tools]
+        logger.debug(
+            f'Successfully connected to MCP STTP server {redact_url_params(server.url)} - '
+            f'provides {len(tool_names)} tools: {tool_names}'
+        )
+
+        # Only return the client after a successful connection
+        return client
+
+    except asyncio.TimeoutError:
+        _report_connect_timeout(
+            redact_url_params(server.url), 'shttp' if is_shttp else 'sse'
+        )
+        return None
+    except Exception as e:
+        # Error is already logged and collected in client.connect_http()
+        logger.error(
+            f'Failed to connect to {redact_text_secrets(str(server))}: {str(e)}',
+            exc_info=True,
+        )
+        return None
+
+
+def _report_connect_timeout(server_name: str, server_type: str) -> None:
+    error_msg = (
+        f'Timed out connecting to MCP server {server_name} after {MCP_CONNECT_TIMEOUT}s'
+    )
+    logger.error(error_msg)
+    mcp_error_collector.add_error(
+        server_name=server_name,
+        server_type=server_type,
+        error_message=error_msg,
+    )
 
 
 async def fetch_mcp_tools_from_config(
-    mcp_config: MCPConfig, conversation_id: str | None = None, use_stdio: bool = False
+    mcp_config: MCPConfig,
+    conversation_id: str | None = None,
+    use_stdio: bool = False,
+    uncached_servers: list[
+        MCPSSEServerConfig | MCPSHTTPServerConfig | MCPStdioServerConfig
+    ]
+    | None = None,
 ) -> list[dict]:
     """Retrieves the list of MCP tools from the MCP clients.
 
+    The tools of each server are cached by its configuration and the conversation ID
+    (See tool_cache), so only the servers whose tools are not cached are connected to.
+
     Args:
         mcp_config: The MCP configuration
         conversation_id: Optional conversation ID to associate with the MCP clients
         use_stdio: Whether to use stdio servers for MCP clients, set to True when running from a CLI runtime
+        uncached_servers: Servers whose tools are listed every time, and not cached,
+            as they are not determined by their configuration
 
     Returns:
         A list of tool dictionaries. Returns an empty list if no connections could be established.
@@ -187,27 +239,52 @@ async def fetch_mcp_tools_from_config(
         logger.info('MCP functionality is disabled on Windows, skipping tool fetching')
         return []
 
-    mcp_clients = []
     mcp_tools = []
     try:
-        logger.debug(
-            f'Creating MCP clients with config: {sanitize_config(mcp_config.model_dump())}'
-        )
-
-        # Create clients - this will fetch tools but not maintain active connections
-        mcp_clients = await create_mcp_clients(
-            mcp_config.sse_servers,
-            mcp_config.shttp_servers,
-            conversation_id,
-            mcp_config.stdio_servers if use_stdio else [],
-        )
+        servers: list[
+            MCPSSEServerConfig | MCPSHTTPServerConfig | MCPStdioServerConfig
+        ] = [
+            *mcp_config.sse_servers,
+            *mcp_config.shttp_servers,
+            *(mcp_config.stdio_servers if use_stdio else []),
+        ]
+        uncached_servers = uncached_servers or []
+        server_tools = [
+            None
+            if server in uncached_servers
+            else mcp_tool_cache.get(server, conversation_id)
+            for server in servers
+        ]
+        missing = [
+            server for server, tools in zip(servers, server_tools) if tools is None
+        ]
+        if missing:
+            logger.debug(
+                f'Creating MCP clients with config: {sanitize_config(mcp_config.model_dump())}'
+            )
+            # List the tools of the servers which are not cached concurrently
+            fetched = iter(
+                await asyncio.gather(
+                    *(
+                        _fetch_mcp_server_tools(
+                            server, conversation_id, server not in uncached_servers
+                        )
+                        for server in missing
+                    )
+                )
+            )
+            server_tools = [
+                next(fetched) if tools is None else tools for tools in server_tools
+            ]
+        else:
+            logger.debug('Using the cached tools of all MCP servers')
 
-        if not mcp_clients:
+        if all(tools is None for tools in server_tools):
             logger.debug('No MCP clients were successfully connected')
             return []
 
-        # Convert tools to the format expected by the agent
-        mcp_tools = convert_mcp_clients_to_tools(mcp_clients)
+        for tools in server_tools:
+            mcp_tools.extend(tools or [])
 
     except Exception as e:
         error_msg = f'Error fetching MCP tools: {str(e)}'
@@ -224,12 +301,49 @@ async def fetch_mcp_tools_from_config(
     return mcp_tools
 
 
-async def call_tool_mcp(mcp_clients: list[MCPClient], action: MCPAction) -> Observation:
+async def _fetch_mcp_server_tools(
+    server: MCPSSEServerConfig | MCPSHTTPServerConfig | MCPStdioServerConfig,
+    conversation_id: str | None,
+    cache: bool,
+) -> list[dict] | None:
+    """List the tools of an MCP server and cache them if cache is set, or return None
+    if it can not be connected to."""
+    if isinstance(server, MCPStdioServerConfig):
+        clients = await create_mcp_clients([], [], conversation_id, [server])
+    elif isinstance(server, MCPSHTTPServerConfig):
+        clients = await create_mcp_clients([], [server], conversation_id, [])
+    else:
+        clients = await create_mcp_clients([server], [], conversation_id, [])
+    if not clients:
+        return None
+    # Convert tools to the format expected by the agent
+    tools = convert_mcp_clients_to_tools(clients)
+    if cache:
+        mcp_tool_cache.put(server, tools, conversation_id)
+    return tools
+
+
+def index_mcp_tools(mcp_clients: list[MCPClient]) -> dict[str, MCPClient]:
+    """Map the name of each tool to the first of the clients which provides it."""
+    tool_index: dict[str, MCPClient] = {}
+    for client in mcp_clients:
+        for tool in client.tools:
+            tool_index.setdefault(tool.name, client)
+    return tool_index
+
+
+async def call_tool_mcp(
+    mcp_clients: list[MCPClient],
+    action: MCPAction,
+    tool_index: Mapping[str, MCPClient] | None = None,
+) -> Observation:
     """Call a tool on an MCP server and return the observation.
 
     Args:
         mcp_clients: The list of MCP clients to execute the action on
         action: The MCP action to execute
+        tool_index: The clients by tool name, as from index_mcp_tools, for clients
+            which are used for several calls
 
     Returns:
         The observation from the MCP server
@@ -253,11 +367,14 @@ async def call_tool_mcp(mcp_clients: list[MCPClient], action: MCPAction) -> Obse
     logger.debug(f'MCP clients: {mcp_clients}')
     logger.debug(f'MCP action name: {action.name}')
 
-    for client in mcp_clients:
-        logger.debug(f'MCP client tools: {client.tools}')
-        if action.name in [tool.name for tool in client.tools]:
-            matching_client = client
-            break
+    if tool_index is not None:
+        matching_client = tool_index.get(action.name)
+    else:
+        for client in mcp_clients:
+            logger.debug(f'MCP client tools: {client.tools}')
+            if action.name in [tool.name for tool in client.tools]:
+                matching_client = client
+                break
 
     if matching_client is None:
         raise ValueError(f'No matching MCP agent found for tool name: {action.name}')
@@ -265,7 +382,8 @@ async def call_tool_mcp(mcp_clients: list[MCPClient], action: MCPAction) -> Obse
     logger.debug(f'Matching client: {matching_client}')
 
     try:
-        # Call the tool - this will create a new connection internally
+        # Call the tool - this uses the client's session if it has one open, or
+        # creates a new connection internally
         response = await matching_client.call_tool(action.name, action.arguments)
         logger.debug(f'MCP response: {response}')
 
@@ -339,10 +457,20 @@ async def add_mcp_tools_to_agent(
     # Add the runtime as another MCP server
     updated_mcp_config = runtime.get_mcp_config(extra_stdio_servers)
 
+    # The tools of the runtime's own MCP server are those of the stdio servers added
+    # to it, and its URL may be that of an earlier runtime, so they are not cached
+    uncached_servers = (
+        [runtime.runtime_mcp_server]
+        if isinstance(runtime, ActionExecutionClient)
+        else []
+    )
+
     # Fetch the MCP tools
     # Only use stdio if run from a CLI runtime
     mcp_tools = await fetch_mcp_tools_from_config(
-        updated_mcp_config, use_stdio=isinstance(runtime, CLIRuntime)
+        updated_mcp_config,
+        use_stdio=isinstance(runtime, CLIRuntime),
+        uncached_servers=uncached_servers,
     )
 
     tool_names = [tool['function']['name'] for tool in mcp_tools]
@@ -23,6 +23,7 @@ from openhands.microagent import (
     RepoMicroagent,
     load_microagents_from_dir,
 )
+from openhands.microagent.trigger_index import TriggerIndex
 from openhands.runtime.base import Runtime
 from openhands.runtime.runtime_status import RuntimeStatus
 from openhands.utils.prompt import (
@@ -71,6 +72,7 @@ class Memory:
         # Additional placeholders to store user workspace microagents
         self.repo_microagents = {}
         self.knowledge_microagents = {}
+        self._trigger_index: TriggerIndex | None = None
 
         # Store repository / runtime info to send them to the templating later
         self.repository_info: RepositoryInfo | None = None
@@ -256,19 +258,30 @@ class Memory:
             return recalled_content
 
         # Search for microagent triggers in the query
-        for name, microagent in self.knowledge_microagents.items():
-            trigger = microagent.match_trigger(query)
-            if trigger:
-                logger.info("Microagent '%s' triggered by keyword '%s'", name, trigger)
-                recalled_content.append(
-                    MicroagentKnowledge(
-                        name=microagent.name,
-                        trigger=trigger,
-                        content=microagent.content,
-                    )
+        for microagent, trigger in self._get_trigger_index().match(query):
+            logger.info(
+                "Microagent '%s' triggered by keyword '%s'", microagent.name, trigger
+            )
+            recalled_content.append(
+                MicroagentKnowledge(
+                    name=microagent.name,
+                    trigger=trigger,
+                    content=microagent.content,
                 )
+            )
         return recalled_content
 
+    def _get_trigger_index(self) -> TriggerIndex:
+        """Get the index of knowledge microagent triggers, rebuilding it only if the
+        knowledge microagents have changed since it was built."""
+        trigger_index = self._trigger_index
+        if trigger_index is None or not trigger_index.is_index_of(
+            self.knowledge_microagents
+        ):
+            trigger_index = TriggerIndex(self.knowledge_microagents)
+            self._trigger_index = trigger_index
+        return trigger_index
+
     def load_user_workspace_microagents(
         self, user_microagents: list[BaseMicroagent]
     ) -> None:
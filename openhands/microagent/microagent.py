@@ -1,5 +1,7 @@
 import io
 import re
+import threading
+from collections import OrderedDict
 from itertools import chain
 from pathlib import Path
 from typing import ClassVar, Union
@@ -274,6 +276,26 @@ class TaskMicroagent(KnowledgeMicroagent):
         return self.metadata.inputs
 
 
+# Parsed microagents for recently loaded directories, keyed by the directory and
+# validated against the paths, modification times and sizes of its files.
+_MICROAGENT_CACHE_MAX_DIRS = 64
+_microagent_cache: OrderedDict[
+    Path,
+    tuple[
+        tuple[tuple[str, int, int], ...],
+        dict[str, RepoMicroagent],
+        dict[str, KnowledgeMicroagent],
+    ],
+] = OrderedDict()
+_microagent_cache_lock = threading.Lock()
+
+
+def clear_microagent_cache() -> None:
+    """Discard all cached microagents."""
+    with _microagent_cache_lock:
+        _microagent_cache.clear()
+
+
 def load_microagents_from_dir(
     microagent_dir: Union[str, Path],
 ) -> tuple[dict[str, RepoMicroagent], dict[str, KnowledgeMicroagent]]:
@@ -316,6 +338,24 @@ def load_microagents_from_dir(
     if microagent_dir.exists():
         md_files = [f for f in microagent_dir.rglob('*.md') if f.name != 'README.md']
 
+    # Reuse the microagents parsed previously if none of the files have changed
+    cache_key = microagent_dir.absolute()
+    try:
+        signature = tuple(
+            (str(file), stat.st_mtime_ns, stat.st_size)
+            for file in chain(special_files, md_files)
+            for stat in (file.stat(),)
+        )
+    except OSError:
+        signature = None
+    if signature is not None:
+        with _microagent_cache_lock:
+            cached = _microagent_cache.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                _microagent_cache.move_to_end(cache_key)
+                logger.debug(f'Using cached microagents for {microagent_dir}')
+                return dict(cached[1]), dict(cached[2])
+
     # Process all files in one loop
     for file in chain(special_files, md_files):
         try:
@@ -338,4 +378,14 @@ def load_microagents_from_dir(
         f'Loaded {len(repo_agents) + len(knowledge_agents)} microagents: '
         f'{[*repo_agents.keys(), *knowledge_agents.keys()]}'
     )
+    if signature is not None:
+        with _microagent_cache_lock:
+            _microagent_cache[cache_key] = (
+                signature,
+                dict(repo_agents),
+                dict(knowledge_agents),
+            )
+            _microagent_cache.move_to_end(cache_key)
+            while len(_microagent_cache) > _MICROAGENT_CACHE_MAX_DIRS:
+                _microagent_cache.popitem(last=False)
     return repo_agents, knowledge_agents
@@ -0,0 +1,113 @@
+from collections import deque
+from typing import Iterable, Mapping
+
+from openhands.microagent.microagent import KnowledgeMicroagent
+
+
+class TriggerMatcher:
+    """Aho-Corasick automaton which finds all of a set of (Case insensitive) patterns
+    occurring in a text in a single pass over the text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        # Node 0 is the root. Each node has its transitions, the node to fall back to
+        # when no transition matches, and the patterns ending at the node.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[str, ...]] = [()]
+        self._match_empty = False
+
+        for pattern in set(pattern.lower() for pattern in patterns):
+            if not pattern:
+                self._match_empty = True
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._output[node] = (pattern,)
+
+        # Breadth first, so the fail node of each node is built before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_node] = fail if fail != next_node else 0
+                self._output[next_node] += self._output[self._fail[next_node]]
+
+    def find_all(self, text: str) -> set[str]:
+        """Get the (Lowercase) patterns which occur in the text."""
+        found: set[str] = {''} if self._match_empty else set()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        for char in text.lower():
+            while True:
+                next_node = goto[node].get(char)
+                if next_node is not None:
+                    node = next_node
+                    break
+                if not node:
+                    break
+                node = fail[node]
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+class TriggerIndex:
+    """Index of the triggers of a set of knowledge microagents.
+
+    Matches are identical to calling match_trigger on each microagent in turn, but the
+    message is scanned once regardless of the number of microagents and triggers.
+    """
+
+    def __init__(self, microagents: Mapping[str, KnowledgeMicroagent]):
+        self.microagents = dict(microagents)
+        self._lowercase_triggers = {
+            name: [(trigger, trigger.lower()) for trigger in microagent.triggers]
+            for name, microagent in self.microagents.items()
+        }
+        self._matcher = TriggerMatcher(
+            lowercase_trigger
+            for triggers in self._lowercase_triggers.values()
+            for _, lowercase_trigger in triggers
+        )
+
+    def is_index_of(self, microagents: Mapping[str, KnowledgeMicroagent]) -> bool:
+        """Check whether this index was built from the same microagents (In the same
+        order, as matches are returned in the order of the microagents)."""
+        if len(microagents) != len(self.microagents):
+            return False
+        return all(
+            name == indexed_name and microagent is indexed_microagent
+            for (name, microagent), (indexed_name, indexed_microagent) in zip(
+                microagents.items(), self.microagents.items()
+            )
+        )
+
+    def match(self, message: str) -> list[tuple[KnowledgeMicroagent, str]]:
+        """Get each microagent triggered by the message, along with the first of its
+        triggers found in the message."""
+        found = self._matcher.find_all(message)
+        if not found:
+            return []
+        matches = []
+        for name, triggers in self._lowercase_triggers.items():
+            for trigger, lowercase_trigger in triggers:
+                if lowercase_trigger in found:
+                    matches.append((self.microagents[name], trigger))
+                    break
+        return matches
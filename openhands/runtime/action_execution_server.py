@@ -13,7 +13,6 @@ NOTE: this will be executed inside the docker sandbox.
 
 import argparse
 import asyncio
-import base64
 import mimetypes
 import os
 import shutil
@@ -78,7 +77,12 @@ from openhands.runtime.mcp.proxy import MCPProxyManager
 from openhands.runtime.plugins import ALL_PLUGINS, JupyterPlugin, Plugin, VSCodePlugin
 from openhands.runtime.utils import find_available_tcp_port
 from openhands.runtime.utils.bash import BashSession
-from openhands.runtime.utils.files import insert_lines, read_lines
+from openhands.runtime.utils.files import (
+    MAX_READ_BINARY_SIZE,
+    insert_lines,
+    read_file_base64,
+    read_text_lines,
+)
 from openhands.runtime.utils.memory_monitor import MemoryMonitor
 from openhands.runtime.utils.runtime_init import init_user_and_working_directory
 from openhands.utils._redact_compat import redact_text_secrets
@@ -473,34 +477,32 @@ class ActionExecutor:
         filepath = self._resolve_path(action.path, working_dir)
         try:
             if filepath.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                with open(filepath, 'rb') as file:
-                    image_data = file.read()
-                    encoded_image = base64.b64encode(image_data).decode('utf-8')
-                    mime_type, _ = mimetypes.guess_type(filepath)
-                    if mime_type is None:
-                        mime_type = 'image/png'  # default to PNG if mime type cannot be determined
-                    encoded_image = f'data:{mime_type};base64,{encoded_image}'
-
-                return FileReadObservation(path=filepath, content=encoded_image)
+                mime_type, _ = mimetypes.guess_type(filepath)
+                if mime_type is None:
+                    # default to PNG if mime type cannot be determined
+                    mime_type = 'image/png'
             elif filepath.lower().endswith('.pdf'):
-                with open(filepath, 'rb') as file:
-                    pdf_data = file.read()
-                    encoded_pdf = base64.b64encode(pdf_data).decode('utf-8')
-                    encoded_pdf = f'data:application/pdf;base64,{encoded_pdf}'
-                return FileReadObservation(path=filepath, content=encoded_pdf)
+                mime_type = 'application/pdf'
             elif filepath.lower().endswith(('.mp4', '.webm', '.ogg')):
-                with open(filepath, 'rb') as file:
-                    video_data = file.read()
-                    encoded_video = base64.b64encode(video_data).decode('utf-8')
-                    mime_type, _ = mimetypes.guess_type(filepath)
-                    if mime_type is None:
-                        mime_type = 'video/mp4'  # default to MP4 if MIME type cannot be determined
-                    encoded_video = f'data:{mime_type};base64,{encoded_video}'
-
-                return FileReadObservation(path=filepath, content=encoded_video)
-
-            with open(filepath, 'r', encoding='utf-8') as file:
-                lines = read_lines(file.readlines(), action.start, action.end)
+                mime_type, _ = mimetypes.guess_type(filepath)
+                if mime_type is None:
+                    # default to MP4 if MIME type cannot be determined
+                    mime_type = 'video/mp4'
+            else:
+                mime_type = None
+
+            if mime_type is not None:
+                file_size = os.path.getsize(filepath)
+                if file_size > MAX_READ_BINARY_SIZE:
+                    return ErrorObservation(
+                        f'File is too large to read: {filepath} is {file_size} bytes, '
+                        f'and the limit is {MAX_READ_BINARY_SIZE} bytes.'
+                    )
+                return FileReadObservation(
+                    path=filepath, content=read_file_base64(filepath, mime_type)
+                )
+
+            code_view = read_text_lines(filepath, action.start, action.end)
         except FileNotFoundError:
             return ErrorObservation(
                 f'File not found: {filepath}. Your current working directory is {working_dir}.'
@@ -512,7 +514,6 @@ class ActionExecutor:
                 f'Path is a directory: {filepath}. You can only read files'
             )
 
-        code_view = ''.join(lines)
         return FileReadObservation(path=filepath, content=code_view)
 
     async def write(self, action: FileWriteAction) -> Observation:
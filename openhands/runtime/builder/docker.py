@@ -7,8 +7,12 @@
 # Tag: Legacy-V0
 import datetime
 import os
+import re
 import subprocess
+import threading
 import time
+from concurrent.futures import Future
+from typing import Callable
 
 import docker
 
@@ -19,6 +23,69 @@ from openhands.runtime.builder.base import RuntimeBuilder
 from openhands.utils.term_color import TermColor, colorize
 from openhands.version import get_version
 
+# The number of images DockerRuntimeBuilder builds at once in a process
+RUNTIME_BUILD_CONCURRENCY = int(os.getenv('RUNTIME_BUILD_CONCURRENCY', '4'))
+# The start of a build step, and the end of one, in the plain progress output
+_BUILD_STEP_START = re.compile(r'^#(\d+) (\[.*)$')
+_BUILD_STEP_DONE = re.compile(r'^#(\d+) DONE (\d+(?:\.\d+)?)s$')
+
+
+class BuildCoordinator:
+    """Runs the image builds of DockerRuntimeBuilder. Concurrent builds of the same
+    image are built once, and at most max_builds images are built at a time."""
+
+    def __init__(self, max_builds: int = RUNTIME_BUILD_CONCURRENCY):
+        self._semaphore = threading.BoundedSemaphore(max_builds)
+        self._builds: dict[str, Future[str]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: str, build: Callable[[], str]) -> str:
+        """Call build, or wait for the build in progress with the same key and get
+        its result."""
+        with self._lock:
+            future = self._builds.get(key)
+            in_progress = future is not None
+            if future is None:
+                future = self._builds[key] = Future()
+        if in_progress:
+            logger.info(f'Waiting for the build of [{key}] which is in progress')
+            return future.result()
+
+        queued_at = time.monotonic()
+        try:
+            with self._semaphore:
+                queued_time = time.monotonic() - queued_at
+                if queued_time >= 1:
+                    logger.info(
+                        f'Build of [{key}] waited {queued_time:.1f}s for other builds'
+                    )
+                result = build()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._builds[key]
+
+
+_build_coordinator = BuildCoordinator()
+
+
+def get_build_step_timings(output_lines: list[str]) -> list[tuple[str, float]]:
+    """The name and seconds taken of each build step which ran, from the plain
+    progress output of a build. Cached steps are left out."""
+    step_names: dict[str, str] = {}
+    timings = []
+    for line in output_lines:
+        if match := _BUILD_STEP_START.match(line):
+            step_names.setdefault(match[1], match[2])
+        elif (match := _BUILD_STEP_DONE.match(line)) and match[1] in step_names:
+            timings.append((step_names[match[1]], float(match[2])))
+    return timings
+
 
 class DockerRuntimeBuilder(RuntimeBuilder):
     def __init__(self, docker_client: docker.DockerClient):
@@ -83,9 +150,26 @@ class DockerRuntimeBuilder(RuntimeBuilder):
 
         Note:
             This method uses Docker BuildKit for improved build performance and caching capabilities.
+            Concurrent builds of the same image in this process are built once, and at most
+            RUNTIME_BUILD_CONCURRENCY images are built at a time.
             If `use_local_cache` is True, it will attempt to use and update the build cache in a local directory.
             The `extra_build_args` parameter allows for passing additional Docker build arguments as needed.
         """
+        return _build_coordinator.run(
+            f'{tags[0]} ({platform})' if platform else tags[0],
+            lambda: self._build(
+                path, tags, platform, extra_build_args, use_local_cache
+            ),
+        )
+
+    def _build(
+        self,
+        path: str,
+        tags: list[str],
+        platform: str | None,
+        extra_build_args: list[str] | None,
+        use_local_cache: bool,
+    ) -> str:
         self.docker_client = docker.from_env()
         version_info = self.docker_client.version()
         server_version = version_info.get('Version', '').split('+')[0].replace('-', '.')
@@ -180,6 +264,7 @@ class DockerRuntimeBuilder(RuntimeBuilder):
             universal_newlines=True,
         )
 
+        build_started_at = time.monotonic()
         try:
             process = subprocess.Popen(
                 buildx_cmd,
@@ -235,7 +320,17 @@ class DockerRuntimeBuilder(RuntimeBuilder):
             logger.error(f'An unexpected error occurred during the build process: {e}')
             raise
 
-        logger.info(f'Image [{target_image_hash_name}] build finished.')
+        logger.info(
+            f'Image [{target_image_hash_name}] build finished in {time.monotonic() - build_started_at:.1f}s.'
+        )
+        slowest_steps = sorted(
+            get_build_step_timings(output_lines), key=lambda step: -step[1]
+        )[:5]
+        if slowest_steps:
+            logger.info(
+                'Slowest build steps:\n'
+                + '\n'.join(f'{seconds:.1f}s {name}' for name, seconds in slowest_steps)
+            )
 
         if target_image_tag:
             image = self.docker_client.images.get(target_image_hash_name)
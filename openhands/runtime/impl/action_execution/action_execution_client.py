@@ -452,15 +452,19 @@ class ActionExecutionClient(Runtime):
 
         if len(self._last_updated_mcp_stdio_servers) > 0:
             # We should always include the runtime as an MCP server whenever there's > 0 stdio servers
-            updated_mcp_config.sse_servers.append(
-                MCPSSEServerConfig(
-                    url=self.action_execution_server_url.rstrip('/') + '/mcp/sse',
-                    api_key=self.session_api_key,
-                )
-            )
+            updated_mcp_config.sse_servers.append(self.runtime_mcp_server)
 
         return updated_mcp_config
 
+    @property
+    def runtime_mcp_server(self) -> MCPSSEServerConfig:
+        """The MCP server of the runtime itself, which serves the stdio servers added
+        to it by get_mcp_config."""
+        return MCPSSEServerConfig(
+            url=self.action_execution_server_url.rstrip('/') + '/mcp/sse',
+            api_key=self.session_api_key,
+        )
+
     async def call_tool_mcp(self, action: MCPAction) -> Observation:
         import sys
 
@@ -472,24 +476,23 @@ class ActionExecutionClient(Runtime):
             return ErrorObservation('MCP functionality is not available on Windows')
 
         # Import here to avoid circular imports
+        from openhands.mcp.client_pool import mcp_client_pool
         from openhands.mcp.utils import call_tool_mcp as call_tool_mcp_handler
-        from openhands.mcp.utils import create_mcp_clients
 
         # Get the updated MCP config
         updated_mcp_config = self.get_mcp_config()
         self.log(
             'debug',
-            f'Creating MCP clients with servers: {redact_text_secrets(str(updated_mcp_config.sse_servers))}',
+            f'Getting MCP clients for servers: {redact_text_secrets(str(updated_mcp_config.sse_servers))}',
         )
 
-        # Create clients for this specific operation
-        mcp_clients = await create_mcp_clients(
+        # The clients are kept connected for the next calls
+        mcp_clients, tool_index = await mcp_client_pool.get_clients(
             updated_mcp_config.sse_servers, updated_mcp_config.shttp_servers, self.sid
         )
 
         # Call the tool and return the result
-        # No need for try/finally since disconnect() is now just resetting state
-        result = await call_tool_mcp_handler(mcp_clients, action)
+        result = await call_tool_mcp_handler(mcp_clients, action, tool_index)
         return result
 
     def close(self) -> None:
@@ -498,4 +501,8 @@ class ActionExecutionClient(Runtime):
         if self._runtime_closed:
             return
         self._runtime_closed = True
+        # Import here to avoid circular imports
+        from openhands.mcp.client_pool import mcp_client_pool
+
+        mcp_client_pool.close(self.sid)
         self.session.close()
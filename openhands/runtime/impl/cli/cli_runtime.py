@@ -706,8 +706,8 @@ class CLIRuntime(Runtime):
             return ErrorObservation('MCP functionality is not available on Windows')
 
         # Import here to avoid circular imports
+        from openhands.mcp.client_pool import mcp_client_pool
         from openhands.mcp.utils import call_tool_mcp as call_tool_mcp_handler
-        from openhands.mcp.utils import create_mcp_clients
 
         try:
             # Get the MCP config for this runtime
@@ -723,13 +723,13 @@ class CLIRuntime(Runtime):
 
             self.log(
                 'debug',
-                f'Creating MCP clients for action {action.name} with servers: '
+                f'Getting MCP clients for action {action.name} with servers: '
                 f'SSE={len(mcp_config.sse_servers)}, SHTTP={len(mcp_config.shttp_servers)}, '
                 f'stdio={len(mcp_config.stdio_servers)}',
             )
 
-            # Create clients for this specific operation
-            mcp_clients = await create_mcp_clients(
+            # The clients are kept connected for the next calls
+            mcp_clients, tool_index = await mcp_client_pool.get_clients(
                 mcp_config.sse_servers,
                 mcp_config.shttp_servers,
                 self.sid,
@@ -747,7 +747,7 @@ class CLIRuntime(Runtime):
                 'debug',
                 f'Executing MCP tool: {action.name} with arguments: {action.arguments}',
             )
-            result = await call_tool_mcp_handler(mcp_clients, action)
+            result = await call_tool_mcp_handler(mcp_clients, action, tool_index)
             self.log('debug', f'MCP tool {action.name} executed successfully')
             return result
 
@@ -901,6 +901,10 @@ class CLIRuntime(Runtime):
             finally:
                 self._powershell_session = None
 
+        # Import here to avoid circular imports
+        from openhands.mcp.client_pool import mcp_client_pool
+
+        mcp_client_pool.close(self.sid)
         self._runtime_initialized = False
         super().close()
 
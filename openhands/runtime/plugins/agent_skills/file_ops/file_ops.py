@@ -27,6 +27,10 @@ Note:
 import os
 
 from openhands.linter import DefaultLinter, LintResult
+from openhands.runtime.plugins.agent_skills.file_ops.file_search import (
+    search_files,
+    walk_files,
+)
 
 CURRENT_FILE: str | None = None
 CURRENT_LINE = 1
@@ -303,6 +307,7 @@ class LineNumberError(Exception):
 
 def search_dir(search_term: str, dir_path: str = './') -> None:
     """Searches for search_term in all files in dir. If dir is not provided, searches in the current directory.
+    Files ignored by .gitignore and binary files are not searched.
 
     Args:
         search_term: str: The term to search for.
@@ -311,16 +316,14 @@ def search_dir(search_term: str, dir_path: str = './') -> None:
     if not os.path.isdir(dir_path):
         _output_error(f'Directory {dir_path} not found')
         return
-    matches = []
-    for root, _, files in os.walk(dir_path):
-        for file in files:
-            if file.startswith('.'):
-                continue
-            file_path = os.path.join(root, file)
-            with open(file_path, 'r', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    if search_term in line:
-                        matches.append((file_path, line_num, line.strip()))
+    matches = search_files(
+        (
+            file_path
+            for file_path in walk_files(dir_path)
+            if not os.path.basename(file_path).startswith('.')
+        ),
+        search_term,
+    )
 
     if not matches:
         print(f'No matches found for "{search_term}" in {dir_path}')
@@ -375,6 +378,7 @@ def search_file(search_term: str, file_path: str | None = None) -> None:
 
 def find_file(file_name: str, dir_path: str = './') -> None:
     """Finds all files with the given name in the specified directory.
+    Files ignored by .gitignore are not found.
 
     Args:
         file_name: str: The name of the file to find.
@@ -384,11 +388,11 @@ def find_file(file_name: str, dir_path: str = './') -> None:
         _output_error(f'Directory {dir_path} not found')
         return
 
-    matches = []
-    for root, _, files in os.walk(dir_path):
-        for file in files:
-            if file_name in file:
-                matches.append(os.path.join(root, file))
+    matches = [
+        file_path
+        for file_path in walk_files(dir_path)
+        if file_name in os.path.basename(file_path)
+    ]
 
     if matches:
         print(f'[Found {len(matches)} matches for "{file_name}" in {dir_path}]')
@@ -0,0 +1,180 @@
+# IMPORTANT: LEGACY V0 CODE - Deprecated since version 1.0.0, scheduled for removal April 1, 2026
+# This file is part of the legacy (V0) implementation of OpenHands and will be removed soon as we complete the migration to V1.
+# OpenHands V1 uses the Software Agent SDK for the agentic core and runs a new application server. Please refer to:
+#   - V1 agentic core (SDK): https://github.com/OpenHands/software-agent-sdk
+#   - V1 application server (in this repo): openhands/app_server/
+# Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
+# Tag: Legacy-V0
+"""Finding and searching the files of a directory, for search_dir and find_file.
+
+Like git, the walk skips the .git directory and the files and directories ignored by
+.gitignore files: those in the directory and below it, and those above it in its
+repository. Ignored directories (Such as node_modules or build output) are not walked
+at all. The directory searched is never ignored though, even if it is ignored by a
+.gitignore file above it, so that it can be searched by its path.
+
+Files are searched concurrently, and binary files (With a NUL byte near the start, as
+git decides) are skipped.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+from pathspec import GitIgnoreSpec
+
+SEARCH_WORKERS = int(
+    os.getenv('AGENT_SKILLS_SEARCH_WORKERS', str(min(32, (os.cpu_count() or 1) + 4)))
+)
+# Files larger than this are searched a line at a time instead of read whole
+_MAX_READ_SIZE = 32 * 1024 * 1024
+# Files with a NUL byte in this many bytes at their start are binary
+_BINARY_CHECK_SIZE = 8000
+
+# The .gitignore files which apply to a directory, as their directory and patterns,
+# from the top of the repository down
+_Ignores = list[tuple[str, GitIgnoreSpec]]
+
+
+def _load_gitignore(dir_path: str) -> GitIgnoreSpec | None:
+    try:
+        with open(
+            os.path.join(dir_path, '.gitignore'), encoding='utf-8', errors='ignore'
+        ) as file:
+            return GitIgnoreSpec.from_lines(file)
+    except OSError:
+        return None
+
+
+def _repository_ignores(dir_path: str) -> _Ignores:
+    """The .gitignore files of the directories above dir_path in its repository,
+    without the patterns which ignore dir_path or a directory above it (Which would
+    ignore everything below it)."""
+    dir_path = os.path.abspath(dir_path)
+    path = dir_path
+    ancestors = []
+    while not os.path.exists(os.path.join(path, '.git')):
+        parent = os.path.dirname(path)
+        if parent == path:
+            # Not in a repository
+            return []
+        path = parent
+        ancestors.append(path)
+    ignores = []
+    for ancestor in reversed(ancestors):
+        spec = _load_gitignore(ancestor)
+        if spec is None:
+            continue
+        # The directories from the .gitignore file down to dir_path
+        relative_parts = os.path.relpath(dir_path, ancestor).split(os.sep)
+        relative_dirs = [
+            '/'.join(relative_parts[: i + 1]) + '/' for i in range(len(relative_parts))
+        ]
+        patterns = [
+            pattern
+            for pattern in spec.patterns
+            if not pattern.include
+            or not any(
+                pattern.match_file(relative_dir) is not None
+                for relative_dir in relative_dirs
+            )
+        ]
+        ignores.append((ancestor, GitIgnoreSpec(patterns)))
+    return ignores
+
+
+def _is_ignored(
+    name: str, is_dir: bool, rules: list[tuple[str, GitIgnoreSpec]]
+) -> bool:
+    """Whether a file or directory is ignored, given the .gitignore files which apply
+    to its directory as the path of the directory relative to theirs and patterns."""
+    if is_dir:
+        name += '/'
+    # The .gitignore file closest to the path decides, if any of its patterns match
+    for prefix, spec in reversed(rules):
+        include = spec.check_file(prefix + name).include
+        if include is not None:
+            return include
+    return False
+
+
+def walk_files(dir_path: str) -> Iterator[str]:
+    """The files in a directory and below it which are not ignored, in the order of
+    os.walk."""
+    root_ignores = {dir_path: _repository_ignores(dir_path)}
+    for root, dirs, files in os.walk(dir_path):
+        ignores = root_ignores.pop(root)
+        spec = _load_gitignore(root)
+        if spec is not None:
+            ignores = [*ignores, (root, spec)]
+        rules = []
+        for base, base_spec in ignores:
+            relative_root = os.path.relpath(root, base)
+            prefix = '' if relative_root == '.' else relative_root + '/'
+            rules.append((prefix, base_spec))
+
+        kept_dirs = []
+        for dir_name in dirs:
+            if dir_name == '.git' or _is_ignored(dir_name, True, rules):
+                continue
+            kept_dirs.append(dir_name)
+            root_ignores[os.path.join(root, dir_name)] = ignores
+        dirs[:] = kept_dirs
+        for file_name in files:
+            if not _is_ignored(file_name, False, rules):
+                yield os.path.join(root, file_name)
+
+
+def _search_large_file(file_path: str, search_term: str) -> list[tuple[int, str]]:
+    matches = []
+    with open(file_path, 'r', errors='ignore') as file:
+        for line_num, line in enumerate(file, 1):
+            if search_term in line:
+                matches.append((line_num, line.strip()))
+    return matches
+
+
+def search_file_lines(file_path: str, search_term: str) -> list[tuple[int, str]]:
+    """The numbers and stripped contents of the lines of a text file with the search
+    term. Binary files and files which can not be read have no matches."""
+    try:
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size > _MAX_READ_SIZE:
+                if b'\0' in file.read(_BINARY_CHECK_SIZE):
+                    return []
+                return _search_large_file(file_path, search_term)
+            data = file.read()
+    except (OSError, UnicodeDecodeError):
+        return []
+    if b'\0' in data[:_BINARY_CHECK_SIZE]:
+        return []
+    # Most files do not have the term, and are ruled out without decoding them
+    if search_term.encode('utf-8') not in data:
+        return []
+
+    text = data.decode('utf-8', errors='ignore')
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return [
+        (line_num, line.strip())
+        for line_num, line in enumerate(lines, 1)
+        if search_term in line
+    ]
+
+
+def search_files(
+    file_paths: Iterable[str], search_term: str
+) -> list[tuple[str, int, str]]:
+    """Search files concurrently. Returns the path, line number and stripped contents
+    of each line with the search term, in the order of the files."""
+    file_paths = list(file_paths)
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        results = executor.map(
+            lambda file_path: search_file_lines(file_path, search_term), file_paths
+        )
+        return [
+            (file_path, line_num, line)
+            for file_path, file_matches in zip(file_paths, results)
+            for line_num, line in file_matches
+        ]
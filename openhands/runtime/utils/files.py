@@ -5,8 +5,14 @@
 #   - V1 application server (in this repo): openhands/app_server/
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
+import base64
+import bisect
 import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
 from openhands.events.observation import (
     ErrorObservation,
@@ -15,6 +21,18 @@ from openhands.events.observation import (
     Observation,
 )
 
+# Files larger than this which are read in part are read through a line index
+LINE_INDEX_MIN_SIZE = 1024 * 1024
+# A line index records the number of lines before each block of this many bytes
+_LINE_INDEX_BLOCK_SIZE = 64 * 1024
+_MAX_LINE_INDEXES = 64
+# The size of the largest binary file which is read whole (Such as an image)
+MAX_READ_BINARY_SIZE = (
+    int(os.getenv('RUNTIME_MAX_READ_BINARY_SIZE_MB', '100')) * 1024 * 1024
+)
+# A multiple of 3, so that the blocks can be encoded one at a time
+_BASE64_BLOCK_SIZE = 3 * 256 * 1024
+
 
 def resolve_path(
     file_path: str,
@@ -58,21 +76,144 @@ def resolve_path(
     return path_in_host_workspace
 
 
-def read_lines(all_lines: list[str], start: int = 0, end: int = -1) -> list[str]:
+def _line_range(num_lines: int, start: int = 0, end: int = -1) -> tuple[int, int]:
+    """The slice of the lines of a file which read_lines returns."""
     start = max(start, 0)
-    start = min(start, len(all_lines))
+    start = min(start, num_lines)
     end = -1 if end == -1 else max(end, 0)
-    end = min(end, len(all_lines))
+    end = min(end, num_lines)
     if end == -1:
-        if start == 0:
-            return all_lines
-        else:
-            return all_lines[start:]
-    else:
-        num_lines = len(all_lines)
-        begin = max(0, min(start, num_lines - 2))
-        end = -1 if end > num_lines else max(begin + 1, end)
-        return all_lines[begin:end]
+        return start, num_lines
+    begin = max(0, min(start, num_lines - 2))
+    return begin, max(begin + 1, end)
+
+
+def read_lines(all_lines: list[str], start: int = 0, end: int = -1) -> list[str]:
+    begin, end = _line_range(len(all_lines), start, end)
+    if begin == 0 and end >= len(all_lines):
+        return all_lines
+    return all_lines[begin:end]
+
+
+@dataclass
+class LineIndex:
+    """Where the lines of a version of a file start, to within a block."""
+
+    size: int
+    mtime_ns: int
+    inode: int
+    num_lines: int
+    # The number of newlines before each block of the file
+    block_newlines: list[int]
+
+    def is_current(self, stat: os.stat_result) -> bool:
+        return (self.size, self.mtime_ns, self.inode) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+        )
+
+
+_line_indexes: OrderedDict[str, LineIndex] = OrderedDict()
+_line_indexes_lock = threading.Lock()
+
+
+def _build_line_index(file: BinaryIO, stat: os.stat_result) -> LineIndex | None:
+    """Count the newlines of each block of a file. Returns None if the file has line
+    breaks other than \\n and \\r\\n, as reading it in text mode splits the lines on
+    those too."""
+    file.seek(0)
+    block_newlines = []
+    newlines = 0
+    size = 0
+    last_byte = b''
+    ends_with_cr = False
+    while block := file.read(_LINE_INDEX_BLOCK_SIZE):
+        if ends_with_cr and not block.startswith(b'\n'):
+            return None
+        ends_with_cr = block.endswith(b'\r')
+        if b'\r' in block:
+            lone_crs = block.count(b'\r') - block.count(b'\r\n') - ends_with_cr
+            if lone_crs:
+                return None
+        block_newlines.append(newlines)
+        newlines += block.count(b'\n')
+        size += len(block)
+        last_byte = block[-1:]
+    if ends_with_cr:
+        return None
+    num_lines = newlines + (last_byte not in (b'', b'\n'))
+    return LineIndex(size, stat.st_mtime_ns, stat.st_ino, num_lines, block_newlines)
+
+
+def _get_line_index(
+    path: str, file: BinaryIO, stat: os.stat_result
+) -> LineIndex | None:
+    with _line_indexes_lock:
+        index = _line_indexes.get(path)
+        if index is not None and index.is_current(stat):
+            _line_indexes.move_to_end(path)
+            return index
+    index = _build_line_index(file, stat)
+    if index is None or index.size != stat.st_size:
+        # The file can not be indexed, or changed while it was indexed
+        return None
+    with _line_indexes_lock:
+        _line_indexes[path] = index
+        _line_indexes.move_to_end(path)
+        while len(_line_indexes) > _MAX_LINE_INDEXES:
+            _line_indexes.popitem(last=False)
+    return index
+
+
+def _line_offset(file: BinaryIO, index: LineIndex, line: int) -> int:
+    """The offset of the start of a line, found by reading the block it starts in."""
+    if line <= 0:
+        return 0
+    if line >= index.num_lines:
+        return index.size
+    # The line starts after the newline which ends the line before it
+    block = bisect.bisect_left(index.block_newlines, line) - 1
+    block_start = block * _LINE_INDEX_BLOCK_SIZE
+    file.seek(block_start)
+    data = file.read(_LINE_INDEX_BLOCK_SIZE)
+    newline = -1
+    for _ in range(line - index.block_newlines[block]):
+        newline = data.find(b'\n', newline + 1)
+    return block_start + newline + 1
+
+
+def read_text_lines(path: str, start: int = 0, end: int = -1) -> str:
+    """Read the lines of a utf-8 text file which read_lines would return from all of
+    its lines.
+
+    The lines of large files are found through a line index which is kept for each
+    version of the file, so that reading a window of lines reads about as much of the
+    file as the window.
+    """
+    with open(path, 'rb') as file:
+        stat = os.fstat(file.fileno())
+        if stat.st_size >= LINE_INDEX_MIN_SIZE and (start > 0 or end != -1):
+            index = _get_line_index(path, file, stat)
+            if index is not None:
+                begin, end = _line_range(index.num_lines, start, end)
+                begin_offset = _line_offset(file, index, begin)
+                end_offset = _line_offset(file, index, end)
+                file.seek(begin_offset)
+                data = file.read(end_offset - begin_offset)
+                return data.decode('utf-8').replace('\r\n', '\n')
+    with open(path, 'r', encoding='utf-8') as file:
+        return ''.join(read_lines(file.readlines(), start, end))
+
+
+def read_file_base64(path: str, mime_type: str) -> str:
+    """Read a file as a base64 data URL, encoding it a block at a time so that the
+    whole file is not held in memory next to its encoding."""
+    parts = [f'data:{mime_type};base64,']
+    with open(path, 'rb') as file:
+        while block := file.read(_BASE64_BLOCK_SIZE):
+            parts.append(base64.b64encode(block).decode('ascii'))
+    return ''.join(parts)
 
 
 async def read_file(
@@ -93,15 +234,13 @@ async def read_file(
         )
 
     try:
-        with open(whole_path, 'r', encoding='utf-8') as file:
-            lines = read_lines(file.readlines(), start, end)
+        code_view = read_text_lines(str(whole_path), start, end)
     except FileNotFoundError:
         return ErrorObservation(f'File not found: {path}')
     except UnicodeDecodeError:
         return ErrorObservation(f'File could not be decoded as utf-8: {path}')
     except IsADirectoryError:
         return ErrorObservation(f'Path is a directory: {path}. You can only read files')
-    code_view = ''.join(lines)
     return FileReadObservation(path=path, content=code_view)
 
 
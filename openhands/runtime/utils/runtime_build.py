@@ -7,12 +7,18 @@
 # Tag: Legacy-V0
 import argparse
 import hashlib
+import json
 import os
 import shutil
+import stat
 import string
 import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
 import docker
 from dirhash import dirhash
@@ -24,6 +30,29 @@ from openhands.core.logger import openhands_logger as logger
 from openhands.runtime.builder import DockerRuntimeBuilder, RuntimeBuilder
 from openhands.version import get_version
 
+# The hashes of the source and lock files are cached in this file, along with the
+# sizes and modification times of the files they were computed from
+RUNTIME_BUILD_HASH_CACHE_FILE = os.getenv(
+    'RUNTIME_BUILD_HASH_CACHE_FILE',
+    os.path.join(
+        os.path.expanduser('~'), '.cache', 'openhands', 'runtime_build_hashes.json'
+    ),
+)
+_MAX_CACHED_HASHES = 32
+_hash_cache: dict[str, str] = {}
+_hash_cache_lock = threading.Lock()
+# Build folders are kept here, named by a hash of their contents, to be reused by the
+# builds with the same contents. As they are reused, only the user running the builds
+# may have access to the directory.
+RUNTIME_BUILD_CONTEXT_DIR = os.getenv(
+    'RUNTIME_BUILD_CONTEXT_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'openhands', 'build-contexts'),
+)
+_MAX_BUILD_CONTEXTS = 8
+# Build folders which were not used for this long may be removed
+_BUILD_CONTEXT_MAX_IDLE_SECONDS = 60 * 60
+_build_context_lock = threading.Lock()
+
 
 class BuildFromImageType(Enum):
     SCRATCH = 'scratch'  # Slowest: Build from base image (no dependencies are reused)
@@ -136,7 +165,7 @@ def build_runtime_image(
     - runtime_builder (RuntimeBuilder): The runtime builder to use
     - platform (str): The target platform for the build (e.g. linux/amd64, linux/arm64)
     - extra_deps (str):
-    - build_folder (str): The directory to use for the build. If not provided a temporary directory will be used
+    - build_folder (str): The directory to use for the build. If not provided, a directory shared by the builds with the same contents is used (A temporary directory for dry runs)
     - dry_run (bool): if True, it will only ready the build folder. It will not actually build the Docker image
     - force_rebuild (bool): if True, it will create the Dockerfile which uses the base_image
     - extra_build_args (List[str]): Additional build arguments to pass to the builder
@@ -147,6 +176,18 @@ def build_runtime_image(
 
     See https://docs.all-hands.dev/usage/architecture/runtime for more details.
     """
+    if build_folder is None and not dry_run:
+        return build_runtime_image_in_folder(
+            base_image=base_image,
+            runtime_builder=runtime_builder,
+            build_folder=None,
+            extra_deps=extra_deps,
+            dry_run=dry_run,
+            force_rebuild=force_rebuild,
+            platform=platform,
+            extra_build_args=extra_build_args,
+            enable_browser=enable_browser,
+        )
     if build_folder is None:
         with tempfile.TemporaryDirectory() as temp_dir:
             result = build_runtime_image_in_folder(
@@ -179,7 +220,7 @@ def build_runtime_image(
 def build_runtime_image_in_folder(
     base_image: str,
     runtime_builder: RuntimeBuilder,
-    build_folder: Path,
+    build_folder: Path | None,
     extra_deps: str | None,
     dry_run: bool,
     force_rebuild: bool,
@@ -187,85 +228,234 @@ def build_runtime_image_in_folder(
     extra_build_args: list[str] | None = None,
     enable_browser: bool = True,
 ) -> str:
-    runtime_image_repo, _ = get_runtime_image_repo_and_tag(base_image)
-    lock_tag = (
-        f'oh_v{get_version()}_{get_hash_for_lock_files(base_image, enable_browser)}'
-    )
-    versioned_tag = (
-        # truncate the base image to 96 characters to fit in the tag max length (128 characters)
-        f'oh_v{get_version()}_{get_tag_for_versioned_image(base_image)}'
-    )
-    versioned_image_name = f'{runtime_image_repo}:{versioned_tag}'
-    source_tag = f'{lock_tag}_{get_hash_for_source_files()}'
-    hash_image_name = f'{runtime_image_repo}:{source_tag}'
+    """Build the runtime image in a build folder, or in the build folder shared by the
+    builds with the same contents if build_folder is None."""
+    timings: dict[str, float] = {}
+    with _timed(timings, 'tags'):
+        runtime_image_repo, _ = get_runtime_image_repo_and_tag(base_image)
+        lock_tag = (
+            f'oh_v{get_version()}_{get_hash_for_lock_files(base_image, enable_browser)}'
+        )
+        versioned_tag = (
+            # truncate the base image to 96 characters to fit in the tag max length (128 characters)
+            f'oh_v{get_version()}_{get_tag_for_versioned_image(base_image)}'
+        )
+        versioned_image_name = f'{runtime_image_repo}:{versioned_tag}'
+        source_tag = f'{lock_tag}_{get_hash_for_source_files()}'
+        hash_image_name = f'{runtime_image_repo}:{source_tag}'
 
     logger.info(f'Building image: {hash_image_name}')
     if force_rebuild:
         logger.debug(
             f'Force rebuild: [{runtime_image_repo}:{source_tag}] from scratch.'
         )
-        prep_build_folder(
-            build_folder,
-            base_image,
-            build_from=BuildFromImageType.SCRATCH,
-            extra_deps=extra_deps,
-            enable_browser=enable_browser,
-        )
+        with _timed(timings, 'context'):
+            build_folder = _prepare_build_folder(
+                build_folder,
+                source_tag,
+                base_image,
+                BuildFromImageType.SCRATCH,
+                extra_deps,
+                enable_browser,
+            )
         if not dry_run:
+            with _timed(timings, 'build'):
+                _build_sandbox_image(
+                    build_folder,
+                    runtime_builder,
+                    runtime_image_repo,
+                    source_tag,
+                    lock_tag,
+                    versioned_tag,
+                    platform,
+                    extra_build_args=extra_build_args,
+                )
+        _log_build_timings(hash_image_name, timings)
+        return hash_image_name
+
+    lock_image_name = f'{runtime_image_repo}:{lock_tag}'
+    build_from = BuildFromImageType.SCRATCH
+
+    with _timed(timings, 'lookup'):
+        # If the exact image already exists, we do not need to build it
+        if runtime_builder.image_exists(hash_image_name, False):
+            logger.debug(f'Reusing Image [{hash_image_name}]')
+            return hash_image_name
+
+        # We look for an existing image that shares the same lock_tag. If such an image exists, we
+        # can use it as the base image for the build and just copy source files. This makes the build
+        # much faster.
+        if runtime_builder.image_exists(lock_image_name):
+            logger.debug(
+                f'Build [{hash_image_name}] from lock image [{lock_image_name}]'
+            )
+            build_from = BuildFromImageType.LOCK
+            base_image = lock_image_name
+        elif runtime_builder.image_exists(versioned_image_name):
+            logger.info(
+                f'Build [{hash_image_name}] from versioned image [{versioned_image_name}]'
+            )
+            build_from = BuildFromImageType.VERSIONED
+            base_image = versioned_image_name
+        else:
+            logger.debug(f'Build [{hash_image_name}] from scratch')
+
+    with _timed(timings, 'context'):
+        build_folder = _prepare_build_folder(
+            build_folder, source_tag, base_image, build_from, extra_deps, enable_browser
+        )
+    if not dry_run:
+        with _timed(timings, 'build'):
             _build_sandbox_image(
                 build_folder,
                 runtime_builder,
                 runtime_image_repo,
-                source_tag,
-                lock_tag,
-                versioned_tag,
-                platform,
+                source_tag=source_tag,
+                lock_tag=lock_tag,
+                # Only tag the versioned image if we are building from scratch.
+                # This avoids too much layers when you lay one image on top of another multiple times
+                versioned_tag=(
+                    versioned_tag if build_from == BuildFromImageType.SCRATCH else None
+                ),
+                platform=platform,
                 extra_build_args=extra_build_args,
             )
-        return hash_image_name
 
-    lock_image_name = f'{runtime_image_repo}:{lock_tag}'
-    build_from = BuildFromImageType.SCRATCH
+    _log_build_timings(hash_image_name, timings)
+    return hash_image_name
 
-    # If the exact image already exists, we do not need to build it
-    if runtime_builder.image_exists(hash_image_name, False):
-        logger.debug(f'Reusing Image [{hash_image_name}]')
-        return hash_image_name
 
-    # We look for an existing image that shares the same lock_tag. If such an image exists, we
-    # can use it as the base image for the build and just copy source files. This makes the build
-    # much faster.
-    if runtime_builder.image_exists(lock_image_name):
-        logger.debug(f'Build [{hash_image_name}] from lock image [{lock_image_name}]')
-        build_from = BuildFromImageType.LOCK
-        base_image = lock_image_name
-    elif runtime_builder.image_exists(versioned_image_name):
-        logger.info(
-            f'Build [{hash_image_name}] from versioned image [{versioned_image_name}]'
+@contextmanager
+def _timed(timings: dict[str, float], stage: str):
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        timings[stage] = time.monotonic() - started_at
+
+
+def _log_build_timings(image_name: str, timings: dict[str, float]) -> None:
+    stages = ', '.join(f'{stage} {seconds:.2f}s' for stage, seconds in timings.items())
+    logger.info(
+        f'Runtime image [{image_name}] ready in {sum(timings.values()):.2f}s ({stages})'
+    )
+
+
+def _prepare_build_folder(
+    build_folder: Path | None,
+    source_tag: str,
+    base_image: str,
+    build_from: BuildFromImageType,
+    extra_deps: str | None,
+    enable_browser: bool,
+) -> Path:
+    if build_folder is not None:
+        prep_build_folder(
+            build_folder, base_image, build_from, extra_deps, enable_browser
         )
-        build_from = BuildFromImageType.VERSIONED
-        base_image = versioned_image_name
-    else:
-        logger.debug(f'Build [{hash_image_name}] from scratch')
+        return build_folder
+    return _get_shared_build_folder(
+        source_tag, base_image, build_from, extra_deps, enable_browser
+    )
 
-    prep_build_folder(build_folder, base_image, build_from, extra_deps, enable_browser)
-    if not dry_run:
-        _build_sandbox_image(
-            build_folder,
-            runtime_builder,
-            runtime_image_repo,
-            source_tag=source_tag,
-            lock_tag=lock_tag,
-            # Only tag the versioned image if we are building from scratch.
-            # This avoids too much layers when you lay one image on top of another multiple times
-            versioned_tag=(
-                versioned_tag if build_from == BuildFromImageType.SCRATCH else None
-            ),
-            platform=platform,
-            extra_build_args=extra_build_args,
+
+def _get_shared_build_folder(
+    source_tag: str,
+    base_image: str,
+    build_from: BuildFromImageType,
+    extra_deps: str | None,
+    enable_browser: bool,
+) -> Path:
+    """Get the build folder for builds with these contents, preparing it if there is
+    none. Reusing it saves copying the source code for each build, and lets BuildKit
+    reuse what it transferred from the folder for earlier builds."""
+    skills_dir = Path(openhands.__file__).parent.parent / 'skills'
+    md5 = hashlib.md5()
+    md5.update(source_tag.encode())
+    md5.update(_get_files_fingerprint(_walk_source_files(skills_dir)).encode())
+    md5.update(
+        _generate_dockerfile(
+            base_image,
+            build_from=build_from,
+            extra_deps=extra_deps,
+            enable_browser=enable_browser,
+        ).encode()
+    )
+    build_folder = Path(RUNTIME_BUILD_CONTEXT_DIR, truncate_hash(md5.hexdigest()))
+
+    with _build_context_lock:
+        _make_private_dir(RUNTIME_BUILD_CONTEXT_DIR)
+        if build_folder.exists():
+            logger.debug(f'Reusing build folder [{build_folder}]')
+            os.utime(build_folder)
+            return build_folder
+        # Prepared under another name, so that the folder is never seen half prepared
+        temp_folder = tempfile.mkdtemp(prefix='.', dir=RUNTIME_BUILD_CONTEXT_DIR)
+        try:
+            prep_build_folder(
+                Path(temp_folder), base_image, build_from, extra_deps, enable_browser
+            )
+            os.rename(temp_folder, build_folder)
+        except OSError:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+            # Another process prepared the same folder first
+            if not build_folder.exists():
+                raise
+        except BaseException:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+            raise
+        _prune_build_folders(keep=build_folder)
+    return build_folder
+
+
+def _make_private_dir(dir_path: str) -> None:
+    """Make a directory only the current user can access, if it does not exist.
+
+    Raises:
+        AgentRuntimeBuildError: If the directory exists and others can access it, or
+            it is not owned by the current user.
+    """
+    os.makedirs(dir_path, mode=0o700, exist_ok=True)
+    if os.name != 'posix':
+        return
+    dir_stat = os.lstat(dir_path)
+    if (
+        not stat.S_ISDIR(dir_stat.st_mode)
+        or dir_stat.st_uid != os.getuid()
+        or dir_stat.st_mode & 0o077
+    ):
+        raise AgentRuntimeBuildError(
+            f'The runtime build context directory [{dir_path}] must be a directory '
+            'owned by the current user that no one else can access (Mode 0700). '
+            'Change its permissions, or set RUNTIME_BUILD_CONTEXT_DIR to another '
+            'directory.'
         )
 
-    return hash_image_name
+
+def _prune_build_folders(keep: Path) -> None:
+    """Remove the least recently used build folders beyond _MAX_BUILD_CONTEXTS which
+    have not been used for a while, and folders left half prepared."""
+    try:
+        entries = list(os.scandir(RUNTIME_BUILD_CONTEXT_DIR))
+    except OSError:
+        return
+    now = time.time()
+    folders = []
+    for entry in entries:
+        try:
+            idle_seconds = now - entry.stat().st_mtime
+        except OSError:
+            continue
+        if entry.name.startswith('.'):
+            if idle_seconds > _BUILD_CONTEXT_MAX_IDLE_SECONDS:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        elif entry.path != str(keep):
+            folders.append((idle_seconds, entry.path))
+    folders.sort()
+    for idle_seconds, path in folders[_MAX_BUILD_CONTEXTS - 1 :]:
+        if idle_seconds > _BUILD_CONTEXT_MAX_IDLE_SECONDS:
+            logger.debug(f'Removing unused build folder [{path}]')
+            shutil.rmtree(path, ignore_errors=True)
 
 
 def prep_build_folder(
@@ -328,24 +518,37 @@ def truncate_hash(hash: str) -> str:
     return ''.join(result)
 
 
-def get_hash_for_lock_files(base_image: str, enable_browser: bool = True) -> str:
-    openhands_source_dir = Path(openhands.__file__).parent
-    md5 = hashlib.md5()
-    md5.update(base_image.encode())
-    # Only include enable_browser in hash when it's False for backward compatibility
-    if not enable_browser:
-        md5.update(str(enable_browser).encode())
+def _get_lock_files(openhands_source_dir: Path) -> list[Path]:
+    lock_files = []
     for file in ['pyproject.toml', 'poetry.lock']:
         src = Path(openhands_source_dir, file)
         if not src.exists():
             src = Path(openhands_source_dir.parent, file)
-        with open(src, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                md5.update(chunk)
-    # We get away with truncation because we want something that is unique
-    # rather than something that is cryptographically secure
-    result = truncate_hash(md5.hexdigest())
-    return result
+        lock_files.append(src)
+    return lock_files
+
+
+def get_hash_for_lock_files(base_image: str, enable_browser: bool = True) -> str:
+    openhands_source_dir = Path(openhands.__file__).parent
+    lock_files = _get_lock_files(openhands_source_dir)
+
+    def compute_hash() -> str:
+        md5 = hashlib.md5()
+        md5.update(base_image.encode())
+        # Only include enable_browser in hash when it's False for backward compatibility
+        if not enable_browser:
+            md5.update(str(enable_browser).encode())
+        for src in lock_files:
+            with open(src, 'rb') as f:
+                for chunk in iter(lambda: f.read(4096), b''):
+                    md5.update(chunk)
+        # We get away with truncation because we want something that is unique
+        # rather than something that is cryptographically secure
+        return truncate_hash(md5.hexdigest())
+
+    return _get_cached_hash(
+        f'lock:{base_image}:{enable_browser}', lock_files, compute_hash
+    )
 
 
 def get_tag_for_versioned_image(base_image: str) -> str:
@@ -354,21 +557,106 @@ def get_tag_for_versioned_image(base_image: str) -> str:
 
 def get_hash_for_source_files() -> str:
     openhands_source_dir = Path(openhands.__file__).parent
-    dir_hash = dirhash(
-        openhands_source_dir,
-        'md5',
-        ignore=[
-            '.*/',  # hidden directories
-            '__pycache__/',
-            '*.pyc',
-        ],
+
+    def compute_hash() -> str:
+        dir_hash = dirhash(
+            openhands_source_dir,
+            'md5',
+            ignore=[
+                '.*/',  # hidden directories
+                '__pycache__/',
+                '*.pyc',
+            ],
+        )
+        # We get away with truncation because we want something that is unique
+        # rather than something that is cryptographically secure
+        return truncate_hash(dir_hash)
+
+    return _get_cached_hash(
+        'source', _walk_source_files(openhands_source_dir), compute_hash
     )
-    # We get away with truncation because we want something that is unique
-    # rather than something that is cryptographically secure
-    result = truncate_hash(dir_hash)
+
+
+def _walk_source_files(source_dir: Path) -> Iterator[str]:
+    """The files which get_hash_for_source_files hashes, following linked directories
+    as dirhash does."""
+    visited_dirs = set()
+    for root, dirs, files in os.walk(source_dir, followlinks=True):
+        root_stat = os.stat(root)
+        if (root_stat.st_dev, root_stat.st_ino) in visited_dirs:
+            dirs[:] = []
+            continue
+        visited_dirs.add((root_stat.st_dev, root_stat.st_ino))
+        dirs[:] = sorted(
+            name for name in dirs if not name.startswith('.') and name != '__pycache__'
+        )
+        for name in sorted(files):
+            if not name.endswith('.pyc'):
+                yield os.path.join(root, name)
+
+
+def _get_files_fingerprint(files: Iterable[str | Path]) -> str:
+    """A digest of the paths, sizes and modification times of files, which changes
+    when any of them is changed, added or removed."""
+    md5 = hashlib.md5()
+    for file in files:
+        try:
+            stat = os.stat(file)
+        except OSError:
+            md5.update(f'{file}\0missing\n'.encode())
+            continue
+        md5.update(f'{file}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+    return md5.hexdigest()
+
+
+def _get_cached_hash(
+    name: str, files: Iterable[str | Path], compute_hash: Callable[[], str]
+) -> str:
+    """Get a hash of files from the cache in this process or on disk, computing it if
+    the files changed since it was cached. Stating the files is much cheaper than
+    reading them, which is what makes starting runtimes faster."""
+    key = f'{name}:{_get_files_fingerprint(files)}'
+    with _hash_cache_lock:
+        if key in _hash_cache:
+            return _hash_cache[key]
+    disk_cache = _read_hash_cache_file()
+    result = disk_cache.get(key)
+    if result is None:
+        result = compute_hash()
+        disk_cache[key] = result
+        _write_hash_cache_file(disk_cache)
+    with _hash_cache_lock:
+        _hash_cache[key] = result
     return result
 
 
+def _read_hash_cache_file() -> dict[str, str]:
+    try:
+        with open(RUNTIME_BUILD_HASH_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict):
+            return cache
+    except (OSError, ValueError) as e:
+        logger.debug(f'Could not read runtime build hash cache: {e}')
+    return {}
+
+
+def _write_hash_cache_file(cache: dict[str, str]) -> None:
+    # Keep the most recently added hashes
+    cache = dict(list(cache.items())[-_MAX_CACHED_HASHES:])
+    try:
+        os.makedirs(os.path.dirname(RUNTIME_BUILD_HASH_CACHE_FILE), exist_ok=True)
+        # Written to a temporary file first, as other processes may be reading it
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(RUNTIME_BUILD_HASH_CACHE_FILE)
+        )
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_path, RUNTIME_BUILD_HASH_CACHE_FILE)
+    except OSError as e:
+        logger.debug(f'Could not write runtime build hash cache: {e}')
+
+
 def _build_sandbox_image(
     build_folder: Path,
     runtime_builder: RuntimeBuilder,
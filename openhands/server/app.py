@@ -24,7 +24,13 @@ from fastapi.responses import JSONResponse
 
 import openhands.agenthub  # noqa F401 (we import this to get the agents registered)
 from openhands.app_server import v1_router
+from openhands.app_server.app_conversation.conversation_statistics_aggregator import (
+    close_conversation_statistics_aggregators,
+)
 from openhands.app_server.config import get_app_lifespan_service
+from openhands.app_server.sandbox.sandbox_health_monitor import (
+    close_sandbox_health_monitors,
+)
 from openhands.app_server.status.status_router import router as health_router
 from openhands.integrations.service_types import AuthenticationError
 from openhands.server.routes.conversation import app as conversation_api_router
@@ -42,6 +48,7 @@ from openhands.server.routes.settings import app as settings_router
 from openhands.server.routes.trajectory import app as trajectory_router
 from openhands.server.shared import conversation_manager, server_config
 from openhands.server.types import AppMode
+from openhands.utils.http_session import close_shared_async_transports
 from openhands.version import get_version
 
 mcp_app = mcp_server.http_app(path='/mcp', stateless_http=True)
@@ -62,7 +69,12 @@ def combine_lifespans(*lifespans):
 @asynccontextmanager
 async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
     async with conversation_manager:
-        yield
+        try:
+            yield
+        finally:
+            await close_conversation_statistics_aggregators()
+            await close_sandbox_health_monitors()
+            await close_shared_async_transports()
 
 
 lifespans = [_lifespan, mcp_app.lifespan]
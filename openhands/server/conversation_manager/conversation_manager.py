@@ -25,7 +25,10 @@ from openhands.server.session.conversation import ServerConversation
 from openhands.storage.conversation.conversation_store import ConversationStore
 from openhands.storage.data_models.settings import Settings
 from openhands.storage.files import FileStore
-from openhands.utils.http_session import httpx_verify_option
+from openhands.utils.http_session import (
+    NESTED_RUNTIME_UPSTREAM,
+    get_shared_async_transport,
+)
 
 
 class ConversationManager(ABC):
@@ -235,7 +238,7 @@ class ConversationManager(ABC):
             httpx.HTTPStatusError: If the nested runtime returns an error status.
         """
         async with httpx.AsyncClient(
-            verify=httpx_verify_option(),
+            transport=get_shared_async_transport(NESTED_RUNTIME_UPSTREAM),
             headers={'X-Session-API-Key': session_api_key} if session_api_key else {},
         ) as client:
             params = {'path': path} if path else {}
@@ -281,7 +284,7 @@ class ConversationManager(ABC):
             A tuple of (content, error).
         """
         async with httpx.AsyncClient(
-            verify=httpx_verify_option(),
+            transport=get_shared_async_transport(NESTED_RUNTIME_UPSTREAM),
             headers={'X-Session-API-Key': session_api_key} if session_api_key else {},
         ) as client:
             params = {'file': file}
@@ -327,7 +330,7 @@ class ConversationManager(ABC):
             A tuple of (uploaded_files, skipped_files).
         """
         async with httpx.AsyncClient(
-            verify=httpx_verify_option(),
+            transport=get_shared_async_transport(NESTED_RUNTIME_UPSTREAM),
             headers={'X-Session-API-Key': session_api_key} if session_api_key else {},
         ) as client:
             try:
@@ -1,11 +1,11 @@
 import threading
-from typing import Optional
+from typing import Iterable, Iterator, Mapping, Optional
 
 import httpx
 import tenacity
 
 from openhands.core.logger import openhands_logger as logger
-from openhands.storage.files import FileStore
+from openhands.storage.files import READ_CHUNK_SIZE, FileStore
 from openhands.utils.async_utils import EXECUTOR
 from openhands.utils.http_session import httpx_verify_option
 
@@ -104,6 +104,34 @@ class BatchedWebHookFileStore(FileStore):
         """
         return self.file_store.read(path)
 
+    def exists(self, path: str) -> bool:
+        """Check whether a file exists in the underlying store."""
+        return self.file_store.exists(path)
+
+    def read_range(self, path: str, start: int = 0, end: int | None = None) -> bytes:
+        """Read a range of bytes from a file in the underlying store."""
+        return self.file_store.read_range(path, start, end)
+
+    def open_read(
+        self, path: str, chunk_size: int = READ_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Read a file from the underlying store in chunks."""
+        return self.file_store.open_read(path, chunk_size)
+
+    def read_many(self, paths: Iterable[str]) -> dict[str, str]:
+        """Read several files from the underlying store."""
+        return self.file_store.read_many(paths)
+
+    def write_many(self, files: Mapping[str, str | bytes]) -> None:
+        """Write several files, and trigger a webhook for each of them.
+
+        Args:
+            files: The contents to write by path
+        """
+        self.file_store.write_many(files)
+        for path, contents in files.items():
+            self._queue_update(path, 'write', contents)
+
     def list(self, path: str) -> list[str]:
         """List files in a directory.
 
@@ -37,7 +37,9 @@ class FileConversationStore(ConversationStore):
     async def get_metadata(self, conversation_id: str) -> ConversationMetadata:
         path = self.get_conversation_metadata_filename(conversation_id)
         json_str = await call_sync_from_async(self.file_store.read, path)
+        return self._parse_metadata(path, json_str)
 
+    def _parse_metadata(self, path: str, json_str: str) -> ConversationMetadata:
         # Validate the JSON
         json_obj = json.loads(json_str)
         if 'created_at' not in json_obj:
@@ -83,9 +85,17 @@ class FileConversationStore(ConversationStore):
         start = page_id_to_offset(page_id)
         end = min(limit + start, num_conversations)
         conversations = []
-        for conversation_id in conversation_ids:
+        paths = {
+            conversation_id: self.get_conversation_metadata_filename(conversation_id)
+            for conversation_id in conversation_ids
+        }
+        # Read all of the metadata at once, rather than one request at a time
+        json_strs = await self.file_store.read_many_async(paths.values())
+        for conversation_id, path in paths.items():
             try:
-                conversations.append(await self.get_metadata(conversation_id))
+                if path not in json_strs:
+                    raise FileNotFoundError(path)
+                conversations.append(self._parse_metadata(path, json_strs[path]))
             except Exception:
                 logger.warning(
                     f'Could not load conversation metadata: {conversation_id}'
@@ -1,4 +1,16 @@
+import os
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Mapping, TypeVar
+
+from openhands.utils.async_utils import call_sync_from_async
+
+# The number of requests made at once by the file stores backed by remote storage
+FILE_STORE_CONCURRENCY = int(os.getenv('FILE_STORE_CONCURRENCY', '16'))
+READ_CHUNK_SIZE = 1024 * 1024
+
+T = TypeVar('T')
+R = TypeVar('R')
 
 
 class FileStore:
@@ -17,3 +29,98 @@ class FileStore:
     @abstractmethod
     def delete(self, path: str) -> None:
         pass
+
+    # The operations below are implemented in terms of the ones above, and are
+    # overridden by the file stores which support them natively.
+
+    def exists(self, path: str) -> bool:
+        """Check whether a file exists."""
+        try:
+            self.read(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def read_range(self, path: str, start: int = 0, end: int | None = None) -> bytes:
+        """Read the bytes of a file from start up to (But not including) end."""
+        return self.read(path).encode('utf-8')[start:end]
+
+    def open_read(
+        self, path: str, chunk_size: int = READ_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Read the bytes of a file in chunks, without holding the whole file in
+        memory where supported. The file is opened when iteration starts."""
+        contents = self.read(path).encode('utf-8')
+        for start in range(0, len(contents), chunk_size):
+            yield contents[start : start + chunk_size]
+
+    def read_many(self, paths: Iterable[str]) -> dict[str, str]:
+        """Read several files. Files which do not exist are left out of the result."""
+        results = {}
+        for path in paths:
+            contents = _read_if_exists(self, path)
+            if contents is not None:
+                results[path] = contents
+        return results
+
+    def write_many(self, files: Mapping[str, str | bytes]) -> None:
+        """Write several files."""
+        for path, contents in files.items():
+            self.write(path, contents)
+
+    async def read_async(self, path: str) -> str:
+        return await call_sync_from_async(self.read, path)
+
+    async def write_async(self, path: str, contents: str | bytes) -> None:
+        await call_sync_from_async(self.write, path, contents)
+
+    async def exists_async(self, path: str) -> bool:
+        return await call_sync_from_async(self.exists, path)
+
+    async def read_many_async(self, paths: Iterable[str]) -> dict[str, str]:
+        return await call_sync_from_async(self.read_many, list(paths))
+
+    async def write_many_async(self, files: Mapping[str, str | bytes]) -> None:
+        await call_sync_from_async(self.write_many, dict(files))
+
+
+def _read_if_exists(file_store: FileStore, path: str) -> str | None:
+    try:
+        return file_store.read(path)
+    except FileNotFoundError:
+        return None
+
+
+def map_concurrently(fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    """Call fn on each item with FILE_STORE_CONCURRENCY calls in flight, for file
+    stores where each call is a request."""
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    max_workers = min(FILE_STORE_CONCURRENCY, len(items))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fn, items))
+
+
+def read_many_concurrently(
+    file_store: FileStore, paths: Iterable[str]
+) -> dict[str, str]:
+    """Read several files from a file store with FILE_STORE_CONCURRENCY reads in
+    flight, for file stores where each read is a request."""
+    unique_paths = list(dict.fromkeys(paths))
+    contents = map_concurrently(
+        lambda path: _read_if_exists(file_store, path), unique_paths
+    )
+    return {
+        path: path_contents
+        for path, path_contents in zip(unique_paths, contents)
+        if path_contents is not None
+    }
+
+
+def write_many_concurrently(
+    file_store: FileStore, files: Mapping[str, str | bytes]
+) -> None:
+    """Write several files to a file store with FILE_STORE_CONCURRENCY writes in
+    flight, for file stores where each write is a request."""
+    map_concurrently(lambda item: file_store.write(*item), files.items())
@@ -1,12 +1,19 @@
 import os
+from typing import Iterable, Iterator, Mapping
 
-from google.api_core.exceptions import NotFound
+from google.api_core.exceptions import NotFound, RequestRangeNotSatisfiable
 from google.cloud import storage
 from google.cloud.storage.blob import Blob
 from google.cloud.storage.bucket import Bucket
 from google.cloud.storage.client import Client
 
-from openhands.storage.files import FileStore
+from openhands.storage.files import (
+    READ_CHUNK_SIZE,
+    FileStore,
+    map_concurrently,
+    read_many_concurrently,
+    write_many_concurrently,
+)
 
 
 class GoogleCloudFileStore(FileStore):
@@ -35,31 +42,57 @@ class GoogleCloudFileStore(FileStore):
         except NotFound as err:
             raise FileNotFoundError(err)
 
+    def exists(self, path: str) -> bool:
+        return self.bucket.blob(path).exists()
+
+    def read_range(self, path: str, start: int = 0, end: int | None = None) -> bytes:
+        if end is not None and end <= start:
+            return b''
+        blob: Blob = self.bucket.blob(path)
+        try:
+            # The end of the range is inclusive
+            return blob.download_as_bytes(
+                start=start, end=None if end is None else end - 1
+            )
+        except NotFound as err:
+            raise FileNotFoundError(err)
+        except RequestRangeNotSatisfiable:
+            # The range starts after the end of the blob
+            return b''
+
+    def open_read(
+        self, path: str, chunk_size: int = READ_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        blob: Blob = self.bucket.blob(path)
+        try:
+            with blob.open('rb') as f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+        except NotFound as err:
+            raise FileNotFoundError(err)
+
+    def read_many(self, paths: Iterable[str]) -> dict[str, str]:
+        return read_many_concurrently(self, paths)
+
+    def write_many(self, files: Mapping[str, str | bytes]) -> None:
+        write_many_concurrently(self, files)
+
     def list(self, path: str) -> list[str]:
         if not path or path == '/':
             path = ''
         elif not path.endswith('/'):
             path += '/'
-        # The delimiter logic screens out directories, so we can't use it. :(
-        # For example, given a structure:
+        # With a delimiter the files directly under the path are listed as blobs,
+        # and the directories as prefixes. For example, given a structure:
         #   foo/bar/zap.txt
         #   foo/bar/bang.txt
         #   ping.txt
-        # prefix=None, delimiter="/"   yields  ["ping.txt"]  # :(
-        # prefix="foo", delimiter="/"  yields  []  # :(
-        blobs: set[str] = set()
-        prefix_len = len(path)
-        for blob in self.bucket.list_blobs(prefix=path):
-            name: str = blob.name
-            if name == path:
-                continue
-            try:
-                index = name.index('/', prefix_len + 1)
-                if index != prefix_len:
-                    blobs.add(name[: index + 1])
-            except ValueError:
-                blobs.add(name)
-        return list(blobs)
+        # prefix="", delimiter="/"  yields  ["ping.txt"] and prefixes {"foo/"}
+        blobs = self.bucket.list_blobs(prefix=path, delimiter='/')
+        results = [blob.name for blob in blobs if blob.name != path]
+        # The prefixes are collected as the pages of blobs are iterated
+        results.extend(blobs.prefixes)
+        return results
 
     def delete(self, path: str) -> None:
         # Sanitize path
@@ -69,8 +102,7 @@ class GoogleCloudFileStore(FileStore):
             path = path[:-1]
 
         # Try to delete any child resources (Assume the path is a directory)
-        for blob in self.bucket.list_blobs(prefix=f'{path}/'):
-            blob.delete()
+        map_concurrently(self._delete_blob, self.bucket.list_blobs(prefix=f'{path}/'))
 
         # Next try to delete item as a file
         try:
@@ -78,3 +110,11 @@ class GoogleCloudFileStore(FileStore):
             file_blob.delete()
         except NotFound:
             pass
+
+    @staticmethod
+    def _delete_blob(blob: Blob) -> None:
+        try:
+            blob.delete()
+        except NotFound:
+            # Deleted since it was listed
+            pass
@@ -1,18 +1,40 @@
 import os
 import shutil
 import threading
+from enum import Enum
+from typing import Iterator
 
 from openhands.core.logger import openhands_logger as logger
-from openhands.storage.files import FileStore
+from openhands.storage.files import READ_CHUNK_SIZE, FileStore
+
+
+class Durability(str, Enum):
+    """How the writes of a LocalFileStore are made durable."""
+
+    # Each file is synced to disk before it replaces the previous version
+    ALWAYS = 'always'
+    # The OS decides when to write the files to disk, so a crash may leave a file
+    # partially written
+    BUFFERED = 'buffered'
+
+
+FILE_STORE_DURABILITY = Durability(os.getenv('FILE_STORE_DURABILITY', 'always'))
+
+# Directories which are known to exist, shared by all stores as a store is created
+# for each use. Writes do not need to make these.
+_known_dirs: set[str] = set()
+_MAX_KNOWN_DIRS = 10_000
 
 
 class LocalFileStore(FileStore):
     root: str
+    durability: Durability
 
-    def __init__(self, root: str):
+    def __init__(self, root: str, durability: Durability = FILE_STORE_DURABILITY):
         if root.startswith('~'):
             root = os.path.expanduser(root)
         self.root = root
+        self.durability = durability
         os.makedirs(self.root, exist_ok=True)
 
     def get_full_path(self, path: str) -> str:
@@ -22,7 +44,25 @@ class LocalFileStore(FileStore):
 
     def write(self, path: str, contents: str | bytes) -> None:
         full_path = self.get_full_path(path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        self._make_parent_dir(full_path)
+        try:
+            self._write_file(full_path, contents)
+        except FileNotFoundError:
+            # The directory was removed since it was made
+            _known_dirs.discard(os.path.dirname(full_path))
+            self._make_parent_dir(full_path)
+            self._write_file(full_path, contents)
+
+    def _make_parent_dir(self, full_path: str) -> None:
+        dir_path = os.path.dirname(full_path)
+        if dir_path in _known_dirs:
+            return
+        os.makedirs(dir_path, exist_ok=True)
+        if len(_known_dirs) >= _MAX_KNOWN_DIRS:
+            _known_dirs.clear()
+        _known_dirs.add(dir_path)
+
+    def _write_file(self, full_path: str, contents: str | bytes) -> None:
         mode = 'w' if isinstance(contents, str) else 'wb'
 
         # Use atomic write: write to temp file, then rename
@@ -31,8 +71,9 @@ class LocalFileStore(FileStore):
         try:
             with open(temp_path, mode) as f:
                 f.write(contents)
-                f.flush()
-                os.fsync(f.fileno())
+                if self.durability != Durability.BUFFERED:
+                    f.flush()
+                    os.fsync(f.fileno())
             os.replace(temp_path, full_path)
         except Exception:
             if os.path.exists(temp_path):
@@ -44,6 +85,23 @@ class LocalFileStore(FileStore):
         with open(full_path, 'r') as f:
             return f.read()
 
+    def exists(self, path: str) -> bool:
+        return os.path.isfile(self.get_full_path(path))
+
+    def read_range(self, path: str, start: int = 0, end: int | None = None) -> bytes:
+        with open(self.get_full_path(path), 'rb') as f:
+            f.seek(start)
+            if end is None:
+                return f.read()
+            return f.read(max(end - start, 0))
+
+    def open_read(
+        self, path: str, chunk_size: int = READ_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        with open(self.get_full_path(path), 'rb') as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
     def list(self, path: str) -> list[str]:
         full_path = self.get_full_path(path)
         files = [os.path.join(path, f) for f in os.listdir(full_path)]
@@ -61,6 +119,12 @@ class LocalFileStore(FileStore):
                 logger.debug(f'Removed local file: {full_path}')
             elif os.path.isdir(full_path):
                 shutil.rmtree(full_path)
+                removed_dir = full_path.rstrip(os.sep)
+                for dir_path in list(_known_dirs):
+                    if dir_path == removed_dir or dir_path.startswith(
+                        removed_dir + os.sep
+                    ):
+                        _known_dirs.discard(dir_path)
                 logger.debug(f'Removed local directory: {full_path}')
         except Exception as e:
             logger.error(f'Error clearing local file store: {str(e)}')
@@ -1,4 +1,5 @@
 import os
+from typing import Iterable, Mapping
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.storage.files import FileStore
@@ -22,6 +23,29 @@ class InMemoryFileStore(FileStore):
             raise FileNotFoundError(path)
         return self.files[path]
 
+    def exists(self, path: str) -> bool:
+        return path in self.files
+
+    def read_many(self, paths: Iterable[str]) -> dict[str, str]:
+        return {path: self.files[path] for path in paths if path in self.files}
+
+    # Nothing blocks, so there is no need to go through a thread
+
+    async def read_async(self, path: str) -> str:
+        return self.read(path)
+
+    async def write_async(self, path: str, contents: str | bytes) -> None:
+        self.write(path, contents)
+
+    async def exists_async(self, path: str) -> bool:
+        return self.exists(path)
+
+    async def read_many_async(self, paths: Iterable[str]) -> dict[str, str]:
+        return self.read_many(paths)
+
+    async def write_many_async(self, files: Mapping[str, str | bytes]) -> None:
+        self.write_many(files)
+
     def list(self, path: str) -> list[str]:
         files = []
         for file in self.files:
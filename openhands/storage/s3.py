@@ -1,10 +1,16 @@
 import os
-from typing import Any, TypedDict
+from typing import Any, Iterable, Iterator, Mapping, TypedDict
 
 import boto3
 import botocore
 
-from openhands.storage.files import FileStore
+from openhands.storage.files import (
+    READ_CHUNK_SIZE,
+    FileStore,
+    map_concurrently,
+    read_many_concurrently,
+    write_many_concurrently,
+)
 
 
 class S3ObjectDict(TypedDict):
@@ -15,8 +21,19 @@ class GetObjectOutputDict(TypedDict):
     Body: Any
 
 
-class ListObjectsV2OutputDict(TypedDict):
-    Contents: list[S3ObjectDict] | None
+class CommonPrefixDict(TypedDict):
+    Prefix: str
+
+
+class ListObjectsV2OutputDict(TypedDict, total=False):
+    Contents: list[S3ObjectDict]
+    CommonPrefixes: list[CommonPrefixDict]
+    IsTruncated: bool
+    NextContinuationToken: str
+
+
+class _InvalidRangeError(Exception):
+    pass
 
 
 class S3FileStore(FileStore):
@@ -56,12 +73,46 @@ class S3FileStore(FileStore):
             )
 
     def read(self, path: str) -> str:
+        with self._get_object(path)['Body'] as stream:
+            return str(stream.read().decode('utf-8'))
+
+    def exists(self, path: str) -> bool:
         try:
-            response: GetObjectOutputDict = self.client.get_object(
-                Bucket=self.bucket, Key=path
-            )
-            with response['Body'] as stream:
-                return str(stream.read().decode('utf-8'))
+            self.client.head_object(Bucket=self.bucket, Key=path)
+            return True
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def read_range(self, path: str, start: int = 0, end: int | None = None) -> bytes:
+        if end is not None and end <= start:
+            return b''
+        byte_range = f'bytes={start}-' if end is None else f'bytes={start}-{end - 1}'
+        try:
+            response = self._get_object(path, Range=byte_range)
+        except _InvalidRangeError:
+            # The range starts after the end of the object
+            return b''
+        with response['Body'] as stream:
+            return stream.read()
+
+    def open_read(
+        self, path: str, chunk_size: int = READ_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        with self._get_object(path)['Body'] as stream:
+            while chunk := stream.read(chunk_size):
+                yield chunk
+
+    def read_many(self, paths: Iterable[str]) -> dict[str, str]:
+        return read_many_concurrently(self, paths)
+
+    def write_many(self, files: Mapping[str, str | bytes]) -> None:
+        write_many_concurrently(self, files)
+
+    def _get_object(self, path: str, **kwargs: Any) -> GetObjectOutputDict:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=path, **kwargs)
         except botocore.exceptions.ClientError as e:
             # Catch all S3-related errors
             if e.response['Error']['Code'] == 'NoSuchBucket':
@@ -72,6 +123,8 @@ class S3FileStore(FileStore):
                 raise FileNotFoundError(
                     f"Error: The object key '{path}' does not exist in bucket '{self.bucket}'."
                 )
+            elif e.response['Error']['Code'] == 'InvalidRange':
+                raise _InvalidRangeError(path)
             else:
                 raise FileNotFoundError(
                     f"Error: Failed to read from bucket '{self.bucket}' at path {path}: {e}"
@@ -86,32 +139,34 @@ class S3FileStore(FileStore):
             path = ''
         elif not path.endswith('/'):
             path += '/'
-        # The delimiter logic screens out directories, so we can't use it. :(
-        # For example, given a structure:
+        # With a delimiter the files directly under the path are listed as objects,
+        # and the directories as common prefixes. For example, given a structure:
         #   foo/bar/zap.txt
         #   foo/bar/bang.txt
         #   ping.txt
-        # prefix=None, delimiter="/"   yields  ["ping.txt"]  # :(
-        # prefix="foo", delimiter="/"  yields  []  # :(
-        results: set[str] = set()
-        prefix_len = len(path)
-        response: ListObjectsV2OutputDict = self.client.list_objects_v2(
-            Bucket=self.bucket, Prefix=path
-        )
-        contents = response.get('Contents')
-        if not contents:
-            return []
-        paths = [obj['Key'] for obj in contents]
-        for sub_path in paths:
-            if sub_path == path:
-                continue
-            try:
-                index = sub_path.index('/', prefix_len + 1)
-                if index != prefix_len:
-                    results.add(sub_path[: index + 1])
-            except ValueError:
-                results.add(sub_path)
-        return list(results)
+        # prefix="", delimiter="/"  yields  ["ping.txt"] and prefixes ["foo/"]
+        results: list[str] = []
+        for response in self._list_objects(path, delimiter='/'):
+            for obj in response.get('Contents') or []:
+                if obj['Key'] != path:
+                    results.append(obj['Key'])
+            for common_prefix in response.get('CommonPrefixes') or []:
+                results.append(common_prefix['Prefix'])
+        return results
+
+    def _list_objects(
+        self, prefix: str, delimiter: str | None = None
+    ) -> Iterator[ListObjectsV2OutputDict]:
+        """List the objects under a prefix, a page of up to 1000 at a time."""
+        kwargs: dict[str, Any] = {'Bucket': self.bucket, 'Prefix': prefix}
+        if delimiter:
+            kwargs['Delimiter'] = delimiter
+        while True:
+            response: ListObjectsV2OutputDict = self.client.list_objects_v2(**kwargs)
+            yield response
+            if not response.get('IsTruncated'):
+                return
+            kwargs['ContinuationToken'] = response['NextContinuationToken']
 
     def delete(self, path: str) -> None:
         try:
@@ -122,11 +177,13 @@ class S3FileStore(FileStore):
                 path = path[:-1]
 
             # Try to delete any child resources (Assume the path is a directory)
-            response = self.client.list_objects_v2(
-                Bucket=self.bucket, Prefix=f'{path}/'
-            )
-            for content in response.get('Contents') or []:
-                self.client.delete_object(Bucket=self.bucket, Key=content['Key'])
+            for response in self._list_objects(f'{path}/'):
+                map_concurrently(
+                    lambda obj: self.client.delete_object(
+                        Bucket=self.bucket, Key=obj['Key']
+                    ),
+                    response.get('Contents') or [],
+                )
 
             # Next try to delete item as a file
             self.client.delete_object(Bucket=self.bucket, Key=path)
@@ -35,12 +35,8 @@ def call_async_from_sync(
         return result
 
     def run():
-        loop_for_thread = asyncio.new_event_loop()
-        try:
-            asyncio.set_event_loop(loop_for_thread)
-            return asyncio.run(arun())
-        finally:
-            loop_for_thread.close()
+        # asyncio.run makes (And closes) the loop the coroutine runs on
+        return asyncio.run(arun())
 
     if getattr(EXECUTOR, '_shutdown', False):
         result = run()
@@ -1,7 +1,11 @@
+import asyncio
+import importlib.util
+import os
 import ssl
+import weakref
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import MutableMapping
+from typing import Any, Iterable, MutableMapping
 
 import httpx
 
@@ -84,3 +88,147 @@ class HttpSession:
 
     def close(self) -> None:
         self._is_closed = True
+
+
+# Upstream names for the shared async transports
+RUNTIME_API_UPSTREAM = 'runtime_api'
+NESTED_RUNTIME_UPSTREAM = 'nested_runtime'
+LITELLM_UPSTREAM = 'litellm'
+GIT_PROVIDER_UPSTREAM = 'git_provider'
+
+_POOL_MAX_CONNECTIONS = int(os.getenv('HTTP_POOL_MAX_CONNECTIONS', '100'))
+_POOL_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv('HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS', '20')
+)
+_POOL_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_POOL_KEEPALIVE_EXPIRY', '30'))
+# HTTP/2 requires the optional h2 package
+_POOL_HTTP2 = (
+    os.getenv('HTTP_POOL_HTTP2', 'true').lower() == 'true'
+    and importlib.util.find_spec('h2') is not None
+)
+
+
+@dataclass
+class AsyncTransportStats:
+    """Counters describing how well connections to an upstream are reused."""
+
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+
+class SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """Pooled transport which can be shared between many short lived
+    httpx.AsyncClient instances. Closing a client does not close the pooled
+    connections - they are only released by `close_pool`.
+    """
+
+    def __init__(self, upstream: str, stats: AsyncTransportStats):
+        self.upstream = upstream
+        self.stats = stats
+        self._transport = httpx.AsyncHTTPTransport(
+            verify=httpx_verify_option(),
+            http2=_POOL_HTTP2,
+            limits=httpx.Limits(
+                max_connections=_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=_POOL_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=_POOL_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests += 1
+        request.extensions['trace'] = self._build_trace(request.extensions.get('trace'))
+        return await self._transport.handle_async_request(request)
+
+    def _build_trace(self, trace: Any):
+        async def _trace(event_name: str, info: dict) -> None:
+            if event_name == 'connection.connect_tcp.complete':
+                self.stats.connections_opened += 1
+            if trace is not None:
+                await trace(event_name, info)
+
+        return _trace
+
+    async def aclose(self) -> None:
+        # Clients sharing this transport close it on exit - keep the pool alive
+        pass
+
+    async def close_pool(self) -> None:
+        await self._transport.aclose()
+
+
+class AsyncTransportPool:
+    """Lazily created shared transports, one per upstream and event loop.
+
+    Connections are bound to the event loop which opened them, so each loop
+    gets its own set of transports.
+    """
+
+    def __init__(self) -> None:
+        self._transports: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, SharedAsyncTransport]
+        ] = weakref.WeakKeyDictionary()
+        self._stats: dict[str, AsyncTransportStats] = {}
+
+    def get_transport(self, upstream: str) -> SharedAsyncTransport:
+        loop = asyncio.get_running_loop()
+        transports = self._transports.get(loop)
+        if transports is None:
+            transports = self._transports[loop] = {}
+        transport = transports.get(upstream)
+        if transport is None:
+            stats = self._stats.setdefault(upstream, AsyncTransportStats())
+            transport = transports[upstream] = SharedAsyncTransport(upstream, stats)
+        return transport
+
+    def get_stats(self) -> dict[str, AsyncTransportStats]:
+        return dict(self._stats)
+
+    async def aclose(self, upstreams: Iterable[str] | None = None) -> None:
+        """Close the transports belonging to the running event loop - only those of
+        the given upstreams if any are given, as other components may still be using
+        the rest."""
+        loop = asyncio.get_running_loop()
+        if upstreams is None:
+            transports = self._transports.pop(loop, {})
+        else:
+            loop_transports = self._transports.get(loop, {})
+            transports = {
+                upstream: loop_transports.pop(upstream)
+                for upstream in upstreams
+                if upstream in loop_transports
+            }
+        for upstream, transport in transports.items():
+            stats = transport.stats
+            logger.debug(
+                'closing_shared_async_transport',
+                extra={
+                    'upstream': upstream,
+                    'requests': stats.requests,
+                    'connections_opened': stats.connections_opened,
+                    'reused_connections': stats.reused_connections,
+                },
+            )
+            await transport.close_pool()
+
+
+_async_transport_pool = AsyncTransportPool()
+
+
+def get_shared_async_transport(upstream: str) -> SharedAsyncTransport:
+    """Get a pooled transport for the upstream, to be passed to an
+    httpx.AsyncClient so that connections (And TLS sessions) are reused
+    across clients. Must be called from within a running event loop."""
+    return _async_transport_pool.get_transport(upstream)
+
+
+def get_shared_async_transport_stats() -> dict[str, AsyncTransportStats]:
+    return _async_transport_pool.get_stats()
+
+
+async def close_shared_async_transports(upstreams: Iterable[str] | None = None) -> None:
+    await _async_transport_pool.aclose(upstreams)
@@ -0,0 +1,198 @@
+"""Tests for the write-behind ConversationStatisticsAggregator."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from openhands.app_server.app_conversation.conversation_statistics_aggregator import (
+    ConversationStatisticsAggregator,
+    close_conversation_statistics_aggregators,
+)
+from openhands.app_server.app_conversation.sql_app_conversation_info_service import (
+    SQLAppConversationInfoService,
+    StoredConversationMetadata,
+)
+from openhands.app_server.user.specifiy_user_context import SpecifyUserContext
+from openhands.app_server.utils.sql_utils import Base
+from openhands.sdk import ConversationStats
+from openhands.sdk.event import ConversationStateUpdateEvent
+
+
+@pytest.fixture
+async def session_maker():
+    engine = create_async_engine(
+        'sqlite+aiosqlite:///:memory:',
+        poolclass=StaticPool,
+        connect_args={'check_same_thread': False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def aggregator(session_maker):
+    # A long interval so that only explicit flushes write to the database
+    return ConversationStatisticsAggregator(
+        session_maker=session_maker, flush_interval=3600
+    )
+
+
+async def _create_conversation(session_maker, conversation_version='V1'):
+    conversation_id = uuid4()
+    async with session_maker() as db_session:
+        db_session.add(
+            StoredConversationMetadata(
+                conversation_id=str(conversation_id),
+                sandbox_id='sandbox_123',
+                conversation_version=conversation_version,
+                accumulated_cost=0.0,
+                prompt_tokens=0,
+                completion_tokens=0,
+                max_budget_per_task=10.0,
+                created_at=datetime.now(timezone.utc),
+                last_updated_at=datetime.now(timezone.utc),
+            )
+        )
+        await db_session.commit()
+    return conversation_id
+
+
+async def _load(session_maker, conversation_id) -> StoredConversationMetadata:
+    async with session_maker() as db_session:
+        result = await db_session.execute(
+            select(StoredConversationMetadata).where(
+                StoredConversationMetadata.conversation_id == str(conversation_id)
+            )
+        )
+        return result.scalar_one()
+
+
+def _stats(cost: float, prompt_tokens: int) -> ConversationStats:
+    return ConversationStats.model_validate(
+        {
+            'usage_to_metrics': {
+                'agent': {
+                    'accumulated_cost': cost,
+                    'accumulated_token_usage': {
+                        'prompt_tokens': prompt_tokens,
+                        'completion_tokens': 10,
+                    },
+                }
+            }
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_latest_statistics_are_flushed_in_bulk(session_maker, aggregator):
+    conversation_ids = [await _create_conversation(session_maker) for _ in range(3)]
+
+    for i, conversation_id in enumerate(conversation_ids):
+        aggregator.add(conversation_id, _stats(0.1, 100))
+        aggregator.add(conversation_id, _stats(0.2 + i, 200 + i))
+
+    # Nothing is written until a flush
+    assert (await _load(session_maker, conversation_ids[0])).prompt_tokens == 0
+
+    assert await aggregator.flush() == 3
+    for i, conversation_id in enumerate(conversation_ids):
+        stored = await _load(session_maker, conversation_id)
+        assert stored.accumulated_cost == pytest.approx(0.2 + i)
+        assert stored.prompt_tokens == 200 + i
+        assert stored.completion_tokens == 10
+        # Values missing from the stats retain the stored value
+        assert stored.max_budget_per_task == 10.0
+
+    assert await aggregator.flush() == 0
+    await aggregator.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_single_conversation(session_maker, aggregator):
+    first_id = await _create_conversation(session_maker)
+    second_id = await _create_conversation(session_maker)
+    aggregator.add(first_id, _stats(1.0, 100))
+    aggregator.add(second_id, _stats(2.0, 200))
+
+    assert await aggregator.flush([first_id]) == 1
+    assert (await _load(session_maker, first_id)).prompt_tokens == 100
+    assert (await _load(session_maker, second_id)).prompt_tokens == 0
+    await aggregator.close()
+
+
+@pytest.mark.asyncio
+async def test_v0_conversations_are_not_updated(session_maker, aggregator):
+    conversation_id = await _create_conversation(session_maker, 'V0')
+    aggregator.add(conversation_id, _stats(1.0, 100))
+    await aggregator.flush()
+    assert (await _load(session_maker, conversation_id)).prompt_tokens == 0
+    await aggregator.close()
+
+
+@pytest.mark.asyncio
+async def test_pending_statistics_are_flushed_on_shutdown(session_maker, aggregator):
+    conversation_id = await _create_conversation(session_maker)
+    aggregator.add(conversation_id, _stats(1.0, 100))
+
+    await close_conversation_statistics_aggregators()
+
+    assert (await _load(session_maker, conversation_id)).prompt_tokens == 100
+
+
+@pytest.mark.asyncio
+async def test_service_writes_behind_when_aggregator_is_set(session_maker, aggregator):
+    conversation_id = await _create_conversation(session_maker)
+    async with session_maker() as db_session:
+        service = SQLAppConversationInfoService(
+            db_session=db_session,
+            user_context=SpecifyUserContext(user_id=None),
+            statistics_aggregator=aggregator,
+        )
+        event = ConversationStateUpdateEvent(
+            key='stats', value=_stats(1.0, 100).model_dump()
+        )
+        await service.process_stats_event(event, conversation_id)
+        assert (await _load(session_maker, conversation_id)).prompt_tokens == 0
+
+        await service.flush_conversation_statistics(conversation_id)
+    assert (await _load(session_maker, conversation_id)).prompt_tokens == 100
+    await aggregator.close()
+
+
+@pytest.mark.asyncio
+async def test_service_only_writes_behind_for_accessible_conversations(
+    session_maker, aggregator
+):
+    conversation_id = await _create_conversation(session_maker)
+    # Not visible through the secure select of the service
+    other_conversation_id = await _create_conversation(session_maker, 'V0')
+    event = ConversationStateUpdateEvent(
+        key='stats', value=_stats(1.0, 100).model_dump()
+    )
+    async with session_maker() as db_session:
+        service = SQLAppConversationInfoService(
+            db_session=db_session,
+            user_context=SpecifyUserContext(user_id='user_1'),
+            statistics_aggregator=aggregator,
+        )
+        with patch.object(
+            service, '_secure_select', wraps=service._secure_select
+        ) as secure_select:
+            await service.process_stats_event(event, conversation_id)
+            await service.process_stats_event(event, conversation_id)
+            await service.process_stats_event(event, other_conversation_id)
+            # Access to each conversation is only checked once
+            assert secure_select.call_count == 2
+
+    assert aggregator.is_writable('user_1', conversation_id)
+    assert not aggregator.is_writable('user_2', conversation_id)
+    assert not aggregator.is_writable('user_1', other_conversation_id)
+    assert await aggregator.flush() == 1
+    await aggregator.close()
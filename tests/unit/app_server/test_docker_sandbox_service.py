@@ -22,6 +22,10 @@ from openhands.app_server.sandbox.docker_sandbox_service import (
     ExposedPort,
     VolumeMount,
 )
+from openhands.app_server.sandbox.sandbox_health_monitor import (
+    SandboxHealth,
+    SandboxHealthMonitor,
+)
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
     VSCODE,
@@ -1706,3 +1710,92 @@ class TestDockerSandboxServiceHostNetwork:
         # Verify - should be STARTING because container started within grace period
         assert result is not None
         assert result.status == SandboxStatus.STARTING
+
+
+class TestDockerSandboxServiceHealthMonitor:
+    """Test cases for serving sandbox health from a SandboxHealthMonitor."""
+
+    @pytest.fixture
+    async def health_monitor(self):
+        async def probe_many(httpx_client, urls):
+            return {url: SandboxHealth(healthy=True) for url in urls}
+
+        health_monitor = SandboxHealthMonitor(
+            probe_many=AsyncMock(side_effect=probe_many),
+            refresh_interval=3600,
+            max_age=3600,
+        )
+        yield health_monitor
+        await health_monitor.close()
+
+    def _create_running_container(self, name: str, host_port: int):
+        container = MagicMock()
+        container.name = name
+        container.status = 'running'
+        container.image.tags = ['spec456']
+        container.attrs = {
+            'Created': '2024-01-15T10:30:00.000000000Z',
+            'Config': {
+                'Env': ['OH_SESSION_API_KEYS_0=session_key_123'],
+                'WorkingDir': '/workspace',
+            },
+            'NetworkSettings': {'Ports': {'8000/tcp': [{'HostPort': str(host_port)}]}},
+        }
+        return container
+
+    @patch(
+        'openhands.app_server.utils.docker_utils.is_running_in_docker',
+        return_value=False,
+    )
+    async def test_search_sandboxes_probes_all_containers_at_once(
+        self, mock_is_docker, service, health_monitor
+    ):
+        service.health_monitor = health_monitor
+        service.docker_client.containers.list.return_value = [
+            self._create_running_container(f'oh-test-{i}', 12000 + i) for i in range(5)
+        ]
+
+        result = await service.search_sandboxes()
+        assert [s.status for s in result.items] == [SandboxStatus.RUNNING] * 5
+        health_monitor.probe_many.assert_awaited_once()
+        assert sorted(health_monitor.probe_many.await_args.args[1]) == [
+            f'http://localhost:{12000 + i}/health' for i in range(5)
+        ]
+
+        # Subsequent calls are served from the cache
+        await service.search_sandboxes()
+        await service.get_sandbox('oh-test-0')
+        assert health_monitor.probe_many.await_count == 1
+        service.httpx_client.get.assert_not_called()
+
+        # Unless a refresh is forced
+        service.docker_client.containers.get.return_value = (
+            service.docker_client.containers.list.return_value[0]
+        )
+        await service.get_sandbox('oh-test-0', force_refresh=True)
+        assert health_monitor.probe_many.await_count == 2
+
+    async def test_batch_get_sandboxes(self, service, health_monitor):
+        service.health_monitor = health_monitor
+        containers = {
+            f'oh-test-{i}': self._create_running_container(f'oh-test-{i}', 12000 + i)
+            for i in range(3)
+        }
+
+        def get_container(sandbox_id):
+            if sandbox_id not in containers:
+                raise NotFound('Not found')
+            return containers[sandbox_id]
+
+        service.docker_client.containers.get.side_effect = get_container
+
+        results = await service.batch_get_sandboxes(
+            ['oh-test-2', 'oh-test-missing', 'oh-test-0']
+        )
+
+        assert [r.id if r else None for r in results] == [
+            'oh-test-2',
+            None,
+            'oh-test-0',
+        ]
+        health_monitor.probe_many.assert_awaited_once()
@@ -0,0 +1,151 @@
+"""Tests for the SandboxHealthMonitor."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from openhands.app_server.sandbox.sandbox_health_monitor import (
+    SandboxHealth,
+    SandboxHealthMonitor,
+    close_sandbox_health_monitors,
+    probe_concurrently,
+)
+
+
+def _healthy_probe_many():
+    async def probe_many(httpx_client, keys):
+        return {key: SandboxHealth(healthy=True) for key in keys}
+
+    return AsyncMock(side_effect=probe_many)
+
+
+@pytest.fixture
+async def monitor():
+    monitor = SandboxHealthMonitor(
+        probe_many=_healthy_probe_many(), refresh_interval=3600, max_age=60
+    )
+    yield monitor
+    await monitor.close()
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached(monitor):
+    results = await monitor.get_many(['a', 'b'])
+    assert results == {
+        'a': SandboxHealth(healthy=True),
+        'b': SandboxHealth(healthy=True),
+    }
+    await monitor.get_many(['a', 'b'])
+    assert monitor.probe_many.await_count == 1
+    assert monitor.get_cached('a').checked_at is not None
+
+    # Only keys which are not cached are probed
+    await monitor.get_many(['a', 'c'])
+    assert monitor.probe_many.await_args.args[1] == ['c']
+
+
+@pytest.mark.asyncio
+async def test_force_refresh(monitor):
+    await monitor.get('a')
+    await monitor.get('a', force_refresh=True)
+    assert monitor.probe_many.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_results_are_probed(monitor):
+    await monitor.get('a')
+    with patch(
+        'openhands.app_server.sandbox.sandbox_health_monitor.time.monotonic',
+        return_value=time.monotonic() + 61,
+    ):
+        await monitor.get('a')
+    assert monitor.probe_many.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate(monitor):
+    await monitor.get('a')
+    monitor.invalidate('a')
+    assert monitor.get_cached('a') is None
+    await monitor.get('a')
+    assert monitor.probe_many.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_results_are_none(monitor):
+    monitor.probe_many = AsyncMock(return_value={})
+    assert await monitor.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_background_refresh():
+    monitor = SandboxHealthMonitor(
+        probe_many=_healthy_probe_many(), refresh_interval=0.01, max_age=60
+    )
+    await monitor.get('a')
+    await asyncio.sleep(0.1)
+    assert monitor.probe_many.await_count > 1
+    await close_sandbox_health_monitors()
+    assert monitor._refresh_task is None
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_stops_for_idle_keys():
+    monitor = SandboxHealthMonitor(
+        probe_many=_healthy_probe_many(),
+        refresh_interval=0.01,
+        max_age=60,
+        idle_expiry=0,
+    )
+    await monitor.get('a')
+    await asyncio.sleep(0.1)
+    assert monitor.probe_many.await_count == 1
+    assert monitor.get_cached('a') is None
+    await monitor.close()
+
+
+@pytest.mark.asyncio
+async def test_probe_concurrently():
+    """Probing 50 sandboxes takes about as long as probing one."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def probe(httpx_client, url):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return SandboxHealth(healthy=True)
+
+    urls = [f'http://localhost:{port}/alive' for port in range(50)]
+    start = time.perf_counter()
+    results = await probe_concurrently(None, urls, probe, concurrency=50)
+    assert time.perf_counter() - start < 1
+    assert list(results) == urls
+    assert max_in_flight == 50
+
+    max_in_flight = 0
+    await probe_concurrently(None, urls, probe, concurrency=10)
+    assert max_in_flight == 10
+
+
+@pytest.mark.asyncio
+async def test_probes_with_the_client_given():
+    monitor = SandboxHealthMonitor(
+        probe_many=_healthy_probe_many(), refresh_interval=3600, timeout=3
+    )
+    async with httpx.AsyncClient() as httpx_client:
+        await monitor.get('a', httpx_client=httpx_client)
+        assert monitor.probe_many.await_args.args[0] is httpx_client
+    assert monitor._httpx_client is None
+
+    # Without a client (As in the background), the monitor's own is used
+    await monitor.get('b')
+    own_client = monitor.probe_many.await_args.args[0]
+    assert own_client is monitor._httpx_client
+    assert own_client.timeout.read == 3
+    await monitor.close()
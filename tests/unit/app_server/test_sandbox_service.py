@@ -359,3 +359,43 @@ class TestCleanupOldSandboxes:
         # Verify: No sandboxes should be stopped
         assert result == []
         mock_sandbox_service.pause_sandbox_mock.assert_not_called()
+
+
+class RefreshingSandboxService(MockSandboxService):
+    """Mock implementation which takes force_refresh."""
+
+    async def get_sandbox(
+        self, sandbox_id: str, force_refresh: bool = False
+    ) -> SandboxInfo | None:
+        return await self.get_sandbox_mock(sandbox_id, force_refresh=force_refresh)
+
+
+class TestForceRefresh:
+    """Test cases for passing force_refresh on to get_sandbox."""
+
+    @pytest.mark.asyncio
+    async def test_get_sandbox_without_force_refresh(self, mock_sandbox_service):
+        """Implementations without the force_refresh parameter still work."""
+        sandbox = create_sandbox_info(
+            'sb1', SandboxStatus.RUNNING, datetime.now(timezone.utc)
+        )
+        mock_sandbox_service.get_sandbox_mock.return_value = sandbox
+
+        assert await mock_sandbox_service.wait_for_sandbox_running('sb1') == sandbox
+        assert await mock_sandbox_service.batch_get_sandboxes(
+            ['sb1'], force_refresh=True
+        ) == [sandbox]
+        mock_sandbox_service.get_sandbox_mock.assert_called_with('sb1')
+
+    @pytest.mark.asyncio
+    async def test_get_sandbox_with_force_refresh(self):
+        service = RefreshingSandboxService()
+        sandbox = create_sandbox_info(
+            'sb1', SandboxStatus.RUNNING, datetime.now(timezone.utc)
+        )
+        service.get_sandbox_mock.return_value = sandbox
+
+        assert await service.wait_for_sandbox_running('sb1') == sandbox
+        service.get_sandbox_mock.assert_called_with('sb1', force_refresh=True)
+        await service.batch_get_sandboxes(['sb1'])
+        service.get_sandbox_mock.assert_called_with('sb1', force_refresh=False)
@@ -0,0 +1,159 @@
+"""Tests for StoredSecretStr encryption and the decrypted secret cache."""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import SecretStr
+
+from openhands.app_server.services.jwt_service import JwtService
+from openhands.app_server.utils import sql_utils
+from openhands.app_server.utils.encryption_key import EncryptionKey
+from openhands.app_server.utils.sql_utils import (
+    DecryptedSecretCache,
+    StoredSecretStr,
+    get_decrypted_secret_cache,
+)
+
+
+def _create_jwt_service(*key_ids: str) -> JwtService:
+    return JwtService(
+        keys=[
+            EncryptionKey(
+                id=key_id,
+                key=SecretStr(f'secret_for_{key_id}'),
+                active=True,
+                created_at=datetime(2024, 1, i + 1),
+            )
+            for i, key_id in enumerate(key_ids)
+        ]
+    )
+
+
+@pytest.fixture
+def jwt_service():
+    jwt_service = _create_jwt_service('key1')
+    get_decrypted_secret_cache().clear()
+    with patch.object(sql_utils, '_get_jwt_service', return_value=jwt_service):
+        yield jwt_service
+    get_decrypted_secret_cache().clear()
+
+
+def test_round_trip(jwt_service):
+    stored_secret_str = StoredSecretStr()
+    token = stored_secret_str.process_bind_param(SecretStr('my-secret'), None)
+    assert 'my-secret' not in token
+    result = stored_secret_str.process_result_param(token, None)
+    assert result.get_secret_value() == 'my-secret'
+    assert stored_secret_str.process_bind_param(None, None) is None
+    assert stored_secret_str.process_result_param(None, None) is None
+
+
+def test_bulk_decoding_decrypts_each_token_once(jwt_service):
+    """Loading the same rows repeatedly only performs the decryption once per row."""
+    stored_secret_str = StoredSecretStr()
+    tokens = [jwt_service.create_jwe_token({'v': f'secret-{i}'}) for i in range(50)]
+    with patch.object(
+        jwt_service, 'decrypt_jwe_token', wraps=jwt_service.decrypt_jwe_token
+    ) as decrypt_jwe_token:
+        for _ in range(10):
+            values = [
+                stored_secret_str.process_result_param(token, None).get_secret_value()
+                for token in tokens
+            ]
+            assert values == [f'secret-{i}' for i in range(50)]
+    assert decrypt_jwe_token.call_count == 50
+
+
+def test_unchanged_value_is_not_reencrypted(jwt_service):
+    stored_secret_str = StoredSecretStr()
+    token = jwt_service.create_jwe_token({'v': 'my-secret'})
+    loaded = stored_secret_str.process_result_param(token, None)
+    with patch.object(jwt_service, 'create_jwe_token') as create_jwe_token:
+        assert stored_secret_str.process_bind_param(loaded, None) == token
+    create_jwe_token.assert_not_called()
+
+    # A new value with the same content is still encrypted
+    new_token = stored_secret_str.process_bind_param(SecretStr('my-secret'), None)
+    assert new_token != token
+
+
+def test_value_is_reencrypted_after_key_rotation():
+    old_jwt_service = _create_jwt_service('key1')
+    new_jwt_service = _create_jwt_service('key1', 'key2')
+    stored_secret_str = StoredSecretStr()
+    token = old_jwt_service.create_jwe_token({'v': 'my-secret'})
+    get_decrypted_secret_cache().clear()
+    with patch.object(sql_utils, '_get_jwt_service', return_value=new_jwt_service):
+        loaded = stored_secret_str.process_result_param(token, None)
+        new_token = stored_secret_str.process_bind_param(loaded, None)
+    assert new_token != token
+    assert new_jwt_service.decrypt_jwe_token(new_token)['v'] == 'my-secret'
+    get_decrypted_secret_cache().clear()
+
+
+def test_cache_is_cleared_when_config_changes():
+    cache = get_decrypted_secret_cache()
+    cache.put('key1', 'token', 'value')
+    injector = MagicMock()
+    config = MagicMock(jwt=injector)
+    with (
+        patch('openhands.app_server.config.get_global_config', return_value=config),
+        patch.object(sql_utils, '_jwt_service_resolution', None),
+    ):
+        assert sql_utils._get_jwt_service() is injector.get_jwt_service.return_value
+        assert len(cache) == 0
+        cache.put('key1', 'token', 'value')
+        sql_utils._get_jwt_service()
+        assert cache.get('key1', 'token') == 'value'
+    cache.clear()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = DecryptedSecretCache(max_size=2)
+    cache.put('key1', 'a', '1')
+    cache.put('key1', 'b', '2')
+    assert cache.get('key1', 'a') == '1'
+    cache.put('key1', 'c', '3')
+    assert cache.get('key1', 'b') is None
+    assert cache.get('key1', 'a') == '1'
+    assert cache.get('key1', 'c') == '3'
+
+
+def test_cache_entries_expire():
+    cache = DecryptedSecretCache(ttl=10)
+    with patch.object(sql_utils.time, 'monotonic', return_value=100):
+        cache.put('key1', 'a', '1')
+    with patch.object(sql_utils.time, 'monotonic', return_value=105):
+        assert cache.get('key1', 'a') == '1'
+    with patch.object(sql_utils.time, 'monotonic', return_value=111):
+        assert cache.get('key1', 'a') is None
+
+
+def test_cache_clear_by_key_id():
+    cache = DecryptedSecretCache()
+    cache.put('key1', 'a', '1')
+    cache.put('key2', 'b', '2')
+    cache.clear('key1')
+    assert cache.get('key1', 'a') is None
+    assert cache.get('key2', 'b') == '2'
+
+
+def test_copied_value_is_reencrypted(jwt_service):
+    stored_secret_str = StoredSecretStr()
+    token = jwt_service.create_jwe_token({'v': 'my-secret'})
+    loaded = stored_secret_str.process_result_param(token, None)
+    copied = SecretStr(loaded.get_secret_value())
+    assert stored_secret_str.process_bind_param(copied, None) != token
+    assert stored_secret_str.process_bind_param(loaded, None) == token
+
+
+def test_stored_token_is_not_reused_for_another_value():
+    cache = DecryptedSecretCache()
+    value = SecretStr('a')
+    cache.remember_token(value, 'key1', 'token')
+    assert cache.get_stored_token(value, 'key1') == 'token'
+    assert cache.get_stored_token(value, 'key2') is None
+    assert cache.get_stored_token(SecretStr('a'), 'key1') is None
+    cache.clear('key1')
+    assert cache.get_stored_token(value, 'key1') is None
@@ -1,6 +1,12 @@
+import base64
+import pickle
 from unittest.mock import patch
 
-from openhands.controller.state.state import State, TrafficControlState
+from openhands.controller.state.state import (
+    SNAPSHOT_PREFIX,
+    State,
+    TrafficControlState,
+)
 from openhands.core.schema import AgentState
 from openhands.events.event import Event
 from openhands.llm.metrics import Metrics
@@ -123,3 +129,50 @@ def test_save_without_deprecated_fields():
         restored_state.iteration_flag.current_value == 0
     )  # The depreciated attrib was not stored, so it did not override existing values on restore
     assert restored_state.iteration_flag.max_value == 100
+
+
+def test_snapshot_is_compressed():
+    state = State(session_id='test_sid')
+    state.extra_data['condenser_meta'] = [
+        {'summary': f'The agent edited file {i}. ' * 20} for i in range(100)
+    ]
+    store = InMemoryFileStore()
+    state.save_to_session('test_sid', store, None)
+
+    encoded = store.read('sessions/test_sid/agent_state.pkl')
+    assert encoded.startswith(SNAPSHOT_PREFIX)
+    assert len(encoded) < len(base64.b64encode(pickle.dumps(state))) / 5
+
+    restored_state = State.restore_from_session('test_sid', store, None)
+    assert restored_state.extra_data == state.extra_data
+
+
+def test_restore_legacy_snapshot():
+    """Snapshots saved by older versions are base64 encoded pickles."""
+    state = State(session_id='test_sid', agent_state=AgentState.PAUSED)
+    store = InMemoryFileStore()
+    store.write(
+        'sessions/test_sid/agent_state.pkl',
+        base64.b64encode(pickle.dumps(state)).decode('utf-8'),
+    )
+
+    restored_state = State.restore_from_session('test_sid', store, None)
+    assert restored_state.session_id == 'test_sid'
+    assert restored_state.resume_state == AgentState.PAUSED
+
+
+def test_unchanged_state_is_not_rewritten():
+    state = State(session_id='test_sid')
+    store = InMemoryFileStore()
+    with patch.object(store, 'write', wraps=store.write) as write:
+        state.save_to_session('test_sid', store, None)
+        state.save_to_session('test_sid', store, None)
+        assert write.call_count == 1
+
+        state.agent_state = AgentState.RUNNING
+        state.save_to_session('test_sid', store, None)
+        assert write.call_count == 2
+
+        # Saving to another session is not skipped
+        state.save_to_session('other_sid', store, None)
+        assert write.call_count == 3
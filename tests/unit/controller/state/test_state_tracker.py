@@ -0,0 +1,143 @@
+from unittest.mock import patch
+
+import pytest
+
+from openhands.controller.state import state_tracker
+from openhands.controller.state.state import State
+from openhands.controller.state.state_tracker import StateTracker
+from openhands.events.action import AgentDelegateAction, CmdRunAction, MessageAction
+from openhands.events.action.agent import CondensationAction
+from openhands.events.event import EventSource
+from openhands.events.observation import AgentDelegateObservation, CmdOutputObservation
+from openhands.events.observation.agent import AgentStateChangedObservation
+from openhands.events.stream import EventStream
+from openhands.memory.view import View
+from openhands.storage.memory import InMemoryFileStore
+
+
+@pytest.fixture
+def event_stream():
+    return EventStream('test-session', InMemoryFileStore())
+
+
+def add_step(event_stream: EventStream, index: int) -> None:
+    event_stream.add_event(CmdRunAction(command=f'echo {index}'), EventSource.AGENT)
+    event_stream.add_event(
+        CmdOutputObservation(content=str(index), command=f'echo {index}'),
+        EventSource.ENVIRONMENT,
+    )
+
+
+def add_delegate_action(event_stream: EventStream) -> None:
+    event_stream.add_event(
+        AgentDelegateAction(agent='BrowsingAgent', inputs={'task': 'browse'}),
+        EventSource.AGENT,
+    )
+
+
+def add_delegate_observation(event_stream: EventStream) -> None:
+    event_stream.add_event(
+        AgentDelegateObservation(content='done', outputs={}), EventSource.AGENT
+    )
+
+
+def restore(event_stream: EventStream, start_id: int = 0, lazy: bool = False):
+    tracker = StateTracker('test-session', event_stream.file_store, None)
+    tracker.state = State(inputs={})
+    tracker.state.start_id = start_id
+    tracker._init_history(event_stream, lazy=lazy)
+    return tracker.state
+
+
+def test_init_history_filters_events(event_stream: EventStream):
+    event_stream.add_event(MessageAction(content='task'), EventSource.USER)
+    add_step(event_stream, 0)
+    event_stream.add_event(
+        AgentStateChangedObservation(content='', agent_state='running'),
+        EventSource.ENVIRONMENT,
+    )
+    hidden_action = CmdRunAction(command='hidden')
+    hidden_action.hidden = True
+    event_stream.add_event(hidden_action, EventSource.AGENT)
+
+    state = restore(event_stream, start_id=1)
+    assert [event.id for event in state.history] == [1, 2]
+    assert state.start_id == 1
+
+
+def test_init_history_excludes_delegate_events(event_stream: EventStream):
+    event_stream.add_event(MessageAction(content='task'), EventSource.USER)  # 0
+    add_delegate_action(event_stream)  # 1
+    add_step(event_stream, 0)  # 2, 3
+    add_delegate_action(event_stream)  # 4, nested
+    add_step(event_stream, 1)  # 5, 6
+    add_delegate_observation(event_stream)  # 7
+    add_delegate_observation(event_stream)  # 8
+    add_step(event_stream, 2)  # 9, 10
+    add_delegate_action(event_stream)  # 11
+    add_step(event_stream, 3)  # 12, 13
+    add_delegate_observation(event_stream)  # 14
+    add_delegate_action(event_stream)  # 15, still running
+    add_step(event_stream, 4)  # 16, 17
+
+    state = restore(event_stream)
+    assert [event.id for event in state.history] == [
+        0,
+        1,
+        8,
+        9,
+        10,
+        11,
+        14,
+        15,
+        16,
+        17,
+    ]
+    assert state.start_id == 0
+
+
+def test_init_history_lazy_restore_keeps_condensed_view(event_stream: EventStream):
+    event_stream.add_event(MessageAction(content='task'), EventSource.USER)
+    for index in range(10):
+        add_step(event_stream, index)
+    event_stream.add_event(
+        CondensationAction(
+            forgotten_events_start_id=0,
+            forgotten_events_end_id=16,
+            summary='summary',
+            summary_offset=0,
+        ),
+        EventSource.AGENT,
+    )
+    add_step(event_stream, 10)
+
+    state = restore(event_stream)
+    lazy_state = restore(event_stream, lazy=True)
+
+    # The forgotten steps are skipped, but the user message is still available
+    assert [event.id for event in lazy_state.history] == [0, 17, 18, 19, 20, 21, 22, 23]
+    view = View.from_events(state.history)
+    lazy_view = View.from_events(lazy_state.history)
+    assert [event.id for event in lazy_view] == [event.id for event in view]
+    assert lazy_view[0].content == 'summary'
+
+
+def test_init_history_only_deserializes_restored_events(event_stream: EventStream):
+    """Restoring a long session with many delegations skips the delegate events
+    without deserializing them, and in a single pass over the events."""
+    event_stream.add_event(MessageAction(content='task'), EventSource.USER)
+    for index in range(200):
+        add_delegate_action(event_stream)
+        for step in range(10):
+            add_step(event_stream, step)
+        add_delegate_observation(event_stream)
+        add_step(event_stream, index)
+
+    with patch.object(
+        state_tracker, 'event_from_dict', wraps=state_tracker.event_from_dict
+    ) as event_from_dict:
+        state = restore(event_stream)
+
+    # The user message, and the delegate actions, observations and steps in between
+    assert len(state.history) == 1 + 200 * 4
+    assert event_from_dict.call_count == len(state.history)
@@ -1,4 +1,5 @@
 import logging
+import random
 from unittest.mock import Mock, patch
 
 import pytest
@@ -12,7 +13,9 @@ from openhands.events.action import (
     FileReadAction,
     MessageAction,
 )
+from openhands.events.action.action import Action
 from openhands.events.action.commands import IPythonRunCellAction
+from openhands.events.action.empty import NullAction
 from openhands.events.event import Event
 from openhands.events.observation import (
     CmdOutputObservation,
@@ -22,6 +25,7 @@ from openhands.events.observation.agent import AgentCondensationObservation
 from openhands.events.observation.commands import IPythonRunCellObservation
 from openhands.events.observation.empty import NullObservation
 from openhands.events.observation.error import ErrorObservation
+from openhands.events.observation.observation import Observation
 from openhands.events.stream import EventSource, EventStream
 from openhands.storage import get_file_store
 
@@ -1027,3 +1031,262 @@ class TestAgentController:
         controller.delegate = Mock()
         controller.delegate._is_stuck.return_value = True
         assert controller._is_stuck() is True
+
+
+class BaselineStuckDetector(StuckDetector):
+    """StuckDetector as it was before it was made incremental, which looks at the whole
+    history on each check. Kept as the oracle for the incremental detector, the checks
+    it does not override are unchanged."""
+
+    def is_stuck(self, headless_mode: bool = True) -> bool:
+        filtered_history_offset = 0
+        if not headless_mode:
+            # In interactive mode, only look at history after the last user message
+            last_user_msg_idx = -1
+            for i, event in enumerate(reversed(self.state.history)):
+                if (
+                    isinstance(event, MessageAction)
+                    and event.source == EventSource.USER
+                ):
+                    last_user_msg_idx = len(self.state.history) - i - 1
+                    break
+            filtered_history_offset = last_user_msg_idx + 1
+            history_to_check = self.state.history[last_user_msg_idx + 1 :]
+        else:
+            # In headless mode, look at all history
+            history_to_check = self.state.history
+
+        # Filter out user messages and null events
+        filtered_history = [
+            event
+            for event in history_to_check
+            if not (
+                (isinstance(event, MessageAction) and event.source == EventSource.USER)
+                or isinstance(event, (NullAction, NullObservation))
+            )
+        ]
+
+        if len(filtered_history) < 3:
+            return False
+
+        last_actions: list[Event] = []
+        last_observations: list[Event] = []
+        for event in reversed(filtered_history):
+            if isinstance(event, Action) and len(last_actions) < 4:
+                last_actions.append(event)
+            elif isinstance(event, Observation) and len(last_observations) < 4:
+                last_observations.append(event)
+
+            if len(last_actions) == 4 and len(last_observations) == 4:
+                break
+
+        if self._is_stuck_repeating_action_observation(
+            last_actions, last_observations, filtered_history, filtered_history_offset
+        ):
+            return True
+
+        if self._is_stuck_repeating_action_error(
+            last_actions, last_observations, filtered_history, filtered_history_offset
+        ):
+            return True
+
+        if self._is_stuck_monologue(filtered_history, filtered_history_offset):
+            return True
+
+        if len(filtered_history) >= 6:
+            if self._is_stuck_action_observation_pattern(
+                filtered_history, filtered_history_offset
+            ):
+                return True
+
+        if len(filtered_history) >= 10:
+            if self._is_stuck_context_window_error(
+                filtered_history, filtered_history_offset
+            ):
+                return True
+
+        self.stuck_analysis = None
+        return False
+
+    def _is_stuck_monologue(
+        self, filtered_history: list[Event], filtered_history_offset: int = 0
+    ) -> bool:
+        agent_message_actions = [
+            (i, event)
+            for i, event in enumerate(filtered_history)
+            if isinstance(event, MessageAction) and event.source == EventSource.AGENT
+        ]
+
+        if len(agent_message_actions) >= 3:
+            last_agent_message_actions = agent_message_actions[-3:]
+
+            if all(
+                (last_agent_message_actions[0][1] == action[1])
+                for action in last_agent_message_actions
+            ):
+                start_index = last_agent_message_actions[0][0]
+                end_index = last_agent_message_actions[-1][0]
+
+                has_observation_between = False
+                for event in filtered_history[start_index + 1 : end_index]:
+                    if isinstance(event, Observation):
+                        has_observation_between = True
+                        break
+
+                if not has_observation_between:
+                    self.stuck_analysis = StuckDetector.StuckAnalysis(
+                        loop_type='monologue',
+                        loop_repeat_times=3,
+                        loop_start_idx=start_index + filtered_history_offset,
+                    )
+                    return True
+        return False
+
+    def _is_stuck_action_observation_pattern(
+        self, filtered_history: list[Event], filtered_history_offset: int = 0
+    ) -> bool:
+        last_six_actions: list[Event] = []
+        last_six_observations: list[Event] = []
+
+        for event in reversed(filtered_history):
+            if isinstance(event, Action) and len(last_six_actions) < 6:
+                last_six_actions.append(event)
+            elif isinstance(event, Observation) and len(last_six_observations) < 6:
+                last_six_observations.append(event)
+
+            if len(last_six_actions) == 6 and len(last_six_observations) == 6:
+                break
+
+        if len(last_six_actions) == 6 and len(last_six_observations) == 6:
+            actions_equal = (
+                self._eq_no_pid(last_six_actions[0], last_six_actions[2])
+                and self._eq_no_pid(last_six_actions[0], last_six_actions[4])
+                and self._eq_no_pid(last_six_actions[1], last_six_actions[3])
+                and self._eq_no_pid(last_six_actions[1], last_six_actions[5])
+            )
+            observations_equal = (
+                self._eq_no_pid(last_six_observations[0], last_six_observations[2])
+                and self._eq_no_pid(last_six_observations[0], last_six_observations[4])
+                and self._eq_no_pid(last_six_observations[1], last_six_observations[3])
+                and self._eq_no_pid(last_six_observations[1], last_six_observations[5])
+            )
+
+            if actions_equal and observations_equal:
+                self.stuck_analysis = StuckDetector.StuckAnalysis(
+                    loop_type='repeating_action_observation_pattern',
+                    loop_repeat_times=3,
+                    loop_start_idx=filtered_history.index(last_six_actions[-1])
+                    + filtered_history_offset,
+                )
+                return True
+        return False
+
+    def _is_stuck_context_window_error(
+        self, filtered_history: list[Event], filtered_history_offset: int = 0
+    ) -> bool:
+        condensation_events = [
+            (i, event)
+            for i, event in enumerate(filtered_history)
+            if isinstance(event, AgentCondensationObservation)
+        ]
+
+        if len(condensation_events) < 10:
+            return False
+
+        last_condensation_events = condensation_events[-10:]
+
+        for i in range(len(last_condensation_events) - 1):
+            start_idx = last_condensation_events[i][0]
+            end_idx = last_condensation_events[i + 1][0]
+
+            has_other_events = False
+            for event in filtered_history[start_idx + 1 : end_idx]:
+                if not isinstance(event, AgentCondensationObservation):
+                    has_other_events = True
+                    break
+
+            if not has_other_events:
+                self.stuck_analysis = StuckDetector.StuckAnalysis(
+                    loop_type='context_window_error',
+                    loop_repeat_times=2,
+                    loop_start_idx=start_idx + filtered_history_offset,
+                )
+                return True
+
+        return False
+
+
+class TestIncrementalStuckDetector:
+    """The detector keeps a window of the history across checks, which must give the
+    same results as the baseline detector looking at the whole history on each check."""
+
+    @pytest.fixture
+    def stuck_detector(self):
+        state = State(inputs={})
+        state.history = []
+        return StuckDetector(state)
+
+    @staticmethod
+    def _random_event(rng: random.Random) -> Event:
+        kind = rng.randrange(8)
+        if kind == 0:
+            message = MessageAction(content=rng.choice(['hi', 'continue']))
+            message._source = rng.choice([EventSource.USER, EventSource.AGENT])
+            return message
+        if kind == 1:
+            return ErrorObservation(content=rng.choice(['error', 'other error']))
+        if kind == 2:
+            return AgentCondensationObservation('AgentCondensationObservation content')
+        if kind == 3:
+            return NullObservation(content='')
+        if kind in (4, 5):
+            return rng.choice([cmd_ls_action, read_file1_action, pwd_action])
+        return rng.choice(
+            [cmd_ls_observation, read_file1_observation, read_file2_observation]
+        )
+
+    @staticmethod
+    def _assert_same_as_baseline(
+        stuck_detector: StuckDetector, headless_mode: bool
+    ) -> None:
+        baseline_detector = BaselineStuckDetector(stuck_detector.state)
+        is_stuck = stuck_detector.is_stuck(headless_mode)
+        assert is_stuck == baseline_detector.is_stuck(headless_mode)
+        if is_stuck:
+            assert stuck_detector.stuck_analysis == baseline_detector.stuck_analysis
+
+    @pytest.mark.parametrize('headless_mode', [True, False])
+    def test_incremental_checks_match_baseline_checks(
+        self, stuck_detector: StuckDetector, headless_mode: bool
+    ):
+        rng = random.Random(42)
+        state = stuck_detector.state
+        for _ in range(500):
+            action = rng.random()
+            if action < 0.05 and state.history:
+                # Truncated in place
+                del state.history[rng.randrange(len(state.history)) :]
+            elif action < 0.1:
+                # Replaced, e.g. when restoring the state
+                state.history = list(state.history)
+            else:
+                for _ in range(rng.randint(1, 3)):
+                    state.history.append(self._random_event(rng))
+            self._assert_same_as_baseline(stuck_detector, headless_mode)
+
+    def test_incremental_checks_on_repeated_steps(self, stuck_detector: StuckDetector):
+        state = stuck_detector.state
+        for _ in range(4):
+            state.history.append(cmd_ls_action)
+            self._assert_same_as_baseline(stuck_detector, True)
+            state.history.append(cmd_ls_observation)
+            self._assert_same_as_baseline(stuck_detector, True)
+        assert stuck_detector.is_stuck(headless_mode=True)
+
+        # A user message starts a new segment in interactive mode only
+        message = MessageAction(content='Please continue')
+        message._source = EventSource.USER
+        state.history.append(message)
+        assert stuck_detector.is_stuck(headless_mode=True)
+        assert not stuck_detector.is_stuck(headless_mode=False)
+        self._assert_same_as_baseline(stuck_detector, False)
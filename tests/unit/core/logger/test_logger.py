@@ -1,7 +1,16 @@
 import logging
+import os
+import queue
+import threading
 from unittest.mock import patch
 
-from openhands.core.logger import RedactURLParamsFilter, SensitiveDataFilter
+from openhands.core.logger import (
+    BoundedQueueHandler,
+    RedactURLParamsFilter,
+    SensitiveDataFilter,
+    SensitiveDataRedactor,
+    add_handlers,
+)
 
 
 @patch.dict(
@@ -117,6 +126,71 @@ def test_sensitive_data_filter_case_sensitivity():
     assert record.msg.count('******') == 3
 
 
+def _filter_message(filter: SensitiveDataFilter, msg: str) -> str:
+    record = logging.LogRecord(
+        name='test_logger',
+        level=logging.INFO,
+        pathname='test.py',
+        lineno=1,
+        msg=msg,
+        args=(),
+        exc_info=None,
+    )
+    filter.filter(record)
+    return record.msg
+
+
+@patch.dict('os.environ', {}, clear=True)
+def test_sensitive_data_filter_environment_changes():
+    filter = SensitiveDataFilter()
+    assert _filter_message(filter, 'Token: late-token-123') == 'Token: late-token-123'
+
+    # Values added after the filter was created are still masked
+    os.environ['LATE_TOKEN'] = 'late-token-123'
+    assert _filter_message(filter, 'Token: late-token-123') == 'Token: ******'
+
+    os.environ['LATE_TOKEN'] = 'changed-token-456'
+    assert _filter_message(filter, 'Token: late-token-123') == 'Token: late-token-123'
+    assert _filter_message(filter, 'Token: changed-token-456') == 'Token: ******'
+
+
+@patch.dict(
+    'os.environ',
+    {'SHORT_KEY': 'abc-secret', 'LONG_KEY': 'abc-secret-extended'},
+    clear=True,
+)
+def test_sensitive_data_filter_overlapping_values():
+    filter = SensitiveDataFilter()
+    assert (
+        _filter_message(filter, 'a: abc-secret-extended, b: abc-secret')
+        == 'a: ******, b: ******'
+    )
+
+
+@patch.dict('os.environ', {}, clear=True)
+def test_sensitive_data_filter_attributes():
+    filter = SensitiveDataFilter()
+    assert (
+        _filter_message(filter, "llm_api_key='sk-123' model=gpt-4 GITHUB_TOKEN=ghp-1")
+        == "llm_api_key='******' model=gpt-4 GITHUB_TOKEN='******'"
+    )
+    assert _filter_message(filter, 'Api_Key=abc') == 'Api_Key=abc'
+
+
+@patch.dict('os.environ', {'API_KEY': 'secret-key-789'}, clear=True)
+def test_sensitive_data_filter_does_not_inspect_environment_per_record():
+    filter = SensitiveDataFilter()
+    with patch.object(
+        SensitiveDataRedactor,
+        'refresh',
+        autospec=True,
+        side_effect=SensitiveDataRedactor.refresh,
+    ) as refresh:
+        for _ in range(1000):
+            assert _filter_message(filter, 'Key: secret-key-789') == 'Key: ******'
+    assert refresh.call_count <= 1
+
+
 # --------------------------------------------------------------------------
 # RedactURLParamsFilter tests
 # --------------------------------------------------------------------------
@@ -301,3 +375,83 @@ def test_redact_url_params_filter_msg_embedded_url():
     assert 'secret-uuid-123' not in record.msg
     assert 'resend_all=true' in record.msg
     assert '<redacted>' in record.msg or '%3Credacted%3E' in record.msg
+
+
+# --------------------------------------------------------------------------
+# BoundedQueueHandler tests
+# --------------------------------------------------------------------------
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread())
+
+
+def _queued_logger(name: str, handler: logging.Handler, maxsize: int = 100):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    with (
+        patch('openhands.core.logger.LOG_QUEUE', True),
+        patch('openhands.core.logger.LOG_QUEUE_SIZE', maxsize),
+        patch('openhands.core.logger.atexit.register'),
+    ):
+        add_handlers(logger, handler)
+    return logger, logger.handlers[-1]
+
+
+def test_queued_records_are_handled_on_a_background_thread():
+    handler = _RecordingHandler()
+    logger, queue_handler = _queued_logger('test_queue_background', handler)
+    assert isinstance(queue_handler, BoundedQueueHandler)
+
+    args = ['original']
+    logger.info('Value: %s', args)
+    # Args are merged when the record is emitted, not when it is handled
+    args[0] = 'changed'
+    queue_handler.listener.stop()
+
+    assert handler.messages == ["Value: ['original']"]
+    assert threading.current_thread() not in handler.threads
+    logger.removeHandler(queue_handler)
+
+
+def test_queued_records_are_dropped_when_full():
+    log_queue = queue.Queue(maxsize=2)
+    queue_handler = BoundedQueueHandler(log_queue, overflow='drop')
+    logger = logging.getLogger('test_queue_drop')
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+
+    for i in range(5):
+        logger.warning('Message %s', i)
+    assert queue_handler.dropped == 3
+    assert [log_queue.get_nowait().msg for _ in range(2)] == [
+        'Message 0',
+        'Message 1',
+    ]
+
+    logger.warning('Message 5')
+    assert [log_queue.get_nowait().msg for _ in range(2)] == [
+        'Message 5',
+        'Dropped 3 log records as the log queue was full',
+    ]
+    assert queue_handler.dropped == 0
+    logger.removeHandler(queue_handler)
+
+
+def test_queued_records_block_when_full():
+    handler = _RecordingHandler()
+    logger, queue_handler = _queued_logger('test_queue_block', handler, maxsize=1)
+    queue_handler.overflow = 'block'
+    for i in range(50):
+        logger.info('Message %s', i)
+    queue_handler.listener.stop()
+    assert handler.messages == [f'Message {i}' for i in range(50)]
+    logger.removeHandler(queue_handler)
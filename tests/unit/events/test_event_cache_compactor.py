@@ -0,0 +1,125 @@
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from openhands.events import EventSource, EventStream
+from openhands.events.event_cache_compactor import (
+    EventCacheCompactor,
+    compact_event_cache,
+)
+from openhands.events.event_store import EventStore
+from openhands.events.observation import NullObservation
+from openhands.storage.memory import InMemoryFileStore
+
+
+@pytest.fixture
+def file_store():
+    return InMemoryFileStore()
+
+
+def write_events(file_store, num_events: int, sid: str = 'abc') -> None:
+    """Write events without cache pages, as for conversations from before pages."""
+    event_stream = EventStream(sid, file_store)
+    event_stream.cache_size = num_events + 1
+    for i in range(num_events):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+
+def count_reads(event_store: EventStore) -> int:
+    with patch.object(
+        event_store.file_store, 'read', wraps=event_store.file_store.read
+    ) as read:
+        events = list(event_store.search_events())
+    assert [event.content for event in events] == [
+        f'test{i}' for i in range(len(events))
+    ]
+    return read.call_count
+
+
+def test_compact_conversation_without_pages(file_store):
+    write_events(file_store, 12)
+    event_store = EventStore('abc', file_store, None, cache_size=5)
+    assert count_reads(event_store) == 3 + 12
+
+    # Two full pages, and the last page with two events
+    assert compact_event_cache(event_store) == 3
+    assert count_reads(event_store) == 3
+    assert compact_event_cache(event_store) == 0
+
+
+def test_compact_rewrites_last_page(file_store):
+    write_events(file_store, 7)
+    event_store = EventStore('abc', file_store, None, cache_size=5)
+    assert compact_event_cache(event_store) == 2
+
+    event_stream = EventStream('abc', file_store)
+    event_stream.cache_size = 5
+    event_stream.add_event(NullObservation('test7'), EventSource.AGENT)
+    assert count_reads(event_store) == 2 + 1
+
+    assert compact_event_cache(event_store) == 1
+    assert count_reads(event_store) == 2
+
+
+def test_compact_with_missing_event(file_store):
+    write_events(file_store, 5)
+    event_store = EventStore('abc', file_store, None, cache_size=5)
+    file_store.delete(event_store._get_filename_for_id(2, None))
+
+    assert compact_event_cache(event_store) == 1
+    page = json.loads(file_store.read(event_store._get_filename_for_cache(0, 5)))
+    assert [data['id'] for data in page] == [0, 1]
+    assert [event.id for event in event_store.search_events()] == [0, 1, 3, 4]
+
+
+def test_compressed_pages(file_store):
+    write_events(file_store, 10)
+    event_store = EventStore('abc', file_store, None, cache_size=5)
+    assert compact_event_cache(event_store, compress=True) == 2
+    assert file_store.read(event_store._get_filename_for_cache(0, 5)).startswith(
+        'zlib:'
+    )
+    assert count_reads(event_store) == 2
+
+
+def test_stream_pages_stay_aligned_after_restart(file_store):
+    event_stream = EventStream('abc', file_store)
+    event_stream.cache_size = 5
+    for i in range(3):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    restarted_stream = EventStream('abc', file_store)
+    restarted_stream.cache_size = 5
+    for i in range(3, 10):
+        restarted_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    event_store = EventStore('abc', file_store, None, cache_size=5)
+    assert count_reads(event_store) == 2
+
+
+def test_compactor_waits_until_idle(file_store):
+    write_events(file_store, 5)
+    compactor = EventCacheCompactor(delay=0.2)
+    try:
+        compactor.schedule('abc', file_store, None, cache_size=5)
+        time.sleep(0.1)
+        compactor.schedule('abc', file_store, None, cache_size=5)
+        time.sleep(0.15)
+        assert 'sessions/abc/event_cache/0-5.json' not in file_store.files
+
+        time.sleep(0.2)
+        assert 'sessions/abc/event_cache/0-5.json' in file_store.files
+    finally:
+        compactor.close()
+
+
+def test_missing_page_schedules_compaction(file_store):
+    write_events(file_store, 5)
+    event_store = EventStore('abc', file_store, None, cache_size=5)
+    with patch(
+        'openhands.events.event_cache_compactor._event_cache_compactor'
+    ) as compactor:
+        list(event_store.search_events())
+    compactor.schedule.assert_called_with('abc', file_store, None, 5)
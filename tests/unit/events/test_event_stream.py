@@ -3,6 +3,7 @@ import json
 import os
 import time
 from datetime import datetime
+from unittest.mock import patch
 
 import psutil
 import pytest
@@ -863,3 +864,25 @@ def test_nested_dict_secret_replacement(temp_dir: str):
     assert 'password123' not in data_with_secrets_replaced['args']['command']
     assert 'password123' not in data_with_secrets_replaced['args']['env']['SECRET_KEY']
     assert 'password123' not in data_with_secrets_replaced['args']['env']['timestamp']
+
+
+def test_cur_id_marker(temp_dir: str):
+    """With the marker, the next event ID is found without listing the events."""
+    file_store = get_file_store('local', temp_dir)
+    with (
+        patch('openhands.events.event_store.EVENT_CUR_ID_MARKER', True),
+        patch('openhands.events.stream.EVENT_CUR_ID_MARKER', True),
+    ):
+        event_stream = EventStream('abc', file_store)
+        event_stream.cache_size = 5
+        for i in range(12):
+            event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+        # The marker is at the end of the last full page
+        assert file_store.read(event_stream._get_filename_for_cur_id()) == '10'
+
+        with patch.object(file_store, 'list', wraps=file_store.list) as list_files:
+            assert EventStream('abc', file_store).cur_id == 12
+            event_stream.close()
+            assert EventStream('abc', file_store).cur_id == 12
+        list_files.assert_not_called()
+        assert file_store.read(event_stream._get_filename_for_cur_id()) == '12'
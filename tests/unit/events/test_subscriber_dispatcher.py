@@ -0,0 +1,210 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from openhands.events import EventSource, EventStream, EventStreamSubscriber
+from openhands.events.observation import NullObservation
+from openhands.events.subscriber_dispatcher import (
+    SubscriberDispatcher,
+    get_subscriber_dispatcher,
+)
+from openhands.storage.memory import InMemoryFileStore
+
+
+@pytest.fixture
+def file_store():
+    return InMemoryFileStore()
+
+
+def wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'Timed out'
+        time.sleep(0.01)
+
+
+def test_callbacks_get_events_in_order(file_store):
+    event_stream = EventStream('abc', file_store)
+    received: dict[str, list[int]] = {'slow': [], 'fast': []}
+
+    def slow_callback(event):
+        time.sleep(0.001)
+        received['slow'].append(event.id)
+
+    event_stream.subscribe(EventStreamSubscriber.TEST, slow_callback, 'slow')
+    event_stream.subscribe(
+        EventStreamSubscriber.TEST,
+        lambda event: received['fast'].append(event.id),
+        'fast',
+    )
+    for i in range(50):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    # Closing waits for the queued events
+    event_stream.close()
+    assert received['slow'] == list(range(50))
+    assert received['fast'] == list(range(50))
+
+
+def test_callbacks_keep_their_event_loop(file_store):
+    event_stream = EventStream('abc', file_store)
+    loops = []
+
+    async def get_loop():
+        return asyncio.get_running_loop()
+
+    def callback(event):
+        loops.append(asyncio.get_event_loop().run_until_complete(get_loop()))
+
+    event_stream.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    for i in range(3):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+        wait_for(lambda num_events=i + 1: len(loops) == num_events)
+    assert len(set(loops)) == 1
+    assert not loops[0].is_closed()
+
+    event_stream.close()
+    assert loops[0].is_closed()
+
+
+def test_unsubscribe_from_callback(file_store):
+    event_stream = EventStream('abc', file_store)
+    received = []
+
+    def callback(event):
+        received.append(event.id)
+        event_stream.unsubscribe(EventStreamSubscriber.TEST, 'callback')
+
+    event_stream.subscribe(EventStreamSubscriber.TEST, callback, 'callback')
+    event_stream.add_event(NullObservation('test0'), EventSource.AGENT)
+    wait_for(lambda: received == [0])
+    event_stream.add_event(NullObservation('test1'), EventSource.AGENT)
+    event_stream.close()
+    assert received == [0]
+
+
+def test_callback_errors_are_recorded(file_store):
+    dispatcher = SubscriberDispatcher(max_workers=2)
+    done = threading.Event()
+
+    def callback(event):
+        if event.id == 0:
+            raise ValueError('test')
+        done.set()
+
+    callback_queue = dispatcher.create_queue('test', 'callback', callback)
+    event_stream = EventStream('abc', file_store)
+    for i in range(2):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+        callback_queue.put(event_stream.get_event(i))
+    assert done.wait(5)
+    callback_queue.close()
+
+    stats = dispatcher.get_stats()['test']
+    assert stats.calls == 2
+    assert stats.errors == 1
+    assert dispatcher.queue_depth() == 0
+
+
+def test_threads_per_conversation(file_store):
+    """The callbacks of all event streams share the dispatch workers, so the number
+    of threads does not grow with the number of conversations."""
+    threads_before = threading.active_count()
+    received = []
+    event_streams = []
+    for sid in range(100):
+        event_stream = EventStream(f'conversation{sid}', file_store)
+        for subscriber in (
+            EventStreamSubscriber.AGENT_CONTROLLER,
+            EventStreamSubscriber.SERVER,
+            EventStreamSubscriber.MEMORY,
+        ):
+            event_stream.subscribe(
+                subscriber, lambda event: received.append(event), subscriber.value
+            )
+        event_stream.add_event(NullObservation('test'), EventSource.AGENT)
+        event_streams.append(event_stream)
+    wait_for(lambda: len(received) == 100 * 3)
+
+    # Each conversation used to have 4 threads of its own
+    new_threads = threading.active_count() - threads_before
+    assert new_threads <= get_subscriber_dispatcher()._executor._max_workers
+    assert new_threads < 100
+
+    for event_stream in event_streams:
+        event_stream.close()
+
+
+def test_blocking_callbacks_do_not_hold_up_other_callbacks(file_store):
+    """Callbacks which block, like the runtime's while it runs an action, do not take
+    the shared workers from the callbacks of other event streams."""
+    dispatcher = SubscriberDispatcher(max_workers=2)
+    release = threading.Event()
+    started = threading.Semaphore(0)
+    received = threading.Event()
+
+    def slow_callback(event):
+        started.release()
+        release.wait(5)
+
+    event_stream = EventStream('abc', file_store)
+    event_stream.add_event(NullObservation('test'), EventSource.AGENT)
+    event = event_stream.get_event(0)
+
+    slow_queues = [
+        dispatcher.create_queue('runtime', f'slow{i}', slow_callback, blocking=True)
+        for i in range(3)
+    ]
+    for slow_queue in slow_queues:
+        slow_queue.put(event)
+    for _ in slow_queues:
+        assert started.acquire(timeout=5)
+
+    fast_queue = dispatcher.create_queue(
+        'agent_controller', 'fast', lambda event: received.set()
+    )
+    fast_queue.put(event)
+    try:
+        assert received.wait(5)
+    finally:
+        release.set()
+    for callback_queue in (*slow_queues, fast_queue):
+        callback_queue.close()
+    assert dispatcher.get_stats()['runtime'].calls == 3
+
+
+def test_runtime_callbacks_are_blocking(file_store):
+    event_stream = EventStream('abc', file_store)
+    event_stream.subscribe(EventStreamSubscriber.RUNTIME, lambda event: None, 'rt')
+    event_stream.subscribe(EventStreamSubscriber.MEMORY, lambda event: None, 'mem')
+    assert event_stream._callback_queues[EventStreamSubscriber.RUNTIME]['rt'].blocking
+    assert not event_stream._callback_queues[EventStreamSubscriber.MEMORY][
+        'mem'
+    ].blocking
+    event_stream.close()
+
+
+def test_call_before_loop_closes(file_store):
+    dispatcher = SubscriberDispatcher(max_workers=2)
+    callback_loops = []
+    closed_on = []
+
+    async def before_loop_closes():
+        closed_on.append(asyncio.get_running_loop())
+
+    def callback(event):
+        callback_loops.append(asyncio.get_event_loop())
+        assert dispatcher.call_before_loop_closes(before_loop_closes)
+
+    event_stream = EventStream('abc', file_store)
+    event_stream.add_event(NullObservation('test'), EventSource.AGENT)
+    callback_queue = dispatcher.create_queue('test', 'callback', callback)
+    callback_queue.put(event_stream.get_event(0))
+
+    # Closing waits for it to run
+    callback_queue.close()
+    assert closed_on == callback_loops
+    assert callback_loops[0].is_closed()
+    assert not dispatcher.call_before_loop_closes(before_loop_closes)
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
@@ -112,7 +113,7 @@ async def test_github_get_repositories_with_user_owner_type():
     ]
 
     with (
-        patch.object(service, '_fetch_paginated_repos', return_value=mock_repo_data),
+        patch.object(service, '_fetch_repos_page', return_value=(mock_repo_data, '')),
         patch.object(service, 'get_installations', return_value=[123]),
     ):
         repositories = await service.get_all_repositories('pushed', AppMode.SAAS)
@@ -151,7 +152,7 @@ async def test_github_get_repositories_with_organization_owner_type():
     ]
 
     with (
-        patch.object(service, '_fetch_paginated_repos', return_value=mock_repo_data),
+        patch.object(service, '_fetch_repos_page', return_value=(mock_repo_data, '')),
         patch.object(service, 'get_installations', return_value=[123]),
     ):
         repositories = await service.get_all_repositories('pushed', AppMode.SAAS)
@@ -190,7 +191,7 @@ async def test_github_get_repositories_mixed_owner_types():
     ]
 
     with (
-        patch.object(service, '_fetch_paginated_repos', return_value=mock_repo_data),
+        patch.object(service, '_fetch_repos_page', return_value=(mock_repo_data, '')),
         patch.object(service, 'get_installations', return_value=[123]),
     ):
         repositories = await service.get_all_repositories('pushed', AppMode.SAAS)
@@ -237,7 +238,7 @@ async def test_github_get_repositories_owner_type_fallback():
     ]
 
     with (
-        patch.object(service, '_fetch_paginated_repos', return_value=mock_repo_data),
+        patch.object(service, '_fetch_repos_page', return_value=(mock_repo_data, '')),
         patch.object(service, 'get_installations', return_value=[123]),
     ):
         repositories = await service.get_all_repositories('pushed', AppMode.SAAS)
@@ -582,3 +583,99 @@ async def test_github_service_graphql_url_github_com():
 
         # This should be correct for GitHub.com
         assert actual_url == 'https://api.github.com/graphql'
+
+
+def _paginated_make_request(total_repos: int, per_page: int):
+    """Mock _make_request returning pages of repos, with GitHub style Link headers.
+    The peak number of requests in flight at once is recorded as max_in_flight."""
+    last_page = -(-total_repos // per_page)
+    in_flight = 0
+
+    async def make_request(url, params=None, method=None, max_age=0):
+        nonlocal in_flight
+        in_flight += 1
+        mock.max_in_flight = max(mock.max_in_flight, in_flight)
+        # Let the other requests start before this one completes
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        page = int(params['page'])
+        start = (page - 1) * per_page
+        repos = [
+            {'id': i, 'full_name': f'{url}/repo-{i}'}
+            for i in range(start, min(start + per_page, total_repos))
+        ]
+        headers = {}
+        if page < last_page:
+            headers['Link'] = (
+                f'<{url}?page={page + 1}>; rel="next", '
+                f'<{url}?page={last_page}>; rel="last"'
+            )
+        if 'installations/' in url:
+            return {'repositories': repos}, headers
+        return repos, headers
+
+    mock = AsyncMock(side_effect=make_request)
+    mock.max_in_flight = 0
+    return mock
+
+
+@pytest.mark.asyncio
+async def test_github_fetch_paginated_repos_fetches_pages_concurrently():
+    service = GitHubService(user_id=None, token=SecretStr('test-token'))
+    make_request = _paginated_make_request(total_repos=950, per_page=100)
+    with patch.object(service, '_make_request', make_request):
+        repos = await service._fetch_paginated_repos(
+            'https://api.github.com/user/repos', {'per_page': '100'}, 1000
+        )
+
+    assert [repo['id'] for repo in repos] == list(range(950))
+    assert make_request.await_count == 10
+    # The first page, then the remaining 9 pages as many at once as allowed
+    assert make_request.max_in_flight == service.MAX_CONCURRENT_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_github_fetch_paginated_repos_stops_at_max_repos():
+    service = GitHubService(user_id=None, token=SecretStr('test-token'))
+    make_request = _paginated_make_request(total_repos=5000, per_page=100)
+    with patch.object(service, '_make_request', make_request):
+        repos = await service._fetch_paginated_repos(
+            'https://api.github.com/user/repos', {'per_page': '100'}, 250
+        )
+    assert [repo['id'] for repo in repos] == list(range(250))
+    assert make_request.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_github_get_all_repositories_fetches_installations_concurrently():
+    service = GitHubService(user_id=None, token=SecretStr('test-token'))
+    make_request = _paginated_make_request(total_repos=400, per_page=100)
+    with (
+        patch.object(service, '_make_request', make_request),
+        patch.object(service, 'get_installations', return_value=['1', '2', '3', '4']),
+    ):
+        repositories = await service.get_all_repositories('', AppMode.SAAS)
+
+    # Installations keep their order and the result is capped at 1000 repos
+    assert len(repositories) == 1000
+    assert repositories[0].full_name.endswith('/installations/1/repositories/repo-0')
+    assert repositories[-1].full_name.endswith('/installations/3/repositories/repo-199')
+    assert make_request.max_in_flight == service.MAX_CONCURRENT_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_github_get_all_repositories_stops_at_max_repos():
+    service = GitHubService(user_id=None, token=SecretStr('test-token'))
+    make_request = _paginated_make_request(total_repos=5000, per_page=100)
+    installation_ids = [str(i) for i in range(20)]
+    with (
+        patch.object(service, '_make_request', make_request),
+        patch.object(service, 'get_installations', return_value=installation_ids),
+    ):
+        repositories = await service.get_all_repositories('', AppMode.SAAS)
+
+    assert len(repositories) == 1000
+    assert all('/installations/0/' in repo.full_name for repo in repositories)
+    # The first installation has enough repos, so only its first 10 pages are
+    # needed. The first pages of the rest of its batch are fetched alongside it.
+    assert make_request.await_count == 10 + service.MAX_CONCURRENT_REQUESTS - 1
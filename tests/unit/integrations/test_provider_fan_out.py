@@ -0,0 +1,183 @@
+"""Tests for querying several git providers concurrently in ProviderHandler."""
+
+import asyncio
+from types import MappingProxyType
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import SecretStr
+
+from openhands.integrations.provider import ProviderHandler, ProviderToken
+from openhands.integrations.service_types import (
+    ProviderTimeoutError,
+    ProviderType,
+    Repository,
+    SuggestedTask,
+    TaskType,
+)
+from openhands.server.types import AppMode
+
+PROVIDERS = [
+    ProviderType.GITHUB,
+    ProviderType.GITLAB,
+    ProviderType.BITBUCKET,
+    ProviderType.AZURE_DEVOPS,
+    ProviderType.FORGEJO,
+]
+DELAY = 0.05
+
+
+def _repository(provider: ProviderType) -> Repository:
+    return Repository(
+        id=provider.value,
+        full_name=f'{provider.value}/repo',
+        git_provider=provider,
+        is_public=True,
+    )
+
+
+class _InFlight:
+    """Counts the provider calls in flight, and the peak number at once."""
+
+    def __init__(self):
+        self.count = 0
+        self.peak = 0
+
+    async def wait(self, delay: float) -> None:
+        self.count += 1
+        self.peak = max(self.peak, self.count)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.count -= 1
+
+
+def _mock_service(
+    provider: ProviderType,
+    delay: float = DELAY,
+    error=None,
+    in_flight: _InFlight | None = None,
+):
+    in_flight = in_flight or _InFlight()
+
+    async def respond(*args, **kwargs):
+        await in_flight.wait(delay)
+        if error:
+            raise error
+        return [_repository(provider)]
+
+    async def suggested_tasks():
+        await in_flight.wait(delay)
+        return [
+            SuggestedTask(
+                git_provider=provider,
+                task_type=TaskType.OPEN_ISSUE,
+                repo=f'{provider.value}/repo',
+                issue_number=1,
+                title='Issue',
+            )
+        ]
+
+    service = MagicMock()
+    service.get_all_repositories.side_effect = respond
+    service.search_repositories.side_effect = respond
+    service.get_suggested_tasks.side_effect = suggested_tasks
+    return service
+
+
+def _handler(services: dict, provider_timeout: float = 10) -> ProviderHandler:
+    handler = ProviderHandler(
+        provider_tokens=MappingProxyType(
+            {provider: ProviderToken(token=SecretStr('token')) for provider in services}
+        ),
+        provider_timeout=provider_timeout,
+    )
+    handler.get_service = services.__getitem__  # type: ignore[method-assign]
+    return handler
+
+
+@pytest.fixture
+def in_flight():
+    return _InFlight()
+
+
+@pytest.fixture
+def services(in_flight):
+    return {
+        provider: _mock_service(provider, in_flight=in_flight) for provider in PROVIDERS
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_repositories_queries_providers_concurrently(services, in_flight):
+    handler = _handler(services)
+    repos = await handler.get_repositories(
+        'pushed', AppMode.SAAS, None, None, None, None
+    )
+
+    # Results are in provider order, with all providers queried at once
+    assert [repo.git_provider for repo in repos] == PROVIDERS
+    assert in_flight.peak == len(PROVIDERS)
+
+
+@pytest.mark.asyncio
+async def test_search_repositories_queries_providers_concurrently(services, in_flight):
+    handler = _handler(services)
+    repos = await handler.search_repositories(
+        None, 'repo', 10, 'stars', 'desc', AppMode.SAAS
+    )
+    assert in_flight.peak == len(PROVIDERS)
+    assert [repo.git_provider for repo in repos] == PROVIDERS
+
+
+@pytest.mark.asyncio
+async def test_get_suggested_tasks_queries_providers_concurrently(services, in_flight):
+    handler = _handler(services)
+    tasks = await handler.get_suggested_tasks()
+    assert in_flight.peak == len(PROVIDERS)
+    assert [task.git_provider for task in tasks] == PROVIDERS
+
+
+@pytest.mark.asyncio
+async def test_slow_and_failing_providers_return_partial_results(services):
+    services[ProviderType.GITLAB] = _mock_service(ProviderType.GITLAB, delay=10)
+    services[ProviderType.BITBUCKET] = _mock_service(
+        ProviderType.BITBUCKET, error=ValueError('Bad credentials')
+    )
+    handler = _handler(services, provider_timeout=DELAY * 2)
+    repos = await handler.get_repositories(
+        'pushed', AppMode.SAAS, None, None, None, None
+    )
+    # The slow provider timed out, rather than being waited for
+    assert [repo.git_provider for repo in repos] == [
+        ProviderType.GITHUB,
+        ProviderType.AZURE_DEVOPS,
+        ProviderType.FORGEJO,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_raised_when_no_provider_responds():
+    services = {
+        ProviderType.GITHUB: _mock_service(ProviderType.GITHUB, delay=10),
+        ProviderType.GITLAB: _mock_service(
+            ProviderType.GITLAB, error=ProviderTimeoutError('Timed out')
+        ),
+    }
+    handler = _handler(services, provider_timeout=DELAY)
+    with pytest.raises(ProviderTimeoutError):
+        await handler.get_repositories('pushed', AppMode.SAAS, None, None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_errors_without_timeouts_return_empty_results():
+    services = {
+        ProviderType.GITHUB: _mock_service(
+            ProviderType.GITHUB, error=ValueError('Bad credentials')
+        ),
+    }
+    handler = _handler(services)
+    assert (
+        await handler.get_repositories('pushed', AppMode.SAAS, None, None, None, None)
+        == []
+    )
@@ -0,0 +1,167 @@
+"""Tests for caching git provider responses with conditional requests."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from pydantic import SecretStr
+
+from openhands.integrations.github.github_service import GitHubService
+from openhands.integrations.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    get_response_cache,
+)
+
+URL = 'https://api.github.com/user/repos'
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    get_response_cache().clear()
+    yield
+    get_response_cache().clear()
+
+
+class MockGitHub:
+    """Serves a repository listing with an ETag, honouring If-None-Match."""
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.repos = [{'id': 1, 'full_name': 'owner/repo'}]
+        self.requests: list[httpx.Request] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get('If-None-Match') == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json=self.repos,
+            headers={'ETag': self.etag, 'Link': '<https://next>; rel="next"'},
+        )
+
+    def transport(self, upstream):
+        return httpx.MockTransport(self.handle)
+
+
+@pytest.fixture
+def github():
+    github = MockGitHub()
+    with patch(
+        'openhands.integrations.github.service.base.get_shared_async_transport',
+        github.transport,
+    ):
+        yield github
+
+
+def _service(token='test-token') -> GitHubService:
+    return GitHubService(user_id=None, token=SecretStr(token))
+
+
+@pytest.mark.asyncio
+async def test_unchanged_responses_are_revalidated(github):
+    service = _service()
+    result = await service._make_request(URL, {'page': '1'}, max_age=0)
+    assert result == (github.repos, {'Link': '<https://next>; rel="next"'})
+
+    assert await service._make_request(URL, {'page': '1'}, max_age=0) == result
+    assert len(github.requests) == 2
+    assert github.requests[1].headers['If-None-Match'] == '"v1"'
+
+    github.etag = '"v2"'
+    github.repos = [{'id': 2, 'full_name': 'owner/other-repo'}]
+    repos, _ = await service._make_request(URL, {'page': '1'}, max_age=0)
+    assert repos == github.repos
+
+
+@pytest.mark.asyncio
+async def test_fresh_responses_are_served_without_a_request(github):
+    service = _service()
+    await service._make_request(URL, max_age=30)
+    repos, _ = await service._make_request(URL, max_age=30)
+    assert repos == github.repos
+    assert len(github.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_responses_are_refreshed_in_the_background(github):
+    service = _service()
+    await service._make_request(URL, max_age=30)
+    github.etag = '"v2"'
+    github.repos = [{'id': 2, 'full_name': 'owner/other-repo'}]
+
+    # Age the cached listing past max_age
+    (key,) = get_response_cache()._entries
+    get_response_cache().get(key).fetched_at -= 60
+
+    # The stale listing is returned immediately...
+    repos, _ = await service._make_request(URL, max_age=30)
+    assert repos == [{'id': 1, 'full_name': 'owner/repo'}]
+    await asyncio.sleep(0.05)
+
+    # ...and the refreshed one is served on the next read
+    assert len(github.requests) == 2
+    repos, _ = await service._make_request(URL, max_age=30)
+    assert repos == github.repos
+    assert len(github.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_responses_are_cached_per_token(github):
+    await _service('token-a')._make_request(URL, max_age=30)
+    await _service('token-b')._make_request(URL, max_age=30)
+    assert len(github.requests) == 2
+    assert 'If-None-Match' not in github.requests[1].headers
+
+
+@pytest.mark.asyncio
+async def test_responses_are_only_cached_when_requested(github):
+    service = _service()
+    await service._make_request(URL)
+    await service._make_request(URL)
+    assert len(get_response_cache()) == 0
+    assert 'If-None-Match' not in github.requests[1].headers
+
+
+@pytest.mark.asyncio
+async def test_responses_after_a_token_refresh_are_cached_for_the_new_token(github):
+    service = _service('old-token')
+    service.refresh = True
+    await service._make_request(URL, max_age=30)
+    get_response_cache().get(
+        ResponseCache.key('Bearer old-token', URL, None)
+    ).fetched_at -= 600
+
+    async def get_latest_token():
+        service.token = SecretStr('new-token')
+        return service.token
+
+    handle = github.handle
+
+    def expire_old_token(request: httpx.Request) -> httpx.Response:
+        if request.headers['Authorization'] == 'Bearer old-token':
+            github.requests.append(request)
+            return httpx.Response(401)
+        return handle(request)
+
+    github.handle = expire_old_token
+    with patch.object(service, 'get_latest_token', get_latest_token):
+        repos, _ = await service._make_request(URL, max_age=30)
+
+    assert repos == github.repos
+    assert 'If-None-Match' not in github.requests[-1].headers
+    assert get_response_cache().get(ResponseCache.key('Bearer new-token', URL, None))
+
+
+def test_cache_is_bounded_by_size():
+    cache = ResponseCache(max_bytes=10)
+    for i in range(3):
+        cache.put(
+            ResponseCache.key('token', URL, {'page': i}),
+            CachedResponse(etag='"etag"', content=b'12345', headers={}),
+        )
+    assert len(cache) == 2
+    assert cache.get(ResponseCache.key('token', URL, {'page': 0})) is None
+    assert cache.get(ResponseCache.key('token', URL, {'page': 2})) is not None
@@ -0,0 +1,12 @@
+import pytest
+
+from openhands.mcp.tool_cache import mcp_tool_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_mcp_tool_cache():
+    """Each test lists the tools of its MCP servers, rather than using those of an
+    earlier test."""
+    mcp_tool_cache.clear()
+    yield
+    mcp_tool_cache.clear()
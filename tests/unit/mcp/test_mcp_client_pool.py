@@ -0,0 +1,196 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Import the module, not the functions directly to avoid circular imports
+import openhands.mcp.utils
+from openhands.core.config.mcp_config import MCPSHTTPServerConfig
+from openhands.events.action.mcp import MCPAction
+from openhands.events.subscriber_dispatcher import get_subscriber_dispatcher
+from openhands.mcp.client_pool import MCPClientPool
+
+
+def make_client(*tool_names: str) -> MagicMock:
+    client = MagicMock()
+    client.tools = []
+    for tool_name in tool_names:
+        tool = MagicMock()
+        tool.name = tool_name
+        client.tools.append(tool)
+    client.open_session = AsyncMock()
+    client.close_session = AsyncMock()
+    response = MagicMock()
+    response.model_dump.return_value = {'result': 'success'}
+    client.call_tool = AsyncMock(return_value=response)
+    return client
+
+
+def make_servers(num_servers: int) -> list[MCPSHTTPServerConfig]:
+    return [
+        MCPSHTTPServerConfig(url=f'http://server{i}:8080/mcp')
+        for i in range(num_servers)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_connects_to_servers_concurrently():
+    connecting = 0
+    max_connecting = 0
+
+    async def connect(server, conversation_id):
+        nonlocal connecting, max_connecting
+        connecting += 1
+        max_connecting = max(max_connecting, connecting)
+        await asyncio.sleep(0.01)
+        connecting -= 1
+        return make_client(f'tool_{server.url}')
+
+    pool = MCPClientPool()
+    with patch(
+        'openhands.mcp.client_pool._connect_mcp_client', side_effect=connect
+    ) as connect_mock:
+        clients, tool_index = await pool.get_clients([], make_servers(5), 'abc')
+
+    assert len(clients) == 5
+    assert connect_mock.call_count == 5
+    # All the connections overlap
+    assert max_connecting == 5
+    assert set(tool_index) == {f'tool_http://server{i}:8080/mcp' for i in range(5)}
+    for client in clients:
+        client.open_session.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_clients_are_reused():
+    pool = MCPClientPool()
+    servers = make_servers(2)
+    with patch(
+        'openhands.mcp.client_pool._connect_mcp_client',
+        side_effect=lambda server, conversation_id: make_client(server.url),
+    ) as connect_mock:
+        clients, tool_index = await pool.get_clients([], servers, 'abc')
+        reused_clients, reused_tool_index = await pool.get_clients([], servers, 'abc')
+        assert connect_mock.call_count == 2
+        assert reused_clients == clients
+        assert reused_tool_index is tool_index
+
+        # Other conversations get clients of their own
+        await pool.get_clients([], servers, 'def')
+        assert connect_mock.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_servers_are_retried():
+    pool = MCPClientPool()
+    servers = make_servers(2)
+    results = [make_client('tool_a'), None, make_client('tool_b')]
+    with patch(
+        'openhands.mcp.client_pool._connect_mcp_client',
+        side_effect=lambda server, conversation_id: results.pop(0),
+    ):
+        clients, tool_index = await pool.get_clients([], servers, 'abc')
+        assert len(clients) == 1
+        assert set(tool_index) == {'tool_a'}
+
+        clients, tool_index = await pool.get_clients([], servers, 'abc')
+        assert len(clients) == 2
+        assert set(tool_index) == {'tool_a', 'tool_b'}
+
+
+@pytest.mark.asyncio
+async def test_close_conversation():
+    pool = MCPClientPool()
+    servers = make_servers(1)
+    with patch(
+        'openhands.mcp.client_pool._connect_mcp_client',
+        side_effect=lambda server, conversation_id: make_client('tool'),
+    ) as connect_mock:
+        (client,), _ = await pool.get_clients([], servers, 'abc')
+        (other_client,), _ = await pool.get_clients([], servers, 'def')
+
+        pool.close('abc')
+        await asyncio.sleep(0.01)
+        client.close_session.assert_awaited_once()
+        other_client.close_session.assert_not_awaited()
+
+        await pool.get_clients([], servers, 'abc')
+        await pool.get_clients([], servers, 'def')
+        assert connect_mock.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_close_from_another_thread_closes_on_the_loop():
+    pool = MCPClientPool()
+    servers = make_servers(1)
+    loop = asyncio.get_running_loop()
+    closed_on: list[asyncio.AbstractEventLoop] = []
+
+    def connect(server, conversation_id):
+        client = make_client('tool')
+        client.close_session.side_effect = lambda: closed_on.append(
+            asyncio.get_running_loop()
+        )
+        return client
+
+    with patch('openhands.mcp.client_pool._connect_mcp_client', side_effect=connect):
+        (client,), _ = await pool.get_clients([], servers, 'abc')
+        closing_thread = threading.Thread(target=pool.close, args=('abc',))
+        closing_thread.start()
+        closing_thread.join()
+        client.close_session.assert_not_awaited()
+
+        # Closed when the loop next gets clients
+        await pool.get_clients([], servers, 'def')
+    client.close_session.assert_awaited_once()
+    assert closed_on == [loop]
+
+
+def test_sessions_are_closed_before_the_callback_loop():
+    """The runtime calls the tools from an event stream callback, so the sessions
+    are closed on the loop of the callback before it is closed, even if the
+    conversation is not closed first."""
+    pool = MCPClientPool()
+    clients: list[MagicMock] = []
+
+    def callback(event):
+        clients.extend(
+            asyncio.get_event_loop().run_until_complete(
+                pool.get_clients([], make_servers(2), 'abc')
+            )[0]
+        )
+
+    with patch(
+        'openhands.mcp.client_pool._connect_mcp_client',
+        side_effect=lambda server, conversation_id: make_client(server.url),
+    ):
+        callback_queue = get_subscriber_dispatcher().create_queue(
+            'test', 'callback', callback
+        )
+        callback_queue.put(MCPAction(name='tool'))
+        callback_queue.close()
+
+    assert len(clients) == 2
+    for client in clients:
+        client.close_session.assert_awaited_once()
+    pool.close('abc')
+
+
+@pytest.mark.asyncio
+async def test_call_tool_mcp_with_tool_index():
+    first_client = make_client('tool_a')
+    second_client = make_client('tool_b')
+    clients = [first_client, second_client]
+    tool_index = openhands.mcp.utils.index_mcp_tools(clients)
+    assert tool_index == {'tool_a': first_client, 'tool_b': second_client}
+
+    action = MCPAction(name='tool_b', arguments={'arg1': 'value1'})
+    await openhands.mcp.utils.call_tool_mcp(clients, action, tool_index)
+    second_client.call_tool.assert_called_once_with('tool_b', {'arg1': 'value1'})
+    first_client.call_tool.assert_not_called()
+
+    with pytest.raises(ValueError, match='No matching MCP agent found'):
+        await openhands.mcp.utils.call_tool_mcp(
+            clients, MCPAction(name='missing_tool', arguments={}), tool_index
+        )
@@ -5,6 +5,7 @@ import pytest
 
 from openhands.core.config.mcp_config import MCPConfig, MCPSSEServerConfig
 from openhands.mcp import MCPClient, create_mcp_clients, fetch_mcp_tools_from_config
+from openhands.mcp.tool_cache import mcp_tool_cache
 
 
 @pytest.mark.asyncio
@@ -46,7 +47,7 @@ async def test_fetch_mcp_tools_with_timeout():
     mock_config = mock.MagicMock(spec=MCPConfig)
 
     # Configure the mock config
-    mock_config.sse_servers = ['http://server1:8080']
+    mock_config.sse_servers = [MCPSSEServerConfig(url='http://server1:8080')]
     mock_config.shttp_servers = []
 
     # Mock create_mcp_clients to return an empty list (simulating all connections failing)
@@ -65,7 +66,10 @@ async def test_mixed_connection_results():
     mock_config = mock.MagicMock(spec=MCPConfig)
 
     # Configure the mock config
-    mock_config.sse_servers = ['http://server1:8080', 'http://server2:8080']
+    mock_config.sse_servers = [
+        MCPSSEServerConfig(url='http://server1:8080'),
+        MCPSSEServerConfig(url='http://server2:8080'),
+    ]
     mock_config.shttp_servers = []
 
     # Create a successful client
@@ -86,13 +90,21 @@ async def test_mixed_connection_results():
     # Set the client's tools
     successful_client.tools = [mock_tool]
 
-    # Mock create_mcp_clients to return our successful client
+    # Mock create_mcp_clients to connect to server1 only
+    def create_clients(sse_servers, shttp_servers, conversation_id, stdio_servers):
+        (server,) = sse_servers
+        return [successful_client] if server.url == 'http://server1:8080' else []
+
     with mock.patch(
-        'openhands.mcp.utils.create_mcp_clients', return_value=[successful_client]
-    ):
+        'openhands.mcp.utils.create_mcp_clients', side_effect=create_clients
+    ) as create_mock:
         # Call fetch_mcp_tools_from_config
         tools = await fetch_mcp_tools_from_config(mock_config, None)
 
-        # Verify that tools were returned
-        assert len(tools) > 0
-        assert tools[0]['function']['name'] == 'mock_tool'
+        # Verify that the tools of server1 were returned
+        assert [tool['function']['name'] for tool in tools] == ['mock_tool']
+        assert create_mock.call_count == 2
+
+    # Only the tools of server1 are cached, so server2 is retried
+    assert mcp_tool_cache.get(mock_config.sse_servers[0]) is not None
+    assert mcp_tool_cache.get(mock_config.sse_servers[1]) is None
@@ -0,0 +1,169 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Import the module, not the functions directly to avoid circular imports
+import openhands.mcp.utils
+from openhands.core.config.mcp_config import (
+    MCPConfig,
+    MCPSHTTPServerConfig,
+    MCPSSEServerConfig,
+)
+from openhands.mcp import tool_cache
+from openhands.mcp.tool_cache import mcp_tool_cache
+from openhands.runtime.impl.action_execution.action_execution_client import (
+    ActionExecutionClient,
+)
+
+
+def make_client(tool_name: str) -> MagicMock:
+    client = MagicMock()
+    tool = MagicMock()
+    tool.name = tool_name
+    tool.to_param.return_value = {'type': 'function', 'function': {'name': tool_name}}
+    client.tools = [tool]
+    return client
+
+
+def create_clients(sse_servers, shttp_servers, conversation_id, stdio_servers):
+    (server,) = [*sse_servers, *shttp_servers, *stdio_servers]
+    return [make_client(f'tool_{server.url.split("/")[2]}')]
+
+
+def tool_names(tools: list[dict]) -> list[str]:
+    return [tool['function']['name'] for tool in tools]
+
+
+@pytest.mark.asyncio
+async def test_tools_are_cached_by_server():
+    shared_server = MCPSHTTPServerConfig(url='http://shared/mcp', api_key='key')
+    with patch(
+        'openhands.mcp.utils.create_mcp_clients', side_effect=create_clients
+    ) as create_mock:
+        for i in range(3):
+            # Each agent has an MCP server of its own, like that of its runtime
+            config = MCPConfig(
+                sse_servers=[MCPSSEServerConfig(url=f'http://runtime{i}/mcp/sse')],
+                shttp_servers=[shared_server],
+            )
+            tools = await openhands.mcp.utils.fetch_mcp_tools_from_config(config)
+            assert tool_names(tools) == [f'tool_runtime{i}', 'tool_shared']
+        # The shared server is connected to once
+        assert create_mock.call_count == 4
+
+        # The cached tools are not changed by changes to the tools returned
+        tools[1]['function']['name'] = 'changed'
+        config = MCPConfig(shttp_servers=[shared_server])
+        tools = await openhands.mcp.utils.fetch_mcp_tools_from_config(config)
+        assert tool_names(tools) == ['tool_shared']
+        assert create_mock.call_count == 4
+
+        # Servers with other configurations, such as other API keys, are not shared
+        config = MCPConfig(
+            shttp_servers=[MCPSHTTPServerConfig(url='http://shared/mcp', api_key='b')]
+        )
+        await openhands.mcp.utils.fetch_mcp_tools_from_config(config)
+        assert create_mock.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_tools_are_cached_by_conversation():
+    """The server is sent the conversation ID, and may list other tools for other
+    conversations."""
+    config = MCPConfig(shttp_servers=[MCPSHTTPServerConfig(url='http://server/mcp')])
+    with patch(
+        'openhands.mcp.utils.create_mcp_clients', side_effect=create_clients
+    ) as create_mock:
+        for conversation_id in ('conversation1', 'conversation1', 'conversation2'):
+            await openhands.mcp.utils.fetch_mcp_tools_from_config(
+                config, conversation_id=conversation_id
+            )
+        assert create_mock.call_count == 2
+        assert [call.args[2] for call in create_mock.call_args_list] == [
+            'conversation1',
+            'conversation2',
+        ]
+
+        # Nor are they shared with the tools listed without a conversation
+        await openhands.mcp.utils.fetch_mcp_tools_from_config(config)
+        assert create_mock.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_runtime_server_is_not_cached():
+    """The runtime's MCP server lists the tools of the stdio servers added to it,
+    which are not part of its configuration."""
+    runtime_server = MCPSSEServerConfig(url='http://runtime/mcp/sse')
+    shared_server = MCPSHTTPServerConfig(url='http://shared/mcp')
+    runtime = MagicMock(spec=ActionExecutionClient)
+    runtime.runtime_initialized = True
+    runtime.runtime_mcp_server = runtime_server
+    runtime.get_mcp_config.return_value = MCPConfig(
+        sse_servers=[runtime_server], shttp_servers=[shared_server]
+    )
+    memory = MagicMock()
+    memory.get_microagent_mcp_tools.return_value = []
+    agent = MagicMock()
+    stdio_tools = ['tool_a']
+
+    def create_runtime_clients(
+        sse_servers, shttp_servers, conversation_id, stdio_servers
+    ):
+        if runtime_server in sse_servers:
+            return [make_client(tool_name) for tool_name in stdio_tools]
+        return create_clients(
+            sse_servers, shttp_servers, conversation_id, stdio_servers
+        )
+
+    with patch(
+        'openhands.mcp.utils.create_mcp_clients', side_effect=create_runtime_clients
+    ) as create_mock:
+        await openhands.mcp.utils.add_mcp_tools_to_agent(agent, runtime, memory)
+        assert tool_names(agent.set_mcp_tools.call_args.args[0]) == [
+            'tool_a',
+            'tool_shared',
+        ]
+
+        # Another stdio server is added to the runtime
+        stdio_tools.append('tool_b')
+        await openhands.mcp.utils.add_mcp_tools_to_agent(agent, runtime, memory)
+        assert tool_names(agent.set_mcp_tools.call_args.args[0]) == [
+            'tool_a',
+            'tool_b',
+            'tool_shared',
+        ]
+        # The runtime server is listed again, and the shared server is not
+        assert create_mock.call_count == 3
+    assert mcp_tool_cache.get(runtime_server) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_servers_are_not_cached():
+    config = MCPConfig(shttp_servers=[MCPSHTTPServerConfig(url='http://server/mcp')])
+    with patch(
+        'openhands.mcp.utils.create_mcp_clients', return_value=[]
+    ) as create_mock:
+        assert await openhands.mcp.utils.fetch_mcp_tools_from_config(config) == []
+        assert await openhands.mcp.utils.fetch_mcp_tools_from_config(config) == []
+        assert create_mock.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_tools_expire():
+    server = MCPSHTTPServerConfig(url='http://server/mcp')
+    config = MCPConfig(shttp_servers=[server])
+    with (
+        patch(
+            'openhands.mcp.utils.create_mcp_clients', side_effect=create_clients
+        ) as create_mock,
+        patch.object(tool_cache.time, 'monotonic', return_value=1000.0) as monotonic,
+    ):
+        await openhands.mcp.utils.fetch_mcp_tools_from_config(config)
+        monotonic.return_value += tool_cache.MCP_TOOLS_CACHE_TTL - 1
+        await openhands.mcp.utils.fetch_mcp_tools_from_config(config)
+        assert create_mock.call_count == 1
+
+        monotonic.return_value += 1
+        assert mcp_tool_cache.get(server) is None
+        await openhands.mcp.utils.fetch_mcp_tools_from_config(config)
+        assert create_mock.call_count == 2
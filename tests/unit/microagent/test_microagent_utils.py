@@ -2,6 +2,7 @@
 
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -13,6 +14,7 @@ from openhands.microagent import (
     RepoMicroagent,
     load_microagents_from_dir,
 )
+from openhands.microagent.microagent import clear_microagent_cache
 
 CONTENT = '# dummy header\ndummy content\n## dummy subheader\ndummy subcontent\n'
 
@@ -545,3 +547,46 @@ def test_load_both_cursorrules_and_agents_md(temp_dir_with_both_cursorrules_and_
     agents_agent = repo_agents['agents']
     assert isinstance(agents_agent, RepoMicroagent)
     assert 'Install deps: `poetry install`' in agents_agent.content
+
+
+def test_load_microagents_is_cached(temp_microagents_dir):
+    """Microagents are only parsed again when the files in the directory change."""
+    repo_agents, knowledge_agents = load_microagents_from_dir(temp_microagents_dir)
+    with patch.object(
+        BaseMicroagent, 'load', side_effect=BaseMicroagent.load
+    ) as mock_load:
+        cached_repo_agents, cached_knowledge_agents = load_microagents_from_dir(
+            temp_microagents_dir
+        )
+        mock_load.assert_not_called()
+        assert cached_knowledge_agents['knowledge'] is knowledge_agents['knowledge']
+        assert cached_repo_agents['repo'] is repo_agents['repo']
+        # Callers get their own dicts
+        assert cached_knowledge_agents is not knowledge_agents
+
+        # Adding a file invalidates the cache
+        (temp_microagents_dir / 'other.md').write_text(
+            '---\ntriggers:\n  - other\n---\n\nOther content\n'
+        )
+        _, knowledge_agents = load_microagents_from_dir(temp_microagents_dir)
+        assert set(knowledge_agents) == {'knowledge', 'other'}
+        assert mock_load.call_count == 3
+
+        # As does changing one
+        mock_load.reset_mock()
+        (temp_microagents_dir / 'other.md').write_text(
+            '---\ntriggers:\n  - changed\n---\n\nChanged content\n'
+        )
+        _, knowledge_agents = load_microagents_from_dir(temp_microagents_dir)
+        assert knowledge_agents['other'].triggers == ['changed']
+        assert mock_load.call_count == 3
+
+
+def test_clear_microagent_cache(temp_microagents_dir):
+    load_microagents_from_dir(temp_microagents_dir)
+    clear_microagent_cache()
+    with patch.object(
+        BaseMicroagent, 'load', side_effect=BaseMicroagent.load
+    ) as mock_load:
+        load_microagents_from_dir(temp_microagents_dir)
+    assert mock_load.call_count == 2
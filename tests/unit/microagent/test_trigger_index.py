@@ -0,0 +1,80 @@
+"""Tests for the microagent trigger index."""
+
+import random
+import string
+
+from openhands.microagent import KnowledgeMicroagent, MicroagentMetadata, MicroagentType
+from openhands.microagent.trigger_index import TriggerIndex, TriggerMatcher
+
+
+def _microagent(name: str, triggers: list[str]) -> KnowledgeMicroagent:
+    return KnowledgeMicroagent(
+        name=name,
+        content=f'Content for {name}',
+        metadata=MicroagentMetadata(name=name, triggers=triggers),
+        source=f'{name}.md',
+        type=MicroagentType.KNOWLEDGE,
+    )
+
+
+def _match_each(microagents: dict[str, KnowledgeMicroagent], message: str):
+    matches = []
+    for microagent in microagents.values():
+        trigger = microagent.match_trigger(message)
+        if trigger:
+            matches.append((microagent, trigger))
+    return matches
+
+
+def test_matcher_finds_overlapping_patterns():
+    matcher = TriggerMatcher(['he', 'she', 'his', 'hers', 'Ushe'])
+    assert matcher.find_all('USHERS') == {'he', 'she', 'hers', 'ushe'}
+    assert matcher.find_all('history') == {'his'}
+    assert matcher.find_all('nothing') == set()
+
+
+def test_matcher_empty_pattern_matches_everything():
+    assert TriggerMatcher(['', 'abc']).find_all('xyz') == {''}
+
+
+def test_index_returns_first_trigger_of_each_microagent():
+    microagents = {
+        'git': _microagent('git', ['github', 'git']),
+        'docker': _microagent('docker', ['Docker', 'container']),
+        'npm': _microagent('npm', ['npm']),
+    }
+    index = TriggerIndex(microagents)
+    message = 'Push the CONTAINER built by docker to Git'
+    assert index.match(message) == [
+        (microagents['git'], 'git'),
+        (microagents['docker'], 'Docker'),
+    ]
+    assert index.match(message) == _match_each(microagents, message)
+
+
+def test_index_matches_are_identical_to_match_trigger():
+    random.seed(42)
+    words = [
+        ''.join(random.choices(string.ascii_letters, k=random.randint(1, 6)))
+        for _ in range(300)
+    ]
+    microagents = {
+        f'agent_{i}': _microagent(
+            f'agent_{i}', random.sample(words, k=random.randint(1, 5))
+        )
+        for i in range(100)
+    }
+    index = TriggerIndex(microagents)
+    for _ in range(50):
+        message = ' '.join(random.choices(words, k=random.randint(0, 40)))
+        assert index.match(message) == _match_each(microagents, message)
+
+
+def test_is_index_of():
+    git = _microagent('git', ['git'])
+    npm = _microagent('npm', ['npm'])
+    index = TriggerIndex({'git': git, 'npm': npm})
+    assert index.is_index_of({'git': git, 'npm': npm})
+    assert not index.is_index_of({'npm': npm, 'git': git})
+    assert not index.is_index_of({'git': git})
+    assert not index.is_index_of({'git': git, 'npm': _microagent('npm', ['npm'])})
@@ -1,6 +1,8 @@
 import hashlib
 import os
 import tempfile
+import threading
+import time
 import uuid
 from importlib.metadata import version
 from pathlib import Path
@@ -13,8 +15,14 @@ from pytest import TempPathFactory
 
 import openhands
 from openhands import __version__ as oh_version
+from openhands.core.exceptions import AgentRuntimeBuildError
 from openhands.core.logger import openhands_logger as logger
-from openhands.runtime.builder.docker import DockerRuntimeBuilder
+from openhands.runtime.builder.docker import (
+    BuildCoordinator,
+    DockerRuntimeBuilder,
+    get_build_step_timings,
+)
+from openhands.runtime.utils import runtime_build
 from openhands.runtime.utils.runtime_build import (
     BuildFromImageType,
     _generate_dockerfile,
@@ -31,6 +39,17 @@ OH_VERSION = f'oh_v{oh_version}'
 DEFAULT_BASE_IMAGE = 'nikolaik/python-nodejs:python3.12-nodejs22-slim'
 
 
+@pytest.fixture(autouse=True)
+def hash_cache(tmp_path, monkeypatch):
+    cache_file = tmp_path / 'hash_cache' / 'runtime_build_hashes.json'
+    monkeypatch.setattr(runtime_build, 'RUNTIME_BUILD_HASH_CACHE_FILE', str(cache_file))
+    monkeypatch.setattr(runtime_build, '_hash_cache', {})
+    monkeypatch.setattr(
+        runtime_build, 'RUNTIME_BUILD_CONTEXT_DIR', str(tmp_path / 'build_contexts')
+    )
+    return cache_file
+
+
 @pytest.fixture
 def temp_dir(tmp_path_factory: TempPathFactory) -> str:
     return str(tmp_path_factory.mktemp('test_runtime_build'))
@@ -153,6 +172,43 @@ def test_get_hash_for_source_files():
         )
 
 
+def test_get_hash_for_source_files_is_cached(tmp_path, hash_cache, monkeypatch):
+    source_dir = tmp_path / 'openhands'
+    (source_dir / 'runtime').mkdir(parents=True)
+    (source_dir / '__pycache__').mkdir()
+    (source_dir / '__init__.py').write_text('')
+    (source_dir / 'runtime' / 'base.py').write_text('x = 1\n')
+    monkeypatch.setattr(
+        runtime_build.openhands, '__file__', str(source_dir / '__init__.py')
+    )
+    mod = get_hash_for_source_files.__module__
+
+    with patch(f'{mod}.dirhash', wraps=runtime_build.dirhash) as dirhash_mock:
+        result = get_hash_for_source_files()
+        assert get_hash_for_source_files() == result
+        assert dirhash_mock.call_count == 1
+
+        # The hash is read from disk by other processes
+        monkeypatch.setattr(runtime_build, '_hash_cache', {})
+        assert get_hash_for_source_files() == result
+        assert dirhash_mock.call_count == 1
+        assert hash_cache.exists()
+
+        # Files which are not hashed do not matter
+        (source_dir / '__pycache__' / 'base.cpython-312.pyc').write_bytes(b'')
+        assert get_hash_for_source_files() == result
+        assert dirhash_mock.call_count == 1
+
+        (source_dir / 'runtime' / 'base.py').write_text('x = 22\n')
+        changed_result = get_hash_for_source_files()
+        assert changed_result != result
+        assert dirhash_mock.call_count == 2
+
+        (source_dir / 'runtime' / 'new.py').write_text('')
+        assert get_hash_for_source_files() != changed_result
+        assert dirhash_mock.call_count == 3
+
+
 def test_generate_dockerfile_build_from_scratch():
     base_image = 'debian:11'
     dockerfile_content = _generate_dockerfile(
@@ -509,6 +565,54 @@ def test_build_runtime_image_exact_hash_not_exist_and_lock_not_exist_and_version
         )
 
 
+def test_build_runtime_image_reuses_build_folder(tmp_path):
+    mock_runtime_builder = MagicMock()
+    mock_runtime_builder.image_exists.return_value = False
+    mock_runtime_builder.build.side_effect = lambda path, tags, **kwargs: tags[0]
+    mod = build_runtime_image.__module__
+    with (
+        patch(f'{mod}.get_hash_for_lock_files', return_value='mock-lock-tag'),
+        patch(f'{mod}.get_hash_for_source_files', return_value='mock-source-tag'),
+        patch(f'{mod}.prep_build_folder') as mock_prep_build_folder,
+    ):
+        build_runtime_image('debian:11', mock_runtime_builder)
+        build_runtime_image('debian:11', mock_runtime_builder)
+        assert mock_prep_build_folder.call_count == 1
+        paths = [
+            call.kwargs['path'] for call in mock_runtime_builder.build.call_args_list
+        ]
+        assert paths[0] == paths[1]
+        assert paths[0].startswith(str(tmp_path / 'build_contexts'))
+
+        # Other contents get a build folder of their own
+        build_runtime_image(
+            'debian:11', mock_runtime_builder, extra_deps='pip install x'
+        )
+        assert mock_prep_build_folder.call_count == 2
+        assert mock_runtime_builder.build.call_args.kwargs['path'] != paths[0]
+    assert len(os.listdir(tmp_path / 'build_contexts')) == 2
+    assert os.stat(tmp_path / 'build_contexts').st_mode & 0o777 == 0o700
+
+
+def test_build_runtime_image_refuses_shared_build_folder(tmp_path):
+    """Others could put build folders in a directory they can write to, to be used
+    for the builds."""
+    (tmp_path / 'build_contexts').mkdir()
+    os.chmod(tmp_path / 'build_contexts', 0o777)
+    mock_runtime_builder = MagicMock()
+    mock_runtime_builder.image_exists.return_value = False
+    mod = build_runtime_image.__module__
+    with (
+        patch(f'{mod}.get_hash_for_lock_files', return_value='mock-lock-tag'),
+        patch(f'{mod}.get_hash_for_source_files', return_value='mock-source-tag'),
+        patch(f'{mod}.prep_build_folder') as mock_prep_build_folder,
+        pytest.raises(AgentRuntimeBuildError),
+    ):
+        build_runtime_image('debian:11', mock_runtime_builder)
+    mock_prep_build_folder.assert_not_called()
+    mock_runtime_builder.build.assert_not_called()
+
+
 # ==============================
 # DockerRuntimeBuilder Tests
 # ==============================
@@ -530,6 +634,116 @@ def test_output_build_progress(docker_runtime_builder):
     assert layers['layer1']['last_logged'] == 50.0
 
 
+def test_build_coordinator_builds_image_once():
+    coordinator = BuildCoordinator(max_builds=4)
+    build_started = threading.Event()
+    finish_build = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        build_started.set()
+        assert finish_build.wait(5)
+        return 'repo:tag'
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(coordinator.run('repo:tag', build))
+        )
+        for _ in range(5)
+    ]
+    threads[0].start()
+    assert build_started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    finish_build.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ['repo:tag'] * 5
+    assert len(builds) == 1
+
+    # Later builds of the image are not deduplicated
+    coordinator.run('repo:tag', build)
+    assert len(builds) == 2
+
+
+def test_build_coordinator_limits_concurrent_builds():
+    coordinator = BuildCoordinator(max_builds=2)
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def build():
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return 'built'
+
+    threads = [
+        threading.Thread(target=coordinator.run, args=(f'repo:tag{i}', build))
+        for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert max_running == 2
+
+
+def test_build_coordinator_shares_errors():
+    coordinator = BuildCoordinator()
+    build_started = threading.Event()
+    finish_build = threading.Event()
+
+    def build():
+        build_started.set()
+        assert finish_build.wait(5)
+        raise AgentRuntimeBuildError('Build failed')
+
+    errors = []
+
+    def run_build():
+        try:
+            coordinator.run('repo:tag', build)
+        except AgentRuntimeBuildError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run_build) for _ in range(2)]
+    threads[0].start()
+    assert build_started.wait(5)
+    threads[1].start()
+    time.sleep(0.1)
+    finish_build.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 2
+
+
+def test_get_build_step_timings():
+    output_lines = [
+        '#1 [internal] load build definition from Dockerfile',
+        '#1 DONE 0.0s',
+        '#5 [2/4] RUN apt-get update',
+        '#6 [3/4] COPY ./code /openhands/code',
+        '#6 CACHED',
+        '#5 12.3 Reading package lists...',
+        '#5 DONE 20.5s',
+        '#7 [4/4] RUN pip install .',
+        '#7 DONE 3.1s',
+    ]
+    assert get_build_step_timings(output_lines) == [
+        ('[internal] load build definition from Dockerfile', 0.0),
+        ('[2/4] RUN apt-get update', 20.5),
+        ('[4/4] RUN pip install .', 3.1),
+    ]
+
+
 @pytest.fixture(scope='function')
 def live_docker_image():
     client = docker.from_env()
@@ -598,6 +598,72 @@ def test_find_file_not_exist_file_specific_path(tmp_path):
     assert result.split('\n') == expected.split('\n')
 
 
+def test_search_dir_skips_ignored_and_binary_files(tmp_path):
+    (tmp_path / '.gitignore').write_text('node_modules/\n*.log\n!keep.log\n')
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'a.py').write_text('x = 1\nbingo = 2\n')
+    (tmp_path / 'src' / 'b.bin').write_bytes(b'bingo\0\1\2')
+    (tmp_path / 'node_modules' / 'pkg').mkdir(parents=True)
+    (tmp_path / 'node_modules' / 'pkg' / 'index.js').write_text('bingo')
+    (tmp_path / 'debug.log').write_text('bingo')
+    (tmp_path / 'keep.log').write_text('bingo\r\nbingo again\r\n')
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.git' / 'HEAD').write_text('bingo')
+
+    with io.StringIO() as buf:
+        with contextlib.redirect_stdout(buf):
+            search_dir('bingo', str(tmp_path))
+        result = buf.getvalue()
+
+    assert sorted(result.splitlines()[1:-1]) == [
+        f'{tmp_path}/keep.log (Line 1): bingo',
+        f'{tmp_path}/keep.log (Line 2): bingo again',
+        f'{tmp_path}/src/a.py (Line 2): bingo = 2',
+    ]
+
+
+def test_find_file_uses_repository_gitignore(tmp_path):
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.gitignore').write_text('build/\n')
+    (tmp_path / 'pkg' / 'build').mkdir(parents=True)
+    (tmp_path / 'pkg' / 'build' / 'a.txt').write_text('')
+    (tmp_path / 'pkg' / '.gitignore').write_text('*.tmp\n')
+    (tmp_path / 'pkg' / 'sub').mkdir()
+    (tmp_path / 'pkg' / 'sub' / 'a.txt').write_text('')
+    (tmp_path / 'pkg' / 'sub' / 'a.txt.tmp').write_text('')
+
+    # The .gitignore files above the directory apply too
+    with io.StringIO() as buf:
+        with contextlib.redirect_stdout(buf):
+            find_file('a.txt', str(tmp_path / 'pkg'))
+        result = buf.getvalue()
+
+    expected = f'[Found 1 matches for "a.txt" in {tmp_path}/pkg]\n'
+    expected += f'{tmp_path}/pkg/sub/a.txt\n'
+    expected += f'[End of matches for "a.txt" in {tmp_path}/pkg]\n'
+    assert result.split('\n') == expected.split('\n')
+
+
+def test_search_dir_in_ignored_directory(tmp_path):
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.gitignore').write_text('node_modules/\n*.log\n')
+    (tmp_path / 'node_modules' / 'pkg' / 'lib').mkdir(parents=True)
+    (tmp_path / 'node_modules' / 'pkg' / 'index.js').write_text('bingo')
+    (tmp_path / 'node_modules' / 'pkg' / 'lib' / 'util.js').write_text('bingo')
+    (tmp_path / 'node_modules' / 'pkg' / 'debug.log').write_text('bingo')
+
+    # Searched by its path, the directory is not ignored, but what is below it still is
+    with io.StringIO() as buf:
+        with contextlib.redirect_stdout(buf):
+            search_dir('bingo', str(tmp_path / 'node_modules' / 'pkg'))
+        result = buf.getvalue()
+
+    assert sorted(result.splitlines()[1:-1]) == [
+        f'{tmp_path}/node_modules/pkg/index.js (Line 1): bingo',
+        f'{tmp_path}/node_modules/pkg/lib/util.js (Line 1): bingo',
+    ]
+
+
 def test_parse_docx(tmp_path):
     # Create a DOCX file with some content
     test_docx_path = tmp_path / 'test.docx'
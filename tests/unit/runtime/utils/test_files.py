@@ -0,0 +1,102 @@
+import base64
+import io
+from unittest.mock import patch
+
+import pytest
+
+from openhands.runtime.utils import files
+from openhands.runtime.utils.files import (
+    read_file_base64,
+    read_lines,
+    read_text_lines,
+)
+
+
+@pytest.fixture(autouse=True)
+def small_line_index(monkeypatch):
+    """Index small files, in small blocks, so that lines span blocks."""
+    monkeypatch.setattr(files, 'LINE_INDEX_MIN_SIZE', 0)
+    monkeypatch.setattr(files, '_LINE_INDEX_BLOCK_SIZE', 16)
+    files._line_indexes.clear()
+
+
+def read_all_lines(path, start: int = 0, end: int = -1) -> str:
+    with open(path, 'r', encoding='utf-8') as file:
+        return ''.join(read_lines(file.readlines(), start, end))
+
+
+@pytest.mark.parametrize(
+    'contents',
+    [
+        '',
+        'one line',
+        'one line\n',
+        ''.join(f'line {i}\n' for i in range(100)),
+        ''.join(f'{"x" * (i % 40)}\n' for i in range(100)) + 'no newline',
+        '\n\n\nline\n\n',
+        ''.join(f'line {i} ✓\r\n' for i in range(50)),
+    ],
+)
+def test_read_text_lines_matches_read_lines(tmp_path, contents):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(contents.encode('utf-8'))
+    for start in (-1, 0, 1, 2, 10, 49, 50, 98, 99, 100, 150):
+        for end in (-5, -1, 0, 1, 2, 3, 11, 50, 51, 99, 100, 101, 200):
+            assert read_text_lines(str(path), start, end) == read_all_lines(
+                path, start, end
+            ), (start, end)
+
+
+def test_lone_carriage_returns_are_not_indexed(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(''.join(f'line {i}\r' for i in range(50)).encode('utf-8'))
+    assert read_text_lines(str(path), 10, 20) == read_all_lines(path, 10, 20)
+    assert str(path) not in files._line_indexes
+
+
+def test_line_index_is_reused_until_file_changes(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_text(''.join(f'line {i}\n' for i in range(100)))
+    with patch.object(
+        files, '_build_line_index', wraps=files._build_line_index
+    ) as build_line_index:
+        assert read_text_lines(str(path), 10, 12) == 'line 10\nline 11\n'
+        assert read_text_lines(str(path), 50, 51) == 'line 50\n'
+        assert build_line_index.call_count == 1
+
+        path.write_text(''.join(f'new line {i}\n' for i in range(100)))
+        assert read_text_lines(str(path), 50, 51) == 'new line 50\n'
+        assert build_line_index.call_count == 2
+
+
+def test_window_reads_part_of_file(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_text(''.join(f'line {i}\n' for i in range(10_000)))
+    read_text_lines(str(path), 0, 1)
+
+    sizes_read = []
+
+    class CountingReader(io.BufferedReader):
+        def read(self, size=-1):
+            data = super().read(size)
+            sizes_read.append(len(data))
+            return data
+
+    with patch.object(
+        files,
+        'open',
+        lambda path, mode: CountingReader(io.FileIO(path, mode)),
+        create=True,
+    ):
+        assert read_text_lines(str(path), 5000, 5002) == 'line 5000\nline 5001\n'
+    # Two blocks to find where the lines start and end, and the lines
+    assert sum(sizes_read) <= 16 * 2 + len('line 5000\nline 5001\n')
+
+
+def test_read_file_base64(tmp_path):
+    path = tmp_path / 'image.png'
+    contents = bytes(range(256)) * 10_000
+    path.write_bytes(contents)
+    with patch.object(files, '_BASE64_BLOCK_SIZE', 3 * 1000):
+        encoded = read_file_base64(str(path), 'image/png')
+    assert encoded == 'data:image/png;base64,' + base64.b64encode(contents).decode()
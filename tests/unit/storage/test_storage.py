@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import shutil
 import tempfile
 import threading
+import time
 from abc import ABC
 from dataclasses import dataclass, field
 from io import BytesIO, StringIO
@@ -11,11 +14,11 @@ from unittest import TestCase
 from unittest.mock import patch
 
 import botocore.exceptions
-from google.api_core.exceptions import NotFound
+from google.api_core.exceptions import NotFound, RequestRangeNotSatisfiable
 
 from openhands.storage.files import FileStore
 from openhands.storage.google_cloud import GoogleCloudFileStore
-from openhands.storage.local import LocalFileStore
+from openhands.storage.local import Durability, LocalFileStore
 from openhands.storage.memory import InMemoryFileStore
 from openhands.storage.s3 import S3FileStore
 
@@ -107,6 +110,70 @@ class _StorageTest(ABC):
         # Verify everything is gone
         self.assertEqual(store.list(''), [])
 
+    def test_exists(self):
+        store = self.get_store()
+        store.write('foo/bar.txt', 'Hello, world!')
+        self.assertTrue(store.exists('foo/bar.txt'))
+        self.assertFalse(store.exists('foo/baz.txt'))
+        store.delete('foo')
+        self.assertFalse(store.exists('foo/bar.txt'))
+
+    def test_read_range(self):
+        store = self.get_store()
+        store.write('foo.txt', 'Hello, world!')
+        self.assertEqual(store.read_range('foo.txt', 7), b'world!')
+        self.assertEqual(store.read_range('foo.txt', 0, 5), b'Hello')
+        self.assertEqual(store.read_range('foo.txt', 7, 100), b'world!')
+        self.assertEqual(store.read_range('foo.txt', 100), b'')
+        self.assertEqual(store.read_range('foo.txt', 5, 5), b'')
+        with self.assertRaises(FileNotFoundError):
+            store.read_range('bar.txt', 0, 5)
+
+    def test_open_read(self):
+        store = self.get_store()
+        store.write('foo.txt', 'Hello, world!')
+        self.assertEqual(
+            list(store.open_read('foo.txt', chunk_size=5)),
+            [b'Hello', b', wor', b'ld!'],
+        )
+        with self.assertRaises(FileNotFoundError):
+            list(store.open_read('bar.txt'))
+
+    def test_read_and_write_many(self):
+        store = self.get_store()
+        files = {f'foo/{i}.txt': f'Hello, {i}!' for i in range(20)}
+        store.write_many(files)
+        self.assertEqual(store.read('foo/3.txt'), 'Hello, 3!')
+        self.assertEqual(store.read_many([*files, 'foo/missing.txt']), files)
+        store.delete('foo')
+
+    def test_async_operations(self):
+        async def run():
+            store = self.get_store()
+            await store.write_async('foo.txt', 'Hello, world!')
+            await store.write_many_async({'bar.txt': 'Hello', 'baz.txt': 'world'})
+            self.assertEqual(await store.read_async('foo.txt'), 'Hello, world!')
+            self.assertTrue(await store.exists_async('bar.txt'))
+            self.assertEqual(
+                await store.read_many_async(['bar.txt', 'baz.txt', 'qux.txt']),
+                {'bar.txt': 'Hello', 'baz.txt': 'world'},
+            )
+
+        asyncio.run(run())
+
+    def test_list_and_delete_more_than_a_page(self):
+        """Remote file stores list at most 1000 files per request."""
+        store = self.get_store()
+        files = {f'foo/{i}.txt': str(i) for i in range(1200)}
+        files['foo/bar/baz.txt'] = 'baz'
+        store.write_many(files)
+        self.assertEqual(
+            sorted(store.list('foo')),
+            sorted([f'foo/{i}.txt' for i in range(1200)] + ['foo/bar/']),
+        )
+        store.delete('foo')
+        self.assertEqual(store.read_many(files), {})
+
 
 class TestLocalFileStore(TestCase, _StorageTest):
     def setUp(self):
@@ -174,6 +241,63 @@ class TestLocalFileStore(TestCase, _StorageTest):
             f'concurrent writes (e.g., shorter write did not fully replace longer write).',
         )
 
+    def test_write_makes_directories_once(self):
+        self.store.write('dir/a.txt', 'a')
+        other_store = LocalFileStore(self.temp_dir)
+        with patch('os.makedirs', wraps=os.makedirs) as makedirs:
+            self.store.write('dir/b.txt', 'b')
+            other_store.write('dir/c.txt', 'c')
+        makedirs.assert_not_called()
+        self.assertEqual(self.store.read('dir/c.txt'), 'c')
+
+    def test_write_after_directory_removed(self):
+        self.store.write('dir/sub/a.txt', 'a')
+        self.store.delete('dir')
+        self.store.write('dir/sub/b.txt', 'b')
+        self.assertEqual(self.store.read('dir/sub/b.txt'), 'b')
+
+        # Removed by something other than the store
+        shutil.rmtree(os.path.join(self.temp_dir, 'dir'))
+        self.store.write('dir/sub/c.txt', 'c')
+        self.assertEqual(self.store.read('dir/sub/c.txt'), 'c')
+
+
+class TestAlwaysSyncLocalFileStore(TestLocalFileStore):
+    def setUp(self):
+        super().setUp()
+        self.store = LocalFileStore(self.temp_dir, durability=Durability.ALWAYS)
+
+    def test_write_syncs_file_before_rename(self):
+        # The inodes of the files synced
+        synced: list[int] = []
+        replace = os.replace
+
+        def check_synced_replace(src, dst):
+            self.assertIn(os.stat(src).st_ino, synced)
+            replace(src, dst)
+
+        with (
+            patch(
+                'os.fsync', side_effect=lambda fd: synced.append(os.fstat(fd).st_ino)
+            ),
+            patch('os.replace', side_effect=check_synced_replace) as replace_mock,
+        ):
+            self.store.write('dir/a.txt', 'a')
+        replace_mock.assert_called_once()
+        self.assertEqual(self.store.read('dir/a.txt'), 'a')
+
+
+class TestBufferedLocalFileStore(TestLocalFileStore):
+    def setUp(self):
+        super().setUp()
+        self.store = LocalFileStore(self.temp_dir, durability=Durability.BUFFERED)
+
+    def test_write_does_not_sync(self):
+        with patch('os.fsync') as fsync:
+            self.store.write('a.txt', 'a')
+        fsync.assert_not_called()
+        self.assertEqual(self.store.read('a.txt'), 'a')
+
 
 class TestInMemoryFileStore(TestCase, _StorageTest):
     def setUp(self):
@@ -192,6 +316,109 @@ class TestS3FileStore(TestCase, _StorageTest):
             self.store = S3FileStore('dear-liza')
 
 
+class TestRemoteFileStoreConcurrency(TestCase):
+    """Batched operations on the remote file stores make their requests
+    concurrently, so they take about as long as a single request."""
+
+    latency = 0.02
+    num_files = 50
+
+    def setUp(self):
+        self.in_flight = _InFlight()
+
+    def _check_concurrency(self, store: FileStore) -> None:
+        files = {f'foo/{i}.txt': f'Hello, {i}!' for i in range(self.num_files)}
+
+        store.write_many(files)
+        self.assertGreater(self.in_flight.reset(), 1)
+        self.assertEqual(store.read_many(files), files)
+        self.assertGreater(self.in_flight.reset(), 1)
+
+        # The files of a directory are deleted concurrently
+        store.delete('foo')
+        self.assertGreater(self.in_flight.reset(), 1)
+        self.assertEqual(store.read_many(files), {})
+
+    def test_s3_batched_operations(self):
+        client = _MockS3Client()
+        with patch('boto3.client', lambda service, **kwargs: client):
+            store = S3FileStore('dear-liza')
+        for method in ('get_object', 'put_object', 'delete_object'):
+            setattr(
+                client,
+                method,
+                _with_latency(getattr(client, method), self.latency, self.in_flight),
+            )
+        self._check_concurrency(store)
+
+    def test_google_cloud_batched_operations(self):
+        with patch('google.cloud.storage.Client', _MockGoogleCloudClient):
+            store = GoogleCloudFileStore('dear-liza')
+        with (
+            patch.object(
+                _MockGoogleCloudBlob,
+                'open',
+                _with_latency(_MockGoogleCloudBlob.open, self.latency, self.in_flight),
+            ),
+            patch.object(
+                _MockGoogleCloudBlob,
+                'delete',
+                _with_latency(
+                    _MockGoogleCloudBlob.delete, self.latency, self.in_flight
+                ),
+            ),
+        ):
+            self._check_concurrency(store)
+
+    def test_s3_directory_listing(self):
+        """Listing a directory only returns its direct children, so it takes one
+        request however many files are below them."""
+        client = _MockS3Client()
+        with patch('boto3.client', lambda service, **kwargs: client):
+            store = S3FileStore('dear-liza')
+        for sid in range(20):
+            for i in range(100):
+                store.write(f'sessions/{sid}/events/{i}.json', '{}')
+        with patch.object(
+            client, 'list_objects_v2', wraps=client.list_objects_v2
+        ) as list_objects:
+            self.assertEqual(len(store.list('sessions')), 20)
+        self.assertEqual(list_objects.call_count, 1)
+
+
+class _InFlight:
+    """Counts the requests in flight, and the most there have been at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._count = 0
+        self._peak = 0
+
+    def __enter__(self):
+        with self._lock:
+            self._count += 1
+            self._peak = max(self._peak, self._count)
+
+    def __exit__(self, *args):
+        with self._lock:
+            self._count -= 1
+
+    def reset(self) -> int:
+        """Return the most requests there have been in flight at once, and reset it."""
+        with self._lock:
+            peak, self._peak = self._peak, 0
+        return peak
+
+
+def _with_latency(fn, latency: float, in_flight: _InFlight):
+    def slow_fn(*args, **kwargs):
+        with in_flight:
+            time.sleep(latency)
+            return fn(*args, **kwargs)
+
+    return slow_fn
+
+
 # I would have liked to use cloud-storage-mocker here but the python versions were incompatible :(
 # If we write tests for the S3 storage class I would definitely recommend we use moto.
 class _MockGoogleCloudClient:
@@ -207,11 +434,33 @@ class _MockGoogleCloudBucket:
     def blob(self, path: str | None = None) -> _MockGoogleCloudBlob:
         return self.blobs_by_path.get(path) or _MockGoogleCloudBlob(self, path)
 
-    def list_blobs(self, prefix: str | None = None) -> list[_MockGoogleCloudBlob]:
-        blobs = list(self.blobs_by_path.values())
+    def list_blobs(
+        self, prefix: str | None = None, delimiter: str | None = None
+    ) -> _MockGoogleCloudBlobIterator:
+        blobs = sorted(self.blobs_by_path.values(), key=lambda blob: blob.name)
         if prefix and prefix != '/':
             blobs = [blob for blob in blobs if blob.name.startswith(prefix)]
-        return blobs
+        iterator = _MockGoogleCloudBlobIterator()
+        prefix_len = len(prefix or '')
+        for blob in blobs:
+            index = blob.name.find(delimiter, prefix_len) if delimiter else -1
+            if index == -1:
+                iterator.blobs.append(blob)
+            else:
+                iterator.all_prefixes.add(blob.name[: index + 1])
+        return iterator
+
+
+@dataclass
+class _MockGoogleCloudBlobIterator:
+    blobs: list[_MockGoogleCloudBlob] = field(default_factory=list)
+    all_prefixes: set[str] = field(default_factory=set)
+    # Like the real iterator, the prefixes are known once the pages are iterated
+    prefixes: set[str] = field(default_factory=set)
+
+    def __iter__(self):
+        yield from self.blobs
+        self.prefixes = self.all_prefixes
 
 
 @dataclass
@@ -225,9 +474,26 @@ class _MockGoogleCloudBlob:
             if self.content is None:
                 raise FileNotFoundError()
             return StringIO(self.content)
-        if op == 'w':
+        if op == 'rb':
+            return BytesIO(self.download_as_bytes())
+        if op in ('w', 'wb'):
             return _MockGoogleCloudBlobWriter(self)
 
+    def exists(self) -> bool:
+        return self.name in self.bucket.blobs_by_path
+
+    def download_as_bytes(self, start: int = 0, end: int | None = None) -> bytes:
+        if self.content is None:
+            raise NotFound('Blob not found')
+        content = (
+            self.content.encode('utf-8')
+            if isinstance(self.content, str)
+            else self.content
+        )
+        if start >= len(content):
+            raise RequestRangeNotSatisfiable('Range not satisfiable')
+        return content[start : None if end is None else end + 1]
+
     def delete(self):
         if self.name not in self.bucket.blobs_by_path:
             raise NotFound('Blob not found')
@@ -263,7 +529,14 @@ class _MockS3Client:
             self.objects_by_bucket[Bucket] = {}
         self.objects_by_bucket[Bucket][Key] = _MockS3Object(Key, Body)
 
-    def get_object(self, Bucket: str, Key: str) -> dict:
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        if Key not in self.objects_by_bucket.get(Bucket, {}):
+            raise botocore.exceptions.ClientError(
+                {'Error': {'Code': '404', 'Message': 'Not Found'}}, 'HeadObject'
+            )
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, Range: str | None = None) -> dict:
         if Bucket not in self.objects_by_bucket:
             raise botocore.exceptions.ClientError(
                 {
@@ -285,11 +558,26 @@ class _MockS3Client:
                 'GetObject',
             )
         content = self.objects_by_bucket[Bucket][Key].content
+        if Range is not None:
+            start, end = Range.removeprefix('bytes=').split('-')
+            if int(start) >= len(content):
+                raise botocore.exceptions.ClientError(
+                    {'Error': {'Code': 'InvalidRange', 'Message': 'Invalid range'}},
+                    'GetObject',
+                )
+            content = content[int(start) : int(end) + 1 if end else None]
         if isinstance(content, bytes):
             return {'Body': BytesIO(content)}
         return {'Body': StringIO(content)}
 
-    def list_objects_v2(self, Bucket: str, Prefix: str = '') -> dict:
+    def list_objects_v2(
+        self,
+        Bucket: str,
+        Prefix: str = '',
+        Delimiter: str | None = None,
+        MaxKeys: int = 1000,
+        ContinuationToken: str | None = None,
+    ) -> dict:
         if Bucket not in self.objects_by_bucket:
             raise botocore.exceptions.ClientError(
                 {
@@ -301,12 +589,35 @@ class _MockS3Client:
                 'ListObjectsV2',
             )
         objects = self.objects_by_bucket[Bucket]
-        contents = [
-            {'Key': key}
-            for key in objects.keys()
-            if not Prefix or key.startswith(Prefix)
+        # Keys, and the common prefixes as (prefix, None), in order
+        entries: dict[str, str | None] = {}
+        for key in sorted(objects.keys()):
+            if Prefix and not key.startswith(Prefix):
+                continue
+            index = key.find(Delimiter, len(Prefix)) if Delimiter else -1
+            if index == -1:
+                entries[key] = key
+            else:
+                entries.setdefault(key[: index + 1], None)
+        # The token is the last entry of the previous page, as in S3 the listing
+        # carries on after it even if objects are deleted in between
+        remaining = [
+            entry
+            for entry in entries.items()
+            if ContinuationToken is None or entry[0] > ContinuationToken
         ]
-        return {'Contents': contents} if contents else {}
+        page = remaining[:MaxKeys]
+        response: dict = {}
+        contents = [{'Key': key} for name, key in page if key is not None]
+        if contents:
+            response['Contents'] = contents
+        common_prefixes = [{'Prefix': name} for name, key in page if key is None]
+        if common_prefixes:
+            response['CommonPrefixes'] = common_prefixes
+        if len(remaining) > MaxKeys:
+            response['IsTruncated'] = True
+            response['NextContinuationToken'] = page[-1][0]
+        return response
 
     def delete_object(self, Bucket: str, Key: str) -> None:
         if Bucket not in self.objects_by_bucket:
@@ -0,0 +1,94 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from openhands.utils.http_session import (
+    AsyncTransportPool,
+    get_shared_async_transport,
+)
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_connections_reused_across_clients(server_url):
+    pool = AsyncTransportPool()
+    transport = pool.get_transport('test')
+    for _ in range(3):
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get(f'{server_url}/status')
+            assert response.json() == {'ok': True}
+
+    stats = pool.get_stats()['test']
+    assert stats.requests == 3
+    assert stats.connections_opened == 1
+    assert stats.reused_connections == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_existing_trace_is_preserved(server_url):
+    pool = AsyncTransportPool()
+    events = []
+
+    async def trace(name, info):
+        events.append(name)
+
+    async with httpx.AsyncClient(transport=pool.get_transport('test')) as client:
+        await client.get(
+            server_url,
+            extensions={'trace': trace},
+        )
+    assert 'connection.connect_tcp.complete' in events
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_transport_is_shared_per_upstream():
+    assert get_shared_async_transport('a') is get_shared_async_transport('a')
+    assert get_shared_async_transport('a') is not get_shared_async_transport('b')
+
+
+@pytest.mark.asyncio
+async def test_aclose_creates_new_transport_on_next_use():
+    pool = AsyncTransportPool()
+    transport = pool.get_transport('test')
+    await pool.aclose()
+    assert pool.get_transport('test') is not transport
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_only_closes_given_upstreams():
+    pool = AsyncTransportPool()
+    transport = pool.get_transport('a')
+    other_transport = pool.get_transport('b')
+    await pool.aclose(['a'])
+    assert pool.get_transport('a') is not transport
+    assert pool.get_transport('b') is other_transport
+    await pool.aclose()